@@ -1,9 +1,13 @@
 use pyo3::prelude::*;
-use pyo3::types::{PyDict, PyList, PyString, PyBool, PyFloat, PyInt};
+use pyo3::exceptions::PyValueError;
+use pyo3::types::{PyByteArray, PyBytes, PyDict, PyList, PyString, PyBool, PyFloat, PyInt};
+use regex::Regex;
+use std::borrow::Cow;
 use std::collections::HashSet;
 use std::thread;
 use std::time::{Duration, Instant};
-use std::sync::Mutex;
+use std::sync::atomic::{AtomicU64, AtomicUsize, Ordering};
+use std::sync::{Arc, Mutex};
 use crossbeam_channel::{bounded, Receiver, Sender, TrySendError};
 
 struct LogItem {
@@ -13,6 +17,44 @@ struct LogItem {
     vector: Option<Vec<f32>>,
 }
 
+#[derive(Clone, Copy, PartialEq)]
+enum OverflowPolicy {
+    Drop,
+    Block,
+    Spill,
+}
+
+impl OverflowPolicy {
+    fn parse(name: &str) -> Option<Self> {
+        match name {
+            "drop" => Some(OverflowPolicy::Drop),
+            "block" => Some(OverflowPolicy::Block),
+            "spill" => Some(OverflowPolicy::Spill),
+            _ => None,
+        }
+    }
+
+    fn as_str(&self) -> &'static str {
+        match self {
+            OverflowPolicy::Drop => "drop",
+            OverflowPolicy::Block => "block",
+            OverflowPolicy::Spill => "spill",
+        }
+    }
+}
+
+/// Counters shared between `add_object` callers and the worker thread.
+#[derive(Default)]
+struct BatchStats {
+    enqueued: AtomicU64,
+    dropped: AtomicU64,
+    spilled: AtomicU64,
+    flushed: AtomicU64,
+    flush_batches: AtomicU64,
+    flush_failures: AtomicU64,
+    last_flush_latency_us: AtomicU64,
+}
+
 #[pyclass]
 struct RustBatchManager {
     sender: Sender<LogItem>,
@@ -20,41 +62,153 @@ struct RustBatchManager {
     flush_callback: PyObject,
     worker_handle: Mutex<Option<thread::JoinHandle<()>>>,
     stop_signal: Sender<()>,
+    capacity: usize,
+    policy: OverflowPolicy,
+    block_timeout: Duration,
+    spill_callback: Option<PyObject>,
+    stats: Arc<BatchStats>,
+    /// Items per flush; read by the worker before every check so the
+    /// adaptive sizer can retune it while running.
+    threshold: Arc<AtomicUsize>,
 }
 
 #[pymethods]
 impl RustBatchManager {
     #[new]
+    #[pyo3(signature = (
+        callback,
+        batch_threshold,
+        flush_interval_ms,
+        capacity=10000,
+        overflow_policy="drop",
+        block_timeout_ms=50,
+        spill_callback=None,
+        columnar=false
+    ))]
     fn new(
         py: Python<'_>,
         callback: PyObject,
         batch_threshold: usize,
         flush_interval_ms: u64,
-    ) -> Self {
-        let (tx, rx) = bounded::<LogItem>(10000);
+        capacity: usize,
+        overflow_policy: &str,
+        block_timeout_ms: u64,
+        spill_callback: Option<PyObject>,
+        columnar: bool,
+    ) -> PyResult<Self> {
+        let policy = OverflowPolicy::parse(overflow_policy).ok_or_else(|| {
+            PyValueError::new_err(format!(
+                "Unknown overflow policy '{}'. Expected one of: drop, block, spill.",
+                overflow_policy
+            ))
+        })?;
+        if policy == OverflowPolicy::Spill && spill_callback.is_none() {
+            return Err(PyValueError::new_err("overflow_policy='spill' requires a spill_callback."));
+        }
+        let capacity = capacity.max(1);
+        let batch_threshold = batch_threshold.max(1);
+
+        let (tx, rx) = bounded::<LogItem>(capacity);
         let (stop_tx, stop_rx) = bounded(1);
         let worker_callback = callback.clone_ref(py);
+        let stats = Arc::new(BatchStats::default());
+        let worker_stats = Arc::clone(&stats);
+        let threshold = Arc::new(AtomicUsize::new(batch_threshold));
+        let worker_threshold = Arc::clone(&threshold);
 
         let handle = thread::spawn(move || {
-            Self::worker_loop(rx, stop_rx, worker_callback, batch_threshold, flush_interval_ms);
+            Self::worker_loop(rx, stop_rx, worker_callback, worker_threshold, flush_interval_ms, columnar, worker_stats);
         });
 
-        RustBatchManager {
+        Ok(RustBatchManager {
             sender: tx,
             flush_callback: callback,
             worker_handle: Mutex::new(Some(handle)),
             stop_signal: stop_tx,
-        }
+            capacity,
+            policy,
+            block_timeout: Duration::from_millis(block_timeout_ms),
+            spill_callback,
+            stats,
+            threshold,
+        })
+    }
+
+    /// Changes the number of items per flush; takes effect on the worker's
+    /// next check.
+    fn set_batch_threshold(&self, batch_threshold: usize) {
+        self.threshold.store(batch_threshold.max(1), Ordering::Relaxed);
+    }
+
+    #[getter]
+    fn batch_threshold(&self) -> usize {
+        self.threshold.load(Ordering::Relaxed)
     }
 
+    /// Queues one object. Returns False when the item was dropped.
     #[pyo3(signature = (collection, properties, uuid=None, vector=None))]
-    fn add_object(&self, collection: PyObject, properties: Py<PyDict>, uuid: Option<PyObject>, vector: Option<Vec<f32>>) {
+    fn add_object(&self, py: Python<'_>, collection: PyObject, properties: Py<PyDict>, uuid: Option<PyObject>, vector: Option<Vec<f32>>) -> bool {
         let item = LogItem { collection, properties, uuid, vector };
-        let _ = self.sender.try_send(item);
+        let rejected = match self.sender.try_send(item) {
+            Ok(()) => None,
+            Err(TrySendError::Full(item)) if self.policy == OverflowPolicy::Block => {
+                let sender = &self.sender;
+                let timeout = self.block_timeout;
+                // Release the GIL while waiting so the worker can flush.
+                py.allow_threads(|| sender.send_timeout(item, timeout)).err().map(|e| e.into_inner())
+            }
+            Err(e) => Some(e.into_inner()),
+        };
+
+        let item = match rejected {
+            None => {
+                self.stats.enqueued.fetch_add(1, Ordering::Relaxed);
+                return true;
+            }
+            Some(item) => item,
+        };
+
+        if self.policy == OverflowPolicy::Spill {
+            if let Some(spill) = &self.spill_callback {
+                let spilled = Self::item_to_dict(py, &item)
+                    .and_then(|dict| spill.call1(py, (PyList::new(py, [dict])?,)));
+                match spilled {
+                    Ok(ret) if ret.extract::<bool>(py).unwrap_or(true) => {
+                        self.stats.spilled.fetch_add(1, Ordering::Relaxed);
+                        return true;
+                    }
+                    Ok(_) => {}
+                    Err(e) => eprintln!("[RustCore] ⚠️ Spill failed: {}", e),
+                }
+            }
+        }
+        self.stats.dropped.fetch_add(1, Ordering::Relaxed);
+        false
+    }
+
+    /// Queue depth and lifetime counters.
+    fn stats<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let s = &self.stats;
+        let dict = PyDict::new(py);
+        dict.set_item("capacity", self.capacity)?;
+        dict.set_item("batch_threshold", self.threshold.load(Ordering::Relaxed))?;
+        dict.set_item("overflow_policy", self.policy.as_str())?;
+        dict.set_item("depth", self.sender.len())?;
+        dict.set_item("enqueued", s.enqueued.load(Ordering::Relaxed))?;
+        dict.set_item("dropped", s.dropped.load(Ordering::Relaxed))?;
+        dict.set_item("spilled", s.spilled.load(Ordering::Relaxed))?;
+        dict.set_item("flushed", s.flushed.load(Ordering::Relaxed))?;
+        dict.set_item("flush_batches", s.flush_batches.load(Ordering::Relaxed))?;
+        dict.set_item("flush_failures", s.flush_failures.load(Ordering::Relaxed))?;
+        dict.set_item(
+            "last_flush_latency_ms",
+            s.last_flush_latency_us.load(Ordering::Relaxed) as f64 / 1000.0,
+        )?;
+        Ok(dict)
     }
 
     fn shutdown(&self, py: Python<'_>) {
-        let _ = self.stop_signal.send(());
+        let _ = self.stop_signal.try_send(());
         py.allow_threads(|| {
             if let Ok(mut handle_guard) = self.worker_handle.lock() {
                 if let Some(handle) = handle_guard.take() {
@@ -66,106 +220,613 @@ impl RustBatchManager {
 }
 
 impl RustBatchManager {
-    fn worker_loop(rx: Receiver<LogItem>, stop_rx: Receiver<()>, callback: PyObject, threshold: usize, interval_ms: u64) {
-            let mut buffer = Vec::with_capacity(threshold);
+    fn worker_loop(
+        rx: Receiver<LogItem>,
+        stop_rx: Receiver<()>,
+        callback: PyObject,
+        threshold: Arc<AtomicUsize>,
+        interval_ms: u64,
+        columnar: bool,
+        stats: Arc<BatchStats>,
+    ) {
+            let mut buffer = Vec::with_capacity(threshold.load(Ordering::Relaxed));
             let mut last_flush = Instant::now();
             let flush_interval = Duration::from_millis(interval_ms);
 
             loop {
+                let mut stopping = false;
                 crossbeam_channel::select! {
-                    recv(stop_rx) -> msg => {
-                        break;
+                    recv(stop_rx) -> _ => {
+                        stopping = true;
                     }
                     recv(rx) -> msg => {
                         match msg {
                             Ok(item) => buffer.push(item),
-                            Err(_) => break,
+                            Err(_) => stopping = true,
                         }
                     }
                     default(Duration::from_millis(100)) => {}
                 }
 
+                if stopping {
+                    // Drain what is still queued so shutdown doesn't lose it.
+                    buffer.extend(rx.try_iter());
+                    for chunk in buffer.chunks(threshold.load(Ordering::Relaxed)) {
+                        Self::flush_and_record(chunk, &callback, columnar, &stats);
+                    }
+                    break;
+                }
 
-                if stop_rx.is_empty() && (buffer.len() >= threshold || (last_flush.elapsed() >= flush_interval && !buffer.is_empty())) {
-
-                     let _ = std::panic::catch_unwind(std::panic::AssertUnwindSafe(|| {
-                        Self::flush_buffer(&buffer, &callback);
-                    }));
+                if stop_rx.is_empty() && (buffer.len() >= threshold.load(Ordering::Relaxed) || (last_flush.elapsed() >= flush_interval && !buffer.is_empty())) {
+                    Self::flush_and_record(&buffer, &callback, columnar, &stats);
                     buffer.clear();
                     last_flush = Instant::now();
                 }
             }
         }
 
-    fn flush_buffer(buffer: &Vec<LogItem>, callback: &PyObject) {
+    fn flush_and_record(items: &[LogItem], callback: &PyObject, columnar: bool, stats: &BatchStats) {
+        let started = Instant::now();
+        let ok = std::panic::catch_unwind(std::panic::AssertUnwindSafe(|| {
+            if columnar {
+                Self::flush_columnar(items, callback)
+            } else {
+                Self::flush_buffer(items, callback)
+            }
+        })).unwrap_or(false);
+        stats.last_flush_latency_us.store(started.elapsed().as_micros() as u64, Ordering::Relaxed);
+        stats.flush_batches.fetch_add(1, Ordering::Relaxed);
+        if ok {
+            stats.flushed.fetch_add(items.len() as u64, Ordering::Relaxed);
+        } else {
+            stats.flush_failures.fetch_add(1, Ordering::Relaxed);
+        }
+    }
+
+    fn item_to_dict<'py>(py: Python<'py>, item: &LogItem) -> PyResult<Bound<'py, PyDict>> {
+        let dict = PyDict::new(py);
+        dict.set_item("collection", item.collection.clone_ref(py))?;
+        dict.set_item("properties", item.properties.clone_ref(py))?;
+        dict.set_item("uuid", item.uuid.as_ref().map_or(py.None(), |u| u.clone_ref(py)))?;
+        dict.set_item("vector", item.vector.as_ref().map_or(py.None(), |v| v.to_object(py)))?;
+        Ok(dict)
+    }
+
+    /// Hands `buffer` to the Python callback. A raised exception or an
+    /// explicit `False` return counts as a failed flush.
+    fn flush_buffer(buffer: &[LogItem], callback: &PyObject) -> bool {
         Python::with_gil(|py| {
             let py_list = PyList::empty(py);
 
             for item in buffer {
-                let dict = PyDict::new(py);
-                let mut set_field = |key: &str, val: PyObject| -> bool {
-                    if let Err(_) = dict.set_item(key, val) { return false; }
-                    true
-                };
-
-                if !set_field("collection", item.collection.clone_ref(py)) { continue; }
-                if !set_field("properties", item.properties.to_object(py)) { continue; }
-                let uuid_val = item.uuid.as_ref().map_or(py.None(), |u| u.clone_ref(py));
-                if !set_field("uuid", uuid_val) { continue; }
-                let vector_val = item.vector.as_ref().map_or(py.None(), |v| v.to_object(py));
-                if !set_field("vector", vector_val) { continue; }
-
-                if let Err(e) = py_list.append(dict) {
+                let appended = Self::item_to_dict(py, item).and_then(|dict| py_list.append(dict));
+                if let Err(e) = appended {
                      eprintln!("[RustCore] ⚠️ Failed to append item: {}", e);
                 }
             }
 
-            if let Err(e) = callback.call1(py, (py_list,)) {
+            Self::call_flush(py, callback, py_list.into_any())
+        })
+    }
+
+    /// Columnar variant used by Lite mode: one list per field instead of a
+    /// dict per item, and every vector packed into a single native-endian
+    /// f32 buffer (`vector_dims[i]` floats for item i, 0 when absent) so no
+    /// Python float objects are created. The Python side wraps the buffer
+    /// as an Arrow FixedSizeList column without copying it.
+    fn flush_columnar(buffer: &[LogItem], callback: &PyObject) -> bool {
+        let total: usize = buffer.iter().map(|item| item.vector.as_ref().map_or(0, |v| v.len())).sum();
+        let mut vector_data: Vec<u8> = Vec::with_capacity(total * 4);
+        let mut vector_dims: Vec<usize> = Vec::with_capacity(buffer.len());
+        for item in buffer {
+            match &item.vector {
+                Some(v) => {
+                    for x in v {
+                        vector_data.extend_from_slice(&x.to_ne_bytes());
+                    }
+                    vector_dims.push(v.len());
+                }
+                None => vector_dims.push(0),
+            }
+        }
+
+        Python::with_gil(|py| {
+            match Self::columnar_dict(py, buffer, &vector_data, vector_dims) {
+                Ok(dict) => Self::call_flush(py, callback, dict.into_any()),
+                Err(e) => {
+                    eprintln!("[RustCore] ⚠️ Failed to build columnar batch: {}", e);
+                    false
+                }
+            }
+        })
+    }
+
+    fn columnar_dict<'py>(
+        py: Python<'py>,
+        buffer: &[LogItem],
+        vector_data: &[u8],
+        vector_dims: Vec<usize>,
+    ) -> PyResult<Bound<'py, PyDict>> {
+        let collections = PyList::empty(py);
+        let properties = PyList::empty(py);
+        let uuids = PyList::empty(py);
+        for item in buffer {
+            collections.append(item.collection.clone_ref(py))?;
+            properties.append(item.properties.clone_ref(py))?;
+            uuids.append(item.uuid.as_ref().map_or(py.None(), |u| u.clone_ref(py)))?;
+        }
+        let dict = PyDict::new(py);
+        dict.set_item("collection", collections)?;
+        dict.set_item("properties", properties)?;
+        dict.set_item("uuid", uuids)?;
+        dict.set_item("vector_data", PyBytes::new(py, vector_data))?;
+        dict.set_item("vector_dims", vector_dims)?;
+        Ok(dict)
+    }
+
+    fn call_flush(py: Python<'_>, callback: &PyObject, payload: Bound<'_, PyAny>) -> bool {
+        match callback.call1(py, (payload,)) {
+            Ok(ret) => ret.extract::<bool>(py).unwrap_or(true),
+            Err(e) => {
                 eprintln!("[RustCore] ⚠️ Flush failed: {}", e);
+                false
             }
-        });
+        }
     }
 }
 
-fn process_recursive(py: Python, value: &Bound<'_, PyAny>, sensitive_set: &HashSet<String>) -> PyResult<PyObject> {
+const MASKED: &str = "[MASKED]";
+const MAX_DEPTH_MARKER: &str = "[MAX_DEPTH]";
+const TRUNCATED_SUFFIX: &str = "...[TRUNCATED]";
+const SERIALIZATION_ERROR: &str = "[SERIALIZATION_ERROR]";
+
+/// Capture limits shared by `mask_and_serialize` and `mask_and_encode`;
+/// `None` means unlimited. Whatever a limit cuts is replaced by a marker so
+/// truncated data is never mistaken for the real value.
+#[derive(Clone, Copy, Default)]
+struct CaptureLimits {
+    max_depth: Option<usize>,
+    max_list_items: Option<usize>,
+    max_string_length: Option<usize>,
+}
+
+impl CaptureLimits {
+    fn too_deep(&self, depth: usize) -> bool {
+        self.max_depth.map_or(false, |max| depth >= max)
+    }
+
+    /// How many items of a `len`-item dict or list are kept.
+    fn keep_items(&self, len: usize) -> usize {
+        self.max_list_items.map_or(len, |max| len.min(max))
+    }
+
+    /// `s` cut to `max_string_length` characters plus "...[TRUNCATED]",
+    /// or None when it fits.
+    fn cut_str(&self, s: &str) -> Option<String> {
+        let max = self.max_string_length?;
+        let (end, _) = s.char_indices().nth(max)?;
+        Some(format!("{}{}", &s[..end], TRUNCATED_SUFFIX))
+    }
+
+    /// One-line description written instead of `str()` for bytes longer than
+    /// `max_string_length` and for array-likes (ndarray, DataFrame, Series:
+    /// anything with `shape` and an integer `size`) holding more than
+    /// `max_list_items` elements.
+    fn summarize(&self, value: &Bound<'_, PyAny>) -> Option<String> {
+        let type_name = value.get_type().name().ok()?.to_string();
+        if value.is_instance_of::<PyBytes>() || value.is_instance_of::<PyByteArray>() {
+            let len = value.len().ok()?;
+            return (len > self.max_string_length?).then(|| format!("<{} len={}>", type_name, len));
+        }
+        let max = self.max_list_items?;
+        let shape = value.getattr("shape").ok()?;
+        let size: usize = value.getattr("size").ok()?.extract().ok()?;
+        if size <= max {
+            return None;
+        }
+        let shape = shape.str().ok()?.to_string();
+        Some(match value.getattr("dtype").and_then(|d| d.str()) {
+            Ok(dtype) => format!("<{} shape={} dtype={}>", type_name, shape, dtype),
+            Err(_) => format!("<{} shape={}>", type_name, shape),
+        })
+    }
+}
+
+/// Compiled masking rules: exact key names (lowercase), plus optional
+/// patterns for keys (matched case-insensitively) and for string values.
+struct MaskRules {
+    keys: HashSet<String>,
+    key_pattern: Option<Regex>,
+    value_pattern: Option<Regex>,
+}
+
+impl MaskRules {
+    fn from_keys(keys: Vec<String>) -> Self {
+        MaskRules {
+            keys: keys.into_iter().map(|s| s.to_lowercase()).collect(),
+            key_pattern: None,
+            value_pattern: None,
+        }
+    }
+
+    fn is_sensitive(&self, key: &str) -> bool {
+        let key = key.to_lowercase();
+        self.keys.contains(&key) || self.key_pattern.as_ref().map_or(false, |re| re.is_match(&key))
+    }
+
+    /// `text` with every value-pattern match replaced by "[MASKED]".
+    fn redact<'s>(&self, text: &'s str) -> Cow<'s, str> {
+        match &self.value_pattern {
+            Some(re) => re.replace_all(text, MASKED),
+            None => Cow::Borrowed(text),
+        }
+    }
+}
+
+/// One regex matching any of `patterns`, or None when there are none.
+fn union_pattern(patterns: &[String], case_insensitive: bool) -> PyResult<Option<Regex>> {
+    if patterns.is_empty() {
+        return Ok(None);
+    }
+    let joined = patterns.iter().map(|p| format!("(?:{})", p)).collect::<Vec<_>>().join("|");
+    let source = if case_insensitive { format!("(?i){}", joined) } else { joined };
+    Regex::new(&source)
+        .map(Some)
+        .map_err(|e| PyValueError::new_err(format!("Invalid mask pattern: {}", e)))
+}
+
+fn more_items(n: usize) -> String {
+    format!("...[{} more items]", n)
+}
+
+/// Text stored for a value with no JSON form: a summary when it is large,
+/// otherwise its redacted `str()` cut to `max_string_length`.
+fn fallback_text(value: &Bound<'_, PyAny>, rules: &MaskRules, limits: &CaptureLimits) -> String {
+    if let Some(summary) = limits.summarize(value) {
+        return summary;
+    }
+    match value.str() {
+        Ok(s) => {
+            let raw = s.to_string_lossy();
+            let text = rules.redact(&raw);
+            limits.cut_str(&text).unwrap_or_else(|| text.into_owned())
+        }
+        Err(_) => SERIALIZATION_ERROR.to_string(),
+    }
+}
+
+fn process_recursive(
+    py: Python,
+    value: &Bound<'_, PyAny>,
+    rules: &MaskRules,
+    limits: &CaptureLimits,
+    depth: usize,
+) -> PyResult<PyObject> {
     if let Ok(dict_obj) = value.downcast::<PyDict>() {
+        if limits.too_deep(depth) {
+            return Ok(PyString::new(py, MAX_DEPTH_MARKER).into());
+        }
         let new_dict = PyDict::new(py);
-        for (k, v) in dict_obj {
-            let k_str = k.to_string().to_lowercase();
-            if sensitive_set.contains(&k_str) {
-                new_dict.set_item(k, "[MASKED]")?;
+        let len = dict_obj.len();
+        let keep = limits.keep_items(len);
+        for (k, v) in dict_obj.iter().take(keep) {
+            if rules.is_sensitive(&k.to_string()) {
+                new_dict.set_item(k, MASKED)?;
             } else {
-                new_dict.set_item(k, process_recursive(py, &v, sensitive_set)?)?;
+                new_dict.set_item(k, process_recursive(py, &v, rules, limits, depth + 1)?)?;
             }
         }
+        if keep < len {
+            new_dict.set_item("...", more_items(len - keep))?;
+        }
         Ok(new_dict.into())
     } else if let Ok(list_obj) = value.downcast::<PyList>() {
+        if limits.too_deep(depth) {
+            return Ok(PyString::new(py, MAX_DEPTH_MARKER).into());
+        }
         let new_list = PyList::empty(py);
-        for item in list_obj {
-            new_list.append(process_recursive(py, &item, sensitive_set)?)?;
+        let len = list_obj.len();
+        let keep = limits.keep_items(len);
+        for item in list_obj.iter().take(keep) {
+            new_list.append(process_recursive(py, &item, rules, limits, depth + 1)?)?;
+        }
+        if keep < len {
+            new_list.append(more_items(len - keep))?;
         }
         Ok(new_list.into())
+    } else if let Ok(s) = value.downcast::<PyString>() {
+        let raw = s.to_string_lossy();
+        let text = rules.redact(&raw);
+        match limits.cut_str(&text) {
+            Some(cut) => Ok(PyString::new(py, &cut).into()),
+            None if matches!(text, Cow::Borrowed(_)) => Ok(value.clone().unbind()),
+            None => Ok(PyString::new(py, &text).into()),
+        }
+    } else if value.is_none() || value.is_instance_of::<PyBool>() || value.is_instance_of::<PyFloat>() || value.is_instance_of::<PyInt>() {
+        Ok(value.clone().unbind())
     } else {
-        if value.is_none() || value.is_instance_of::<PyBool>() || value.is_instance_of::<PyFloat>() || value.is_instance_of::<PyInt>() || value.is_instance_of::<PyString>() {
-            Ok(value.clone().unbind())
+        Ok(PyString::new(py, &fallback_text(value, rules, limits)).into())
+    }
+}
+
+/// Masks sensitive keys in `data`, turning anything that isn't a dict, list,
+/// str, number, bool or None into a string. Containers nested deeper than
+/// `max_depth` become "[MAX_DEPTH]", dicts and lists keep their first
+/// `max_list_items` items plus a "...[N more items]" marker, and strings
+/// longer than `max_string_length` end in "...[TRUNCATED]".
+#[pyfunction]
+#[pyo3(signature = (data, sensitive_keys, max_depth=None, max_list_items=None, max_string_length=None))]
+fn mask_and_serialize(
+    py: Python,
+    data: &Bound<'_, PyAny>,
+    sensitive_keys: Vec<String>,
+    max_depth: Option<usize>,
+    max_list_items: Option<usize>,
+    max_string_length: Option<usize>,
+) -> PyResult<PyObject> {
+    let limits = CaptureLimits { max_depth, max_list_items, max_string_length };
+    process_recursive(py, data, &MaskRules::from_keys(sensitive_keys), &limits, 0)
+}
+
+/// Single-pass masking JSON encoder. Produces the same document as
+/// `json.dumps(mask_and_serialize(value, keys, ...), separators=(",", ":"))`
+/// (non-ASCII is written as UTF-8 instead of `\u` escapes) without
+/// building the intermediate Python objects.
+struct MaskingEncoder<'a> {
+    rules: &'a MaskRules,
+    limits: CaptureLimits,
+    max_bytes: Option<usize>,
+    out: Vec<u8>,
+    overflowed: bool,
+}
+
+impl<'a> MaskingEncoder<'a> {
+    fn write_str(&mut self, s: &str) {
+        // Serializing a &str into a Vec can't fail.
+        let _ = serde_json::to_writer(&mut self.out, s);
+    }
+
+    fn write_py_str(&mut self, s: &Bound<'_, PyString>) {
+        // Lossy only for lone surrogates, which UTF-8 can't represent.
+        let raw = s.to_string_lossy();
+        let text = self.rules.redact(&raw);
+        match self.limits.cut_str(&text) {
+            Some(cut) => self.write_str(&cut),
+            None => self.write_str(&text),
+        }
+    }
+
+    fn write_key(&mut self, key: &Bound<'_, PyAny>) {
+        if let Ok(s) = key.downcast::<PyString>() {
+            self.write_str(&s.to_string_lossy());
+        } else if key.is_none() {
+            self.write_str("null");
+        } else if let Ok(b) = key.downcast::<PyBool>() {
+            self.write_str(if b.is_true() { "true" } else { "false" });
+        } else {
+            let text = key.to_string();
+            self.write_str(&text);
+        }
+    }
+
+    fn write_float(&mut self, f: f64) {
+        if f.is_nan() {
+            self.out.extend_from_slice(b"NaN");
+        } else if f.is_infinite() {
+            self.out.extend_from_slice(if f > 0.0 { &b"Infinity"[..] } else { &b"-Infinity"[..] });
+        } else {
+            let _ = serde_json::to_writer(&mut self.out, &f);
+        }
+    }
+
+    fn write_value(&mut self, value: &Bound<'_, PyAny>, depth: usize) -> PyResult<()> {
+        if self.overflowed {
+            return Ok(());
+        }
+        if let Some(limit) = self.max_bytes {
+            if self.out.len() > limit {
+                // The result is truncated anyway; stop walking.
+                self.overflowed = true;
+                return Ok(());
+            }
+        }
+
+        if value.is_none() {
+            self.out.extend_from_slice(b"null");
+        } else if let Ok(b) = value.downcast::<PyBool>() {
+            self.out.extend_from_slice(if b.is_true() { &b"true"[..] } else { &b"false"[..] });
+        } else if value.is_instance_of::<PyInt>() {
+            match value.extract::<i64>() {
+                Ok(i) => self.out.extend_from_slice(i.to_string().as_bytes()),
+                Err(_) => self.out.extend_from_slice(value.str()?.to_str()?.as_bytes()),
+            }
+        } else if value.is_instance_of::<PyFloat>() {
+            self.write_float(value.extract::<f64>()?);
+        } else if let Ok(s) = value.downcast::<PyString>() {
+            self.write_py_str(s);
+        } else if let Ok(dict) = value.downcast::<PyDict>() {
+            if self.limits.too_deep(depth) {
+                self.write_str(MAX_DEPTH_MARKER);
+                return Ok(());
+            }
+            let len = dict.len();
+            let keep = self.limits.keep_items(len);
+            self.out.push(b'{');
+            for (i, (k, v)) in dict.iter().take(keep).enumerate() {
+                if i > 0 {
+                    self.out.push(b',');
+                }
+                self.write_key(&k);
+                self.out.push(b':');
+                if self.rules.is_sensitive(&k.to_string()) {
+                    self.write_str(MASKED);
+                } else {
+                    self.write_value(&v, depth + 1)?;
+                }
+            }
+            if keep < len {
+                if keep > 0 {
+                    self.out.push(b',');
+                }
+                self.write_str("...");
+                self.out.push(b':');
+                self.write_str(&more_items(len - keep));
+            }
+            self.out.push(b'}');
+        } else if let Ok(list) = value.downcast::<PyList>() {
+            if self.limits.too_deep(depth) {
+                self.write_str(MAX_DEPTH_MARKER);
+                return Ok(());
+            }
+            let len = list.len();
+            let keep = self.limits.keep_items(len);
+            self.out.push(b'[');
+            for (i, item) in list.iter().take(keep).enumerate() {
+                if i > 0 {
+                    self.out.push(b',');
+                }
+                self.write_value(&item, depth + 1)?;
+            }
+            if keep < len {
+                if keep > 0 {
+                    self.out.push(b',');
+                }
+                self.write_str(&more_items(len - keep));
+            }
+            self.out.push(b']');
         } else {
-            match value.str() {
-                Ok(s) => Ok(s.into()),
-                Err(_) => Ok(PyString::new(py, "[SERIALIZATION_ERROR]").into())
+            let text = fallback_text(value, self.rules, &self.limits);
+            self.write_str(&text);
+        }
+        Ok(())
+    }
+
+    /// The encoded document, or, past `max_bytes`, a JSON string holding
+    /// its first `max_bytes` bytes followed by the truncation marker.
+    fn finish(mut self) -> Vec<u8> {
+        match self.max_bytes {
+            Some(limit) if self.overflowed || self.out.len() > limit => {
+                let mut cut = limit.min(self.out.len());
+                // Back up to a UTF-8 character boundary.
+                while cut > 0 && cut < self.out.len() && (self.out[cut] & 0xC0) == 0x80 {
+                    cut -= 1;
+                }
+                let head = String::from_utf8_lossy(&self.out[..cut]).into_owned();
+                self.out = Vec::with_capacity(cut + TRUNCATED_SUFFIX.len() + 16);
+                self.write_str(&(head + TRUNCATED_SUFFIX));
+                self.out
             }
+            _ => self.out,
         }
     }
 }
 
+fn encode_with<'py>(
+    py: Python<'py>,
+    rules: &MaskRules,
+    data: &Bound<'py, PyAny>,
+    limits: CaptureLimits,
+    max_bytes: Option<usize>,
+) -> PyResult<Bound<'py, PyBytes>> {
+    let mut encoder = MaskingEncoder {
+        rules,
+        limits,
+        max_bytes,
+        out: Vec::with_capacity(256),
+        overflowed: false,
+    };
+    encoder.write_value(data, 0)?;
+    Ok(PyBytes::new(py, &encoder.finish()))
+}
+
+/// Masks sensitive keys and encodes `data` as compact JSON bytes in one
+/// walk, applying the same limits as `mask_and_serialize`. Output longer
+/// than `max_bytes` becomes a JSON string of its prefix ending in
+/// "...[TRUNCATED]".
 #[pyfunction]
-fn mask_and_serialize(py: Python, data: &Bound<'_, PyAny>, sensitive_keys: Vec<String>) -> PyResult<PyObject> {
-    let sensitive_set: HashSet<String> = sensitive_keys.into_iter().map(|s| s.to_lowercase()).collect();
-    process_recursive(py, data, &sensitive_set)
+#[pyo3(signature = (data, sensitive_keys, max_depth=None, max_bytes=None, max_list_items=None, max_string_length=None))]
+fn mask_and_encode<'py>(
+    py: Python<'py>,
+    data: &Bound<'py, PyAny>,
+    sensitive_keys: Vec<String>,
+    max_depth: Option<usize>,
+    max_bytes: Option<usize>,
+    max_list_items: Option<usize>,
+    max_string_length: Option<usize>,
+) -> PyResult<Bound<'py, PyBytes>> {
+    let limits = CaptureLimits { max_depth, max_list_items, max_string_length };
+    encode_with(py, &MaskRules::from_keys(sensitive_keys), data, limits, max_bytes)
 }
 
+/// Masking rules compiled once (from the sensitive-key settings) and reused
+/// for every call, instead of rebuilding the key set per value like
+/// `mask_and_serialize` does. Keys are masked when their lowercase name is
+/// in `sensitive_keys` or matches one of `key_patterns`; substrings of
+/// string values matching `value_patterns` are replaced by "[MASKED]".
+#[pyclass(frozen)]
+struct Masker {
+    rules: MaskRules,
+}
+
+#[pymethods]
+impl Masker {
+    #[new]
+    #[pyo3(signature = (sensitive_keys, key_patterns=Vec::new(), value_patterns=Vec::new()))]
+    fn new(sensitive_keys: Vec<String>, key_patterns: Vec<String>, value_patterns: Vec<String>) -> PyResult<Self> {
+        let mut rules = MaskRules::from_keys(sensitive_keys);
+        rules.key_pattern = union_pattern(&key_patterns, true)?;
+        rules.value_pattern = union_pattern(&value_patterns, false)?;
+        Ok(Masker { rules })
+    }
+
+    fn is_sensitive(&self, key: &str) -> bool {
+        self.rules.is_sensitive(key)
+    }
+
+    fn redact(&self, text: &str) -> String {
+        self.rules.redact(text).into_owned()
+    }
+
+    /// Same as `mask_and_serialize` with this masker's rules.
+    #[pyo3(signature = (data, max_depth=None, max_list_items=None, max_string_length=None))]
+    fn mask(
+        &self,
+        py: Python<'_>,
+        data: &Bound<'_, PyAny>,
+        max_depth: Option<usize>,
+        max_list_items: Option<usize>,
+        max_string_length: Option<usize>,
+    ) -> PyResult<PyObject> {
+        let limits = CaptureLimits { max_depth, max_list_items, max_string_length };
+        process_recursive(py, data, &self.rules, &limits, 0)
+    }
+
+    /// Same as `mask_and_encode` with this masker's rules.
+    #[pyo3(signature = (data, max_depth=None, max_bytes=None, max_list_items=None, max_string_length=None))]
+    fn encode<'py>(
+        &self,
+        py: Python<'py>,
+        data: &Bound<'py, PyAny>,
+        max_depth: Option<usize>,
+        max_bytes: Option<usize>,
+        max_list_items: Option<usize>,
+        max_string_length: Option<usize>,
+    ) -> PyResult<Bound<'py, PyBytes>> {
+        let limits = CaptureLimits { max_depth, max_list_items, max_string_length };
+        encode_with(py, &self.rules, data, limits, max_bytes)
+    }
+}
+
+/// Bumped whenever the Python package starts relying on something new in
+/// this module; `vectorwave.runtime.RUST_CORE_API_VERSION` must match it.
+const API_VERSION: u32 = 2;
+
 #[pymodule]
 fn vectorwave_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add("API_VERSION", API_VERSION)?;
     m.add_class::<RustBatchManager>()?;
+    m.add_class::<Masker>()?;
     m.add_function(wrap_pyfunction!(mask_and_serialize, m)?)?;
+    m.add_function(wrap_pyfunction!(mask_and_encode, m)?)?;
     Ok(())
 }
\ No newline at end of file
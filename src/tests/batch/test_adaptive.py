@@ -0,0 +1,49 @@
+from vectorwave.batch.adaptive import AdaptiveBatchSizer
+
+
+def _window(sizer, items, seconds, ok=True):
+    result = None
+    for _ in range(sizer.window):
+        result = sizer.record(items, seconds, ok)
+    return result
+
+
+def test_grows_while_time_per_item_drops():
+    sizer = AdaptiveBatchSizer(20, min_size=10, max_size=100)
+
+    assert _window(sizer, 20, 0.020) == 25  # first window probes upward
+    assert _window(sizer, 25, 0.020) == 31  # 0.8ms/item, down from 1ms
+    assert _window(sizer, 31, 0.0248) is None  # flat: hold
+    assert sizer.size == 31
+
+
+def test_reverses_when_time_per_item_gets_worse():
+    sizer = AdaptiveBatchSizer(40, min_size=10, max_size=100)
+    _window(sizer, 40, 0.040)
+
+    assert _window(sizer, 50, 0.100) == 40  # 2ms/item after growing: step back
+
+
+def test_backs_off_on_slow_p95_or_errors():
+    sizer = AdaptiveBatchSizer(80, min_size=10, max_size=100, target_p95_seconds=0.5)
+    assert _window(sizer, 80, 0.9) == 40
+
+    for _ in range(sizer.window - 1):
+        sizer.record(40, 0.01, True)
+    assert sizer.record(40, 0.01, False) == 20
+    assert sizer.stats()["last_error_rate"] == 1 / sizer.window
+
+
+def test_interval_driven_flushes_do_not_change_the_size():
+    sizer = AdaptiveBatchSizer(50)
+    assert _window(sizer, 3, 0.001) is None
+    assert sizer.size == 50
+
+
+def test_size_stays_within_bounds():
+    sizer = AdaptiveBatchSizer(500, min_size=10, max_size=60)
+    assert sizer.size == 60
+    assert _window(sizer, 60, 0.001) is None
+    for _ in range(5):
+        _window(sizer, sizer.size, 10.0)
+    assert sizer.size == 10
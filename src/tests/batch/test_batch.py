@@ -6,6 +6,8 @@ same callback the Rust worker thread invokes) and asserting items land in
 Weaviate. Connection-failure paths stay mocked because they are tedious to
 reproduce against a live container.
 """
+import threading
+import time
 from datetime import datetime, timezone
 from unittest.mock import MagicMock
 from uuid import uuid4
@@ -70,6 +72,292 @@ def test_batch_manager_shutdown_is_idempotent(monkeypatch):
     assert mock_client.close.call_count == 1
 
 
+@pytest.fixture
+def python_batch_manager(monkeypatch):
+    """Python-path manager whose worker never drains, so the queue fills."""
+    import vectorwave.batch.batch as batch_mod
+
+    written = []
+    client = MagicMock()
+    client.batch.failed_objects = []
+    client.batch.dynamic.return_value.__enter__.return_value.add_object.side_effect = (
+        lambda **kw: written.append(kw)
+    )
+    monkeypatch.setattr(batch_mod, "USE_RUST_CORE", False)
+    monkeypatch.setattr(batch_mod, "get_weaviate_client", MagicMock(return_value=client))
+    monkeypatch.setattr(batch_mod.WeaviateBatchManager, "_start_python_worker", lambda self: None)
+
+    def build(**settings):
+        monkeypatch.setattr(batch_mod, "get_weaviate_settings", MagicMock(return_value=WeaviateSettings(
+            BATCH_QUEUE_SIZE=2, **settings,
+        )))
+        manager = batch_mod.WeaviateBatchManager()
+        manager._stop_event.set()
+        return manager, written
+
+    return build
+
+
+def test_python_queue_counts_drops_when_full(python_batch_manager):
+    manager, _ = python_batch_manager()
+
+    results = [manager.add_object("C", {"i": i}) for i in range(5)]
+
+    assert results == [True, True, False, False, False]
+    stats = manager.stats()
+    assert stats["worker"] == "python"
+    assert (stats["enqueued"], stats["dropped"], stats["depth"]) == (2, 3, 2)
+
+
+def test_drop_warnings_at_powers_of_two_without_stats(python_batch_manager, caplog):
+    manager, _ = python_batch_manager()
+    manager.stats = MagicMock(side_effect=AssertionError("stats() on the drop path"))
+
+    with caplog.at_level("WARNING", logger="vectorwave.batch.batch"):
+        for i in range(10):
+            manager.add_object("C", {"i": i})
+
+    warned = [r.args[-1] for r in caplog.records if "is FULL" in r.getMessage()]
+    assert warned == [1, 2, 4, 8]
+
+
+def test_python_queue_block_policy_waits_then_drops(python_batch_manager):
+    manager, _ = python_batch_manager(
+        BATCH_QUEUE_OVERFLOW_POLICY="block", BATCH_QUEUE_BLOCK_TIMEOUT_SECONDS=0.05,
+    )
+    manager.add_object("C", {"i": 0})
+    manager.add_object("C", {"i": 1})
+
+    started = time.monotonic()
+    assert manager.add_object("C", {"i": 2}) is False
+    assert time.monotonic() - started >= 0.04
+    assert manager.stats()["dropped"] == 1
+
+
+def test_python_queue_spill_policy_writes_overflow_inline(python_batch_manager):
+    manager, written = python_batch_manager(BATCH_QUEUE_OVERFLOW_POLICY="spill")
+
+    assert all(manager.add_object("C", {"i": i}) for i in range(3))
+    assert [w["properties"] for w in written] == [{"i": 2}]
+    assert manager.stats()["spilled"] == 1
+    assert manager.stats()["dropped"] == 0
+
+
+def test_flush_counters_and_failures(python_batch_manager):
+    manager, _ = python_batch_manager()
+    manager._retry = MagicMock()
+
+    manager._python_flush([{"collection": "C", "properties": {}, "uuid": None, "vector": None}] * 3)
+    manager._initialized = False
+    manager._connect_client = lambda: None
+    manager._python_flush([{"collection": "C", "properties": {}, "uuid": None, "vector": None}])
+
+    stats = manager.stats()
+    assert (stats["flushed"], stats["flush_batches"], stats["flush_failures"]) == (3, 2, 1)
+    assert stats["last_flush_latency_ms"] >= 0.0
+
+
+def test_failed_flush_is_spilled_and_replayed(python_batch_manager, tmp_path):
+    manager, written = python_batch_manager(
+        BATCH_SPILL_PATH=str(tmp_path / "spill"), BATCH_SPILL_REPLAY_INTERVAL_SECONDS=60,
+    )
+    items = [{"collection": "C", "properties": {"i": i}, "uuid": None, "vector": None} for i in range(3)]
+
+    connected = manager.client
+    manager._initialized = False
+    manager._connect_client = lambda: None
+    assert manager._flush_batch_core(items) is False
+    assert manager.stats()["spill"]["spilled_items"] == 3
+    assert manager.replay_spill() == 0
+
+    manager._initialized, manager.client = True, connected
+    assert manager.replay_spill() == 3
+    assert [w["properties"]["i"] for w in written] == [0, 1, 2]
+    assert manager.stats()["spill"]["segments"] == 0
+    manager.shutdown()
+
+
+def test_rejected_objects_go_to_the_retry_layer(python_batch_manager):
+    manager, _ = python_batch_manager()
+    rejected = MagicMock(message="invalid date", original_uuid=None)
+    rejected.object_.collection = "C"
+    rejected.object_.properties = {"i": 1}
+    rejected.object_.uuid = "00000000-0000-0000-0000-000000000001"
+    rejected.object_.vector = None
+    manager.client.batch.failed_objects = [rejected]
+    manager._retry = MagicMock()
+
+    items = [{"collection": "C", "properties": {"i": i}, "uuid": None, "vector": None} for i in range(2)]
+    assert manager._flush_batch_core(items) is False
+
+    failed, error = manager._retry.submit.call_args.args
+    assert failed == [{"collection": "C", "properties": {"i": 1},
+                       "uuid": "00000000-0000-0000-0000-000000000001", "vector": None}]
+    assert error == "invalid date"
+
+
+def test_flush_exception_is_retried_not_raised(python_batch_manager):
+    manager, _ = python_batch_manager()
+    manager.client.batch.dynamic.side_effect = ValueError("boom")
+    manager._retry = MagicMock()
+
+    items = [{"collection": "C", "properties": {}, "uuid": None, "vector": None}]
+    assert manager._flush_batch_core(items) is False
+    manager._retry.submit.assert_called_once_with(items, "boom")
+
+
+def test_write_objects_bypasses_the_queue(python_batch_manager):
+    manager, written = python_batch_manager()
+
+    items = [{"collection": "C", "properties": {"i": i}, "uuid": None, "vector": None} for i in range(5)]
+    assert manager.write_objects(items) is True
+    assert [w["properties"]["i"] for w in written] == [0, 1, 2, 3, 4]
+    assert manager.stats()["depth"] == 0
+
+
+def test_items_are_sharded_across_flush_workers(python_batch_manager):
+    manager, _ = python_batch_manager(
+        BATCH_FLUSH_WORKERS=4, BATCH_SHARD_KEY="trace_id",
+        BATCH_COLLECTION_WORKERS={"Slow": {"batch_threshold": 5, "queue_size": 3}},
+    )
+
+    slow = manager._shard_for("Slow", {"trace_id": "t1"})
+    assert (slow.name, slow.batch_threshold, slow.capacity) == ("Slow", 5, 3)
+    assert slow.flush_interval == manager.flush_interval
+    # A trace's spans stay on one worker; different traces spread out.
+    assert manager._shard_for("C", {"trace_id": "t1"}) is manager._shard_for("C", {"trace_id": "t1"})
+    assert len({manager._shard_for("C", {"trace_id": f"t{i}"}).name for i in range(64)}) == 4
+    assert manager._shard_for("C", {}) is manager._shard_for("C", {"trace_id": None})
+
+    for i in range(4):
+        manager.add_object("Slow", {"i": i})
+    stats = manager.stats()
+    assert [w["name"] for w in stats["workers"]] == ["worker-0", "worker-1", "worker-2", "worker-3", "Slow"]
+    assert stats["workers"][-1]["depth"] == 3
+    assert (stats["capacity"], stats["dropped"]) == (4 * 2 + 3, 1)
+
+
+def test_concurrent_workers_write_through_collection_batches(python_batch_manager):
+    manager, written = python_batch_manager(BATCH_FLUSH_WORKERS=2)
+    batches = {}
+
+    def collection(name):
+        coll = batches.setdefault(name, MagicMock())
+        coll.batch.failed_objects = []
+        return coll
+
+    manager.client.collections.get.side_effect = collection
+    items = [{"collection": c, "properties": {"i": i}, "uuid": None, "vector": None}
+             for i, c in enumerate("ABA")]
+
+    assert manager._flush_batch_core(items) is True
+    assert written == []  # the shared client.batch context is not used
+    add_a = batches["A"].batch.dynamic.return_value.__enter__.return_value.add_object
+    assert [c.kwargs["properties"] for c in add_a.call_args_list] == [{"i": 0}, {"i": 2}]
+
+
+def test_adaptive_mode_retunes_and_reports_the_batch_size(python_batch_manager):
+    manager, _ = python_batch_manager(BATCH_ADAPTIVE=True, BATCH_THRESHOLD=20)
+    shard = manager._shards[0]
+    items = [{"collection": "C", "properties": {}, "uuid": None, "vector": None}] * 20
+
+    assert manager.current_batch_size() == 20
+    for _ in range(shard.sizer.window):
+        manager._python_flush(items, shard)
+
+    assert manager.current_batch_size("C") == 25
+    worker = manager.stats()["workers"][0]
+    assert worker["batch_threshold"] == 25
+    assert worker["adaptive"]["adjustments"] == 1
+
+
+def test_slow_collection_does_not_delay_other_workers(monkeypatch):
+    import vectorwave.batch.batch as batch_mod
+
+    release = threading.Event()
+    written = []
+    client = MagicMock()
+
+    def collection(name):
+        coll = MagicMock()
+        coll.batch.failed_objects = []
+
+        def add(**kw):
+            if name == "Slow":
+                release.wait(5)
+            written.append(name)
+
+        coll.batch.dynamic.return_value.__enter__.return_value.add_object.side_effect = add
+        return coll
+
+    client.collections.get.side_effect = collection
+    monkeypatch.setattr(batch_mod, "USE_RUST_CORE", False)
+    monkeypatch.setattr(batch_mod, "get_weaviate_client", MagicMock(return_value=client))
+    monkeypatch.setattr(batch_mod, "get_weaviate_settings", MagicMock(return_value=WeaviateSettings(
+        BATCH_THRESHOLD=1, FLUSH_INTERVAL_SECONDS=0.01, BATCH_COLLECTION_WORKERS={"Slow": {}},
+    )))
+    manager = batch_mod.WeaviateBatchManager()
+    try:
+        manager.add_object("Slow", {})
+        manager.add_object("Fast", {})
+        deadline = time.monotonic() + 5
+        while "Fast" not in written and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert written == ["Fast"]
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def _columnar_batch(rows):
+    """The payload a Lite-mode Rust core hands to the flush callback."""
+    from array import array
+    vectors = array("f")
+    for _, _, vector in rows:
+        vectors.extend(vector or [])
+    return {
+        "collection": [c for c, _, _ in rows],
+        "properties": [p for _, p, _ in rows],
+        "uuid": [p.get("id") for _, p, _ in rows],
+        "vector_data": vectors.tobytes(),
+        "vector_dims": [len(v or []) for _, _, v in rows],
+    }
+
+
+def test_columnar_rust_batch_is_written_to_lite_store(monkeypatch, tmp_path):
+    pytest.importorskip("lancedb")
+    import vectorwave.batch.batch as batch_mod
+    from vectorwave.store.lance_store import LanceVectorStore
+
+    store = LanceVectorStore(db_path=str(tmp_path / "lance"), vector_dim=2)
+    monkeypatch.setenv("VECTORWAVE_MODE", "lite")
+    monkeypatch.setattr("vectorwave.store.get_vector_store", lambda: store)
+    monkeypatch.setattr(batch_mod, "USE_RUST_CORE", False)
+    monkeypatch.setattr(batch_mod.WeaviateBatchManager, "_start_python_worker", lambda self: None)
+    manager = batch_mod.WeaviateBatchManager()
+
+    uniform = _columnar_batch([("A", {"id": "a0"}, [1.0, 2.0]), ("B", {"id": "b0"}, [3.0, 4.0])])
+    mixed = _columnar_batch([("A", {"id": "a1"}, None), ("A", {"id": "a2"}, [5.0])])
+    assert manager._flush_batch_core(uniform) is True
+    assert manager._flush_batch_core(mixed) is True
+
+    assert store.fetch_by_id("B", "b0", include_vector=True).vector == [3.0, 4.0]
+    assert store.fetch_by_id("A", "a1", include_vector=True).vector == [0.0, 0.0]
+    assert store.fetch_by_id("A", "a2", include_vector=True).vector == [5.0, 0.0]
+    manager._stop_event.set()
+    manager.shutdown()
+
+
+def test_columnar_batch_expands_to_items_for_retry():
+    from vectorwave.batch.batch import _columnar_items
+
+    batch = _columnar_batch([("A", {"id": "a"}, [0.5, 1.5]), ("A", {"id": "b"}, None)])
+    assert _columnar_items(batch) == [
+        {"collection": "A", "properties": {"id": "a"}, "uuid": "a", "vector": [0.5, 1.5]},
+        {"collection": "A", "properties": {"id": "b"}, "uuid": "b", "vector": None},
+    ]
+
+
 # ---------------------------------------------------------------------------
 # E2E tests
 # ---------------------------------------------------------------------------
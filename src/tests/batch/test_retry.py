@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+
+from vectorwave.batch.retry import JsonlDeadLetterSink, RetryScheduler, is_payload_too_large, is_throttled
+
+
+def _items(n):
+    return [{"collection": "C", "properties": {"i": i}, "uuid": None, "vector": None} for i in range(n)]
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_transient_failure_is_retried_until_written():
+    calls = []
+    written = []
+
+    def write(items):
+        calls.append(len(items))
+        if len(calls) < 3:
+            raise ConnectionError("503 temporarily unavailable")
+        written.extend(items)
+        return [], None
+
+    retry = RetryScheduler(write, base_delay=0.001, max_delay=0.01)
+    retry.submit(_items(4), "503 temporarily unavailable")
+
+    _wait_for(lambda: len(written) == 4)
+    stats = retry.stats()
+    assert stats["succeeded"] == 4
+    assert stats["dead_lettered"] == 0
+    assert stats["pending"] == 0
+    retry.shutdown()
+
+
+def test_only_rejected_items_are_resubmitted():
+    seen = []
+
+    def write(items):
+        seen.append([i["properties"]["i"] for i in items])
+        return [i for i in items if i["properties"]["i"] == 1 and len(seen) == 1], "conflict"
+
+    retry = RetryScheduler(write, base_delay=0.001)
+    retry.submit(_items(3), "first flush failed")
+
+    _wait_for(lambda: len(seen) == 2)
+    assert seen == [[0, 1, 2], [1]]
+    retry.shutdown()
+
+
+def test_oversized_batch_is_split_in_half():
+    written = []
+    lock = threading.Lock()
+
+    def write(items):
+        if len(items) > 2:
+            return items, "413 Request Entity Too Large"
+        with lock:
+            written.extend(i["properties"]["i"] for i in items)
+        return [], None
+
+    retry = RetryScheduler(write, base_delay=60.0, max_attempts=2)
+    retry.submit(_items(7), "413 Request Entity Too Large")
+
+    # No backoff wait and no attempts spent on splitting.
+    _wait_for(lambda: len(written) == 7, timeout=2.0)
+    assert sorted(written) == list(range(7))
+    assert retry.stats()["splits"] >= 3
+    assert retry.stats()["dead_lettered"] == 0
+    retry.shutdown()
+
+
+def test_gives_up_to_dead_letter_file_after_max_attempts(tmp_path):
+    path = tmp_path / "dead" / "letters.jsonl"
+    calls = []
+
+    def write(items):
+        calls.append(1)
+        return items, "invalid property type"
+
+    retry = RetryScheduler(write, dead_letter=JsonlDeadLetterSink(str(path)),
+                           max_attempts=3, base_delay=0.001)
+    retry.submit(_items(2), "invalid property type")
+
+    _wait_for(lambda: retry.stats()["dead_lettered"] == 2)
+    # attempt 1 was the original flush; two retries follow
+    assert len(calls) == 2
+    record = json.loads(path.read_text().strip())
+    assert record["attempts"] == 3
+    assert record["error"] == "invalid property type"
+    assert [i["properties"]["i"] for i in record["items"]] == [0, 1]
+    retry.shutdown()
+
+
+def test_full_queue_and_shutdown_hand_items_to_overflow():
+    overflowed = []
+    retry = RetryScheduler(lambda items: (items, "down"), base_delay=60.0, max_pending=3,
+                           overflow=lambda items: overflowed.extend(items) or True)
+
+    retry.submit(_items(2), "down")
+    retry.submit(_items(2), "down")  # would exceed max_pending
+    assert len(overflowed) == 2
+
+    retry.shutdown()
+    assert len(overflowed) == 4
+    assert retry.stats()["overflowed"] == 4
+
+
+def test_backoff_is_bounded_and_jittered():
+    retry = RetryScheduler(lambda items: ([], None), base_delay=1.0, max_delay=8.0)
+    assert 0.5 <= retry.backoff(1) <= 1.0
+    assert 2.0 <= retry.backoff(3) <= 4.0
+    assert 4.0 <= retry.backoff(10) <= 8.0
+
+
+def test_payload_too_large_detection():
+    assert is_payload_too_large("413 Request Entity Too Large")
+    assert is_payload_too_large("grpc: received message larger than max (5000 vs. 4194304)")
+    assert is_payload_too_large("Unexpected status code: 413, with response body: None")
+    assert is_payload_too_large("HTTP/1.1 413 Payload Too Large")
+    assert not is_payload_too_large("connection refused")
+    assert not is_payload_too_large(None)
+    # 413 inside ids, and rate limiting, are not size rejections.
+    assert not is_payload_too_large("object 6f1c4130-9a41-4413-b413-1a2b3c4d5e6f failed: 422 invalid")
+    assert not is_payload_too_large("batch 413 failed: connection reset")
+    assert not is_payload_too_large("<_InactiveRpcError: StatusCode.RESOURCE_EXHAUSTED, rate limit exceeded>")
+
+
+def test_throttle_detection():
+    assert is_throttled("StatusCode.RESOURCE_EXHAUSTED: too many concurrent requests")
+    assert is_throttled("Unexpected status code: 429")
+    assert not is_throttled("RESOURCE_EXHAUSTED: received message larger than max (5000 vs. 4194304)")
+    assert not is_throttled("connection refused")
+    assert not is_throttled(None)
+
+
+def test_throttled_batch_is_retried_whole():
+    calls = []
+
+    def write(items):
+        calls.append(len(items))
+        if len(calls) == 1:
+            return items, "StatusCode.RESOURCE_EXHAUSTED"
+        return [], None
+
+    retry = RetryScheduler(write, base_delay=0.01)
+    retry.submit(_items(6), "StatusCode.RESOURCE_EXHAUSTED")
+
+    _wait_for(lambda: retry.stats()["succeeded"] == 6)
+    assert calls == [6, 6]
+    assert retry.stats()["splits"] == 0
+    assert retry.stats()["throttled"] == 1
+    retry.shutdown()
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from vectorwave.batch.spill import SpillLog
+
+
+def _batch(tag, n=2):
+    return [{"collection": "C", "properties": {"tag": tag, "i": i}, "uuid": None, "vector": [0.5, 1.0]}
+            for i in range(n)]
+
+
+def _collect(spill):
+    seen = []
+    spill.replay(lambda items: seen.extend(i["properties"]["tag"] for i in items))
+    return seen
+
+
+def test_append_and_replay_in_order_across_rotated_segments(tmp_path):
+    spill = SpillLog(str(tmp_path), max_segment_bytes=200)
+    for tag in "abcd":
+        assert spill.append(_batch(tag))
+    assert spill.stats()["segments"] > 1
+
+    assert _collect(spill) == ["a", "a", "b", "b", "c", "c", "d", "d"]
+    assert not spill.pending()
+    assert not [n for n in os.listdir(tmp_path) if n.endswith(".seg")]
+
+
+def test_spill_survives_restart(tmp_path):
+    first = SpillLog(str(tmp_path))
+    first.append(_batch("before-crash"))
+    first.close()
+
+    second = SpillLog(str(tmp_path))
+    assert second.pending()
+    assert _collect(second) == ["before-crash", "before-crash"]
+
+
+def test_failed_handler_resumes_from_the_same_batch(tmp_path):
+    spill = SpillLog(str(tmp_path))
+    for tag in "abc":
+        spill.append(_batch(tag, n=1))
+
+    seen = []
+
+    def flaky(items):
+        if items[0]["properties"]["tag"] == "b":
+            return False
+        seen.append(items[0]["properties"]["tag"])
+
+    assert spill.replay(flaky) == 1
+    spill.close()
+
+    # The cursor is persisted: a new process picks up at "b", not "a".
+    assert _collect(SpillLog(str(tmp_path))) == ["b", "c"]
+    assert seen == ["a"]
+
+
+def test_size_cap_rejects_new_batches(tmp_path):
+    spill = SpillLog(str(tmp_path), max_total_bytes=300)
+    assert spill.append(_batch("a"))
+    assert not spill.append(_batch("b"))
+    assert spill.stats()["rejected_items"] == 2
+
+
+def test_torn_tail_frame_is_skipped(tmp_path):
+    spill = SpillLog(str(tmp_path))
+    spill.append(_batch("ok"))
+    spill.close()
+    segment = [n for n in os.listdir(tmp_path) if n.endswith(".seg")][0]
+    with open(tmp_path / segment, "ab") as f:
+        f.write(b"\x00\x00\x10\x00garbage")
+
+    spill = SpillLog(str(tmp_path))
+    assert _collect(spill) == ["ok", "ok"]
+    assert spill.stats()["corrupt_frames"] == 1
+
+
+def test_directory_is_locked_to_one_process(tmp_path):
+    pytest.importorskip("fcntl")
+    owner = SpillLog(str(tmp_path))
+    with pytest.raises(RuntimeError):
+        SpillLog(str(tmp_path))
+    owner.close()
+    SpillLog(str(tmp_path)).close()
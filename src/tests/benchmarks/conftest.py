@@ -1,15 +1,27 @@
 """Fixtures shared by VectorWave benchmarks.
 
-The benchmarks measure pure Python overhead in `@vectorize`, so we stub the
+The `@vectorize` benchmarks measure pure Python overhead, so we stub the
 batch manager / alerter / vectorizer to take their cost out of the numbers.
 The point isn't to micro-optimise infra; it's to know how much CPU
 VectorWave adds to a wrapped function call before deciding what (if
 anything) to port to Rust.
+
+The storage benchmarks run the real `LanceVectorStore` on a temp directory
+and the real `WeaviateVectorStore` / `WeaviateBatchManager` on top of
+`FakeWeaviateClient`, an in-memory stand-in for the parts of the v4 client
+VectorWave calls. Fake-backed numbers are the client-side floor (filter
+building, record conversion, batching), not Weaviate server latency.
 """
 from __future__ import annotations
 
-from typing import Any, List
+import fnmatch
+import threading
+import uuid as uuid_lib
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
 
+import numpy as np
 import pytest
 
 from vectorwave.models.db_config import WeaviateSettings
@@ -70,8 +82,217 @@ def stubbed_vectorize_env(monkeypatch, tmp_path):
         if hasattr(fn, "cache_clear"):
             fn.cache_clear()
 
-    monkeypatch.setattr("vectorwave.core.decorator.get_batch_manager", lambda *a, **k: batch)
+    monkeypatch.setattr("vectorwave.core.registry.get_batch_manager", lambda *a, **k: batch)
     monkeypatch.setattr("vectorwave.monitoring.tracer.get_batch_manager", lambda *a, **k: batch)
     monkeypatch.setattr("vectorwave.monitoring.tracer.get_alerter", lambda *a, **k: alerter)
 
     yield batch
+
+
+# ---------------------------------------------------------------------------
+# In-memory fake of the Weaviate v4 client surface VectorWave uses.
+# ---------------------------------------------------------------------------
+
+_COMPARE: Dict[str, Callable[[Any, Any], bool]] = {
+    "Equal": lambda a, b: a == b,
+    "NotEqual": lambda a, b: a != b,
+    "GreaterThan": lambda a, b: a is not None and a > b,
+    "GreaterThanEqual": lambda a, b: a is not None and a >= b,
+    "LessThan": lambda a, b: a is not None and a < b,
+    "LessThanEqual": lambda a, b: a is not None and a <= b,
+    "ContainsAny": lambda a, b: a in b,
+    "Like": lambda a, b: isinstance(a, str) and fnmatch.fnmatchcase(a, b),
+}
+
+
+def _compile_weaviate_filter(flt) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """Turns a `weaviate.classes.query.Filter` tree into a predicate over a
+    properties dict. Only the operators `_build_weaviate_filter` emits."""
+    if flt is None:
+        return None
+    children = getattr(flt, "filters", None)
+    if children is not None:
+        preds = [_compile_weaviate_filter(f) for f in children]
+        if type(flt).__name__ == "_FilterOr":
+            return lambda props: any(p(props) for p in preds)
+        return lambda props: all(p(props) for p in preds)
+    compare = _COMPARE[flt.operator.value]
+    target, value = flt.target, flt.value
+    return lambda props: compare(props.get(target), value)
+
+
+class _FakeCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self.uuids: List[str] = []
+        self.props: List[Dict[str, Any]] = []
+        self.vectors: List[Optional[List[float]]] = []
+        self._matrix = None
+        self._lock = threading.Lock()
+        self.data = SimpleNamespace(insert=self._insert, update=self._update, delete_many=self._delete_many)
+        self.query = SimpleNamespace(
+            fetch_objects=self._fetch_objects,
+            fetch_object_by_id=self._fetch_object_by_id,
+            near_vector=self._near_vector,
+        )
+
+    # -- writes ---------------------------------------------------------------
+
+    def _insert(self, properties, uuid=None, vector=None):
+        uid = str(uuid or uuid_lib.uuid4())
+        with self._lock:
+            self.uuids.append(uid)
+            self.props.append(dict(properties))
+            self.vectors.append(list(vector) if vector is not None else None)
+            self._matrix = None
+        return uid
+
+    def _update(self, uuid, properties):
+        idx = self.uuids.index(str(uuid))
+        self.props[idx].update(properties)
+
+    def _delete_many(self, where):
+        pred = _compile_weaviate_filter(where)
+        with self._lock:
+            keep = [i for i, p in enumerate(self.props) if not pred(p)]
+            removed = len(self.props) - len(keep)
+            self.uuids = [self.uuids[i] for i in keep]
+            self.props = [self.props[i] for i in keep]
+            self.vectors = [self.vectors[i] for i in keep]
+            self._matrix = None
+        return SimpleNamespace(successful=removed, failed=0, matches=removed)
+
+    # -- reads ----------------------------------------------------------------
+
+    def _obj(self, i, include_vector=False, distance=None):
+        vector = {"default": self.vectors[i]} if include_vector and self.vectors[i] is not None else {}
+        certainty = None if distance is None else 1.0 - distance / 2.0
+        return SimpleNamespace(
+            uuid=self.uuids[i],
+            properties=dict(self.props[i]),
+            vector=vector,
+            metadata=SimpleNamespace(distance=distance, certainty=certainty),
+        )
+
+    def _matching(self, filters) -> List[int]:
+        pred = _compile_weaviate_filter(filters)
+        if pred is None:
+            return list(range(len(self.props)))
+        return [i for i, p in enumerate(self.props) if pred(p)]
+
+    def _fetch_objects(self, limit=10, filters=None, sort=None, include_vector=False, **_):
+        idx = self._matching(filters)
+        for s in reversed(sort.sorts if sort is not None else []):
+            idx.sort(key=lambda i: (self.props[i].get(s.prop) is None, self.props[i].get(s.prop) or 0),
+                     reverse=not s.ascending)
+        return SimpleNamespace(objects=[self._obj(i, include_vector) for i in idx[:limit]])
+
+    def _fetch_object_by_id(self, uuid, include_vector=False):
+        try:
+            return self._obj(self.uuids.index(str(uuid)), include_vector)
+        except ValueError:
+            return None
+
+    def _near_vector(self, near_vector, limit=1, filters=None, certainty=None, include_vector=False, **_):
+        with self._lock:
+            if self._matrix is None:
+                dim = len(near_vector)
+                m = np.array([v if v is not None else [0.0] * dim for v in self.vectors], dtype=np.float32)
+                norms = np.linalg.norm(m, axis=1, keepdims=True)
+                self._matrix = m / np.where(norms == 0, 1.0, norms)
+            matrix = self._matrix
+        if not len(matrix):
+            return SimpleNamespace(objects=[])
+        q = np.asarray(near_vector, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        # Weaviate's default cosine distance.
+        distances = 1.0 - matrix @ q
+        if filters is not None:
+            mask = np.full(len(distances), np.inf, dtype=np.float32)
+            idx = self._matching(filters)
+            mask[idx] = 0.0
+            distances = distances + mask
+        k = min(limit, len(distances))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        out = []
+        for i in top:
+            d = float(distances[i])
+            if not np.isfinite(d) or (certainty is not None and 1.0 - d / 2.0 < certainty):
+                break
+            out.append(self._obj(int(i), include_vector, distance=d))
+        return SimpleNamespace(objects=out)
+
+    def iterator(self):
+        for i in range(len(self.uuids)):
+            yield self._obj(i)
+
+
+class _FakeBatch:
+    def __init__(self, client: "FakeWeaviateClient"):
+        self._client = client
+        self.failed_objects: List[Any] = []
+
+    @contextmanager
+    def dynamic(self):
+        yield self
+
+    def add_object(self, collection, properties, uuid=None, vector=None):
+        self._client.collections.get(collection).data.insert(properties=properties, uuid=uuid, vector=vector)
+        self._client.objects_added += 1
+
+
+class _FakeCollectionBatch(_FakeBatch):
+    """``collection.batch``: what the batch manager writes through when it
+    runs several flush workers."""
+
+    def __init__(self, client: "FakeWeaviateClient", name: str):
+        super().__init__(client)
+        self._name = name
+
+    def add_object(self, properties, uuid=None, vector=None):
+        super().add_object(self._name, properties, uuid=uuid, vector=vector)
+
+
+class _FakeCollections:
+    def __init__(self, client: "FakeWeaviateClient"):
+        self._client = client
+        self._by_name: Dict[str, _FakeCollection] = {}
+        self._lock = threading.Lock()
+
+    def exists(self, name: str) -> bool:
+        return name in self._by_name
+
+    def create(self, name: str, **_):
+        return self.get(name)
+
+    def get(self, name: str) -> _FakeCollection:
+        with self._lock:
+            if name not in self._by_name:
+                self._by_name[name] = _FakeCollection(name)
+                self._by_name[name].batch = _FakeCollectionBatch(self._client, name)
+            return self._by_name[name]
+
+    def delete(self, name: str) -> None:
+        self._by_name.pop(name, None)
+
+
+class FakeWeaviateClient:
+    """Just enough of `weaviate.WeaviateClient` for `WeaviateVectorStore`
+    and `WeaviateBatchManager` to run unmodified against memory."""
+
+    def __init__(self):
+        self.collections = _FakeCollections(self)
+        self.batch = _FakeBatch(self)
+        self.objects_added = 0
+
+    def is_ready(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_weaviate_client():
+    return FakeWeaviateClient()
@@ -0,0 +1,294 @@
+"""Benchmarks for the storage backends and end-to-end logging throughput.
+
+Run with:
+    pytest src/tests/benchmarks/test_store_backends.py --benchmark-only
+
+Track regressions by saving each run as JSON and comparing later ones to it:
+    pytest src/tests/benchmarks/test_store_backends.py --benchmark-only --benchmark-save=stores
+    pytest src/tests/benchmarks/test_store_backends.py --benchmark-only --benchmark-compare=0001
+
+Two backends are measured through the `VectorStore` interface: `lance`
+(the real `LanceVectorStore` in a temp directory) and `weaviate-fake` (the
+real `WeaviateVectorStore` over `FakeWeaviateClient`, see conftest.py).
+
+Scaled-up row counts are opt-in because loading takes minutes:
+    VECTORWAVE_BENCH_MAX_ROWS=1000000 pytest src/tests/benchmarks/test_store_backends.py --benchmark-only
+
+`near_vector` benchmarks record p50 / p99 latency (ms) and the throughput
+benchmarks record spans/sec in `extra_info`, which lands in the saved JSON.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+import uuid as uuid_lib
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from vectorwave.batch import batch as batch_mod
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.store.weaviate_store import WeaviateVectorStore
+
+from .conftest import FakeWeaviateClient
+
+lance_store = pytest.importorskip("vectorwave.store.lance_store")
+
+COLLECTION = "BenchExecutions"
+DIM = int(os.environ.get("VECTORWAVE_BENCH_DIM", "384"))
+MAX_ROWS = int(os.environ.get("VECTORWAVE_BENCH_MAX_ROWS", "10000"))
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+BACKENDS = ["lance", "weaviate-fake"]
+LOAD_CHUNK = 10_000
+TEAMS = ("payments", "search", "ingest")
+_T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _span(i: int, rng: np.random.Generator, function_name: str = None) -> dict:
+    return {
+        "properties": {
+            "function_name": function_name or f"fn_{i % 50}",
+            "status": "ERROR" if i % 20 == 0 else "SUCCESS",
+            "timestamp_utc": (_T0 + timedelta(seconds=i)).isoformat(),
+            "duration_ms": float(i % 997) / 7.0,
+            "trace_id": uuid_lib.uuid4().hex,
+            "span_id": uuid_lib.uuid4().hex,
+            # Custom property: not a Lance typed column, filtered in Python.
+            "team": TEAMS[i % len(TEAMS)],
+        },
+        "uuid": str(uuid_lib.uuid4()),
+        "vector": rng.standard_normal(DIM).astype(np.float32).tolist(),
+    }
+
+
+def _skip_unless_enabled(rows: int) -> None:
+    if rows > MAX_ROWS:
+        pytest.skip(f"{rows} rows > VECTORWAVE_BENCH_MAX_ROWS={MAX_ROWS}")
+
+
+def _record_percentiles(benchmark) -> None:
+    data = sorted(benchmark.stats.stats.data)
+    if data:
+        benchmark.extra_info["p50_ms"] = data[len(data) // 2] * 1000
+        benchmark.extra_info["p99_ms"] = data[min(len(data) - 1, int(len(data) * 0.99))] * 1000
+
+
+# ---------------------------------------------------------------------------
+# Loaded stores, built once per (backend, rows) for the whole module.
+# ---------------------------------------------------------------------------
+
+def _open_store(backend: str, path):
+    if backend == "lance":
+        # Indexes are built explicitly after loading, not by the write-path
+        # checker, so no background thread races the measurements.
+        return lance_store.LanceVectorStore(
+            db_path=str(path), vector_dim=DIM,
+            scalar_index_min_rows=None, vector_index_min_rows=None,
+        )
+    return WeaviateVectorStore(FakeWeaviateClient())
+
+
+@pytest.fixture(scope="module")
+def loaded_store(tmp_path_factory):
+    cache = {}
+
+    def get(backend: str, rows: int):
+        key = (backend, rows)
+        if key not in cache:
+            path = tmp_path_factory.mktemp(f"{backend}-{rows}")
+            store = _open_store(backend, path)
+            store.ensure_collection(COLLECTION, properties=[], vector_dim=DIM)
+            rng = np.random.default_rng(rows)
+            for start in range(0, rows, LOAD_CHUNK):
+                store.insert_many(COLLECTION, [_span(i, rng) for i in range(start, min(rows, start + LOAD_CHUNK))])
+            if backend == "lance":
+                # Reopen with the default thresholds, as a restarted process would.
+                store = lance_store.LanceVectorStore(db_path=str(path), vector_dim=DIM)
+                store.build_indexes(COLLECTION)
+            cache[key] = store
+        return cache[key]
+
+    return get
+
+
+@pytest.fixture(scope="module")
+def query_vectors():
+    rng = np.random.default_rng(7)
+    return [rng.standard_normal(DIM).astype(np.float32).tolist() for _ in range(64)]
+
+
+# ---------------------------------------------------------------------------
+# near_vector latency
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_near_vector_top10(benchmark, loaded_store, query_vectors, backend, rows):
+    """Unfiltered top-10 nearest neighbours."""
+    _skip_unless_enabled(rows)
+    store = loaded_store(backend, rows)
+    queries = itertools.cycle(query_vectors)
+
+    result = benchmark(lambda: store.near_vector(COLLECTION, next(queries), limit=10))
+
+    assert len(result) == 10
+    _record_percentiles(benchmark)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_near_vector_cache_lookup(benchmark, loaded_store, query_vectors, backend, rows):
+    """The semantic-cache shape: one function's SUCCESS rows, limit 1."""
+    _skip_unless_enabled(rows)
+    store = loaded_store(backend, rows)
+    queries = itertools.cycle(query_vectors)
+    filters = {"function_name": "fn_7", "status": "SUCCESS"}
+
+    result = benchmark(lambda: store.near_vector(COLLECTION, next(queries), filters=filters, limit=1))
+
+    assert result and result[0].properties["function_name"] == "fn_7"
+    _record_percentiles(benchmark)
+
+
+# ---------------------------------------------------------------------------
+# Filtered query
+# ---------------------------------------------------------------------------
+
+_QUERY_CASES = {
+    # Typed columns only: the Lance backend pushes filter and LIMIT down.
+    "typed_filter": dict(filters={"function_name": "fn_10", "status": "ERROR"}, limit=20),
+    # Sorted: every matching row is read before the sort.
+    "typed_filter_sorted": dict(filters={"status": "ERROR"}, sort_by="timestamp_utc", limit=20),
+    "range_filter": dict(filters={"duration_ms__gte": 100.0, "function_name": "fn_11"}, limit=50),
+    # Custom property: evaluated in Python on the Lance backend.
+    "custom_property": dict(filters={"team": "payments", "status": "SUCCESS"}, limit=20),
+}
+
+
+@pytest.mark.parametrize("case", list(_QUERY_CASES))
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_query_with_filters(benchmark, loaded_store, backend, rows, case):
+    _skip_unless_enabled(rows)
+    store = loaded_store(backend, rows)
+
+    result = benchmark(store.query, COLLECTION, **_QUERY_CASES[case])
+
+    assert result
+
+
+# ---------------------------------------------------------------------------
+# delete_by_filter
+# ---------------------------------------------------------------------------
+
+DELETE_BATCH = 500
+
+
+@pytest.mark.parametrize("custom_property", [False, True], ids=["typed", "custom_property"])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_delete_by_filter(benchmark, loaded_store, backend, custom_property):
+    """Deletes a freshly inserted batch from a 10k-row table each round (the
+    archiver's pattern). Insertion happens in setup and isn't timed."""
+    store = loaded_store(backend, 10_000)
+    rng = np.random.default_rng(11)
+    counter = itertools.count()
+
+    def setup():
+        tag = f"bench_delete_{next(counter)}"
+        store.insert_many(COLLECTION, [_span(i, rng, function_name=tag) for i in range(DELETE_BATCH)])
+        filters = {"function_name": tag}
+        if custom_property:
+            filters["team"] = "payments"
+        return (COLLECTION, filters), {}
+
+    deleted = benchmark.pedantic(store.delete_by_filter, setup=setup, rounds=20, iterations=1)
+
+    expected = sum(1 for i in range(DELETE_BATCH) if TEAMS[i % len(TEAMS)] == "payments") \
+        if custom_property else DELETE_BATCH
+    assert deleted == expected
+
+
+# ---------------------------------------------------------------------------
+# End-to-end logging throughput through WeaviateBatchManager
+# ---------------------------------------------------------------------------
+
+SPANS_PER_ROUND = 2_000
+
+
+@pytest.fixture
+def batch_manager_factory(monkeypatch, tmp_path):
+    """Builds a `WeaviateBatchManager` on the requested worker path and
+    backend and counts the items its flush callback actually delivered."""
+    managers = []
+
+    def build(path: str, backend: str, workers: int = 1):
+        if path == "rust" and not batch_mod.USE_RUST_CORE:
+            pytest.skip("vectorwave_core (Rust) extension not built")
+        monkeypatch.setattr(batch_mod, "USE_RUST_CORE", path == "rust")
+        monkeypatch.setattr(batch_mod, "get_weaviate_settings", lambda: WeaviateSettings(
+            BATCH_THRESHOLD=100, FLUSH_INTERVAL_SECONDS=0.05,
+            BATCH_FLUSH_WORKERS=workers, BATCH_SHARD_KEY="trace_id",
+        ))
+        if backend == "lance":
+            monkeypatch.setenv("VECTORWAVE_MODE", "lite")
+            store = lance_store.LanceVectorStore(
+                db_path=str(tmp_path / "lance"), vector_dim=DIM,
+                scalar_index_min_rows=None, vector_index_min_rows=None,
+            )
+            monkeypatch.setattr("vectorwave.store.get_vector_store", lambda: store)
+        else:
+            monkeypatch.setenv("VECTORWAVE_MODE", "pro")
+            client = FakeWeaviateClient()
+            monkeypatch.setattr(batch_mod, "get_weaviate_client", lambda *a, **k: client)
+
+        delivered = [0]
+        delivered_lock = threading.Lock()
+        flush = batch_mod.WeaviateBatchManager._flush_batch_core
+
+        def counting_flush(self, items):
+            flush(self, items)
+            n = batch_mod._batch_len(items)
+            with delivered_lock:
+                delivered[0] += n
+
+        # Patched on the class before construction: the Rust worker holds
+        # the bound method it was given.
+        monkeypatch.setattr(batch_mod.WeaviateBatchManager, "_flush_batch_core", counting_flush)
+        manager = batch_mod.WeaviateBatchManager()
+        managers.append(manager)
+        return manager, delivered
+
+    yield build
+    for manager in managers:
+        manager.shutdown()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("path", ["rust", "python"])
+def test_batch_manager_throughput(benchmark, batch_manager_factory, path, backend, workers):
+    """Spans/sec from `add_object` until the flush callback has handed every
+    span to the backend, with one flush worker or four sharded by trace_id."""
+    manager, delivered = batch_manager_factory(path, backend, workers)
+    rng = np.random.default_rng(3)
+
+    def setup():
+        return ([_span(i, rng) for i in range(SPANS_PER_ROUND)],), {}
+
+    def run(spans):
+        target = delivered[0] + len(spans)
+        for s in spans:
+            manager.add_object(COLLECTION, s["properties"], s["uuid"], s["vector"])
+        deadline = time.monotonic() + 60
+        while delivered[0] < target:
+            if time.monotonic() > deadline:
+                raise AssertionError(f"only {delivered[0]} of {target} spans delivered")
+            time.sleep(0.001)
+
+    benchmark.pedantic(run, setup=setup, rounds=5, iterations=1, warmup_rounds=1)
+
+    benchmark.extra_info["spans_per_round"] = SPANS_PER_ROUND
+    benchmark.extra_info["spans_per_sec"] = SPANS_PER_ROUND / benchmark.stats.stats.median
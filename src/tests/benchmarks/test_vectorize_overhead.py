@@ -151,3 +151,56 @@ def test_micro_create_input_vector_data_nested(benchmark):
         kwargs={"query": "find me", "payload": payload},
         sensitive_keys=_SENSITIVE,
     )
+
+
+# ---------------------------------------------------------------------------
+# Micro: span creation on the caller's thread. Logging is handed to a stub
+# pipeline so only the trace_span wrapper itself is measured.
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def active_trace(stubbed_vectorize_env, monkeypatch):
+    from vectorwave.models.db_config import get_weaviate_settings
+    from vectorwave.monitoring import tracer as tracer_mod
+
+    class _NullPipeline:
+        def submit(self, ctx):
+            return True
+
+    monkeypatch.setenv("ASYNC_LOGGING", "true")
+    get_weaviate_settings.cache_clear()
+    monkeypatch.setattr(tracer_mod, "_get_span_pipeline", lambda: _NullPipeline())
+
+    token = tracer_mod.current_tracer_var.set(tracer_mod.TraceCollector(trace_id="bench"))
+    yield
+    tracer_mod.current_tracer_var.reset(token)
+    get_weaviate_settings.cache_clear()
+
+
+def test_trace_span_creation_success(benchmark, active_trace):
+    """Caller-side cost of one successful span: ids, timing, span record."""
+    from vectorwave.monitoring.tracer import trace_span
+
+    @trace_span
+    def add(a, b):
+        return a + b
+
+    benchmark(add, 3, 4)
+
+
+def test_trace_span_creation_failure(benchmark, active_trace):
+    """Caller-side cost of a span whose function raises; the traceback is
+    only formatted when the span is logged."""
+    from vectorwave.monitoring.tracer import trace_span
+
+    @trace_span
+    def fail():
+        raise ValueError("boom")
+
+    def call():
+        try:
+            fail()
+        except ValueError:
+            pass
+
+    benchmark(call)
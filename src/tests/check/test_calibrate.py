@@ -15,6 +15,7 @@ from vectorwave.check.calibrate import (
     _pairwise_similarities,
     _percentile,
     _summarize,
+    _vectorizer_name,
     format_pyproject_snippet,
     format_report,
 )
@@ -151,3 +152,18 @@ def test_format_report_contains_percentiles_and_recommendation():
     assert "p5" in text and "p95" in text
     assert "Recommended" in text
     assert "pyproject.toml" in text
+
+
+def test_vectorizer_name_reports_the_model_behind_the_embedding_cache():
+    from vectorwave.vectorizer.base import BaseVectorizer
+    from vectorwave.vectorizer.caching_vectorizer import CachingVectorizer
+
+    class TinyVectorizer(BaseVectorizer):
+        def embed(self, text):
+            return [1.0]
+
+        def embed_batch(self, texts):
+            return [[1.0] for _ in texts]
+
+    assert _vectorizer_name(CachingVectorizer(TinyVectorizer(), model_name="tiny")) == "TinyVectorizer"
+    assert _vectorizer_name(None) is None
@@ -21,6 +21,19 @@ VECTORWAVE_COLLECTIONS = (
 logger = logging.getLogger(__name__)
 
 
+@pytest.fixture
+def require_rust_core():
+    """Call with a reason when a Rust-core test case can't run because the
+    compiled vectorwave_core predates what it tests. Skips locally; fails
+    when ``VECTORWAVE_REQUIRE_RUST_CORE`` is set, as in CI, where the core is
+    built from this checkout and a stale one means the build is broken."""
+    def require(reason: str):
+        if os.environ.get("VECTORWAVE_REQUIRE_RUST_CORE", "").lower() in ("1", "true", "yes"):
+            pytest.fail(f"{reason} (VECTORWAVE_REQUIRE_RUST_CORE is set)")
+        pytest.skip(reason)
+    return require
+
+
 def pytest_configure(config):
     config.addinivalue_line(
         "markers",
@@ -74,7 +87,11 @@ def vcr_config():
 
 
 def _delete_cache():
-    """Helper function to remove the cache file if it exists."""
+    """Helper function to empty the function cache and remove the legacy JSON
+    cache file if it exists. The SQLite file stays open in the process-wide
+    manager, so it is cleared rather than deleted."""
+    from vectorwave.utils.function_cache import function_cache_manager
+    function_cache_manager.clear()
     if os.path.exists(CACHE_FILE_PATH):
         try:
             os.remove(CACHE_FILE_PATH)
@@ -112,6 +129,8 @@ def _clear_vectorwave_singletons():
     from vectorwave.database.db import get_cached_client
     from vectorwave.vectorizer.factory import get_vectorizer
     from vectorwave.batch.batch import get_batch_manager as _gbm
+    from vectorwave.utils.semantic_index import get_semantic_index
+    from vectorwave.utils.exact_cache import get_exact_cache
     # Also drop the VectorStore singleton — Lite-mode tests that ran earlier
     # cache a LanceVectorStore here, which would silently serve Pro-mode
     # `store.query` calls against an empty LanceDB and break the e2e suite.
@@ -119,7 +138,8 @@ def _clear_vectorwave_singletons():
         from vectorwave.store.factory import get_vector_store
     except ImportError:
         get_vector_store = None
-    targets = [get_weaviate_settings, get_cached_client, get_vectorizer, _gbm]
+    targets = [get_weaviate_settings, get_cached_client, get_vectorizer, _gbm, get_semantic_index,
+               get_exact_cache]
     if get_vector_store is not None:
         targets.append(get_vector_store)
     for fn in targets:
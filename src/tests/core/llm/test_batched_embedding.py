@@ -0,0 +1,114 @@
+"""Batched embedding requests against a local OpenAI-compatible stub server."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from vectorwave.core.llm import openai_client as openai_client_module
+from vectorwave.core.llm.openai_client import VectorWaveOpenAIClient
+from vectorwave.models.db_config import WeaviateSettings
+
+
+class _EmbeddingStub(BaseHTTPRequestHandler):
+    requests = []
+    lock = threading.Lock()
+    fail_inputs = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            self.requests.append(body["input"])
+        if self.fail_inputs & set(body["input"]):
+            self._reply(400, {"error": {"message": "bad input", "type": "invalid_request_error"}})
+            return
+        # Reverse the data order: clients must place vectors by `index`.
+        data = [
+            {"object": "embedding", "index": i, "embedding": [float(len(text)), float(i)]}
+            for i, text in enumerate(body["input"])
+        ][::-1]
+        self._reply(200, {
+            "object": "list",
+            "data": data,
+            "model": body["model"],
+            "usage": {"prompt_tokens": len(data), "total_tokens": len(data)},
+        })
+
+    def _reply(self, status, payload):
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EmbeddingStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _EmbeddingStub.requests = []
+    _EmbeddingStub.fail_inputs = set()
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+
+    settings = WeaviateSettings(
+        OPENAI_API_KEY="sk-test-stub",
+        OPENAI_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        OPENAI_EMBEDDING_MAX_INPUTS=3,
+        OPENAI_EMBEDDING_MAX_CONCURRENCY=2,
+    )
+    batch = MagicMock()
+    monkeypatch.setattr(openai_client_module, "get_weaviate_settings", lambda: settings)
+    monkeypatch.setattr(openai_client_module, "get_batch_manager", lambda: batch)
+    llm = VectorWaveOpenAIClient()
+    llm.client = llm.client.with_options(max_retries=0)
+    yield llm, batch
+    server.shutdown()
+    server.server_close()
+
+
+def test_list_input_is_chunked_and_ordered(stub_llm):
+    llm, batch = stub_llm
+    texts = ["a", "bb", "ccc", "dddd", "eeeee", "line\nbreak", "g"]
+
+    vectors = llm.create_embedding(text=texts, model="text-embedding-3-small", category="batch")
+
+    assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0, 10.0, 1.0]
+    assert sorted(map(tuple, _EmbeddingStub.requests)) == [
+        ("a", "bb", "ccc"), ("dddd", "eeeee", "line break"), ("g",)
+    ]
+    # Token usage is logged once per request, not once per text.
+    tokens = sorted(c.kwargs["properties"]["tokens"] for c in batch.add_object.call_args_list)
+    assert tokens == [1, 3, 3]
+
+
+def test_failed_chunk_yields_none_for_its_inputs_only(stub_llm):
+    llm, _ = stub_llm
+    _EmbeddingStub.fail_inputs = {"bad"}
+
+    vectors = llm.create_embedding(text=["a", "bad", "c", "d"], model="m")
+
+    assert vectors[:3] == [None, None, None]
+    assert vectors[3] == [1.0, 0.0]
+
+
+def test_single_text_keeps_returning_one_vector(stub_llm):
+    llm, _ = stub_llm
+    assert llm.create_embedding(text="hello", model="m") == [5.0, 0.0]
+    assert _EmbeddingStub.requests == [["hello"]]
+
+
+def test_openai_vectorizer_embed_batch_uses_batched_requests(stub_llm, monkeypatch):
+    llm, _ = stub_llm
+    from vectorwave.vectorizer import openai_vectorizer
+
+    monkeypatch.setattr(openai_vectorizer, "get_llm_client", lambda: llm)
+    vectorizer = openai_vectorizer.OpenAIVectorizer(api_key="sk-test-stub")
+
+    assert vectorizer.embed_batch(["x", "yy", "zzz", "w"]) == [[1.0, 0.0], [2.0, 1.0], [3.0, 2.0], [1.0, 0.0]]
+    assert len(_EmbeddingStub.requests) == 2
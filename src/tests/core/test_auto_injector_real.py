@@ -15,9 +15,9 @@ def mock_db_dependencies():
     DB or AI models.
     (The wrapping logic itself runs for 'real')
     """
-    with patch("vectorwave.core.decorator.get_batch_manager") as mock_batch, \
+    with patch("vectorwave.core.registry.get_batch_manager") as mock_batch, \
             patch("vectorwave.core.decorator.get_vectorizer") as mock_vec, \
-            patch("vectorwave.core.decorator.function_cache_manager"), \
+            patch("vectorwave.core.registry.function_cache_manager"), \
             patch("vectorwave.core.decorator.get_weaviate_settings"), \
             patch("vectorwave.core.decorator.generate_uuid5", return_value="mock-uuid"):
 
@@ -12,9 +12,9 @@ class TestVectorWaveExtensions:
         """Mocks external dependencies of VectorWave."""
         # [Important] The patch path must be where the function is 'used' (decorator.py),
         # not where it is defined.
-        with patch('vectorwave.core.decorator.get_batch_manager') as mock_batch, \
+        with patch('vectorwave.core.registry.get_batch_manager') as mock_batch, \
                 patch('vectorwave.core.decorator.get_vectorizer') as mock_vec, \
-                patch('vectorwave.core.decorator.function_cache_manager') as mock_cache, \
+                patch('vectorwave.core.registry.function_cache_manager') as mock_cache, \
                 patch('vectorwave.core.decorator.generate_uuid5', return_value="mock-uuid"), \
                 patch('vectorwave.core.decorator.trace_span') as mock_trace_span, \
                 patch('vectorwave.core.decorator._check_and_return_cached_result') as mock_check_cache:
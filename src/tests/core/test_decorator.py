@@ -12,6 +12,7 @@ import time
 import pytest
 
 from vectorwave.core.decorator import vectorize
+from vectorwave.core.registry import flush_registrations
 from vectorwave.monitoring.tracer import trace_span
 from vectorwave.database.db import (
     get_weaviate_client,
@@ -121,6 +122,9 @@ def test_vectorize_writes_function_metadata_to_weaviate(vectorize_e2e_env):
         """My test docstring"""
         pass
 
+    # Registration is deferred until the first call or an explicit flush.
+    assert flush_registrations() >= 1
+
     client = get_weaviate_client(settings)
     try:
         funcs = client.collections.get(settings.COLLECTION_NAME)
@@ -7,6 +7,7 @@ and narrative (replayed from a VCR cassette), and the resulting row lands in
 VectorWaveFunctions.
 """
 import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -92,3 +93,36 @@ def test_auto_metadata_generates_description_and_registers(auto_metadata_env):
         assert props["sequence_narrative"] == "Receives two integers a and b, returns a + b."
     finally:
         client.close()
+
+
+def test_generated_descriptions_are_embedded_and_written_in_bulk():
+    PENDING_FUNCTIONS.clear()
+    batch = MagicMock()
+    vectorizer = MagicMock()
+    vectorizer.embed_batch.side_effect = lambda texts: [[1.0] for _ in texts]
+    cache = MagicMock()
+    cache.get_cached_metadata.return_value = None
+
+    with patch("vectorwave.core.decorator.trace_root", return_value=lambda f: f), \
+            patch("vectorwave.core.decorator.trace_span", return_value=lambda f: f):
+        @vectorize(auto=True)
+        def first(a):
+            return a
+
+        @vectorize(auto=True)
+        def second(b):
+            return b
+
+    generated = {"search_description": "desc", "sequence_narrative": "narr"}
+    with patch("vectorwave.core.generator.get_batch_manager", return_value=batch), \
+            patch("vectorwave.core.generator.get_vectorizer", return_value=vectorizer), \
+            patch("vectorwave.core.generator.function_cache_manager", cache), \
+            patch("vectorwave.core.generator.generate_metadata_via_llm", return_value=generated):
+        generate_and_register_metadata()
+
+    assert PENDING_FUNCTIONS == []
+    vectorizer.embed_batch.assert_called_once_with(["desc"])
+    batch.write_objects.assert_called_once()
+    items = batch.write_objects.call_args.args[0]
+    assert [i["properties"]["function_name"] for i in items] == ["first", "second"]
+    assert all(i["vector"] == [1.0] and i["properties"]["search_description"] == "desc" for i in items)
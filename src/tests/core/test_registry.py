@@ -0,0 +1,162 @@
+"""Deferred @vectorize registration: nothing is written at decoration time;
+the first call (in the background) or flush_registrations() registers every
+pending function in one pass."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from vectorwave.core.decorator import vectorize, PENDING_FUNCTIONS
+from vectorwave.core.registry import MAX_WRITE_ATTEMPTS, flush_registrations, function_registry
+
+REGISTRY_MODULE_PATH = "vectorwave.core.registry"
+
+
+@pytest.fixture
+def registry_deps():
+    flush_registrations()  # drain anything earlier tests left pending
+    batch = MagicMock()
+    vectorizer = MagicMock()
+    vectorizer.embed_batch.side_effect = lambda texts: [[float(len(t))] for t in texts]
+    cache = MagicMock()
+    cache.is_cached_and_unchanged.return_value = False
+    cache.calculate_content_hash.side_effect = lambda identifier, props: f"hash-{identifier}"
+
+    with patch(f"{REGISTRY_MODULE_PATH}.get_batch_manager", return_value=batch), \
+            patch(f"{REGISTRY_MODULE_PATH}.get_vectorizer", return_value=vectorizer), \
+            patch(f"{REGISTRY_MODULE_PATH}.function_cache_manager", cache), \
+            patch("vectorwave.core.decorator.trace_root", return_value=lambda f: f), \
+            patch("vectorwave.core.decorator.trace_span", return_value=lambda f: f):
+        yield {"batch": batch, "vectorizer": vectorizer, "cache": cache}
+    flush_registrations()
+
+
+def _written(batch):
+    return {item["properties"]["function_name"]: item
+            for call in batch.write_objects.call_args_list for item in call.args[0]}
+
+
+def test_decoration_writes_nothing_until_flush(registry_deps):
+    @vectorize(search_description="Adds numbers")
+    def add(a, b):
+        """Adds."""
+        return a + b
+
+    @vectorize(search_description="Subtracts numbers")
+    def sub(a, b):
+        return a - b
+
+    registry_deps["batch"].write_objects.assert_not_called()
+    registry_deps["cache"].calculate_content_hash.assert_not_called()
+    assert function_registry.pending_count() == 2
+
+    assert flush_registrations() == 2
+    # One embed_batch and one bulk write for the whole pass.
+    registry_deps["vectorizer"].embed_batch.assert_called_once_with(["Adds numbers", "Subtracts numbers"])
+    registry_deps["batch"].write_objects.assert_called_once()
+    written = _written(registry_deps["batch"])
+    assert set(written) == {"add", "sub"}
+    assert written["add"]["properties"]["docstring"] == "Adds."
+    assert "def add(a, b)" in written["add"]["properties"]["source_code"]
+    assert written["add"]["vector"] == [12.0]
+    registry_deps["cache"].update_cache_many.assert_called_once_with(
+        {written["add"]["uuid"]: f"hash-{__name__}.add", written["sub"]["uuid"]: f"hash-{__name__}.sub"}
+    )
+    sync = function_registry.last_sync
+    assert (sync.pending, sync.written, sync.embedded) == (2, 2, 2)
+    assert sync.total_seconds >= sync.embed_seconds + sync.write_seconds
+    assert flush_registrations() == 0
+
+
+def test_first_call_registers_in_background(registry_deps):
+    @vectorize(search_description="Doubles")
+    def double(x):
+        return 2 * x
+
+    assert double(2) == 4
+    function_registry._worker.join(timeout=5)
+
+    assert set(_written(registry_deps["batch"])) == {"double"}
+    assert function_registry.pending_count() == 0
+
+
+def test_exit_hook_registers_what_is_left_before_batch_shutdown(registry_deps):
+    @vectorize(search_description="Called once")
+    def called(x):
+        return x
+
+    with patch(f"{REGISTRY_MODULE_PATH}.atexit") as mock_atexit:
+        called(1)
+        function_registry._worker.join(timeout=5)
+    # Registered after get_batch_manager() ran, so it runs before its shutdown hook.
+    mock_atexit.unregister.assert_called_once_with(function_registry._flush_at_exit)
+    mock_atexit.register.assert_called_once_with(function_registry._flush_at_exit)
+
+    @vectorize(search_description="Decorated after the pass")
+    def late(x):
+        return x
+
+    function_registry._flush_at_exit()
+    assert set(_written(registry_deps["batch"])) == {"called", "late"}
+    assert function_registry.pending_count() == 0
+
+
+def test_unchanged_functions_are_skipped(registry_deps):
+    registry_deps["cache"].is_cached_and_unchanged.return_value = True
+
+    @vectorize(search_description="Same as before")
+    def unchanged():
+        return None
+
+    assert flush_registrations() == 0
+    registry_deps["batch"].write_objects.assert_not_called()
+    registry_deps["vectorizer"].embed_batch.assert_not_called()
+    assert function_registry.last_sync.unchanged == 1
+
+
+def test_failed_write_is_not_cached(registry_deps):
+    registry_deps["batch"].write_objects.return_value = False
+
+    @vectorize(search_description="Rejected")
+    def rejected():
+        return None
+
+    assert flush_registrations() == 0
+    registry_deps["cache"].update_cache_many.assert_not_called()
+    assert function_registry.last_sync.failed == 1
+
+    # Put back for the next pass, which writes it once the store accepts it.
+    assert function_registry.pending_count() == 1
+    assert function_registry.last_sync.requeued == 1
+    registry_deps["batch"].write_objects.return_value = True
+    assert flush_registrations() == 1
+    registry_deps["cache"].update_cache_many.assert_called_once()
+    assert function_registry.pending_count() == 0
+
+
+def test_failed_write_is_given_up_after_max_attempts(registry_deps):
+    registry_deps["batch"].write_objects.side_effect = RuntimeError("store down")
+
+    @vectorize(search_description="Never accepted")
+    def rejected():
+        return None
+
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        assert flush_registrations() == 0
+    assert registry_deps["batch"].write_objects.call_count == MAX_WRITE_ATTEMPTS
+    assert function_registry.pending_count() == 0
+    assert function_registry.last_sync.requeued == 0
+
+
+def test_auto_functions_wait_for_the_generator(registry_deps):
+    PENDING_FUNCTIONS.clear()
+
+    @vectorize(auto=True)
+    def documented_later(a):
+        return a
+
+    try:
+        assert function_registry.pending_count() == 0
+        assert PENDING_FUNCTIONS[-1]["func_name"] == "documented_later"
+        assert "def documented_later" in PENDING_FUNCTIONS[-1]["registration"].static_properties()["source_code"]
+    finally:
+        PENDING_FUNCTIONS.clear()
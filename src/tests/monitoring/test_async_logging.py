@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from contextvars import ContextVar
 
-from vectorwave.monitoring.tracer import trace_span, TraceCollector
+from vectorwave.monitoring.tracer import trace_span, TraceCollector, SpanContext
 from vectorwave.models.db_config import WeaviateSettings
 from vectorwave.utils.context import execution_source_context
 
@@ -15,8 +15,16 @@ def mock_settings():
     settings.ASYNC_LOGGING = False  # Default value
     settings.SENSITIVE_FIELD_NAMES = "password,secret"
     settings.sensitive_keys = {"password", "secret"}
+    settings.SENSITIVE_KEY_PATTERNS = []
+    settings.SENSITIVE_VALUE_PATTERNS = []
     settings.ignored_error_codes = set()
     settings.DRIFT_DETECTION_ENABLED = False
+    settings.global_custom_values = None
+    settings.EXECUTION_COLLECTION_NAME = "TestExecutions"
+    settings.CAPTURE_MAX_DEPTH = None
+    settings.CAPTURE_MAX_BYTES = None
+    settings.CAPTURE_MAX_LIST_ITEMS = None
+    settings.CAPTURE_MAX_STRING_LENGTH = None
     return settings
 
 @pytest.fixture
@@ -27,6 +35,7 @@ def mock_tracer(mock_settings):
     tracer.batch = MagicMock()
     tracer.alerter = MagicMock()
     tracer.alert_sent = False
+    tracer.trace_id = "trace-test"
     return tracer
 
 # --- Tests ---
@@ -34,13 +43,13 @@ def mock_tracer(mock_settings):
 def test_async_logging_enabled(mock_tracer):
     """
     [Case 1] When ASYNC_LOGGING=True,
-    _perform_background_logging should be called via executor.submit.
+    the span should be handed to the span pipeline instead of being logged inline.
     """
     mock_tracer.settings.ASYNC_LOGGING = True
 
     # [Fix] Patch the variable itself, not the .get method.
     with patch('vectorwave.monitoring.tracer.current_tracer_var') as mock_ctx_var, \
-            patch('vectorwave.monitoring.tracer._background_executor.submit') as mock_submit, \
+            patch('vectorwave.monitoring.tracer._get_span_pipeline') as mock_pipeline, \
             patch('vectorwave.monitoring.tracer._perform_background_logging') as mock_perform:
 
         # Configure return value of current_tracer_var.get() to return mock_tracer
@@ -53,22 +62,23 @@ def test_async_logging_enabled(mock_tracer):
         result = sample_func(10, 20)
 
         assert result == 30
+        mock_submit = mock_pipeline.return_value.submit
         mock_submit.assert_called_once()
-        # Verify that the first argument of submit is the actual logging function
-        assert mock_submit.call_args[0][0] == mock_perform
-        # Ensure direct execution did not happen (it should run inside submit)
+        # The pipeline receives the SpanContext; its workers do the logging
+        assert isinstance(mock_submit.call_args[0][0], SpanContext)
+        # Ensure direct execution did not happen (it should run inside the pipeline)
         mock_perform.assert_not_called()
 
 
 def test_sync_logging_fallback(mock_tracer):
     """
     [Case 2] When ASYNC_LOGGING=False,
-    _perform_background_logging should be called directly in the main thread, instead of executor.submit.
+    _perform_background_logging should be called directly in the main thread, instead of the span pipeline.
     """
     mock_tracer.settings.ASYNC_LOGGING = False
 
     with patch('vectorwave.monitoring.tracer.current_tracer_var') as mock_ctx_var, \
-            patch('vectorwave.monitoring.tracer._background_executor.submit') as mock_submit, \
+            patch('vectorwave.monitoring.tracer._get_span_pipeline') as mock_pipeline, \
             patch('vectorwave.monitoring.tracer._perform_background_logging') as mock_perform:
 
         mock_ctx_var.get.return_value = mock_tracer
@@ -80,7 +90,7 @@ def test_sync_logging_fallback(mock_tracer):
         result = sample_func(5, 5)
 
         assert result == 10
-        mock_submit.assert_not_called()
+        mock_pipeline.return_value.submit.assert_not_called()
         mock_perform.assert_called_once()
 
 
@@ -92,7 +102,7 @@ def test_force_sync_override(mock_tracer):
     mock_tracer.settings.ASYNC_LOGGING = True
 
     with patch('vectorwave.monitoring.tracer.current_tracer_var') as mock_ctx_var, \
-            patch('vectorwave.monitoring.tracer._background_executor.submit') as mock_submit, \
+            patch('vectorwave.monitoring.tracer._get_span_pipeline') as mock_pipeline, \
             patch('vectorwave.monitoring.tracer._perform_background_logging') as mock_perform:
 
         mock_ctx_var.get.return_value = mock_tracer
@@ -103,7 +113,7 @@ def test_force_sync_override(mock_tracer):
 
         critical_func()
 
-        mock_submit.assert_not_called()
+        mock_pipeline.return_value.submit.assert_not_called()
         mock_perform.assert_called_once()
 
 
@@ -119,7 +129,7 @@ def test_execution_source_capture_in_async(mock_tracer):
 
     try:
         with patch('vectorwave.monitoring.tracer.current_tracer_var') as mock_ctx_var, \
-                patch('vectorwave.monitoring.tracer._background_executor.submit') as mock_submit:
+                patch('vectorwave.monitoring.tracer._get_span_pipeline') as mock_pipeline:
 
             mock_ctx_var.get.return_value = mock_tracer
 
@@ -129,8 +139,8 @@ def test_execution_source_capture_in_async(mock_tracer):
 
             context_func()
 
-            # submit is called as submit(fn, SpanContext) — check exec_source inside SpanContext
-            call_args = mock_submit.call_args[0]
+            # submit is called as submit(SpanContext) — check exec_source inside SpanContext
+            call_args = mock_pipeline.return_value.submit.call_args[0]
             span_ctx = call_args[-1]  # SpanContext is the last positional arg
 
             assert span_ctx.exec_source == test_source, f"Expected '{test_source}', but got '{span_ctx.exec_source}'"
@@ -147,7 +157,7 @@ async def test_async_wrapper_logging(mock_tracer):
     mock_tracer.settings.ASYNC_LOGGING = True
 
     with patch('vectorwave.monitoring.tracer.current_tracer_var') as mock_ctx_var, \
-            patch('vectorwave.monitoring.tracer._background_executor.submit') as mock_submit, \
+            patch('vectorwave.monitoring.tracer._get_span_pipeline') as mock_pipeline, \
             patch('vectorwave.monitoring.tracer._perform_background_logging') as mock_perform:
 
         mock_ctx_var.get.return_value = mock_tracer
@@ -159,5 +169,75 @@ async def test_async_wrapper_logging(mock_tracer):
         result = await async_sample_func()
 
         assert result == "async_result"
+        mock_submit = mock_pipeline.return_value.submit
         mock_submit.assert_called_once()
-        assert mock_submit.call_args[0][0] == mock_perform
\ No newline at end of file
+        assert isinstance(mock_submit.call_args[0][0], SpanContext)
+        mock_perform.assert_not_called()
+
+def _make_span_ctx(tracer, func, status="SUCCESS", args=(), error_msg=None):
+    return SpanContext(
+        tracer=tracer, func=func, start_time=0.0,
+        status=status, error_msg=error_msg, error_code=None if status == "SUCCESS" else "ValueError",
+        my_span_id="span", parent_span_id=None,
+        capture_return_value=True, result="ok" if status == "SUCCESS" else None,
+        attributes_to_capture=None, args=args, kwargs={},
+        exec_source="REALTIME", enable_alert=False, end_time=0.001,
+    )
+
+
+def test_background_batch_embeds_spans_with_one_vectorizer_call(mock_tracer):
+    """
+    [Case 6] The pipeline handler should vectorize a whole micro-batch with a
+    single embed_batch call and route each vector back to its own span.
+    """
+    from vectorwave.monitoring.tracer import _perform_background_logging_batch
+
+    def search(q):
+        return q
+
+    vectorizer = MagicMock()
+    vectorizer.embed_batch.side_effect = lambda texts: [[float(i)] for i in range(len(texts))]
+
+    batch = [
+        _make_span_ctx(mock_tracer, search, args=("alpha",)),
+        _make_span_ctx(mock_tracer, search, status="ERROR", error_msg="Traceback: boom"),
+        _make_span_ctx(mock_tracer, search, args=("beta",)),
+        _make_span_ctx(mock_tracer, search, status="ERROR", error_msg="Traceback: boom"),
+    ]
+
+    with patch('vectorwave.monitoring.tracer.get_vectorizer', return_value=vectorizer):
+        _perform_background_logging_batch(batch)
+
+    vectorizer.embed.assert_not_called()
+    vectorizer.embed_batch.assert_called_once()
+    texts = vectorizer.embed_batch.call_args[0][0]
+    # Identical error messages are embedded once
+    assert len(texts) == 3
+    assert "alpha" in texts[0] and texts[1] == "Traceback: boom" and "beta" in texts[2]
+
+    vectors = [c.kwargs["vector"] for c in mock_tracer.batch.add_object.call_args_list]
+    assert vectors == [[0.0], [1.0], [2.0], [1.0]]
+
+
+def test_background_batch_falls_back_to_per_span_embed(mock_tracer):
+    """
+    [Case 7] If embed_batch fails, each span is embedded individually rather
+    than being logged without a vector.
+    """
+    from vectorwave.monitoring.tracer import _perform_background_logging_batch
+
+    def search(q):
+        return q
+
+    vectorizer = MagicMock()
+    vectorizer.embed_batch.side_effect = RuntimeError("model busy")
+    vectorizer.embed.return_value = [0.5]
+
+    batch = [_make_span_ctx(mock_tracer, search, args=("a",)), _make_span_ctx(mock_tracer, search, args=("b",))]
+
+    with patch('vectorwave.monitoring.tracer.get_vectorizer', return_value=vectorizer):
+        _perform_background_logging_batch(batch)
+
+    assert vectorizer.embed.call_count == 2
+    vectors = [c.kwargs["vector"] for c in mock_tracer.batch.add_object.call_args_list]
+    assert vectors == [[0.5], [0.5]]
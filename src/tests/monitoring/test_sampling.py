@@ -0,0 +1,125 @@
+from unittest.mock import MagicMock
+
+from vectorwave.monitoring.sampling import Sampler, KEEP, DROP, DEFER
+from vectorwave.monitoring.tracer import trace_root, trace_span
+
+from ..monitoring.test_tracer import mock_tracer_deps  # noqa: F401  (used by tests below)
+
+TRACER_MODULE_PATH = "vectorwave.monitoring.tracer"
+NAMES = ("app.handler", "handler")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_default_sampler_keeps_everything():
+    assert Sampler().decide(NAMES) == KEEP
+    assert Sampler().stats()["kept"] == 0  # the fast path keeps no counters
+
+
+def test_head_rate_per_function():
+    sampler = Sampler(rates={"handler": 0.0, "app.other": 1.0}, keep_errors=False, keep_slow=False,
+                      rng=lambda: 0.5)
+
+    assert sampler.decide(NAMES) == DROP
+    assert sampler.decide(("app.other", "other")) == KEEP
+    assert sampler.decide(NAMES, rate=0.6) == KEEP
+    assert sampler.decide(NAMES, rate=0.4) == DROP
+
+
+def test_rate_limit_refills_per_second():
+    clock = FakeClock()
+    sampler = Sampler(max_traces_per_second=2, keep_errors=False, keep_slow=False, clock=clock)
+
+    assert [sampler.decide(NAMES) for _ in range(3)] == [KEEP, KEEP, DROP]
+    assert sampler.decide(("app.other", "other")) == KEEP  # buckets are per root function
+    clock.now = 0.5
+    assert [sampler.decide(NAMES) for _ in range(2)] == [KEEP, DROP]
+    assert sampler.stats()["rate_limited"] == 2
+
+
+def test_head_dropped_trace_is_deferred_when_tail_sampling():
+    assert Sampler(rate=0.0).decide(NAMES) == DEFER
+    assert Sampler(rate=0.0, keep_errors=False, keep_slow=False).decide(NAMES) == DROP
+
+
+def test_slow_spans_above_percentile():
+    sampler = Sampler(rate=0.0, slow_percentile=90, slow_min_samples=10, latency_window=16)
+    func = object()
+
+    for i in range(16):
+        assert not sampler.should_keep_span(func, 0.01 + (i % 10) * 0.001, failed=False)
+    assert sampler.should_keep_span(func, 1.0, failed=False)
+    assert not sampler.should_keep_span(func, 0.011, failed=False)
+    assert sampler.should_keep_span(func, 0.011, failed=True)
+
+
+def _use_sampler(monkeypatch, sampler):
+    monkeypatch.setattr(f"{TRACER_MODULE_PATH}.get_sampler", MagicMock(return_value=sampler))
+
+
+def test_dropped_trace_logs_no_spans(mock_tracer_deps, monkeypatch):
+    _use_sampler(monkeypatch, Sampler(rate=0.0, keep_errors=False, keep_slow=False))
+
+    @trace_span
+    def inner():
+        return 1
+
+    @trace_root()
+    @trace_span
+    def root():
+        return inner() + 1
+
+    assert root() == 2
+    mock_tracer_deps["batch"].add_object.assert_not_called()
+
+
+def test_deferred_trace_is_kept_whole_when_a_span_fails(mock_tracer_deps, monkeypatch):
+    sampler = Sampler(rate=0.0, keep_slow=False)
+    _use_sampler(monkeypatch, sampler)
+
+    @trace_span
+    def ok():
+        return 1
+
+    @trace_span
+    def failing():
+        raise ValueError("boom")
+
+    @trace_root()
+    @trace_span
+    def root(fail):
+        ok()
+        if fail:
+            try:
+                failing()
+            except ValueError:
+                pass
+        return "done"
+
+    root(False)
+    mock_tracer_deps["batch"].add_object.assert_not_called()
+
+    root(True)
+    logged = [c.kwargs["properties"] for c in mock_tracer_deps["batch"].add_object.call_args_list]
+    assert sorted(p["function_name"] for p in logged) == ["failing", "ok", "root"]
+    assert len({p["trace_id"] for p in logged}) == 1
+    assert sampler.stats()["kept_by_tail"] == 1
+    assert sampler.stats()["dropped_spans"] == 2
+
+
+def test_trace_root_sample_rate_overrides_settings(mock_tracer_deps, monkeypatch):
+    _use_sampler(monkeypatch, Sampler(rate=1.0, keep_errors=False, keep_slow=False))
+
+    @trace_root(sample_rate=0.0)
+    @trace_span
+    def root():
+        return 1
+
+    root()
+    mock_tracer_deps["batch"].add_object.assert_not_called()
@@ -0,0 +1,221 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from vectorwave.monitoring.pipeline import SpanPipeline
+
+
+class _GatedHandler:
+    """Handler that blocks until released, so tests can fill the buffer
+    deterministically while the workers are busy."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, batch):
+        self.started.set()
+        self.release.wait(timeout=5)
+        with self._lock:
+            self.batches.append(list(batch))
+
+    @property
+    def items(self):
+        with self._lock:
+            return [i for b in self.batches for i in b]
+
+
+def _occupy_worker(pipeline, handler):
+    """Submit one sentinel item and wait until the single worker holds it."""
+    pipeline.submit("sentinel")
+    assert handler.started.wait(timeout=2)
+
+
+def test_pipeline_processes_all_items_in_micro_batches():
+    seen = []
+    lock = threading.Lock()
+
+    def handler(batch):
+        with lock:
+            seen.append(list(batch))
+
+    pipeline = SpanPipeline(handler, capacity=1000, workers=2, batch_size=8)
+    for i in range(100):
+        assert pipeline.submit(i) is True
+
+    assert pipeline.flush(timeout=5)
+    flat = sorted(i for b in seen for i in b)
+    assert flat == list(range(100))
+    assert all(1 <= len(b) <= 8 for b in seen)
+
+    stats = pipeline.stats()
+    assert stats["enqueued"] == 100
+    assert stats["processed"] == 100
+    assert stats["dropped"] == 0
+    assert stats["depth"] == 0
+    pipeline.shutdown()
+
+
+def test_linger_collects_partial_batch_into_one_handler_call():
+    seen = []
+    pipeline = SpanPipeline(seen.append, capacity=100, workers=2, batch_size=10, linger=0.5)
+
+    for i in range(4):
+        pipeline.submit(i)
+        time.sleep(0.01)
+
+    assert pipeline.flush(timeout=5)
+    assert seen == [[0, 1, 2, 3]]
+    pipeline.shutdown()
+
+
+def test_linger_does_not_delay_a_full_batch():
+    seen = []
+    pipeline = SpanPipeline(seen.append, capacity=100, workers=1, batch_size=3, linger=10.0)
+
+    start = time.monotonic()
+    for i in range(3):
+        pipeline.submit(i)
+    assert pipeline.flush(timeout=5)
+    assert time.monotonic() - start < 5
+    assert seen == [[0, 1, 2]]
+    pipeline.shutdown()
+
+
+def test_filling_batch_wakes_the_lingering_worker_not_a_parked_one():
+    seen = []
+    pipeline = SpanPipeline(seen.append, capacity=100, workers=4, batch_size=4, linger=10.0)
+    pipeline.submit(0)
+    time.sleep(0.05)  # one worker lingers on the partial batch, three are parked
+    parked_wakeups = MagicMock(wraps=pipeline._not_empty.notify)
+    pipeline._not_empty.notify = parked_wakeups
+
+    start = time.monotonic()
+    for i in range(1, 4):
+        pipeline.submit(i)
+    assert pipeline.flush(timeout=5)
+    assert time.monotonic() - start < 2
+    assert seen == [[0, 1, 2, 3]]
+    parked_wakeups.assert_not_called()
+    pipeline.shutdown()
+
+
+def test_drop_oldest_evicts_head_of_buffer():
+    handler = _GatedHandler()
+    pipeline = SpanPipeline(handler, capacity=3, overflow_policy="drop_oldest", workers=1, batch_size=10)
+    _occupy_worker(pipeline, handler)
+
+    for i in range(5):
+        assert pipeline.submit(i) is True
+
+    stats = pipeline.stats()
+    assert stats["depth"] == 3
+    assert stats["dropped_oldest"] == 2
+
+    handler.release.set()
+    assert pipeline.flush(timeout=5)
+    assert handler.items == ["sentinel", 2, 3, 4]
+    pipeline.shutdown()
+
+
+def test_drop_newest_rejects_incoming_span():
+    handler = _GatedHandler()
+    pipeline = SpanPipeline(handler, capacity=2, overflow_policy="drop_newest", workers=1)
+    _occupy_worker(pipeline, handler)
+
+    results = [pipeline.submit(i) for i in range(4)]
+    assert results == [True, True, False, False]
+    assert pipeline.stats()["dropped_newest"] == 2
+
+    handler.release.set()
+    assert pipeline.flush(timeout=5)
+    assert handler.items == ["sentinel", 0, 1]
+    pipeline.shutdown()
+
+
+def test_block_policy_waits_then_drops_on_timeout():
+    handler = _GatedHandler()
+    pipeline = SpanPipeline(handler, capacity=1, overflow_policy="block", block_timeout=0.05, workers=1)
+    _occupy_worker(pipeline, handler)
+
+    assert pipeline.submit("a") is True
+    start = time.monotonic()
+    assert pipeline.submit("b") is False
+    assert time.monotonic() - start >= 0.04
+    assert pipeline.stats()["dropped_timeout"] == 1
+
+    handler.release.set()
+    pipeline.shutdown()
+
+
+def test_block_policy_succeeds_when_space_frees_up():
+    handler = _GatedHandler()
+    pipeline = SpanPipeline(handler, capacity=1, overflow_policy="block", block_timeout=2.0, workers=1)
+    _occupy_worker(pipeline, handler)
+    assert pipeline.submit("a") is True
+
+    threading.Timer(0.05, handler.release.set).start()
+    assert pipeline.submit("b") is True
+
+    assert pipeline.flush(timeout=5)
+    assert handler.items == ["sentinel", "a", "b"]
+    assert pipeline.stats()["dropped"] == 0
+    pipeline.shutdown()
+
+
+def test_handler_errors_are_counted_and_do_not_kill_workers():
+    calls = []
+
+    def handler(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    pipeline = SpanPipeline(handler, capacity=10, workers=1, batch_size=1)
+    pipeline.submit(1)
+    assert pipeline.flush(timeout=5)
+    pipeline.submit(2)
+    assert pipeline.flush(timeout=5)
+
+    assert calls == [[1], [2]]
+    assert pipeline.stats()["handler_errors"] == 1
+    pipeline.shutdown()
+
+
+def test_shutdown_drains_buffer_and_rejects_new_spans():
+    seen = []
+    pipeline = SpanPipeline(seen.extend, capacity=100, workers=1)
+    for i in range(10):
+        pipeline.submit(i)
+    pipeline.shutdown()
+
+    assert sorted(seen) == list(range(10))
+    assert pipeline.submit(99) is False
+    pipeline.shutdown()  # idempotent
+
+
+def test_unknown_policy_raises():
+    with pytest.raises(ValueError, match="overflow policy"):
+        SpanPipeline(lambda b: None, overflow_policy="spill")
+
+
+def test_pipeline_stats_are_visible_through_runtime_info(monkeypatch):
+    from vectorwave import runtime
+    from vectorwave.monitoring import tracer
+    from vectorwave.models.db_config import WeaviateSettings
+
+    monkeypatch.setattr(tracer, "get_weaviate_settings", lambda: WeaviateSettings(SPAN_QUEUE_SIZE=7))
+    tracer._get_span_pipeline.cache_clear()
+    try:
+        pipeline = tracer._get_span_pipeline()
+        info = runtime.get_info()
+        assert info.stats["span_pipeline"]["capacity"] == 7
+        assert info.stats["span_pipeline"]["dropped"] == 0
+    finally:
+        pipeline.shutdown()
+        tracer._get_span_pipeline.cache_clear()
+        runtime._stats_providers.pop("span_pipeline", None)
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 import json
 from datetime import datetime
 import time
+import traceback
 
 from vectorwave.monitoring.tracer import trace_root, trace_span
 
@@ -12,7 +13,7 @@ from vectorwave.models.db_config import WeaviateSettings
 from vectorwave.batch.batch import get_batch_manager as real_get_batch_manager
 from vectorwave.database.db import get_cached_client as real_get_cached_client
 from vectorwave.models.db_config import get_weaviate_settings as real_get_settings
-from vectorwave.monitoring.tracer import TraceCollector, current_tracer_var, current_span_id_var
+from vectorwave.monitoring.tracer import TraceCollector, SpanContext, current_tracer_var, current_span_id_var
 from vectorwave.monitoring.alert.base import BaseAlerter
 
 # Module paths to mock (adjust to your project structure if needed)
@@ -421,3 +422,76 @@ def test_enable_alert_false_default_is_true(mock_tracer_deps):
     my_workflow()
 
     mock_alerter.notify.assert_called_once()
+
+
+def test_span_ids_are_unique_hex_and_linked(mock_tracer_deps):
+    """Span ids are generated as ints and stored as 32-char hex strings."""
+    mock_batch = mock_tracer_deps["batch"].add_object
+
+    @trace_span
+    def leaf(i):
+        return i
+
+    @trace_root()
+    @trace_span
+    def root():
+        return [leaf(i) for i in range(3)]
+
+    root()
+
+    props = [call.kwargs["properties"] for call in mock_batch.call_args_list]
+    span_ids = [p["span_id"] for p in props]
+    assert len(set(span_ids)) == 4
+    assert all(isinstance(s, str) and len(s) == 32 and int(s, 16) for s in span_ids)
+    root_id = next(p["span_id"] for p in props if p["function_name"] == "root")
+    assert all(p["parent_span_id"] == root_id for p in props if p["function_name"] == "leaf")
+
+
+def test_failure_traceback_is_formatted_when_logged():
+    """The caller's thread only keeps exc_info; error_msg formats it later
+    and matches what traceback.format_exc() gave inside the handler."""
+    try:
+        raise ValueError("late format")
+    except ValueError as e:
+        exc_info = (type(e), e, e.__traceback__)
+        expected = traceback.format_exc()
+
+    ctx = SpanContext(
+        tracer=None, func=None, start_time=0.0, status="ERROR", error_msg=None,
+        error_code="ValueError", my_span_id=1, parent_span_id=None,
+        capture_return_value=False, result=None, attributes_to_capture=None,
+        args=(), kwargs={}, exec_source=None, exc_info=exc_info,
+    )
+
+    assert ctx.error_msg == expected
+    assert ctx.exc_info is None
+
+
+def test_span_stores_its_logged_return_value_for_a_pending_exact_entry(mock_tracer_deps):
+    """A semantic-cache miss leaves an exact-match key behind; the next span
+    takes it and stores the return value it encoded for its own log."""
+    from vectorwave.monitoring.tracer import pending_exact_store_var
+    from vectorwave.utils.exact_cache import ExactMatchCache
+
+    cache = ExactMatchCache()
+
+    @trace_span(force_sync=True)
+    def helper():
+        return "inner"
+
+    @trace_root()
+    @trace_span(capture_return_value=True, force_sync=True)
+    def lookup():
+        helper()
+        return {"answer": 42}
+
+    pending_exact_store_var.set((cache, "key", "lookup"))
+    assert lookup() == {"answer": 42}
+
+    assert pending_exact_store_var.get() is None
+    logged = {
+        call.kwargs["properties"]["function_name"]: call.kwargs["properties"]
+        for call in mock_tracer_deps["batch"].add_object.call_args_list
+    }
+    assert cache.get("key") == (True, logged["lookup"]["return_value"])
+    assert json.loads(cache.get("key")[1]) == {"answer": 42}
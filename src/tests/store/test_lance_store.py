@@ -0,0 +1,342 @@
+"""LanceVectorStore storage layout: typed columns, overflow JSON, migration."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("lancedb")
+
+from vectorwave.store.lance_store import LanceVectorStore, TYPED_COLUMNS
+
+DIM = 4
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LanceVectorStore(db_path=str(tmp_path / "lance"), vector_dim=DIM)
+
+
+def _span(i, **extra):
+    props = {
+        "function_name": f"fn_{i % 2}",
+        "status": "SUCCESS" if i % 3 else "ERROR",
+        "timestamp_utc": f"2026-01-01T00:00:{i:02d}+00:00",
+        "duration_ms": float(i),
+        "trace_id": f"t{i}",
+        "error_code": None,
+        "team": "core",
+    }
+    props.update(extra)
+    return props
+
+
+def test_new_tables_use_typed_columns(store):
+    store.ensure_collection("Exec", properties=[])
+    schema = store._open("Exec").schema
+    for name in TYPED_COLUMNS:
+        assert name in schema.names
+    assert str(schema.field("duration_ms").type) == "double"
+
+
+def test_properties_round_trip_through_columns_and_overflow(store):
+    props = _span(1, nested={"a": [1, 2]}, exec_source="replay")
+    uuid = store.insert("Exec", props, vector=[1.0, 0.0, 0.0, 0.0])
+
+    row = store._open("Exec").to_arrow().to_pylist()[0]
+    assert row["function_name"] == "fn_1"
+    assert row["duration_ms"] == 1.0
+    # Only custom / null-valued properties are left in the overflow JSON.
+    assert json.loads(row["payload"]) == {"error_code": None, "team": "core", "nested": {"a": [1, 2]}}
+
+    assert store.fetch_by_id("Exec", uuid).properties == props
+
+
+def test_int_duration_is_stored_in_its_float_column(store):
+    store.insert("Exec", {"function_name": "f", "duration_ms": 12}, vector=[1.0] * DIM)
+    row = store._open("Exec").to_arrow().to_pylist()[0]
+    assert row["duration_ms"] == 12.0
+    assert json.loads(row["payload"]) == {}
+
+
+def test_mistyped_known_field_stays_in_overflow(store):
+    store.insert("Exec", {"function_name": "f", "duration_ms": True, "status": 3}, vector=[1.0] * DIM)
+    rec = store.query("Exec", limit=1)[0]
+    assert rec.properties["duration_ms"] is True
+    assert rec.properties["status"] == 3
+
+
+def test_insert_columns_writes_arrow_batch(store):
+    import numpy as np
+
+    vectors = np.arange(3 * DIM, dtype=np.float32).reshape(3, DIM)
+    n = store.insert_columns("Exec", [_span(i) for i in range(3)], vectors, uuids=["u0", None, "u2"])
+
+    assert n == 3
+    rows = {r["trace_id"]: r for r in store._open("Exec").to_arrow().to_pylist()}
+    assert rows["t0"]["uuid"] == "u0" and rows["t1"]["uuid"]
+    assert rows["t2"]["vector"] == [8.0, 9.0, 10.0, 11.0]
+    assert store.fetch_by_id("Exec", "u2").properties == _span(2)
+
+
+def test_insert_many_pads_short_and_missing_vectors(store):
+    store.insert_many("Exec", [
+        {"properties": _span(0), "uuid": "short", "vector": [1.0, 2.0]},
+        {"properties": _span(1), "uuid": "none", "vector": None},
+    ])
+    assert store.fetch_by_id("Exec", "short", include_vector=True).vector == [1.0, 2.0, 0.0, 0.0]
+    assert store.fetch_by_id("Exec", "none", include_vector=True).vector == [0.0] * DIM
+
+
+def test_query_filters_sort_and_delete_on_typed_columns(store):
+    store.insert_many("Exec", [
+        {"properties": _span(i), "vector": [float(i), 1.0, 0.0, 0.0]} for i in range(6)
+    ])
+
+    recs = store.query("Exec", filters={"function_name": "fn_1", "status": "SUCCESS"},
+                       sort_by="timestamp_utc", limit=10)
+    assert [r.properties["trace_id"] for r in recs] == ["t5", "t1"]
+
+    recs = store.query("Exec", filters={"team": "core", "duration_ms__gte": 4.0}, limit=10)
+    assert sorted(r.properties["trace_id"] for r in recs) == ["t4", "t5"]
+
+    assert store.delete_by_filter("Exec", {"status": "ERROR"}) == 2
+    assert len(store.query("Exec", limit=10)) == 4
+
+
+def test_update_preserves_columns_and_vector(store):
+    uuid = store.insert("Exec", _span(2), vector=[0.0, 1.0, 0.0, 0.0])
+    store.update("Exec", uuid, {"status": "ANOMALY", "note": "drift"})
+
+    rec = store.fetch_by_id("Exec", uuid, include_vector=True)
+    assert rec.properties["status"] == "ANOMALY"
+    assert rec.properties["note"] == "drift"
+    assert rec.properties["trace_id"] == "t2"
+    assert rec.vector == [0.0, 1.0, 0.0, 0.0]
+
+
+def _write_legacy_table(path, rows):
+    import lancedb
+    import pyarrow as pa
+
+    schema = pa.schema([
+        pa.field("uuid", pa.string()),
+        pa.field("vector", pa.list_(pa.float32(), DIM)),
+        pa.field("payload", pa.string()),
+    ])
+    db = lancedb.connect(path)
+    db.create_table("Legacy", data=pa.Table.from_pylist(rows, schema=schema))
+
+
+def test_legacy_payload_table_is_migrated_on_open(tmp_path):
+    path = str(tmp_path / "lance")
+    _write_legacy_table(path, [
+        {"uuid": f"u{i}", "vector": [1.0, 0.0, 0.0, float(i)], "payload": json.dumps(_span(i))}
+        for i in range(3)
+    ])
+
+    store = LanceVectorStore(db_path=path, vector_dim=DIM)
+    recs = store.query("Legacy", filters={"status": "SUCCESS"}, sort_by="trace_id", sort_ascending=True)
+    assert [r.uuid for r in recs] == ["u1", "u2"]
+    assert recs[0].properties == _span(1)
+    assert "function_name" in store._open("Legacy").schema.names
+    assert store.migrate_collection("Legacy") == 0
+
+
+def test_legacy_table_readable_without_migration(tmp_path):
+    path = str(tmp_path / "lance")
+    _write_legacy_table(path, [{"uuid": "u0", "vector": [1.0] * DIM, "payload": json.dumps(_span(0))}])
+
+    store = LanceVectorStore(db_path=path, vector_dim=DIM, auto_migrate=False)
+    store.insert("Legacy", _span(1), uuid="u1", vector=[1.0] * DIM)
+
+    assert "function_name" not in store._open("Legacy").schema.names
+    recs = store.query("Legacy", filters={"trace_id": "t1"})
+    assert recs[0].properties == _span(1)
+
+
+# ---------------------------------------------------------------------------
+# Filter pushdown
+# ---------------------------------------------------------------------------
+
+def test_compile_filters_quotes_and_keeps_custom_props_residual():
+    from vectorwave.store.lance_store import _compile_filters
+
+    where, residual = _compile_filters(
+        {"status": "it's", "function_name": ["a", "b"], "duration_ms__lt": 5, "team": "core"},
+        TYPED_COLUMNS,
+    )
+    assert where == (
+        "status = 'it''s' AND function_name IN ('a', 'b') AND duration_ms < 5.0"
+    )
+    assert residual == {"team": "core"}
+
+    # Wrong-typed values can't be compared in SQL and stay in Python.
+    where, residual = _compile_filters({"duration_ms": "fast"}, TYPED_COLUMNS)
+    assert where is None and residual == {"duration_ms": "fast"}
+
+
+def test_pushdown_matches_python_semantics(store):
+    store.insert_many("Exec", [
+        {"properties": _span(i, error_code=code), "vector": [1.0, 0.0, 0.0, float(i)]}
+        for i, code in enumerate(["E_1", "E%2", None, "E_1x", "x'y", None])
+    ])
+    cases = [
+        {"error_code__like": "E_1"},
+        {"error_code__like": "%"},
+        {"error_code__not_equal": "E_1"},
+        {"error_code": None},
+        {"error_code": ["x'y", "E%2"]},
+        {"function_name": []},
+        {"timestamp_utc__gte": "2026-01-01T00:00:03", "status__not_equal": "ERROR"},
+        {"uuid": "nope"},
+    ]
+    from vectorwave.store.lance_store import _matches_filter
+    everything = store.query("Exec", limit=100)
+    for filters in cases:
+        expected = sorted(r.uuid for r in everything if _matches_filter(r.properties, filters))
+        got = sorted(r.uuid for r in store.query("Exec", filters=filters, limit=100))
+        assert got == expected, filters
+
+
+def test_pushdown_on_int_valued_fields(store):
+    # Int-valued rows must be visible to the SQL predicate, as they are to
+    # the Python filter.
+    store.insert_many("Exec", [
+        {"properties": _span(i, duration_ms=i), "vector": [1.0] * DIM} for i in range(30)
+    ])
+    from vectorwave.store.lance_store import _matches_filter
+    everything = store.query("Exec", limit=100)
+    filters = {"duration_ms__gte": 5}
+    expected = sorted(r.uuid for r in everything if _matches_filter(r.properties, filters))
+
+    assert len(expected) == 25
+    assert sorted(r.uuid for r in store.query("Exec", filters=filters, limit=100)) == expected
+    assert store.delete_by_filter("Exec", filters) == 25
+    assert len(store.query("Exec", limit=100)) == 5
+
+
+def test_selective_filter_does_not_starve_near_vector(store):
+    # 200 near rows for fn_a, a single far row for fn_b: a post-filter over the
+    # nearest max(limit*5, 50) rows would never reach fn_b.
+    items = [{"properties": {"function_name": "fn_a"}, "vector": [1.0, 0.0, 0.0, 0.0]} for _ in range(200)]
+    items.append({"properties": {"function_name": "fn_b", "team": "x"}, "vector": [0.0, 1.0, 0.0, 0.0]})
+    store.insert_many("Exec", items)
+
+    hits = store.near_vector("Exec", [1.0, 0.0, 0.0, 0.0], filters={"function_name": "fn_b"}, limit=3)
+    assert [h.properties["function_name"] for h in hits] == ["fn_b"]
+
+    # Residual (custom property) filters grow the fetch until satisfied.
+    hits = store.near_vector("Exec", [1.0, 0.0, 0.0, 0.0], filters={"team": "x"}, limit=1)
+    assert [h.properties["function_name"] for h in hits] == ["fn_b"]
+
+
+def test_delete_by_filter_pushdown_and_residual(store):
+    store.insert_many("Exec", [{"properties": _span(i), "vector": [1.0] * DIM} for i in range(6)])
+
+    assert store.delete_by_filter("Exec", {"function_name": "fn_0", "duration_ms__gt": 1.0}) == 2
+    assert store.delete_by_filter("Exec", {"team": "core", "status": "ERROR"}) == 2
+    assert sorted(r.properties["trace_id"] for r in store.query("Exec", limit=10)) == ["t1", "t5"]
+
+
+# ---------------------------------------------------------------------------
+# Index management
+# ---------------------------------------------------------------------------
+
+def _fill(store, n, collection="Exec"):
+    import random
+    rng = random.Random(7)
+    store.insert_many(collection, [
+        {"properties": _span(i), "vector": [rng.random() for _ in range(DIM)]} for i in range(n)
+    ])
+
+
+def test_indexes_are_built_once_thresholds_are_reached(tmp_path):
+    store = LanceVectorStore(db_path=str(tmp_path / "lance"), vector_dim=DIM,
+                             scalar_index_min_rows=500, vector_index_min_rows=None)
+    _fill(store, 100)
+    assert store.build_indexes("Exec") == []
+
+    _fill(store, 400)
+    built = store.build_indexes("Exec")
+    assert set(built) == {"uuid_idx", "function_name_idx", "status_idx", "timestamp_utc_idx", "trace_id_idx"}
+    types = {i["columns"][0]: i["type"] for i in store.inspect_indexes("Exec")}
+    assert types["status"].lower() == "bitmap"
+    assert types["timestamp_utc"].lower() == "btree"
+    # Queries keep working against indexed columns.
+    assert len(store.query("Exec", filters={"status": "ERROR"}, limit=1000)) == 168
+
+
+def test_vector_index_and_rebuild(tmp_path):
+    store = LanceVectorStore(db_path=str(tmp_path / "lance"), vector_dim=DIM,
+                             scalar_index_min_rows=None, vector_index_min_rows=None)
+    _fill(store, 300)
+    assert store.build_indexes("Exec", force=True)[-1] == "vector_idx"
+    assert "vector_idx" in [i["name"] for i in store.inspect_indexes("Exec")]
+    assert len(store.near_vector("Exec", [0.5] * DIM, filters={"function_name": "fn_1"}, limit=3)) == 3
+
+    assert len(store.build_indexes("Exec", rebuild=True)) == 6
+
+
+def test_thresholded_search_decides_the_same_with_the_vector_index(tmp_path):
+    np = pytest.importorskip("numpy")
+    dim, n = 64, 2000
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(n, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    store = LanceVectorStore(db_path=str(tmp_path / "lance"), vector_dim=dim,
+                             scalar_index_min_rows=None, vector_index_min_rows=None)
+    store.insert_many("Exec", [
+        {"properties": _span(i), "vector": v.tolist()} for i, v in enumerate(vectors)
+    ])
+    # Near-duplicates of stored rows, spread across both sides of the threshold.
+    queries = []
+    for i, noise in enumerate(np.linspace(0.2, 0.8, 40)):
+        q = vectors[i * 7] + rng.normal(size=dim) * noise / np.sqrt(dim)
+        queries.append((q / np.linalg.norm(q)).tolist())
+
+    def decisions():
+        return [
+            [round(r.certainty, 4) for r in store.near_vector("Exec", q, certainty=0.9)]
+            for q in queries
+        ]
+
+    exact = decisions()
+    assert 5 < sum(bool(hit) for hit in exact) < 35
+    assert store.build_indexes("Exec", force=True)[-1] == "vector_idx"
+    assert decisions() == exact
+
+
+def test_writes_trigger_background_index_check(tmp_path, monkeypatch):
+    import vectorwave.store.lance_store as lance_store
+
+    monkeypatch.setattr(lance_store, "INDEX_CHECK_EVERY_ROWS", 50)
+    store = LanceVectorStore(db_path=str(tmp_path / "lance"), vector_dim=DIM,
+                             scalar_index_min_rows=50, vector_index_min_rows=None)
+    calls = []
+    monkeypatch.setattr(store, "build_indexes", lambda c, **kw: calls.append(c))
+
+    _fill(store, 30)
+    assert calls == []
+    _fill(store, 30)
+    for t in __import__("threading").enumerate():
+        if t.name.startswith("VectorWaveLanceIndex_"):
+            t.join(5)
+    assert calls == ["Exec"]
+
+
+def test_index_cli_build_and_inspect(tmp_path, capsys):
+    from vectorwave.cli import main
+
+    path = str(tmp_path / "lance")
+    store = LanceVectorStore(db_path=path, vector_dim=DIM, scalar_index_min_rows=None, vector_index_min_rows=None)
+    _fill(store, 20)
+
+    assert main(["index", "build", "Exec", "--path", path]) == 0
+    assert "status_idx" in capsys.readouterr().out
+
+    assert main(["index", "inspect", "--path", path]) == 0
+    out = capsys.readouterr().out
+    assert "function_name_idx" in out and "Exec" in out
+
+    assert main(["index", "inspect", "Nope", "--path", path]) == 1
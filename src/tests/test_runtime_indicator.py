@@ -137,3 +137,24 @@ def test_quiet_env_silences_banner(tmp_path, monkeypatch, capsys):
     captured = capsys.readouterr()
     assert captured.err == ""
     rt.deactivate()
+
+
+def test_rust_core_api_version(monkeypatch):
+    import vectorwave.vectorwave_core as core
+    rt = _reload_runtime()
+
+    monkeypatch.setattr(core, "API_VERSION", rt.RUST_CORE_API_VERSION, raising=False)
+    assert rt.rust_core_is_stale() is False
+    monkeypatch.setattr(core, "API_VERSION", rt.RUST_CORE_API_VERSION - 1)
+    assert rt.rust_core_is_stale() is True
+
+
+def test_compiled_rust_core_is_current(require_rust_core):
+    import vectorwave.runtime as rt
+    if rt.rust_core_api_version() is None:
+        require_rust_core("vectorwave_core is not compiled")
+    if rt.rust_core_is_stale():
+        require_rust_core(
+            f"vectorwave_core API {rt.rust_core_api_version()} is older than "
+            f"{rt.RUST_CORE_API_VERSION}; rebuild it with 'maturin develop'"
+        )
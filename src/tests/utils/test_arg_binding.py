@@ -0,0 +1,64 @@
+import inspect
+
+import pytest
+
+from vectorwave.utils.arg_binding import BindingPlan
+
+
+def _reference(func, names, args, kwargs):
+    sig = inspect.signature(func)
+    bound = sig.bind(*args, **{k: v for k, v in kwargs.items() if k in sig.parameters})
+    bound.apply_defaults()
+    values = bound.arguments
+    return {n: values[n] if n in values else kwargs[n]
+            for n in dict.fromkeys(names) if n in values or (n not in sig.parameters and n in kwargs)}
+
+
+def target(a, b=2, /, c=3, *rest, d, e=5, **extra):
+    pass
+
+
+@pytest.mark.parametrize("args, kwargs", [
+    ((1, 10, 20, 30, 40), {"d": 4}),
+    ((1,), {"c": 7, "d": 4, "team": "ml"}),
+    ((1, 2), {"d": 4, "e": 6, "other": 0}),
+])
+def test_bind_matches_signature_bind(args, kwargs):
+    names = ["a", "b", "c", "rest", "d", "e", "extra", "team", "missing"]
+    plan = BindingPlan.for_function(target, names)
+
+    assert plan.bind(args, kwargs) == _reference(target, names, args, kwargs)
+
+
+def test_extras_from_kwargs_can_be_disabled():
+    plan = BindingPlan.for_function(target, ["c", "team"], extras_from_kwargs=False)
+
+    assert plan.bind((1,), {"d": 4, "team": "ml"}) == {"c": 3}
+
+
+@pytest.mark.parametrize("args, kwargs", [
+    ((), {"d": 4}),                   # missing positional
+    ((1,), {}),                       # missing keyword-only
+    ((1, 2, 3), {"c": 3, "d": 4}),    # duplicate
+])
+def test_bind_rejects_calls_that_do_not_fit(args, kwargs):
+    plan = BindingPlan.for_function(target, ["a"])
+
+    with pytest.raises(TypeError):
+        plan.bind(args, kwargs)
+
+
+def test_too_many_positional_arguments():
+    def f(x, y=1):
+        pass
+
+    with pytest.raises(TypeError):
+        BindingPlan.for_function(f, ["x"]).bind((1, 2, 3), {})
+
+
+def test_uninspectable_function_has_no_plan():
+    def f(x):
+        pass
+    f.__signature__ = "not a signature"
+
+    assert BindingPlan.for_function(f, ["x"]) is None
@@ -1,7 +1,10 @@
 import pytest
 import json
-from unittest.mock import patch, mock_open, ANY, MagicMock
-from vectorwave.utils.function_cache import FunctionCacheManager
+import multiprocessing
+import os
+import sqlite3
+from unittest.mock import patch
+from vectorwave.utils.function_cache import FunctionCacheManager, CACHE_DB_FILE_NAME, CACHE_FILE_NAME
 
 # --- 1. Tests for calculate_content_hash static method ---
 
@@ -49,48 +52,55 @@ def test_calculate_content_hash_order_invariance():
     assert hash1 == hash2
 
 
-# --- 2. Tests for __init__ and _load_cache ---
+# --- 2. Tests for __init__ and the legacy JSON import ---
 
-@patch("os.path.exists", return_value=False)
-def test_init_cache_file_not_found(mock_exists):
-    """Tests that self.cache is initialized as an empty dict ({}) when the cache file is not found."""
-    manager = FunctionCacheManager()
+def test_init_without_cache_files(tmp_path):
+    """Tests that the SQLite file is only created on first use."""
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
+    assert not (tmp_path / CACHE_DB_FILE_NAME).exists()
 
-    mock_exists.assert_called_once_with("./.vectorwave_functions_cache.json")
-    assert manager.cache == {}
+    assert manager.is_cached_and_unchanged("uuid_abc", "hash_123") == False
+    assert (tmp_path / CACHE_DB_FILE_NAME).exists()
 
-@patch("os.path.exists", return_value=True)
-@patch("builtins.open", new_callable=mock_open, read_data='{"uuid_abc": "hash_123"}')
-def test_init_cache_file_loaded(mock_file, mock_exists):
-    """Tests that the cache file is loaded successfully."""
-    manager = FunctionCacheManager()
 
-    mock_exists.assert_called_once_with("./.vectorwave_functions_cache.json")
-    mock_file.assert_called_once_with("./.vectorwave_functions_cache.json", 'r', encoding='utf-8')
-    assert manager.cache == {"uuid_abc": "hash_123"}
+def test_legacy_json_is_imported_on_first_load(tmp_path):
+    """Tests that both legacy entry formats are read from the old JSON file."""
+    legacy = {
+        "uuid_old": "hash_123",
+        "uuid_new": {"hash": "hash_456", "metadata": {"search_description": "desc"}},
+    }
+    (tmp_path / CACHE_FILE_NAME).write_text(json.dumps(legacy))
+
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
+
+    assert manager.is_cached_and_unchanged("uuid_old", "hash_123")
+    assert manager.get_cached_metadata("uuid_new", "hash_456") == {"search_description": "desc"}
+    assert json.loads((tmp_path / CACHE_FILE_NAME).read_text()) == legacy  # left in place
+
+    # Later loads keep the database's newer entries.
+    manager.update_cache("uuid_old", "hash_789")
+    reloaded = FunctionCacheManager(cache_dir=str(tmp_path))
+    assert reloaded.is_cached_and_unchanged("uuid_old", "hash_789")
+
 
-@patch("os.path.exists", return_value=True)
-@patch("builtins.open", new_callable=mock_open, read_data='{invalid_json')
 @patch("logging.Logger.warning") # Mock the logger
-def test_init_cache_invalid_json(mock_logger, mock_file, mock_exists):
-    """Tests that a warning is logged and cache is an empty dict ({}) if JSON parsing fails."""
-    manager = FunctionCacheManager()
+def test_invalid_legacy_json_is_skipped(mock_logger, tmp_path):
+    """Tests that a warning is logged and the cache starts empty if JSON parsing fails."""
+    (tmp_path / CACHE_FILE_NAME).write_text("{invalid_json")
+
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
 
-    assert manager.cache == {}
+    assert manager.is_cached_and_unchanged("uuid_abc", "hash_123") == False
     mock_logger.assert_called_once()
-    assert "Failed to load cache" in mock_logger.call_args[0][0]
+    assert "Failed to load legacy cache" in mock_logger.call_args[0][0]
 
 
 # --- 3. Tests for logic and saving ---
 
-@patch("os.path.exists", return_value=False)
-def test_is_cached_and_unchanged_logic(mock_exists):
+def test_is_cached_and_unchanged_logic(tmp_path):
     """Tests the True/False logic of is_cached_and_unchanged."""
-    manager = FunctionCacheManager()
-    manager.cache = {
-        "uuid_A": "hash_A_123",
-        "uuid_B": "hash_B_123"
-    }
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
+    manager.update_cache_many({"uuid_A": "hash_A_123", "uuid_B": "hash_B_123"})
 
     # 1. Cache Hit (Both UUID and hash match)
     assert manager.is_cached_and_unchanged("uuid_A", "hash_A_123") == True
@@ -101,27 +111,83 @@ def test_is_cached_and_unchanged_logic(mock_exists):
     # 3. Cache Miss (UUID does not exist)
     assert manager.is_cached_and_unchanged("uuid_C_NEW", "hash_C_123") == False
 
-@patch("os.path.exists", return_value=False)
-@patch("json.dump") # Mock json.dump
-@patch("builtins.open", new_callable=mock_open)
-def test_update_cache_calls_save(mock_file, mock_json_dump, mock_exists):
-    """Tests if update_cache updates self.cache and calls _save_cache."""
-    manager = FunctionCacheManager()
-    assert manager.cache == {}
 
+def test_updates_are_visible_to_other_managers(tmp_path):
+    """Tests that updates persist and metadata is only returned for the matching hash."""
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
     manager.update_cache("uuid_new", "hash_new_123")
+    manager.update_cache_with_metadata("uuid_meta", "hash_meta", {"sequence_narrative": "narr"})
+
+    other = FunctionCacheManager(cache_dir=str(tmp_path))
+    assert other.is_cached_and_unchanged("uuid_new", "hash_new_123")
+    assert other.get_cached_metadata("uuid_new", "hash_new_123") is None
+    assert other.get_cached_metadata("uuid_meta", "hash_meta") == {"sequence_narrative": "narr"}
+    assert other.get_cached_metadata("uuid_meta", "hash_changed") is None
+
+    other.clear()
+    assert not manager.is_cached_and_unchanged("uuid_new", "hash_new_123")
+
+
+def _write_entries(cache_dir, worker):
+    manager = FunctionCacheManager(cache_dir=cache_dir)
+    for i in range(50):
+        manager.update_cache(f"uuid_{worker}_{i}", f"hash_{i}")
+
+
+def test_concurrent_processes_share_the_cache(tmp_path):
+    """Tests that several processes writing to one directory lose no entries."""
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    workers = [ctx.Process(target=_write_entries, args=(str(tmp_path), w)) for w in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
+    assert all(manager.is_cached_and_unchanged(f"uuid_{w}_{i}", f"hash_{i}") for w in range(4) for i in range(50))
+
+
+def test_falls_back_to_memory_when_database_is_unavailable(tmp_path):
+    """Tests that the cache keeps working in memory if SQLite can't open the file."""
+    (tmp_path / CACHE_FILE_NAME).write_text(json.dumps({"uuid_old": "hash_123"}))
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
+
+    with patch.object(FunctionCacheManager, "_open", side_effect=sqlite3.OperationalError("unable to open database file")):
+        assert manager.is_cached_and_unchanged("uuid_old", "hash_123")
+    manager.update_cache("uuid_new", "hash_new")
+    assert manager.is_cached_and_unchanged("uuid_new", "hash_new")
+    assert not (tmp_path / CACHE_DB_FILE_NAME).exists()
+
+
+def test_locked_database_is_retried_not_abandoned(tmp_path, monkeypatch):
+    """Tests that a locked database buffers writes in memory and saves them once it opens."""
+    monkeypatch.setattr("vectorwave.utils.function_cache.OPEN_RETRY_DELAY_SECONDS", 0)
+    manager = FunctionCacheManager(cache_dir=str(tmp_path))
+    real_open = FunctionCacheManager._open
+
+    with patch.object(FunctionCacheManager, "_open", side_effect=sqlite3.OperationalError("database is locked")) as mock_open:
+        manager.update_cache("uuid_a", "hash_a")
+        assert manager.is_cached_and_unchanged("uuid_a", "hash_a")
+    assert mock_open.call_count > 1  # retried within a call, and again on the next call
+
+    with patch.object(FunctionCacheManager, "_open", side_effect=real_open):
+        manager.update_cache("uuid_b", "hash_b")
+
+    other = FunctionCacheManager(cache_dir=str(tmp_path))
+    assert other.is_cached_and_unchanged("uuid_a", "hash_a")
+    assert other.is_cached_and_unchanged("uuid_b", "hash_b")
+
 
-    # 1. Check if the internal cache was updated
-    expected_cache = {"uuid_new": {"hash": "hash_new_123", "metadata": None}}
-    assert manager.cache == expected_cache
+def test_import_creates_no_cache_file(tmp_path):
+    """Tests that importing vectorwave leaves the working directory untouched."""
+    import subprocess
+    import sys
+    import vectorwave
 
-    # 2. Check if _save_cache was called and attempted to write to the file
-    mock_file.assert_called_once_with("./.vectorwave_functions_cache.json", 'w', encoding='utf-8')
+    src = os.path.dirname(os.path.dirname(vectorwave.__file__))
+    env = dict(os.environ, PYTHONPATH=src, VECTORWAVE_QUIET="1", VECTORWAVE_RUN_DIR=str(tmp_path / "run"))
+    subprocess.run([sys.executable, "-c", "import vectorwave"], cwd=tmp_path, env=env, check=True, timeout=120)
 
-    # 3. Check if json.dump was called with the correct arguments (indent, sort_keys)
-    mock_json_dump.assert_called_once_with(
-        expected_cache, # 1. The updated cache
-        ANY, # 2. The mock_file handle
-        indent=4,
-        sort_keys=True
-    )
\ No newline at end of file
+    assert not (tmp_path / CACHE_DB_FILE_NAME).exists()
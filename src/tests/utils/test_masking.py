@@ -0,0 +1,62 @@
+import pytest
+
+from vectorwave.utils import masking
+from vectorwave.utils.masking import compile_masker, get_masker, key_pattern_regex
+from vectorwave.utils.serialization import encode_return_value
+
+
+@pytest.fixture(params=["core", "fallback"])
+def masker_impl(request, monkeypatch, require_rust_core):
+    if request.param == "core":
+        if masking._RustMasker is None:
+            require_rust_core("vectorwave_core predates Masker")
+    else:
+        monkeypatch.setattr(masking, "_RustMasker", None)
+    masking.compile_masker.cache_clear()
+    masking._settings_masker.cache_clear()
+    yield request.param
+    masking.compile_masker.cache_clear()
+    masking._settings_masker.cache_clear()
+
+
+def test_glob_and_regex_key_patterns(masker_impl):
+    masker = compile_masker(frozenset({"password"}), ("*_token", "re:^x-.*-key$"), ())
+
+    assert masker.is_sensitive("PASSWORD")
+    assert masker.is_sensitive("Refresh_Token")
+    assert masker.is_sensitive("x-api-key")
+    assert not masker.is_sensitive("token_count")
+    assert masker.mask({"auth_token": "abc", "nested": [{"X-Client-Key": 1, "n": 2}]}) == \
+        {"auth_token": "[MASKED]", "nested": [{"X-Client-Key": "[MASKED]", "n": 2}]}
+
+
+def test_value_patterns_redact_inside_strings(masker_impl):
+    masker = compile_masker(frozenset(), (), ("email", "bearer_token"))
+
+    masked = masker.mask({"note": "mail kim@example.com, header Bearer abc.def-123", "n": 1})
+
+    assert masked == {"note": "mail [MASKED], header [MASKED]", "n": 1}
+    assert encode_return_value(["ping lee@corp.io"], masker) == '["ping [MASKED]"]'
+
+
+def test_compiled_once_per_rule_set(masker_impl):
+    first = compile_masker(frozenset({"a", "b"}), ("*_key",), ())
+
+    assert compile_masker(frozenset({"b", "a"}), ("*_key",), ()) is first
+    assert compile_masker(frozenset({"a"}), ("*_key",), ()) is not first
+
+
+def test_invalid_setting_pattern_falls_back_to_key_names(masker_impl, caplog):
+    class _Settings:
+        sensitive_keys = {"secret"}
+        SENSITIVE_KEY_PATTERNS = ["re:(unclosed"]
+        SENSITIVE_VALUE_PATTERNS = []
+
+    masker = get_masker(_Settings)
+
+    assert masker.mask({"secret": 1, "x": 2}) == {"secret": "[MASKED]", "x": 2}
+    assert "Ignoring SENSITIVE_KEY_PATTERNS" in caplog.text
+
+
+def test_glob_escapes_regex_metacharacters():
+    assert key_pattern_regex("x.key*") == r"^x\.key.*$"
@@ -48,7 +48,7 @@ def mock_replay_deps(monkeypatch):
     monkeypatch.setattr("vectorwave.models.db_config.get_weaviate_settings", mock_get_settings)
 
     # 4. Patch batch manager for Decorator & Tracer
-    monkeypatch.setattr("vectorwave.core.decorator.get_batch_manager", mock_get_batch)
+    monkeypatch.setattr("vectorwave.core.registry.get_batch_manager", mock_get_batch)
     monkeypatch.setattr("vectorwave.monitoring.tracer.get_batch_manager", mock_get_batch)
 
     # 5. Patch search_executions in THIS test file
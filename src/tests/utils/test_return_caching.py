@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 import json
 import weaviate.classes.query as wvc_query
 from vectorwave.utils.return_caching_utils import _check_and_return_cached_result, CACHE_MISS
+from vectorwave.monitoring.tracer import pending_exact_store_var
+from vectorwave.utils.exact_cache import ExactMatchCache
 from vectorwave.models.db_config import WeaviateSettings
 
 
@@ -40,6 +42,9 @@ def mock_caching_utils_deps(monkeypatch):
     monkeypatch.setattr(f"{TARGET_MODULE}.get_weaviate_settings", mock_get_settings)
     monkeypatch.setattr(f"{TARGET_MODULE}.get_batch_manager", mock_get_batch)
     monkeypatch.setattr(f"{TARGET_MODULE}.get_vectorizer", mock_get_vectorizer)
+    # Fresh exact-match tier per test so hits don't leak between tests
+    exact_cache = ExactMatchCache()
+    monkeypatch.setattr(f"{TARGET_MODULE}.get_exact_cache", lambda: exact_cache)
 
     return {
         "batch_manager": mock_batch_manager,
@@ -77,6 +82,8 @@ def mock_caching_utils_deps_v2(monkeypatch):
     monkeypatch.setattr(f"{TARGET}.get_vector_store", mock_get_store)
     monkeypatch.setattr(f"{TARGET}.get_vectorizer", mock_get_vectorizer)
     monkeypatch.setattr(f"{TARGET}.get_batch_manager", mock_get_batch)
+    exact_cache = ExactMatchCache()
+    monkeypatch.setattr(f"{TARGET}.get_exact_cache", lambda: exact_cache)
 
     # Mock search_similar_execution (standard search fallback)
     mock_search_std = MagicMock(return_value=None)
@@ -86,6 +93,8 @@ def mock_caching_utils_deps_v2(monkeypatch):
         "store": mock_store,
         "search_std": mock_search_std,
         "batch": mock_batch,
+        "vectorizer": mock_vectorizer,
+        "exact_cache": exact_cache,
     }
 
 
@@ -112,7 +121,7 @@ def test_check_and_return_cached_result_cache_hit_logging(mock_caching_utils_dep
             with patch("vectorwave.utils.return_caching_utils.current_tracer_var") as mock_tracer_var:
                 with patch("vectorwave.utils.return_caching_utils.current_span_id_var") as mock_span_var:
                     mock_tracer_var.get.return_value = mock_caching_utils_deps["tracer_obj"]
-                    mock_span_var.get.return_value = "parent-span-123"
+                    mock_span_var.get.return_value = 0x2a
 
                     def dummy_func(a, b): pass
 
@@ -127,6 +136,12 @@ def test_check_and_return_cached_result_cache_hit_logging(mock_caching_utils_dep
 
     # Assert
     assert result == {"result": "cached_data"}
+    hit = mock_caching_utils_deps["batch_manager"].add_object.call_args.kwargs["properties"]
+    assert hit["status"] == "CACHE_HIT"
+    assert hit["parent_span_id"] == f"{0x2a:032x}"
+    # Same 32-hex counter ids as trace_span's spans, not uuid4 strings.
+    assert len(hit["span_id"]) == 32 and "-" not in hit["span_id"]
+    assert int(hit["span_id"], 16) != 0x2a
 
 
 def test_check_and_return_cached_result_cache_miss(mock_caching_utils_deps):
@@ -206,3 +221,72 @@ def test_cache_priority_golden_miss_fallback(mock_caching_utils_deps_v2):
     # Both should have been called
     deps["store"].near_vector.assert_called_once()
     deps["search_std"].assert_called_once()
+
+
+def test_exact_match_tier_skips_vectorizer_and_store(mock_caching_utils_deps_v2):
+    """
+    [Case 5] A repeated call with identical arguments is answered by the
+    exact-match tier: no embedding, no store lookup.
+    """
+    deps = mock_caching_utils_deps_v2
+    deps["search_std"].return_value = {
+        "return_value": '"StdResult"',
+        "metadata": {"distance": 0.1, "certainty": 0.9},
+        "uuid": "std-1"
+    }
+
+    call = dict(func=lambda q: None, args=("hello",), kwargs={}, function_name="test",
+                cache_threshold=0.9, is_async=False)
+    assert _check_and_return_cached_result(**call) == "StdResult"
+    assert _check_and_return_cached_result(**call) == "StdResult"
+
+    deps["vectorizer"].embed.assert_called_once()
+    deps["search_std"].assert_called_once()
+    # The exact hit is still logged as CACHE_HIT (without a vector)
+    last = deps["batch"].add_object.call_args.kwargs
+    assert last["properties"]["status"] == "CACHE_HIT"
+    assert last["vector"] is None
+
+    stats = deps["exact_cache"].stats()
+    assert stats["exact"]["hits"] == 1
+    assert stats["exact"]["misses"] == 1
+    assert stats["store"] == {"hits": 1, "misses": 0}
+
+
+def test_exact_match_tier_respects_filters(mock_caching_utils_deps_v2):
+    """
+    [Case 6] Same arguments under a different semantic_cache scope/filter
+    must not share an exact-match entry.
+    """
+    deps = mock_caching_utils_deps_v2
+    call = dict(func=lambda q: None, args=("hello",), kwargs={}, function_name="test",
+                cache_threshold=0.9, is_async=False)
+
+    # A miss hands its key to the span that computes the result; the span
+    # stores the return value it logs.
+    assert _check_and_return_cached_result(**call, filters={"user_id": "alice"},
+                                           remember_exact=True) is CACHE_MISS
+    exact_cache, key, function_name = pending_exact_store_var.get()
+    pending_exact_store_var.set(None)
+    assert exact_cache is deps["exact_cache"] and function_name == "test"
+    exact_cache.put(key, function_name, json.dumps({"answer": 1}))
+    deps["vectorizer"].embed.reset_mock()
+    assert _check_and_return_cached_result(**call, filters={"user_id": "alice"}) == {"answer": 1}
+    deps["vectorizer"].embed.assert_not_called()
+
+    assert _check_and_return_cached_result(**call, filters={"user_id": "bob"}) is CACHE_MISS
+    deps["vectorizer"].embed.assert_called_once()
+
+
+def test_exact_match_entries_expire_after_ttl():
+    cache = ExactMatchCache(max_entries=2, ttl_seconds=0.0)
+    cache.put("k", "fn", "1")
+    assert cache.get("k") == (False, None)
+
+    cache = ExactMatchCache(max_entries=2, ttl_seconds=60.0)
+    for key in ("a", "b", "c"):
+        cache.put(key, "fn", key)
+    assert cache.get("a") == (False, None)  # evicted (LRU)
+    assert cache.get("c") == (True, "c")
+    cache.invalidate("fn")
+    assert cache.stats()["exact"]["size"] == 0
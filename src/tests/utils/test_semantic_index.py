@@ -0,0 +1,180 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.store.base import StoreRecord
+from vectorwave.utils.return_caching_utils import _check_and_return_cached_result, CACHE_MISS
+from vectorwave.utils.semantic_index import LocalSemanticIndex
+
+SETTINGS = WeaviateSettings(
+    EXECUTION_COLLECTION_NAME="Executions",
+    GOLDEN_COLLECTION_NAME="GoldenData",
+)
+
+
+def _record(uuid, vector, **props):
+    props.setdefault("function_name", "lookup")
+    props.setdefault("status", "SUCCESS")
+    return StoreRecord(uuid=uuid, properties=props, vector=vector)
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    """Store mock whose query() serves executions / golden rows from dicts."""
+    store = MagicMock()
+    store.rows = {"Executions": [], "GoldenData": []}
+    store.collection_exists.return_value = True
+    store.query.side_effect = lambda collection, **kw: list(store.rows[collection])
+    monkeypatch.setattr("vectorwave.store.get_vector_store", lambda: store)
+    monkeypatch.setattr("vectorwave.utils.semantic_index.get_weaviate_settings", lambda: SETTINGS)
+    return store
+
+
+def test_warm_loads_vectors_from_store_and_answers_hits(fake_store):
+    fake_store.rows["Executions"] = [
+        _record("e1", [1.0, 0.0], return_value=json.dumps("east")),
+        _record("e2", [0.0, 1.0], return_value=json.dumps("north")),
+    ]
+    index = LocalSemanticIndex()
+
+    hit = index.search("lookup", [0.99, 0.05], threshold=0.95)
+    assert hit.uuid == "e1"
+    assert hit.return_value == json.dumps("east")
+    assert hit.is_golden is False
+    assert hit.certainty > 0.95
+
+    # Warmed once; second lookup never touches the store.
+    assert index.search("lookup", [0.0, 1.0], threshold=0.95).uuid == "e2"
+    assert fake_store.query.call_count == 2  # executions + golden, once
+    kwargs = fake_store.query.call_args_list[0].kwargs
+    assert kwargs["include_vector"] is True
+    assert kwargs["filters"] == {"function_name": "lookup", "status": "SUCCESS"}
+
+
+def test_miss_below_threshold_is_authoritative(fake_store):
+    fake_store.rows["Executions"] = [_record("e1", [1.0, 0.0], return_value="1")]
+    index = LocalSemanticIndex()
+
+    assert index.search("lookup", [0.0, 1.0], threshold=0.9) is None
+    assert index.stats()["misses"] == 1
+
+
+def test_golden_entries_take_priority(fake_store):
+    fake_store.rows["Executions"] = [_record("e1", [1.0, 0.0], return_value="exec")]
+    fake_store.rows["GoldenData"] = [_record("g1", [0.98, 0.2], return_value="gold")]
+    index = LocalSemanticIndex()
+
+    hit = index.search("lookup", [1.0, 0.0], threshold=0.9)
+    assert hit.is_golden is True
+    assert hit.return_value == "gold"
+
+
+def test_filters_use_store_filter_grammar(fake_store):
+    fake_store.rows["Executions"] = [
+        _record("u1", [1.0, 0.0], user_id="alice", return_value="a"),
+        _record("u2", [1.0, 0.0], user_id="bob", return_value="b"),
+    ]
+    index = LocalSemanticIndex()
+
+    assert index.search("lookup", [1.0, 0.0], 0.9, filters={"user_id": "bob"}).uuid == "u2"
+    assert index.search("lookup", [1.0, 0.0], 0.9, filters={"user_id": "carol"}) is None
+    assert index.search("lookup", [1.0, 0.0], 0.9, filters={"user_id": ["alice", "x"]}).uuid == "u1"
+
+
+def test_add_execution_updates_warm_index_only(fake_store):
+    index = LocalSemanticIndex()
+    index.add_execution("lookup", "early", [1.0, 0.0], {"return_value": "x"})
+    assert index.stats()["functions"] == 0  # not warmed yet -> ignored
+
+    assert index.search("lookup", [1.0, 0.0], 0.9) is None  # warms (empty)
+    index.add_execution("lookup", "s1", [1.0, 0.0], {"return_value": "fresh"})
+    assert index.search("lookup", [1.0, 0.0], 0.9).return_value == "fresh"
+
+
+def test_truncated_index_falls_back_to_store(fake_store):
+    fake_store.rows["Executions"] = [
+        _record(f"e{i}", [1.0, float(i)], return_value=str(i)) for i in range(3)
+    ]
+    index = LocalSemanticIndex(max_rows=3)
+
+    # Page is full -> older rows may exist, so a local miss isn't trusted.
+    assert index.search("lookup", [-1.0, 0.0], 0.9) is NotImplemented
+    assert index.stats()["store_fallbacks"] == 1
+
+
+def test_ttl_expiry_rebuilds_from_store(fake_store):
+    index = LocalSemanticIndex(ttl_seconds=0.0)
+    index.search("lookup", [1.0, 0.0], 0.9)
+    index.search("lookup", [1.0, 0.0], 0.9)
+    assert index.stats()["rebuilds"] == 1
+
+
+def test_store_failure_falls_back(fake_store):
+    fake_store.query.side_effect = RuntimeError("store down")
+    index = LocalSemanticIndex()
+    assert index.search("lookup", [1.0, 0.0], 0.9) is NotImplemented
+
+
+@pytest.mark.parametrize("cos, threshold", [(0.85, 0.9), (0.95, 0.9), (0.55, 0.7), (0.75, 0.7)])
+def test_local_decision_matches_lance_store_at_same_threshold(tmp_path, monkeypatch, cos, threshold):
+    pytest.importorskip("lancedb")
+    from vectorwave.store.lance_store import LanceVectorStore
+
+    store = LanceVectorStore(db_path=str(tmp_path / "lance"), vector_dim=2)
+    sin = (1.0 - cos * cos) ** 0.5
+    store.insert("Executions", {"function_name": "lookup", "status": "SUCCESS", "return_value": "1"},
+                 vector=[cos, sin])
+    monkeypatch.setattr("vectorwave.store.get_vector_store", lambda: store)
+    monkeypatch.setattr("vectorwave.utils.semantic_index.get_weaviate_settings", lambda: SETTINGS)
+
+    remote = store.near_vector("Executions", [1.0, 0.0], certainty=threshold, limit=1)
+    local = LocalSemanticIndex().search("lookup", [1.0, 0.0], threshold)
+
+    assert (local is not None) == bool(remote)
+    if remote:
+        assert local.certainty == pytest.approx(remote[0].certainty, abs=1e-4)
+        assert local.distance == pytest.approx(remote[0].distance, abs=1e-4)
+
+
+def test_weaviate_scale_is_half_cosine(fake_store):
+    fake_store.backend_name = "weaviate"
+    fake_store.rows["Executions"] = [_record("e1", [0.85, (1 - 0.85 ** 2) ** 0.5], return_value="1")]
+    index = LocalSemanticIndex()
+
+    # cos 0.85 is certainty 0.925 on Weaviate's scale.
+    assert index.search("lookup", [1.0, 0.0], 0.9).certainty == pytest.approx(0.925)
+    assert index.search("lookup", [1.0, 0.0], 0.93) is None
+
+
+def test_cached_lookup_is_served_from_local_index(fake_store, monkeypatch):
+    fake_store.rows["Executions"] = [_record("e1", [1.0, 0.0], return_value=json.dumps({"v": 1}))]
+    index = LocalSemanticIndex()
+
+    vectorizer = MagicMock()
+    vectorizer.embed.return_value = [1.0, 0.0]
+    batch = MagicMock()
+    search_std = MagicMock()
+    remote_store = MagicMock()
+
+    TARGET = "vectorwave.utils.return_caching_utils"
+    monkeypatch.setattr(f"{TARGET}.get_weaviate_settings", lambda: SETTINGS)
+    monkeypatch.setattr(f"{TARGET}.get_vectorizer", lambda: vectorizer)
+    monkeypatch.setattr(f"{TARGET}.get_batch_manager", lambda: batch)
+    monkeypatch.setattr(f"{TARGET}.get_semantic_index", lambda: index)
+    monkeypatch.setattr(f"{TARGET}.search_similar_execution", search_std)
+    monkeypatch.setattr(f"{TARGET}.get_vector_store", lambda: remote_store)
+
+    def lookup(x):
+        return x
+
+    result = _check_and_return_cached_result(lookup, ("q",), {}, "lookup", 0.9, False)
+    assert result == {"v": 1}
+    remote_store.near_vector.assert_not_called()
+    search_std.assert_not_called()
+    assert batch.add_object.call_args.kwargs["properties"]["status"] == "CACHE_HIT"
+
+    vectorizer.embed.return_value = [0.0, 1.0]
+    assert _check_and_return_cached_result(lookup, ("other",), {}, "lookup", 0.9, False) is CACHE_MISS
+    remote_store.near_vector.assert_not_called()
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from vectorwave.utils import masking
+from vectorwave.utils.serialization import (
+    MAX_DEPTH_MARKER,
+    TRUNCATED_SUFFIX,
+    CaptureLimits,
+    deserialize_return_value,
+    encode_return_value,
+    mask_value,
+)
+
+
+@pytest.fixture(params=["core", "fallback"])
+def encoder_path(request, monkeypatch, require_rust_core):
+    if request.param == "core":
+        if masking._RustMasker is None:
+            require_rust_core("vectorwave_core predates Masker")
+    else:
+        monkeypatch.setattr(masking, "_RustMasker", None)
+        monkeypatch.setattr(masking, "_rust_mask_and_encode", None)
+        monkeypatch.setattr(masking, "_RUST_LIMITS", False)
+    masking.compile_masker.cache_clear()
+    yield request.param
+    masking.compile_masker.cache_clear()
+
+
+class _Opaque:
+    def __str__(self):
+        return "opaque!"
+
+
+def test_masks_and_encodes_compact_json(encoder_path):
+    value = {"user": "kim", "Password": "hunter2", "items": [1, 2.5, None, True, _Opaque()], "이름": "값"}
+
+    text = encode_return_value(value, {"password"})
+
+    assert text == '{"user":"kim","Password":"[MASKED]","items":[1,2.5,null,true,"opaque!"],"이름":"값"}'
+    assert deserialize_return_value(text)["Password"] == "[MASKED]"
+
+
+def test_matches_mask_and_serialize_then_json_dumps(encoder_path):
+    from vectorwave.vectorwave_core import mask_and_serialize
+
+    value = {"a": [{"token": "x", "b": (1, 2)}, float("inf"), 10 ** 30], "k": {"nested": {"deep": "y"}}}
+    expected = json.loads(json.dumps(mask_and_serialize(value, ["token"])))
+
+    assert json.loads(encode_return_value(value, ["token"])) == expected
+
+
+def test_depth_limit_replaces_nested_containers(encoder_path):
+    value = {"a": {"b": {"c": [1]}}, "flat": 1}
+
+    assert json.loads(encode_return_value(value, [], CaptureLimits(max_depth=2))) == {"a": {"b": MAX_DEPTH_MARKER}, "flat": 1}
+
+
+def test_size_limit_stores_a_marked_prefix(encoder_path):
+    text = encode_return_value(list(range(10_000)), [], CaptureLimits(max_bytes=64))
+
+    stored = json.loads(text)
+    assert isinstance(stored, str) and stored.endswith(TRUNCATED_SUFFIX)
+    assert stored.startswith("[0,1,2,3")
+    assert len(stored.encode("utf-8")) <= 64 + len(TRUNCATED_SUFFIX)
+    assert encode_return_value([1, 2], [], CaptureLimits(max_bytes=64)) == "[1,2]"
+
+
+def test_item_and_string_limits_leave_markers(encoder_path):
+    value = {"rows": list(range(10)), "note": "x" * 50, "k1": 1, "k2": 2}
+    limits = CaptureLimits(max_list_items=3, max_string_length=5)
+
+    assert mask_value(value, [], limits) == {
+        "rows": [0, 1, 2, "...[7 more items]"],
+        "note": "xxxxx" + TRUNCATED_SUFFIX,
+        "k1": 1,
+        "...": "...[1 more items]",
+    }
+    assert json.loads(encode_return_value(value, [], limits)) == mask_value(value, [], limits)
+
+
+def test_large_bytes_and_arrays_are_summarized(encoder_path):
+    np = pytest.importorskip("numpy")
+    limits = CaptureLimits(max_list_items=100, max_string_length=16)
+
+    assert mask_value([b"\x00" * 1000, b"ok"], [], limits) == ["<bytes len=1000>", "b'ok'"]
+    assert mask_value(np.zeros((200, 3), dtype=np.float32), [], limits) == \
+        "<ndarray shape=(200, 3) dtype=float32>"
+    assert mask_value(np.arange(3), [], limits) == "[0 1 2]"
+
+
+def test_from_settings_applies_decorator_overrides():
+    class _Settings:
+        CAPTURE_MAX_DEPTH = 4
+        CAPTURE_MAX_BYTES = None
+        CAPTURE_MAX_LIST_ITEMS = 1000
+        CAPTURE_MAX_STRING_LENGTH = None
+
+    limits = CaptureLimits.from_settings(_Settings, {"max_list_items": 10, "max_bytes": 2048})
+
+    assert limits == CaptureLimits(max_depth=4, max_bytes=2048, max_list_items=10)
+    assert not CaptureLimits().active
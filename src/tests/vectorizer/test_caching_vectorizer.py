@@ -0,0 +1,97 @@
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.vectorizer.base import BaseVectorizer
+from vectorwave.vectorizer.caching_vectorizer import CachingVectorizer
+
+
+class CountingVectorizer(BaseVectorizer):
+    def __init__(self):
+        self.embed_calls = []
+        self.batch_calls = []
+
+    def embed(self, text):
+        self.embed_calls.append(text)
+        return [float(len(text)), 0.5]
+
+    def embed_batch(self, texts):
+        self.batch_calls.append(list(texts))
+        return [[float(len(t)), 0.5] if t != "fail" else [] for t in texts]
+
+
+def test_repeated_text_hits_memory_tier():
+    inner = CountingVectorizer()
+    vec = CachingVectorizer(inner, model_name="m")
+
+    assert vec.embed("hello") == [5.0, 0.5]
+    assert vec.embed("hello") == [5.0, 0.5]
+    assert inner.embed_calls == ["hello"]
+
+    stats = vec.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_batch_only_embeds_unseen_and_deduplicated_texts():
+    inner = CountingVectorizer()
+    vec = CachingVectorizer(inner, model_name="m")
+    vec.embed("a")
+
+    result = vec.embed_batch(["a", "bb", "bb", "fail", "ccc"])
+    assert result == [[1.0, 0.5], [2.0, 0.5], [2.0, 0.5], [], [3.0, 0.5]]
+    assert inner.batch_calls == [["bb", "fail", "ccc"]]
+
+    # Failed (empty) embeddings are not cached.
+    vec.embed_batch(["fail", "bb"])
+    assert inner.batch_calls[-1] == ["fail"]
+
+
+def test_model_name_is_part_of_the_key():
+    inner = CountingVectorizer()
+    a = CachingVectorizer(inner, model_name="model-a")
+    b = CachingVectorizer(inner, model_name="model-b")
+    assert a._key("x") != b._key("x")
+
+
+def test_lru_evicts_least_recently_used():
+    inner = CountingVectorizer()
+    vec = CachingVectorizer(inner, model_name="m", max_entries=2)
+    vec.embed("a")
+    vec.embed("b")
+    vec.embed("a")  # refresh "a"
+    vec.embed("c")  # evicts "b"
+    vec.embed("a")
+    vec.embed("b")
+    assert inner.embed_calls == ["a", "b", "c", "b"]
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.sqlite")
+    first = CountingVectorizer()
+    CachingVectorizer(first, model_name="m", disk_path=path).embed_batch(["alpha", "beta"])
+
+    second = CountingVectorizer()
+    vec = CachingVectorizer(second, model_name="m", disk_path=path)
+    assert vec.embed("alpha") == [5.0, 0.5]
+    assert vec.embed_batch(["beta", "gamma"]) == [[4.0, 0.5], [5.0, 0.5]]
+    assert second.embed_calls == []
+    assert second.batch_calls == [["gamma"]]
+    assert vec.stats()["disk_hits"] == 2
+
+
+def test_factory_wraps_vectorizer_when_enabled(monkeypatch):
+    from vectorwave.vectorizer import factory
+
+    inner = CountingVectorizer()
+    inner.model = "text-embedding-3-small"
+    monkeypatch.setattr(factory, "_create_vectorizer", lambda settings: inner)
+
+    monkeypatch.setattr(factory, "get_weaviate_settings", lambda: WeaviateSettings(VECTORIZER="openai_client"))
+    factory.get_vectorizer.cache_clear()
+    vec = factory.get_vectorizer()
+    assert isinstance(vec, CachingVectorizer)
+    assert vec.inner is inner
+    assert vec.model_name == "CountingVectorizer:text-embedding-3-small"
+
+    monkeypatch.setattr(factory, "get_weaviate_settings", lambda: WeaviateSettings(EMBEDDING_CACHE=False))
+    factory.get_vectorizer.cache_clear()
+    assert factory.get_vectorizer() is inner
+    factory.get_vectorizer.cache_clear()
@@ -9,6 +9,7 @@ from .database.db_search import search_functions, search_executions, search_erro
 from .monitoring.tracer import trace_span
 from .search.rag_search import search_and_answer, analyze_trace_log
 from .core.generator import generate_and_register_metadata
+from .core.registry import flush_registrations
 from .utils.healer import VectorWaveHealer
 from .utils.replayer import VectorWaveReplayer
 from .utils.replayer_semantic import SemanticReplayer
@@ -26,6 +27,7 @@ __all__ = [
     'search_and_answer',
     'analyze_trace_log',
     'generate_and_register_metadata',
+    'flush_registrations',
     'VectorWaveHealer',
     'VectorWaveReplayer',
     'SemanticReplayer',
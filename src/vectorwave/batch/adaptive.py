@@ -0,0 +1,120 @@
+"""Adaptive flush batch size (``BATCH_ADAPTIVE=true``).
+
+Each flush worker feeds its flush timings to an ``AdaptiveBatchSizer``,
+which retunes the worker's batch threshold once per window of flushes:
+
+- shrink by half when the window's p95 flush time exceeds
+  ``target_p95_seconds`` or its error rate exceeds ``max_error_rate``,
+- otherwise, if most flushes in the window were full batches (so traffic
+  isn't the limit), keep moving the size (a quarter up, a fifth down) in
+  the direction that last lowered the time per item, reverse when the time
+  per item got worse, and hold once it is flat. Sizing starts by growing,
+  and again after every back-off.
+
+The size always stays within ``[min_size, max_size]``.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Dict, List, Optional
+
+# Flushes observed before each decision.
+WINDOW = 8
+# Relative change in time-per-item treated as noise.
+TOLERANCE = 0.05
+
+
+class AdaptiveBatchSizer:
+    """Picks a batch size from observed flush latency and failures."""
+
+    def __init__(
+        self,
+        initial: int,
+        min_size: int = 10,
+        max_size: int = 1000,
+        target_p95_seconds: float = 1.0,
+        max_error_rate: float = 0.05,
+        window: int = WINDOW,
+    ):
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.target_p95_seconds = target_p95_seconds
+        self.max_error_rate = max_error_rate
+        self.window = max(1, window)
+        self._size = min(self.max_size, max(self.min_size, initial))
+        self._lock = threading.Lock()
+        self._samples: List[tuple] = []
+        self._last_per_item: Optional[float] = None
+        self._grew = True
+        self._last_p95 = 0.0
+        self._last_error_rate = 0.0
+        self._adjustments = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def record(self, items: int, seconds: float, ok: bool) -> Optional[int]:
+        """Records one flush. Returns the new size if this flush closed a
+        window that changed it, else None."""
+        if items <= 0:
+            return None
+        with self._lock:
+            self._samples.append((items, seconds, ok))
+            if len(self._samples) < self.window:
+                return None
+            samples, self._samples = self._samples, []
+            new_size = self._decide(samples)
+            if new_size == self._size:
+                return None
+            self._size = new_size
+            self._adjustments += 1
+            return new_size
+
+    def _decide(self, samples: List[tuple]) -> int:
+        durations = sorted(seconds for _, seconds, _ in samples)
+        p95 = durations[min(len(durations) - 1, math.ceil(0.95 * len(durations)) - 1)]
+        error_rate = sum(1 for _, _, ok in samples if not ok) / len(samples)
+        self._last_p95, self._last_error_rate = p95, error_rate
+        size = self._size
+
+        if p95 > self.target_p95_seconds or error_rate > self.max_error_rate:
+            # Overloaded: back off hard and re-measure from scratch.
+            self._last_per_item = None
+            return max(self.min_size, size // 2)
+
+        succeeded = [(items, seconds) for items, seconds, ok in samples if ok]
+        full = sum(1 for items, _ in succeeded if items >= size)
+        if not succeeded or full * 2 < len(samples):
+            # Flushes are interval-driven; the size isn't what limits throughput.
+            return size
+        per_item = sum(seconds for _, seconds in succeeded) / sum(items for items, _ in succeeded)
+        previous, self._last_per_item = self._last_per_item, per_item
+
+        if previous is None:
+            # First clean window (at start or after a back-off): probe upward.
+            self._grew = True
+        elif per_item > previous * (1 + TOLERANCE):
+            # Worse than before the last move: undo it.
+            self._grew = not self._grew
+        elif per_item >= previous * (1 - TOLERANCE):
+            return size
+        return self._grow(size) if self._grew else self._shrink(size)
+
+    def _grow(self, size: int) -> int:
+        return min(self.max_size, max(size + 1, int(size * 1.25)))
+
+    def _shrink(self, size: int) -> int:
+        return max(self.min_size, int(size * 0.8))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batch_size": self._size,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "last_p95_seconds": self._last_p95,
+                "last_error_rate": self._last_error_rate,
+                "adjustments": self._adjustments,
+            }
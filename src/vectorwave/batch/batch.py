@@ -1,15 +1,20 @@
 import os
 import weaviate
 import atexit
+import itertools
 import logging
 import threading
 import queue
 import time
-from functools import lru_cache
+import zlib
+from functools import lru_cache, partial
 from typing import Optional, List, Dict, Any
 
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 from ..database.db import get_weaviate_client
+from .adaptive import AdaptiveBatchSizer
+from .retry import JsonlDeadLetterSink, RetryScheduler, WriteResult, log_dead_letter
+from .spill import SpillLog
 
 # Rust Core 모듈 Import 시도
 
@@ -22,6 +27,78 @@ try:
 except ImportError:
     USE_RUST_CORE = False
 
+# What add_object does when the queue is full: drop the item, wait up to
+# BATCH_QUEUE_BLOCK_TIMEOUT_SECONDS for room, or hand it to the spill path.
+OVERFLOW_POLICIES = ("drop", "block", "spill")
+
+# How add_object picks one of the BATCH_FLUSH_WORKERS shards. "trace_id"
+# spreads a single busy collection over every worker while keeping a
+# trace's spans together; spans without one fall back to the collection.
+SHARD_KEYS = ("collection", "trace_id")
+
+
+class _BackendUnavailable(Exception):
+    """Raised by a write when neither Weaviate nor the Lite store is reachable."""
+
+
+class _FlushShard:
+    """One flush worker: its own queue (Rust channel or ``queue.Queue``),
+    threshold, interval and capacity, i.e. how many items it may hold in
+    flight before the overflow policy applies."""
+
+    def __init__(self, name: str, batch_threshold: int, flush_interval: float, capacity: int):
+        self.name = name
+        self.batch_threshold = max(1, int(batch_threshold))
+        self.flush_interval = float(flush_interval)
+        self.capacity = max(1, int(capacity))
+        self.rust_manager = None
+        self.queue: Optional[queue.Queue] = None
+        self.thread: Optional[threading.Thread] = None
+        self.sizer: Optional[AdaptiveBatchSizer] = None
+
+    def describe(self) -> Dict[str, Any]:
+        info = {
+            "name": self.name,
+            "batch_threshold": self.batch_threshold,
+            "flush_interval_seconds": self.flush_interval,
+            "capacity": self.capacity,
+        }
+        if self.sizer is not None:
+            info["adaptive"] = self.sizer.stats()
+        return info
+
+
+def _batch_len(batch) -> int:
+    if isinstance(batch, dict):
+        return len(batch["collection"])
+    return len(batch)
+
+
+def _columnar_items(batch) -> List[Dict[str, Any]]:
+    """Expands a columnar flush payload from the Rust core into item dicts.
+
+    In Lite mode the core hands over ``{"collection": [...], "properties":
+    [...], "uuid": [...], "vector_data": bytes, "vector_dims": [...]}``, where
+    ``vector_data`` packs every vector as native float32 and item ``i`` owns
+    ``vector_dims[i]`` of them. Only the spill / retry paths need it per item.
+    """
+    if not isinstance(batch, dict):
+        return batch
+    flat = memoryview(batch["vector_data"]).cast("f")
+    items = []
+    offset = 0
+    for collection, properties, uuid, dim in zip(
+            batch["collection"], batch["properties"], batch["uuid"], batch["vector_dims"]):
+        items.append({
+            "collection": collection,
+            "properties": properties,
+            "uuid": uuid,
+            "vector": flat[offset:offset + dim].tolist() if dim else None,
+        })
+        offset += dim
+    return items
+
+
 class WeaviateBatchManager:
     """
     Manages Weaviate batch imports.
@@ -49,28 +126,155 @@ class WeaviateBatchManager:
         # Batch Configuration
         self.batch_threshold = self.settings.BATCH_THRESHOLD
         self.flush_interval = self.settings.FLUSH_INTERVAL_SECONDS
+        self.queue_capacity = max(1, self.settings.BATCH_QUEUE_SIZE)
+        self.block_timeout = self.settings.BATCH_QUEUE_BLOCK_TIMEOUT_SECONDS
+        self.overflow_policy = self.settings.BATCH_QUEUE_OVERFLOW_POLICY.lower()
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            logger.warning(
+                "Unknown BATCH_QUEUE_OVERFLOW_POLICY '%s'. Falling back to 'drop'.", self.overflow_policy
+            )
+            self.overflow_policy = "drop"
+        self.shard_key = self.settings.BATCH_SHARD_KEY.lower()
+        if self.shard_key not in SHARD_KEYS:
+            logger.warning("Unknown BATCH_SHARD_KEY '%s'. Falling back to 'collection'.", self.shard_key)
+            self.shard_key = "collection"
+
+        # Flush workers: BATCH_FLUSH_WORKERS hashed shards, plus one dedicated
+        # worker per BATCH_COLLECTION_WORKERS entry so a slow collection
+        # can't hold up the others.
+        self._shards: List[_FlushShard] = [
+            _FlushShard(f"worker-{i}", self.batch_threshold, self.flush_interval, self.queue_capacity)
+            for i in range(max(1, self.settings.BATCH_FLUSH_WORKERS))
+        ]
+        self._dedicated: Dict[str, _FlushShard] = {
+            collection: _FlushShard(
+                collection,
+                cfg.get("batch_threshold", self.batch_threshold),
+                cfg.get("flush_interval_seconds", self.flush_interval),
+                cfg.get("queue_size", self.queue_capacity),
+            )
+            for collection, cfg in (self.settings.BATCH_COLLECTION_WORKERS or {}).items()
+        }
+        self._all_shards: List[_FlushShard] = self._shards + list(self._dedicated.values())
+        if self.settings.BATCH_ADAPTIVE:
+            for shard in self._all_shards:
+                shard.sizer = AdaptiveBatchSizer(
+                    shard.batch_threshold,
+                    min_size=self.settings.BATCH_ADAPTIVE_MIN_SIZE,
+                    max_size=self.settings.BATCH_ADAPTIVE_MAX_SIZE,
+                    target_p95_seconds=self.settings.BATCH_ADAPTIVE_TARGET_P95_SECONDS,
+                    max_error_rate=self.settings.BATCH_ADAPTIVE_MAX_ERROR_RATE,
+                )
+                shard.batch_threshold = shard.sizer.size
+        # With one worker every write shares client.batch under _flush_lock;
+        # with several they write concurrently through per-collection contexts.
+        self._concurrent_writes = len(self._all_shards) > 1
+
+        # Python-path counters; the Rust core keeps its own atomics.
+        self._stats_lock = threading.Lock()
+        self._flush_lock = threading.RLock()
+        self._enqueued = 0
+        self._dropped = 0
+        self._spilled = 0
+        self._flushed = 0
+        self._flush_batches = 0
+        self._flush_failures = 0
+        # Drops seen by add_object on either path; next() on a count is
+        # atomic under the GIL, so the warning needs no lock or stats() walk.
+        self._drop_count = itertools.count(1)
+        self._last_flush_latency_ms = 0.0
+
+        # On-disk spill for batches that can't be written right now
+        self._spill: Optional[SpillLog] = self._open_spill()
+
+        # Failed writes are retried off the flush thread, then dead-lettered
+        dead_letter_path = self.settings.BATCH_DEAD_LETTER_PATH
+        self._retry = RetryScheduler(
+            write=self._retry_write,
+            dead_letter=JsonlDeadLetterSink(dead_letter_path) if dead_letter_path else log_dead_letter,
+            max_attempts=self.settings.BATCH_RETRY_MAX_ATTEMPTS,
+            base_delay=self.settings.BATCH_RETRY_BASE_DELAY_SECONDS,
+            max_delay=self.settings.BATCH_RETRY_MAX_DELAY_SECONDS,
+            max_pending=self.settings.BATCH_RETRY_MAX_PENDING,
+            overflow=self._spill.append if self._spill is not None else None,
+        )
 
         # Connect to DB
         self._connect_client()
 
         if USE_RUST_CORE:
-            logger.info(f"🚀 [VectorWave] Rust Core Activated! (Threshold: {self.batch_threshold}, Interval: {self.flush_interval}s)")
-            self._rust_manager = RustBatchManager(
-                self._flush_batch_core,
-                self.batch_threshold,
-                int(self.flush_interval * 1000) # ms 단위 변환
+            logger.info(
+                f"🚀 [VectorWave] Rust Core Activated! (Threshold: {self.batch_threshold}, "
+                f"Interval: {self.flush_interval}s, Workers: {len(self._all_shards)})"
             )
-            self._worker_thread = None
+            self._rust_stats = True
+            for shard in self._all_shards:
+                shard.rust_manager = self._new_rust_manager(shard)
         else:
             logger.warning("⚠️ [VectorWave] Rust Core not found. Using slower Python implementation.")
             # --- Legacy Python Implementation ---
-            self.queue = queue.Queue(maxsize=10000)
+            for shard in self._all_shards:
+                shard.queue = queue.Queue(maxsize=shard.capacity)
             self._stop_event = threading.Event()
             self._start_python_worker()
 
+        self._replay_stop = threading.Event()
+        self._replay_thread = None
+        if self._spill is not None:
+            self._replay_thread = threading.Thread(
+                target=self._spill_replay_loop, name="VectorWaveSpillReplay", daemon=True
+            )
+            self._replay_thread.start()
+
         # Register shutdown handler
         atexit.register(self.shutdown)
 
+    def _new_rust_manager(self, shard: _FlushShard):
+        # Adaptive workers time each flush on the Python side of the callback.
+        callback = self._flush_batch_core if shard.sizer is None else partial(self._timed_flush, shard)
+        manager = None
+        if self._rust_stats:
+            try:
+                manager = RustBatchManager(
+                    callback,
+                    shard.batch_threshold,
+                    int(shard.flush_interval * 1000), # ms 단위 변환
+                    capacity=shard.capacity,
+                    overflow_policy=self.overflow_policy,
+                    block_timeout_ms=int(self.block_timeout * 1000),
+                    spill_callback=self._spill_items,
+                    # Lite mode takes whole columns straight into Arrow.
+                    columnar=self._lite_mode,
+                )
+            except TypeError:
+                # Older vectorwave_core builds: fixed 10000-slot queue, silent drops.
+                logger.warning("vectorwave_core predates queue options; overflow policy and stats unavailable.")
+                self._rust_stats = False
+        if manager is None:
+            manager = RustBatchManager(
+                callback,
+                shard.batch_threshold,
+                int(shard.flush_interval * 1000)
+            )
+        if shard.sizer is not None and not hasattr(manager, "set_batch_threshold"):
+            logger.warning("vectorwave_core can't change its batch size; BATCH_ADAPTIVE has no effect.")
+            shard.sizer = None
+        return manager
+
+    def _open_spill(self) -> Optional[SpillLog]:
+        path = self.settings.BATCH_SPILL_PATH
+        if not path:
+            return None
+        try:
+            return SpillLog(
+                path,
+                max_segment_bytes=self.settings.BATCH_SPILL_MAX_SEGMENT_BYTES,
+                max_total_bytes=self.settings.BATCH_SPILL_MAX_BYTES,
+            )
+        except Exception as e:
+            logger.warning(f"Batch spill disabled, could not open '{path}': {e}")
+            return None
+
     def _connect_client(self):
         """Attempts to connect to the configured backend (Weaviate or Lite store)."""
         if self._lite_mode:
@@ -100,33 +304,225 @@ class WeaviateBatchManager:
             self._initialized = False
 
     def _start_python_worker(self):
-        """Starts the legacy Python background thread."""
-        self._worker_thread = threading.Thread(target=self._python_worker_loop, daemon=True)
-        self._worker_thread.start()
-
-    def add_object(self, collection: str, properties: dict, uuid: str = None, vector: Optional[List[float]] = None):
+        """Starts one legacy Python background thread per shard."""
+        for shard in self._all_shards:
+            shard.thread = threading.Thread(
+                target=self._python_worker_loop, args=(shard,),
+                name=f"VectorWaveFlush-{shard.name}", daemon=True,
+            )
+            shard.thread.start()
+
+    def _shard_for(self, collection: str, properties: Any) -> _FlushShard:
+        shard = self._dedicated.get(collection)
+        if shard is not None:
+            return shard
+        shards = self._shards
+        if len(shards) == 1:
+            return shards[0]
+        key = collection
+        if self.shard_key == "trace_id" and isinstance(properties, dict):
+            key = properties.get("trace_id") or collection
+        return shards[zlib.crc32(str(key).encode("utf-8")) % len(shards)]
+
+    def add_object(self, collection: str, properties: dict, uuid: str = None, vector: Optional[List[float]] = None) -> bool:
         """
         [Public API] Adds an object to the batch queue.
+
+        Returns False if the queue was full and the object was dropped
+        under the configured overflow policy.
         """
+        shard = self._shard_for(collection, properties)
         if USE_RUST_CORE:
+            # Older cores return None and never report a drop.
+            if shard.rust_manager.add_object(collection, properties, uuid, vector) is False:
+                self._warn_dropped(shard)
+                return False
+            return True
+
+        # Python Legacy Queue
+        item = {
+            "collection": collection,
+            "properties": properties,
+            "uuid": uuid,
+            "vector": vector
+        }
+        try:
+            if self.overflow_policy == "block":
+                shard.queue.put(item, timeout=self.block_timeout)
+            else:
+                shard.queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow_policy == "spill" and self._spill_items([item]):
+                with self._stats_lock:
+                    self._spilled += 1
+                return True
+            with self._stats_lock:
+                self._dropped += 1
+            self._warn_dropped(shard)
+            return False
+        with self._stats_lock:
+            self._enqueued += 1
+        return True
+
+    def write_objects(self, items: List[Dict[str, Any]]) -> bool:
+        """
+        [Public API] Writes ``items`` (dicts with ``collection``,
+        ``properties``, ``uuid``, ``vector``) in one bulk write on the
+        caller's thread, bypassing the queue. Anything not written goes to
+        the retry layer (or the spill file) like a failed flush.
 
-            self._rust_manager.add_object(collection, properties, uuid, vector)
-        else:
-            # Python Legacy Queue
-            item = {
-                "collection": collection,
-                "properties": properties,
-                "uuid": uuid,
-                "vector": vector
+        Returns False if any item wasn't written by this attempt.
+        """
+        return self._flush_batch_core(list(items))
+
+    def current_batch_size(self, collection: Optional[str] = None) -> int:
+        """The batch threshold the worker handling ``collection`` (the first
+        worker if omitted) currently flushes at. Changes over time when
+        ``BATCH_ADAPTIVE`` is on."""
+        if collection is None:
+            return self._shards[0].batch_threshold
+        return self._shard_for(collection, None).batch_threshold
+
+    def _timed_flush(self, shard: _FlushShard, items) -> bool:
+        started = time.perf_counter()
+        ok = self._flush_batch_core(items) is not False
+        self._record_flush(shard, _batch_len(items), time.perf_counter() - started, ok)
+        return ok
+
+    def _record_flush(self, shard: Optional[_FlushShard], items: int, seconds: float, ok: bool) -> None:
+        if shard is None or shard.sizer is None:
+            return
+        size = shard.sizer.record(items, seconds, ok)
+        if size is None:
+            return
+        logger.debug("Batch size for %s: %d -> %d", shard.name, shard.batch_threshold, size)
+        shard.batch_threshold = size
+        if shard.rust_manager is not None:
+            shard.rust_manager.set_batch_threshold(size)
+
+    def _spill_items(self, items: List[Dict[str, Any]]) -> bool:
+        """Overflow sink for the ``spill`` policy. Appends to the spill file
+        when ``BATCH_SPILL_PATH`` is set; otherwise writes the items inline
+        on the caller's thread, trading producer latency for not losing them."""
+        if self._spill is not None:
+            return self._spill.append(items)
+        # Whatever this write doesn't land is now owned by the retry layer.
+        self._flush_batch_core(items)
+        return True
+
+    def _warn_dropped(self, shard: _FlushShard):
+        dropped = next(self._drop_count)
+        # Warn on the 1st, 2nd, 4th, 8th, ... drop rather than once per span.
+        if dropped & (dropped - 1) == 0:
+            logger.warning(
+                "🚨 VectorWave Log Queue '%s' is FULL (capacity=%d, policy=%s). %d logs dropped so far.",
+                shard.name, shard.capacity, self.overflow_policy, dropped,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and enqueue / drop / flush counters for whichever
+        worker (Rust or Python) is active, summed over the flush workers,
+        with per-worker depth under ``"workers"``."""
+        extra = {"retry": self._retry.stats()}
+        if self._spill is not None:
+            extra["spill"] = self._spill.stats()
+        workers = [shard.describe() for shard in self._all_shards]
+        if USE_RUST_CORE:
+            if not self._rust_stats:
+                return {"worker": "rust", "capacity": 10000 * len(workers), "overflow_policy": "drop",
+                        "workers": workers, **extra}
+            totals: Dict[str, Any] = {}
+            for info, shard in zip(workers, self._all_shards):
+                shard_stats = shard.rust_manager.stats()
+                info["depth"] = shard_stats.get("depth", 0)
+                for key, value in shard_stats.items():
+                    if key == "batch_threshold":
+                        continue
+                    if key == "last_flush_latency_ms":
+                        totals[key] = max(totals.get(key, 0.0), value)
+                    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                        totals[key] = totals.get(key, 0) + value
+                    else:
+                        totals.setdefault(key, value)
+            return {"worker": "rust", **totals, "workers": workers, **extra}
+        for info, shard in zip(workers, self._all_shards):
+            info["depth"] = shard.queue.qsize()
+        with self._stats_lock:
+            return {
+                **extra,
+                "worker": "python",
+                "capacity": sum(shard.capacity for shard in self._all_shards),
+                "overflow_policy": self.overflow_policy,
+                "depth": sum(info["depth"] for info in workers),
+                "enqueued": self._enqueued,
+                "dropped": self._dropped,
+                "spilled": self._spilled,
+                "flushed": self._flushed,
+                "flush_batches": self._flush_batches,
+                "flush_failures": self._flush_failures,
+                "last_flush_latency_ms": self._last_flush_latency_ms,
+                "workers": workers,
             }
-            try:
-                self.queue.put_nowait(item)
-            except queue.Full:
-                logger.warning("🚨 VectorWave Log Queue is FULL. Dropping log.")
 
-    def _flush_batch_core(self, items: List[Dict[str, Any]]):
+    def _flush_batch_core(self, items) -> bool:
+        """
+        The flush callback handed to the Rust or Python worker. Makes a
+        single write attempt: the Rust worker holds the GIL while this runs,
+        so anything that fails is handed to the retry layer (or, if the
+        backend is unreachable, the spill file) instead of being retried
+        here. Returns False when any item wasn't written, which the workers
+        count as a flush failure.
+
+        ``items`` is a list of item dicts, or a columnar batch (see
+        ``_columnar_items``) from a Rust core running in Lite mode.
+        """
+        if not _batch_len(items):
+            return True
+        try:
+            failed, error = self._write_locked(items)
+        except _BackendUnavailable as e:
+            items = _columnar_items(items)
+            if self._spill is not None and self._spill.append(items):
+                logger.warning(f"Spilled {len(items)} unwritten log(s) to '{self._spill.directory}'.")
+                return False
+            failed, error = items, str(e)
+        except RuntimeError:
+            # Interpreter shutdown ("cannot schedule new futures ...").
+            return False
+        except Exception as e:
+            msg = str(e).lower()
+            if "shutdown" in msg or "closed" in msg:
+                return False
+            logger.error(f"❌ Batch Flush Error: {e}")
+            failed, error = _columnar_items(items), str(e)
+        if not failed:
+            return True
+        self._retry.submit(failed, error)
+        return False
+
+    def _write_locked(self, items: List[Dict[str, Any]]) -> WriteResult:
+        if self._concurrent_writes:
+            # Per-collection batch contexts; nothing shared between writers.
+            return self._write_batch(items)
+        # Serialized so a ``spill`` write on a caller's thread, a retry and a
+        # spill replay never share the Weaviate batch context with the worker.
+        with self._flush_lock:
+            return self._write_batch(items)
+
+    def _retry_write(self, items: List[Dict[str, Any]]) -> WriteResult:
+        """Write used by the retry layer; an unreachable backend moves the
+        items to the spill file rather than spending their attempts."""
+        try:
+            return self._write_locked(items)
+        except _BackendUnavailable as e:
+            if self._spill is not None and self._spill.append(items):
+                return [], None
+            return items, str(e)
+
+    def _write_batch(self, items: List[Dict[str, Any]]) -> WriteResult:
         """
-        The actual flush logic called by either Rust or Python worker.
+        The actual flush logic. Returns the items the backend rejected and
+        the first rejection message; raises if the whole batch failed.
 
         In Pro mode (default) this uses Weaviate's bulk batch.dynamic() context.
         In Lite mode it groups items by collection and calls
@@ -134,20 +530,22 @@ class WeaviateBatchManager:
         single-context bulk write, but per-collection batching is fine for the
         Lite use case.
         """
-        if not items:
-            return
+        if not _batch_len(items):
+            return [], None
 
         # 1. Check/Retry Connection
         if not self._initialized or (not self._lite_mode and not self.client):
             self._connect_client()
             if not self._initialized:
-                return
+                raise _BackendUnavailable("backend is not reachable")
 
         if self._lite_mode:
-            self._flush_via_store(items)
-            return
+            return self._flush_via_store(items)
 
         # 2. Send Batch via Weaviate Client (Pro mode)
+        items = _columnar_items(items)
+        if self._concurrent_writes:
+            return self._write_per_collection(items)
         try:
             # Weaviate v4 batch context
             with self.client.batch.dynamic() as batch:
@@ -158,62 +556,225 @@ class WeaviateBatchManager:
                         uuid=item.get('uuid'),
                         vector=item.get('vector')
                     )
-
-            if len(self.client.batch.failed_objects) > 0:
-                for failed in self.client.batch.failed_objects:
-                    logger.error(f"⚠️ Batch Item Failed: {failed.message}")
-
-        except RuntimeError:
-            return
         except Exception as e:
-            msg = str(e).lower()
-            if "shutdown" in msg or "closed" in msg:
-                return
-            logger.error(f"❌ Batch Flush Error: {e}")
-
-    def _flush_via_store(self, items: List[Dict[str, Any]]):
+            if not self._client_ready():
+                raise _BackendUnavailable(str(e)) from e
+            raise
+        return self._collect_failed(self.client.batch.failed_objects, len(items))
+
+    def _write_per_collection(self, items: List[Dict[str, Any]]) -> WriteResult:
+        """Pro-mode write used when several workers flush at once.
+        ``client.batch`` is a single context shared by the whole client, so
+        each collection is written through its own ``collection.batch``."""
+        by_collection: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            by_collection.setdefault(item["collection"], []).append(item)
+        failed_objects = []
+        for collection, group in by_collection.items():
+            batcher = self.client.collections.get(collection).batch
+            try:
+                with batcher.dynamic() as batch:
+                    for item in group:
+                        batch.add_object(
+                            properties=item['properties'],
+                            uuid=item.get('uuid'),
+                            vector=item.get('vector')
+                        )
+            except Exception as e:
+                if not self._client_ready():
+                    raise _BackendUnavailable(str(e)) from e
+                raise
+            failed_objects.extend(batcher.failed_objects)
+        return self._collect_failed(failed_objects, len(items))
+
+    def _collect_failed(self, failed_objects, attempted: int) -> WriteResult:
+        if not failed_objects:
+            return [], None
+        if len(failed_objects) >= attempted and not self._client_ready():
+            raise _BackendUnavailable(failed_objects[0].message)
+        for failed in failed_objects:
+            logger.error(f"⚠️ Batch Item Failed: {failed.message}")
+        return [self._failed_item(f) for f in failed_objects], failed_objects[0].message
+
+    def _client_ready(self) -> bool:
+        """Only consulted after a failure, to tell an outage from a rejection."""
+        try:
+            return bool(self.client.is_ready())
+        except Exception:
+            return False
+
+    @staticmethod
+    def _failed_item(failed) -> Dict[str, Any]:
+        obj = failed.object_
+        uuid = failed.original_uuid or obj.uuid
+        return {
+            "collection": obj.collection,
+            "properties": obj.properties,
+            "uuid": str(uuid) if uuid is not None else None,
+            "vector": obj.vector,
+        }
+
+    def _flush_via_store(self, items) -> WriteResult:
         """Lite-mode flush: route items through the VectorStore abstraction."""
         from ..store import get_vector_store
         try:
             store = get_vector_store()
         except Exception as e:
             logger.error(f"❌ Lite store unavailable: {e}")
-            return
+            raise _BackendUnavailable(str(e)) from e
+        if isinstance(items, dict):
+            return self._flush_columns_via_store(store, items)
         by_collection: Dict[str, List[Dict[str, Any]]] = {}
         for item in items:
-            by_collection.setdefault(item["collection"], []).append({
-                "properties": item["properties"],
-                "uuid": item.get("uuid"),
-                "vector": item.get("vector"),
-            })
-        for collection, batch in by_collection.items():
+            by_collection.setdefault(item["collection"], []).append(item)
+        failed: List[Dict[str, Any]] = []
+        error = None
+        for collection, group in by_collection.items():
             try:
                 # Lite stores create tables lazily, but ensure the schema exists
                 # so writes don't fail with "table not found".
                 if not store.collection_exists(collection):
                     store.ensure_collection(collection, properties=[])
-                store.insert_many(collection, batch)
+                store.insert_many(collection, [
+                    {"properties": i["properties"], "uuid": i.get("uuid"), "vector": i.get("vector")}
+                    for i in group
+                ])
+            except Exception as e:
+                logger.error(f"❌ Lite batch flush failed for '{collection}': {e}")
+                failed.extend(group)
+                error = error or str(e)
+        return failed, error
+
+    def _flush_columns_via_store(self, store, batch: Dict[str, Any]) -> WriteResult:
+        """Lite-mode flush of a columnar batch from the Rust core.
+
+        The packed vectors are viewed as an ``(n, dim)`` float32 array without
+        copying when every item carries a vector of the same dim (the normal
+        case) and go to ``insert_columns``, which wraps them as the Arrow
+        vector column. Stores without it get item dicts via ``insert_many``.
+        """
+        import numpy as np
+
+        dims = batch["vector_dims"]
+        n = len(dims)
+        flat = np.frombuffer(batch["vector_data"], dtype=np.float32)
+        uniform = n and dims[0] and all(d == dims[0] for d in dims)
+        matrix = flat.reshape(n, dims[0]) if uniform else None
+        offsets = None if uniform else np.concatenate(([0], np.cumsum(dims)))
+
+        by_collection: Dict[str, List[int]] = {}
+        for idx, collection in enumerate(batch["collection"]):
+            by_collection.setdefault(collection, []).append(idx)
+        insert_columns = getattr(store, "insert_columns", None)
+        failed: List[Dict[str, Any]] = []
+        error = None
+        for collection, idxs in by_collection.items():
+            try:
+                if not store.collection_exists(collection):
+                    store.ensure_collection(collection, properties=[])
+                properties = [batch["properties"][i] for i in idxs]
+                uuids = [batch["uuid"][i] for i in idxs]
+                if insert_columns is None:
+                    items = _columnar_items(batch)
+                    store.insert_many(collection, [
+                        {"properties": items[i]["properties"], "uuid": items[i]["uuid"],
+                         "vector": items[i]["vector"]}
+                        for i in idxs
+                    ])
+                    continue
+                if matrix is not None:
+                    vectors = matrix if len(idxs) == n else matrix[idxs]
+                else:
+                    # Mixed dims or missing vectors: pad into a fresh matrix.
+                    width = max(dims[i] for i in idxs)
+                    vectors = np.zeros((len(idxs), width), dtype=np.float32) if width else None
+                    for row, i in enumerate(idxs):
+                        if dims[i]:
+                            vectors[row, :dims[i]] = flat[offsets[i]:offsets[i + 1]]
+                insert_columns(collection, properties, vectors, uuids=uuids)
             except Exception as e:
                 logger.error(f"❌ Lite batch flush failed for '{collection}': {e}")
+                items = _columnar_items(batch)
+                failed.extend(items[i] for i in idxs)
+                error = error or str(e)
+        return failed, error
+
+    # --- Spill replay ---
+    def _spill_replay_loop(self):
+        # First pass runs immediately so a previous run's spill drains on start.
+        while True:
+            try:
+                self.replay_spill()
+            except Exception as e:
+                logger.error(f"❌ Spill replay failed: {e}")
+            if self._replay_stop.wait(self.settings.BATCH_SPILL_REPLAY_INTERVAL_SECONDS):
+                return
+
+    def replay_spill(self) -> int:
+        """Writes spilled batches back to the backend if it is reachable.
+        Returns the number of items replayed."""
+        if self._spill is None or not self._spill.pending():
+            return 0
+        if not self._initialized or (not self._lite_mode and not self.client):
+            self._connect_client()
+            if not self._initialized:
+                return 0
+
+        def _write(items: List[Dict[str, Any]]) -> bool:
+            try:
+                failed, error = self._write_locked(items)
+            except _BackendUnavailable:
+                return False  # stay in the spill until the next pass
+            except Exception as e:
+                failed, error = items, str(e)
+            # Rejected items leave the spill for the retry / dead-letter path
+            # so one bad batch can't block replay forever.
+            self._retry.submit(failed, error)
+            return True
+
+        replayed = self._spill.replay(_write)
+        if replayed:
+            logger.info(f"Replayed {replayed} spilled log(s) from '{self._spill.directory}'.")
+        return replayed
 
     # --- Legacy Python Worker Methods (Only used if Rust is missing) ---
-    def _python_worker_loop(self):
+    def _python_worker_loop(self, shard: _FlushShard):
         pending_items = []
         last_flush_time = time.time()
 
         while not self._stop_event.is_set():
             try:
-                item = self.queue.get(timeout=0.5)
+                item = shard.queue.get(timeout=0.5)
                 pending_items.append(item)
             except queue.Empty:
                 pass
 
             current_time = time.time()
-            if len(pending_items) >= self.batch_threshold or (pending_items and current_time - last_flush_time >= self.flush_interval):
-                self._flush_batch_core(pending_items)
+            if len(pending_items) >= shard.batch_threshold or (pending_items and current_time - last_flush_time >= shard.flush_interval):
+                self._python_flush(pending_items, shard)
                 pending_items = []
                 last_flush_time = current_time
 
+        if pending_items:
+            self._python_flush(pending_items, shard)
+
+    def _python_flush(self, items: List[Dict[str, Any]], shard: Optional[_FlushShard] = None):
+        started = time.perf_counter()
+        try:
+            ok = self._flush_batch_core(items) is not False
+        except Exception as e:
+            logger.error(f"❌ Batch Flush Error: {e}")
+            ok = False
+        elapsed = time.perf_counter() - started
+        self._record_flush(shard, len(items), elapsed, ok)
+        with self._stats_lock:
+            self._last_flush_latency_ms = elapsed * 1000.0
+            self._flush_batches += 1
+            if ok:
+                self._flushed += len(items)
+            else:
+                self._flush_failures += 1
+
     def shutdown(self):
         """Gracefully shuts down. Idempotent — repeated calls are no-ops, so the
         atexit handler firing after a test-time cache_clear cannot trigger a
@@ -223,22 +784,35 @@ class WeaviateBatchManager:
         self._shutdown_done = True
 
         if USE_RUST_CORE:
-            try:
-                self._rust_manager.shutdown()
-            except Exception as e:
-                logger.debug(f"Rust manager shutdown raised: {e}")
+            for shard in self._all_shards:
+                try:
+                    shard.rust_manager.shutdown()
+                except Exception as e:
+                    logger.debug(f"Rust manager shutdown raised: {e}")
         else:
             if not self._stop_event.is_set():
                 self._stop_event.set()
-                if self._worker_thread and self._worker_thread.is_alive():
-                    self._worker_thread.join(timeout=1.0)
+                for shard in self._all_shards:
+                    if shard.thread and shard.thread.is_alive():
+                        shard.thread.join(timeout=1.0)
 
                 # Flush remaining items
-                remaining = []
-                while not self.queue.empty():
-                    remaining.append(self.queue.get_nowait())
-                if remaining:
-                    self._flush_batch_core(remaining)
+                for shard in self._all_shards:
+                    remaining = []
+                    while not shard.queue.empty():
+                        remaining.append(shard.queue.get_nowait())
+                    if remaining:
+                        self._python_flush(remaining, shard)
+
+        # Waiting retries go to the spill file, or the dead-letter sink.
+        self._retry.shutdown()
+
+        # Anything the final flush couldn't write is in the spill by now.
+        self._replay_stop.set()
+        if self._replay_thread and self._replay_thread.is_alive():
+            self._replay_thread.join(timeout=1.0)
+        if self._spill is not None:
+            self._spill.close()
 
         # Close client
         if self.client:
@@ -254,4 +828,10 @@ def get_batch_manager(
         grpc_port: Optional[int] = None,
         api_key: Optional[str] = None
 ) -> WeaviateBatchManager:
-    return WeaviateBatchManager(host=host, port=port, grpc_port=grpc_port, api_key=api_key)
\ No newline at end of file
+    manager = WeaviateBatchManager(host=host, port=port, grpc_port=grpc_port, api_key=api_key)
+    try:
+        from ..runtime import register_stats_provider
+        register_stats_provider("batch_manager", manager.stats)
+    except Exception:
+        pass
+    return manager
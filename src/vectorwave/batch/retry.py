@@ -0,0 +1,262 @@
+"""Retry layer for batch writes the backend rejected.
+
+The flush callback runs on the Rust worker with the GIL held, so it makes a
+single write attempt and hands whatever failed (the whole batch on an
+exception, or just ``client.batch.failed_objects``) to ``RetryScheduler``.
+The scheduler's own thread re-submits them with bounded exponential backoff
+and jitter:
+
+- attempt ``n`` waits ``min(max_delay, base_delay * 2 ** (n - 1))`` scaled
+  by a random factor in ``[0.5, 1.0]``, so many processes retrying against
+  a recovering backend don't synchronise,
+- a batch rejected as too large (HTTP 413, gRPC message size) is split in
+  half and both halves are retried immediately, without spending an
+  attempt; a throttled one (HTTP 429, gRPC RESOURCE_EXHAUSTED) is retried
+  whole with the backoff above,
+- after ``max_attempts`` the items go to the dead-letter sink.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Items = List[Dict[str, Any]]
+# (items that still failed, error message)
+WriteResult = Tuple[Items, Optional[str]]
+
+# An HTTP 413 status as clients report it ("status code: 413", "HTTP/1.1 413",
+# "413 Payload Too Large"), and gRPC's message-size rejection. A bare "413"
+# is not enough: it turns up inside UUIDs and object ids in error text.
+_TOO_LARGE_PATTERN = re.compile(
+    r"\b(?:status(?:[ _]?code)?|http(?:/[\d.]+)?|code|error)\b[\s:=(]*413\b"
+    r"|\b413\s+(?:payload|request entity|content)\b"
+    r"|(?:payload|request entity|request|message|body|batch) (?:is )?too large"
+    r"|larger than max"
+    r"|exceeds the maximum",
+    re.IGNORECASE,
+)
+# Rate limiting: gRPC RESOURCE_EXHAUSTED (without a size complaint) and
+# HTTP 429. Retried with the usual backoff, never split.
+_THROTTLED_PATTERN = re.compile(
+    r"resource_exhausted|resource exhausted"
+    r"|\b(?:status(?:[ _]?code)?|http(?:/[\d.]+)?|code|error)\b[\s:=(]*429\b"
+    r"|too many requests|rate limit",
+    re.IGNORECASE,
+)
+
+
+def is_payload_too_large(error: Optional[str]) -> bool:
+    """True if ``error`` looks like an HTTP 413 / gRPC message-size rejection."""
+    return bool(error) and _TOO_LARGE_PATTERN.search(error) is not None
+
+
+def is_throttled(error: Optional[str]) -> bool:
+    """True if ``error`` is a rate-limit rejection rather than an oversized batch."""
+    return bool(error) and not is_payload_too_large(error) and _THROTTLED_PATTERN.search(error) is not None
+
+
+class JsonlDeadLetterSink:
+    """Appends given-up batches to a JSON Lines file, one batch per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, items: Items, error: Optional[str], attempts: int) -> None:
+        record = {
+            "failed_at": datetime.now(timezone.utc).isoformat(),
+            "attempts": attempts,
+            "error": error,
+            "items": items,
+        }
+        line = json.dumps(record, default=str, separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def log_dead_letter(items: Items, error: Optional[str], attempts: int) -> None:
+    """Default sink when no dead-letter file is configured: the items are lost."""
+    logger.error(f"❌ Giving up on {len(items)} log(s) after {attempts} attempt(s): {error}")
+
+
+class RetryScheduler:
+    """Background re-submission of failed batch items.
+
+    ``write`` performs one attempt and returns ``(failed_items, error)``;
+    raising counts as the whole batch failing. ``dead_letter`` receives
+    ``(items, error, attempts)``. At most ``max_pending`` items wait for a
+    retry; beyond that new failures go straight to ``overflow`` (if it
+    accepts them) or the dead-letter sink.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Items], WriteResult],
+        dead_letter: Callable[[Items, Optional[str], int], None] = log_dead_letter,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        max_pending: int = 10000,
+        overflow: Optional[Callable[[Items], bool]] = None,
+    ):
+        self._write = write
+        self._dead_letter = dead_letter
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.max_pending = max(1, max_pending)
+        self._overflow = overflow
+
+        self._heap: List[Tuple[float, int, int, Items, Optional[str]]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self._pending_items = 0
+        self._retried = 0
+        self._succeeded = 0
+        self._splits = 0
+        self._dead_lettered = 0
+        self._overflowed = 0
+        self._throttled = 0
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    # ------------------------------------------------------------------
+
+    def submit(self, items: Items, error: Optional[str], attempt: int = 1) -> None:
+        """Schedules ``items`` (which just failed attempt ``attempt``)."""
+        if not items:
+            return
+        if attempt >= self.max_attempts and not (is_payload_too_large(error) and len(items) > 1):
+            self._give_up(items, error, attempt)
+            return
+        with self._cond:
+            if self._stopped or self._pending_items + len(items) > self.max_pending:
+                spill = True
+            else:
+                spill = False
+                # Oversized batches are split right away rather than after a wait.
+                delay = 0.0 if is_payload_too_large(error) else self.backoff(attempt)
+                self._push_locked(time.monotonic() + delay, attempt, items, error)
+                self._ensure_thread_locked()
+        if spill:
+            self._overflow_or_give_up(items, error, attempt)
+
+    def _push_locked(self, due: float, attempt: int, items: Items, error: Optional[str]) -> None:
+        heapq.heappush(self._heap, (due, next(self._seq), attempt, items, error))
+        self._pending_items += len(items)
+        self._cond.notify()
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="VectorWaveFlushRetry", daemon=True)
+            self._thread.start()
+
+    def _overflow_or_give_up(self, items: Items, error: Optional[str], attempt: int) -> None:
+        if self._overflow is not None:
+            try:
+                if self._overflow(items):
+                    with self._cond:
+                        self._overflowed += len(items)
+                    return
+            except Exception as e:
+                logger.warning(f"Retry overflow sink failed: {e}")
+        self._give_up(items, error, attempt)
+
+    def _give_up(self, items: Items, error: Optional[str], attempts: int) -> None:
+        with self._cond:
+            self._dead_lettered += len(items)
+        try:
+            self._dead_letter(items, error, attempts)
+        except Exception as e:
+            logger.error(f"❌ Dead-letter sink failed, {len(items)} log(s) lost: {e}")
+
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                _, _, attempt, items, error = heapq.heappop(self._heap)
+                self._pending_items -= len(items)
+                self._retried += len(items)
+            self._attempt(items, attempt)
+
+    def _attempt(self, items: Items, attempt: int) -> None:
+        try:
+            failed, error = self._write(items)
+        except Exception as e:
+            failed, error = items, str(e)
+        with self._cond:
+            self._succeeded += len(items) - len(failed)
+            if failed and is_throttled(error):
+                self._throttled += 1
+        if not failed:
+            return
+        if is_payload_too_large(error) and len(failed) > 1:
+            mid = len(failed) // 2
+            with self._cond:
+                self._splits += 1
+                now = time.monotonic()
+                self._push_locked(now, attempt, failed[:mid], None)
+                self._push_locked(now, attempt, failed[mid:], None)
+            return
+        self.submit(failed, error, attempt + 1)
+
+    # ------------------------------------------------------------------
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """Stops the retry thread. Items still waiting go to ``overflow`` (the
+        spill file, if any) or the dead-letter sink."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+            remaining = [(attempt, items, error) for _, _, attempt, items, error in self._heap]
+            self._heap.clear()
+            self._pending_items = 0
+        if thread is not None:
+            thread.join(timeout=timeout)
+        for attempt, items, error in remaining:
+            self._overflow_or_give_up(items, error, attempt)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pending": self._pending_items,
+                "retried": self._retried,
+                "succeeded": self._succeeded,
+                "splits": self._splits,
+                "dead_lettered": self._dead_lettered,
+                "overflowed": self._overflowed,
+                "throttled": self._throttled,
+                "max_attempts": self.max_attempts,
+            }
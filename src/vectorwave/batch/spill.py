@@ -0,0 +1,278 @@
+"""Append-only on-disk spill for batches the backend could not take.
+
+When a flush fails (backend down, connection refused) or the in-memory
+queue overflows under ``BATCH_QUEUE_OVERFLOW_POLICY=spill``, the batch is
+appended to a segment file under ``BATCH_SPILL_PATH`` instead of being
+dropped. A replayer drains the segments back through the normal write path
+once the backend is reachable again, including segments left behind by a
+previous process.
+
+On-disk layout::
+
+    <dir>/spill-000000000001.seg   frames, oldest first
+    <dir>/spill-000000000002.seg   active segment (appended to)
+    <dir>/cursor                   "<segment seq> <byte offset>" replay position
+    <dir>/.lock                    held by the owning process
+
+Each frame is ``>II`` (payload length, CRC32 of payload) followed by the
+payload: one batch as UTF-8 JSON. A torn frame at the tail of a segment
+(crash mid-write) fails the length or CRC check and ends that segment.
+Writes are flushed to the OS on every append and fsynced on rotation and
+close, so a process crash loses nothing that was appended; a power loss can
+lose the unsynced tail of the active segment.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_FRAME_HEADER = struct.Struct(">II")
+_SEGMENT_PREFIX = "spill-"
+_SEGMENT_SUFFIX = ".seg"
+
+
+def _segment_name(seq: int) -> str:
+    return f"{_SEGMENT_PREFIX}{seq:012d}{_SEGMENT_SUFFIX}"
+
+
+def _encode(items: List[Dict[str, Any]]) -> bytes:
+    payload = json.dumps(items, default=str, separators=(",", ":")).encode("utf-8")
+    return _FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class SpillLog:
+    """Segmented write-ahead log of pending batches.
+
+    ``append`` is called from flush / add_object threads and ``replay`` from
+    the replayer. Replay only reads sealed segments and doesn't hold the
+    append lock while the handler writes, so producers never wait on the
+    backend. ``max_total_bytes`` bounds the directory: once reached, new
+    batches are rejected (counted in ``stats()["rejected_items"]``) until
+    replay frees space.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        max_total_bytes: int = 256 * 1024 * 1024,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_segment_bytes = max(1, max_segment_bytes)
+        self.max_total_bytes = max(1, max_total_bytes)
+
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._lock_file = self._acquire_dir_lock()
+        self._segments: List[int] = self._scan_segments()
+        self._sizes: Dict[int, int] = {
+            seq: os.path.getsize(self._path(seq)) for seq in self._segments
+        }
+        self._cursor: Tuple[int, int] = self._read_cursor()
+        self._active = None
+        self._active_seq: Optional[int] = None
+        # Never reuse a sequence number at or below the replay cursor.
+        self._next_seq = max(self._segments + [self._cursor[0]]) + 1
+
+        self._spilled_batches = 0
+        self._spilled_items = 0
+        self._replayed_items = 0
+        self._rejected_items = 0
+        self._corrupt_frames = 0
+
+        if self._segments:
+            logger.info(
+                "Found %d spill segment(s) (%d bytes) in '%s' from a previous run.",
+                len(self._segments), self.total_bytes(), directory,
+            )
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, _segment_name(seq))
+
+    def _acquire_dir_lock(self):
+        handle = open(os.path.join(self.directory, ".lock"), "a+")
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                raise RuntimeError(f"spill directory '{self.directory}' is in use by another process")
+        return handle
+
+    def _scan_segments(self) -> List[int]:
+        seqs = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+                try:
+                    seqs.append(int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(seqs)
+
+    def _read_cursor(self) -> Tuple[int, int]:
+        try:
+            with open(os.path.join(self.directory, "cursor"), "r", encoding="utf-8") as f:
+                seq, offset = f.read().split()
+                return int(seq), int(offset)
+        except (OSError, ValueError):
+            return (self._segments[0] if self._segments else 0), 0
+
+    def _write_cursor(self, seq: int, offset: int) -> None:
+        self._cursor = (seq, offset)
+        tmp = os.path.join(self.directory, "cursor.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"{seq} {offset}")
+        os.replace(tmp, os.path.join(self.directory, "cursor"))
+
+    def _seal_active(self) -> None:
+        if self._active is not None:
+            self._active.flush()
+            os.fsync(self._active.fileno())
+            self._active.close()
+            self._active = None
+            self._active_seq = None
+
+    def _remove_segment(self, seq: int) -> None:
+        try:
+            os.remove(self._path(seq))
+        except FileNotFoundError:
+            pass
+        self._segments.remove(seq)
+        self._sizes.pop(seq, None)
+
+    def total_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    # ------------------------------------------------------------------
+    # Write side
+    # ------------------------------------------------------------------
+
+    def append(self, items: List[Dict[str, Any]]) -> bool:
+        """Persists one batch. Returns False if the size cap rejected it."""
+        if not items:
+            return True
+        frame = _encode(items)
+        with self._lock:
+            if self.total_bytes() + len(frame) > self.max_total_bytes:
+                self._rejected_items += len(items)
+                return False
+            if self._active is not None and self._sizes[self._active_seq] + len(frame) > self.max_segment_bytes:
+                self._seal_active()
+            if self._active is None:
+                seq = self._next_seq
+                self._next_seq += 1
+                self._active = open(self._path(seq), "ab")
+                self._active_seq = seq
+                self._segments.append(seq)
+                self._sizes[seq] = 0
+            self._active.write(frame)
+            self._active.flush()
+            self._sizes[self._active_seq] += len(frame)
+            self._spilled_batches += 1
+            self._spilled_items += len(items)
+            return True
+
+    # ------------------------------------------------------------------
+    # Read side
+    # ------------------------------------------------------------------
+
+    def pending(self) -> bool:
+        with self._lock:
+            return bool(self._segments)
+
+    def replay(self, handler: Callable[[List[Dict[str, Any]]], bool]) -> int:
+        """Feeds spilled batches to ``handler`` oldest first.
+
+        ``handler`` returns False to stop (backend still failing); the
+        cursor then stays on that batch for the next call. Fully replayed
+        segments are deleted. Returns the number of items replayed.
+        """
+        replayed = 0
+        with self._replay_lock:
+            with self._lock:
+                # Appends go to a fresh segment while we read the sealed ones.
+                self._seal_active()
+                segments = list(self._segments)
+            for seq in segments:
+                cur_seq, offset = self._cursor
+                if seq < cur_seq:
+                    with self._lock:
+                        self._remove_segment(seq)
+                    continue
+                done, n = self._replay_segment(seq, offset if seq == cur_seq else 0, handler)
+                replayed += n
+                if not done:
+                    break
+                with self._lock:
+                    self._remove_segment(seq)
+                    next_seq = self._segments[0] if self._segments else seq + 1
+                self._write_cursor(next_seq, 0)
+            with self._lock:
+                self._replayed_items += replayed
+        return replayed
+
+    def _replay_segment(self, seq: int, offset: int, handler) -> Tuple[bool, int]:
+        replayed = 0
+        with open(self._path(seq), "rb") as f:
+            f.seek(offset)
+            while True:
+                header = f.read(_FRAME_HEADER.size)
+                if not header:
+                    return True, replayed
+                payload = None
+                if len(header) == _FRAME_HEADER.size:
+                    length, crc = _FRAME_HEADER.unpack(header)
+                    payload = f.read(length)
+                    if len(payload) != length or zlib.crc32(payload) != crc:
+                        payload = None
+                if payload is None:
+                    with self._lock:
+                        self._corrupt_frames += 1
+                    logger.warning("Truncated or corrupt frame in spill segment %s; skipping its tail.",
+                                   _segment_name(seq))
+                    return True, replayed
+                items = json.loads(payload.decode("utf-8"))
+                if handler(items) is False:
+                    return False, replayed
+                replayed += len(items)
+                self._write_cursor(seq, f.tell())
+
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        with self._lock:
+            self._seal_active()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.directory,
+                "segments": len(self._segments),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_total_bytes,
+                "spilled_batches": self._spilled_batches,
+                "spilled_items": self._spilled_items,
+                "replayed_items": self._replayed_items,
+                "rejected_items": self._rejected_items,
+                "corrupt_frames": self._corrupt_frames,
+            }
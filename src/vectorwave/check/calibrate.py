@@ -157,6 +157,11 @@ def _run_coroutine_safely(coro):
 def _vectorizer_name(vectorizer) -> Optional[str]:
     if vectorizer is None:
         return None
+    from ..vectorizer.caching_vectorizer import CachingVectorizer
+
+    # Report the model, not the embedding cache wrapped around it.
+    while isinstance(vectorizer, CachingVectorizer):
+        vectorizer = vectorizer.inner
     return type(vectorizer).__name__
 
 
@@ -63,6 +63,14 @@ def _maturin_build_warning() -> None:
             "the high-performance batch path (Python fallback will be used until then).",
             file=sys.stderr,
         )
+        return
+    from ..runtime import rust_core_is_stale
+    if rust_core_is_stale():
+        print(
+            "[warn] Rust extension is older than this checkout. Run 'maturin develop' "
+            "to rebuild it (Python fallbacks cover what it lacks until then).",
+            file=sys.stderr,
+        )
 
 
 def cmd_start(_args: argparse.Namespace) -> int:
@@ -266,6 +274,9 @@ def _build_parser() -> argparse.ArgumentParser:
     from vectorwave.check.cli import add_check_subparser
     add_check_subparser(subparsers)
 
+    from vectorwave.store.cli import add_index_subparser
+    add_index_subparser(subparsers)
+
     return parser
 
 
@@ -291,7 +302,7 @@ def cmd_info(_args: argparse.Namespace) -> int:
         age = int(now - (p.started_at or now))
         age_str = f"{age // 3600}h{(age % 3600) // 60}m" if age >= 3600 else f"{age // 60}m{age % 60}s"
         otel = f"on:{p.otel_service_name}" if p.otel_enabled else "off"
-        rust = "yes" if p.rust_core else "py"
+        rust = ("stale" if p.rust_core_stale else "yes") if p.rust_core else "py"
         mods = ",".join(p.instrumented_modules) or "-"
         if len(mods) > 50:
             mods = mods[:47] + "..."
@@ -1,19 +1,18 @@
 import inspect
 import logging
-import os
 from functools import wraps
 from typing import List, Optional, Dict, Any
 
 from weaviate.util import generate_uuid5
 
-from ..batch.batch import get_batch_manager
 from ..models.db_config import get_weaviate_settings
-from ..monitoring.tracer import trace_root, trace_span
-from ..utils.function_cache import function_cache_manager
+from ..monitoring.tracer import trace_root, trace_span, pending_exact_store_var
+from .registry import FunctionRegistration, function_registry
 from ..utils.return_caching_utils import CACHE_MISS, _check_and_return_cached_result
 from ..vectorizer.factory import get_vectorizer
 from ..utils.context import execution_source_context
-from ..utils.path_utils import get_repo_root_and_relative_path
+from ..utils.serialization import CaptureLimits
+from ..utils.arg_binding import BindingPlan
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +31,21 @@ def vectorize(search_description: Optional[str] = None,
               semantic_cache_filters: Optional[Dict[str, Any]] = None,
               semantic_cache_scope: Optional[List[str]] = None,
               enable_alert: bool = True,
+              capture_limits: Optional[Dict[str, Optional[int]]] = None,
+              sample_rate: Optional[float] = None,
+              max_traces_per_second: Optional[float] = None,
               **execution_tags):
     """
     VectorWave Decorator with Auto-Generation support.
+
+    ``capture_limits`` overrides the global ``CAPTURE_MAX_*`` settings for
+    this function, e.g. ``{"max_list_items": 100, "max_string_length": 2000}``
+    (keys: ``max_depth``, ``max_bytes``, ``max_list_items``,
+    ``max_string_length``).
+
+    ``sample_rate`` / ``max_traces_per_second`` override the ``SAMPLING_*``
+    settings for traces rooted at this function. Calls that are sampled out
+    are not stored, so ``semantic_cache`` and ``replay`` only see kept ones.
     """
 
     if semantic_cache:
@@ -91,70 +102,36 @@ def vectorize(search_description: Optional[str] = None,
                         key
                     )
 
-        try:
-            # define static properties
-            docstring = inspect.getdoc(func) or ""
-            source_code = inspect.getsource(func)
-
-            try:
-                abs_file_path = os.path.abspath(inspect.getsourcefile(func))
-                repo_root, relative_file_path = get_repo_root_and_relative_path(abs_file_path)
-                if relative_file_path:
-                    file_path = relative_file_path
-                else:
-                    file_path = abs_file_path
-                    logger.warning(f"Function '{function_name}' is not in a Git repository. "
-                                   f"PR creation might fail for absolute path: {file_path}")
-            except Exception as e:
-                file_path = ""
-                logger.error(f"Failed to determine file path for '{function_name}': {e}")
-
-            static_properties = {
-                "function_name": function_name,
-                "file_path": file_path,
-                "module_name": module_name,
-                "docstring": docstring,
-                "source_code": source_code,
-                "search_description": search_description,
-                "sequence_narrative": sequence_narrative
-            }
-            static_properties.update(valid_execution_tags)
-
-            if auto:
-                logger.info(f"Function '{function_name}' registered for auto-metadata generation.")
-                PENDING_FUNCTIONS.append({
-                    "func_name": function_name,
-                    "func_uuid": func_uuid,
-                    "func_identifier": func_identifier,
-                    "static_properties": static_properties
-                })
-            else:
-                current_content_hash = function_cache_manager.calculate_content_hash(func_identifier, static_properties)
-
-                if function_cache_manager.is_cached_and_unchanged(func_uuid, current_content_hash):
-                    logger.info(f"Function '{function_name}' is UNCHANGED. Skipping DB write.")
-                else:
-                    logger.info(f"Function '{function_name}' is NEW or CHANGED. Writing to DB.")
-                    batch = get_batch_manager()
-                    vectorizer = get_vectorizer()
-                    vector_to_add = None
-
-                    if vectorizer is not None and search_description:
-                        try:
-                            vector_to_add = vectorizer.embed(search_description)
-                        except Exception as e:
-                            logger.warning(f"Failed to vectorize '{function_name}': {e}")
-
-                    batch.add_object(
-                        collection=settings.COLLECTION_NAME,
-                        properties=static_properties,
-                        uuid=func_uuid,
-                        vector=vector_to_add
-                    )
-                    function_cache_manager.update_cache(func_uuid, current_content_hash)
+        if (semantic_cache or replay) and CaptureLimits.from_settings(settings, capture_limits).active:
+            logger.warning(
+                "Capture limits are set for '%s'; cache hits and replay baselines use the stored "
+                "return value, so a result cut by the limits is returned cut.",
+                function_name
+            )
 
-        except Exception as e:
-            logger.error("Error in @vectorize setup for '%s': %s", func.__name__, e)
+        # Registration (source, hash, embedding, upsert) is deferred to
+        # core.registry: one bulk pass on the first call or flush_registrations().
+        registration = FunctionRegistration(
+            func=func,
+            function_name=function_name,
+            module_name=module_name,
+            func_identifier=func_identifier,
+            func_uuid=func_uuid,
+            search_description=search_description,
+            sequence_narrative=sequence_narrative,
+            execution_tags=valid_execution_tags,
+        )
+        if auto:
+            logger.info(f"Function '{function_name}' registered for auto-metadata generation.")
+            registration.pending = False
+            PENDING_FUNCTIONS.append({
+                "func_name": function_name,
+                "func_uuid": func_uuid,
+                "func_identifier": func_identifier,
+                "registration": registration
+            })
+        else:
+            function_registry.add(registration)
 
         # Surface the wrapped function's module in `vectorwave info` so a
         # debugger can see which modules are being observed (matches what
@@ -165,18 +142,21 @@ def vectorize(search_description: Optional[str] = None,
         except Exception:
             pass
 
+        scope_plan = BindingPlan.for_function(func, semantic_cache_scope, extras_from_kwargs=False) \
+            if semantic_cache_scope else None
+
         def resolve_semantic_filters(args, kwargs):
             runtime_filters = semantic_cache_filters.copy() if semantic_cache_filters else {}
 
             if semantic_cache_scope:
                 try:
-                    sig = inspect.signature(func)
-                    bound_args = sig.bind(*args, **kwargs)
-                    bound_args.apply_defaults()
+                    if scope_plan is None:
+                        raise TypeError("signature is not inspectable")
+                    bound_args = scope_plan.bind(args, kwargs)
 
                     for arg_name in semantic_cache_scope:
-                        if arg_name in bound_args.arguments:
-                            runtime_filters[arg_name] = bound_args.arguments[arg_name]
+                        if arg_name in bound_args:
+                            runtime_filters[arg_name] = bound_args[arg_name]
                         else:
                             logger.warning(f"Semantic Scope: Argument '{arg_name}' not found in call to '{function_name}'.")
                 except Exception as e:
@@ -187,15 +167,18 @@ def vectorize(search_description: Optional[str] = None,
         # --- Wrapper Logic ---
 
         def _try_cache(args, kwargs):
-            """Check semantic cache. Returns the cached value (possibly None) on
-            hit, or CACHE_MISS on miss — using a sentinel lets functions that
-            legitimately return None still be cached."""
+            """Check semantic cache. Returns the cached value (possibly None)
+            on hit, or CACHE_MISS on miss — using a sentinel lets functions
+            that legitimately return None still be cached. On a miss the
+            exact-match key is left for inner_wrapper's span, which stores
+            the result it logs."""
             if not semantic_cache:
                 return CACHE_MISS
             filters = resolve_semantic_filters(args, kwargs)
             return _check_and_return_cached_result(
                 func, args, kwargs, function_name, cache_threshold,
-                is_async_func, filters=filters
+                is_async_func, filters=filters, capture_limits=capture_limits,
+                remember_exact=True
             )
 
         def _build_full_kwargs(kwargs):
@@ -207,12 +190,13 @@ def vectorize(search_description: Optional[str] = None,
             return full_kwargs
 
         if is_async_func:
-            @trace_root()
+            @trace_root(sample_rate=sample_rate, max_traces_per_second=max_traces_per_second)
             @trace_span(
                 attributes_to_capture=final_attributes,
                 capture_return_value=capture_return_value,
                 force_sync=semantic_cache,
-                enable_alert=enable_alert
+                enable_alert=enable_alert,
+                capture_limits=capture_limits
             )
             @wraps(func)
             async def inner_wrapper(*args, **kwargs):
@@ -222,21 +206,28 @@ def vectorize(search_description: Optional[str] = None,
 
             @wraps(func)
             async def outer_wrapper(*args, **kwargs):
+                if registration.pending:
+                    function_registry.schedule_flush()
                 cached = _try_cache(args, kwargs)
                 if cached is not CACHE_MISS:
                     return cached
-                return await inner_wrapper(*args, **_build_full_kwargs(kwargs))
+                try:
+                    return await inner_wrapper(*args, **_build_full_kwargs(kwargs))
+                finally:
+                    if semantic_cache:
+                        pending_exact_store_var.set(None)  # untraced call: nothing took it
 
             outer_wrapper._is_vectorized = True
             return outer_wrapper
 
         else:  # Sync wrapper
-            @trace_root()
+            @trace_root(sample_rate=sample_rate, max_traces_per_second=max_traces_per_second)
             @trace_span(
                 attributes_to_capture=final_attributes,
                 capture_return_value=capture_return_value,
                 force_sync=semantic_cache,
-                enable_alert=enable_alert
+                enable_alert=enable_alert,
+                capture_limits=capture_limits
             )
             @wraps(func)
             def inner_wrapper(*args, **kwargs):
@@ -246,10 +237,16 @@ def vectorize(search_description: Optional[str] = None,
 
             @wraps(func)
             def outer_wrapper(*args, **kwargs):
+                if registration.pending:
+                    function_registry.schedule_flush()
                 cached = _try_cache(args, kwargs)
                 if cached is not CACHE_MISS:
                     return cached
-                return inner_wrapper(*args, **_build_full_kwargs(kwargs))
+                try:
+                    return inner_wrapper(*args, **_build_full_kwargs(kwargs))
+                finally:
+                    if semantic_cache:
+                        pending_exact_store_var.set(None)  # untraced call: nothing took it
 
             outer_wrapper._is_vectorized = True
             return outer_wrapper
@@ -1,5 +1,6 @@
 import logging
 import json
+import time
 from typing import Optional, Dict, Any
 
 from ..utils.function_cache import function_cache_manager
@@ -7,6 +8,7 @@ from ..models.db_config import get_weaviate_settings
 from ..batch.batch import get_batch_manager
 from ..vectorizer.factory import get_vectorizer
 from .decorator import PENDING_FUNCTIONS
+from .registry import RegistrySync, write_function_rows
 from .llm.factory import get_llm_client
 
 logger = logging.getLogger(__name__)
@@ -88,13 +90,20 @@ def generate_and_register_metadata():
     batch = get_batch_manager()
     vectorizer = get_vectorizer()
 
-    processed_count = 0
+    started = time.perf_counter()
+    sync = RegistrySync(pending=len(PENDING_FUNCTIONS))
+    rows = []
 
     for item in PENDING_FUNCTIONS:
         func_name = item["func_name"]
         func_uuid = item["func_uuid"]
         func_identifier = item["func_identifier"]
-        static_props = item["static_properties"]
+        try:
+            static_props = item["registration"].static_properties()
+        except Exception as e:
+            logger.error(f"Failed to read source for '{func_name}': {e}")
+            sync.failed += 1
+            continue
 
         current_hash = function_cache_manager.calculate_content_hash(func_identifier, static_props)
 
@@ -127,28 +136,23 @@ def generate_and_register_metadata():
                 )
             else:
                 logger.warning(f"⚠️ Skipping registration for '{func_name}' due to generation failure.")
+                sync.failed += 1
                 continue
 
         # 3. Update Properties
         static_props["search_description"] = final_desc
         static_props["sequence_narrative"] = final_narr
+        rows.append((func_uuid, static_props))
 
-        # 4. Vectorize the Description
-        vector_to_add = None
-        if vectorizer is not None and final_desc:
-            try:
-                vector_to_add = vectorizer.embed(final_desc)
-            except Exception as e:
-                logger.warning(f"Vectorization failed for '{func_name}': {e}")
-
-        # 5. Register to DB
-        batch.add_object(
-            collection=settings.COLLECTION_NAME,
-            properties=static_props,
-            uuid=func_uuid,
-            vector=vector_to_add
-        )
-        processed_count += 1
+    sync.collect_seconds = time.perf_counter() - started
+
+    # 4. Vectorize every description in one batch and register them in one bulk write
+    if rows:
+        if write_function_rows(settings, batch, vectorizer, rows, sync):
+            sync.written = len(rows)
+        else:
+            sync.failed += len(rows)
+    sync.total_seconds = time.perf_counter() - started
 
     PENDING_FUNCTIONS.clear()
-    logger.info(f"✨ Auto-generation complete. Registered {processed_count} functions.")
\ No newline at end of file
+    logger.info(f"✨ Auto-generation complete. Registered {sync.written} functions: {sync.summary()}")
\ No newline at end of file
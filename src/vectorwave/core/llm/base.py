@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 
 class BaseLLMClient(ABC):
     """
@@ -8,17 +8,24 @@ class BaseLLMClient(ABC):
     """
 
     @abstractmethod
-    def create_embedding(self, text: str, model: str, category: str = "default") -> Optional[List[float]]:
+    def create_embedding(
+            self,
+            text: Union[str, List[str]],
+            model: str,
+            category: str = "default"
+    ) -> Union[Optional[List[float]], List[Optional[List[float]]]]:
         """
         Generates text embeddings.
 
         Args:
-            text: The text to embed.
+            text: The text to embed, or a list of texts to embed in as few
+                requests as the provider allows.
             model: The name of the model to use.
             category: Category for aggregating token usage (e.g., 'execution_log', 'auto_doc').
 
         Returns:
-            The generated list of embedding vectors (None on failure).
+            The generated embedding vector (None on failure). For a list input,
+            one entry per text in the same order (None for failed entries).
         """
         pass
 
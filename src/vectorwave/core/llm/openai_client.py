@@ -1,6 +1,7 @@
 # src/vectorwave/core/llm/openai_client.py
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Union
 from datetime import datetime, timezone
 from ...models.db_config import get_weaviate_settings
 from ...batch.batch import get_batch_manager  # [추가]
@@ -22,7 +23,9 @@ class VectorWaveOpenAIClient(BaseLLMClient):
         if OpenAI is None or not self.settings.OPENAI_API_KEY:
             self.client = None
         else:
-            self.client = OpenAI(api_key=self.settings.OPENAI_API_KEY)
+            # OPENAI_BASE_URL points the client at a compatible endpoint
+            # (proxy, Azure gateway, or a local stub server in tests).
+            self.client = OpenAI(api_key=self.settings.OPENAI_API_KEY, base_url=self.settings.OPENAI_BASE_URL)
 
     def _log_usage(self, tokens: int, model: str, usage_type: str, category: str):
         if tokens > 0:
@@ -40,23 +43,50 @@ class VectorWaveOpenAIClient(BaseLLMClient):
             except Exception as e:
                 logger.warning(f"Failed to log token usage: {e}")
 
-    def create_embedding(self, text: str, model: str = "text-embedding-3-small", category: str = "default") -> Optional[
-        List[float]]:
+    def create_embedding(self, text: Union[str, List[str]], model: str = "text-embedding-3-small",
+                         category: str = "default") -> Union[Optional[List[float]], List[Optional[List[float]]]]:
         """
         Returns: Vector list only (Tokens are logged internally)
+
+        `text` may also be a list of texts, which is sent in chunks of at most
+        OPENAI_EMBEDDING_MAX_INPUTS inputs per request (up to
+        OPENAI_EMBEDDING_MAX_CONCURRENCY requests in flight). Returns one
+        vector per input in order; inputs of a failed request are None.
         """
-        if not self.client: return None
+        if isinstance(text, str):
+            if not self.client: return None
+            vectors = self._embed_chunk([text], model, category)
+            return vectors[0]
+
+        texts = list(text)
+        if not self.client or not texts:
+            return [None] * len(texts)
+
+        size = max(1, self.settings.OPENAI_EMBEDDING_MAX_INPUTS)
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        workers = min(len(chunks), max(1, self.settings.OPENAI_EMBEDDING_MAX_CONCURRENCY))
+        if workers == 1:
+            results = [self._embed_chunk(chunk, model, category) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="VectorWaveEmbed") as pool:
+                results = list(pool.map(lambda c: self._embed_chunk(c, model, category), chunks))
+        return [vector for chunk_result in results for vector in chunk_result]
+
+    def _embed_chunk(self, texts: List[str], model: str, category: str) -> List[Optional[List[float]]]:
+        """One embeddings request; token usage is logged once for the whole chunk."""
         try:
-            text = text.replace("\n", " ")
-            res = self.client.embeddings.create(input=[text], model=model)
+            res = self.client.embeddings.create(input=[t.replace("\n", " ") for t in texts], model=model)
 
             tokens = res.usage.total_tokens if res.usage else 0
             self._log_usage(tokens, model, "embedding", category)
 
-            return res.data[0].embedding
+            vectors: List[Optional[List[float]]] = [None] * len(texts)
+            for item in res.data:
+                vectors[item.index] = item.embedding
+            return vectors
         except Exception as e:
-            logger.error(f"Embedding error: {e}")
-            return None
+            logger.error(f"Embedding error ({len(texts)} inputs): {e}")
+            return [None] * len(texts)
 
     def create_chat_completion(self, messages: List[Dict], model: str = "gpt-4-turbo", temperature: float = 0.1,
                                response_format=None, category: str = "default") -> Optional[str]:
@@ -0,0 +1,314 @@
+"""Deferred registration of ``@vectorize`` functions.
+
+``@vectorize`` runs at import time, and registering a function (reading its
+source, resolving its repository path, hashing it, embedding its
+``search_description`` and upserting it into ``COLLECTION_NAME``) used to
+happen right there, once per decorated function. The decorator now only
+records a ``FunctionRegistration``; the expensive work happens in one bulk
+pass over everything pending, started in the background by the first call
+to any vectorized function or run by ``flush_registrations()``. Once a
+background pass has been started, whatever is still pending at interpreter
+exit is registered by an ``atexit`` hook that runs before the batch
+manager's shutdown.
+
+The pass is a sync stage: it builds every pending row, diffs the content
+hashes against the ``FunctionCacheManager``, embeds the changed rows'
+``search_description`` with one ``embed_batch`` and writes them with one
+bulk write. Its timing is logged and kept under
+``runtime.get_info().stats["function_registry"]``. Functions whose write
+fails are put back on the pending list, so the next pass (the next call to a
+vectorized function, ``flush_registrations()`` or the exit hook) writes them
+again, up to ``MAX_WRITE_ATTEMPTS`` times.
+"""
+import atexit
+import inspect
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..batch.batch import get_batch_manager
+from ..models.db_config import get_weaviate_settings
+from ..utils.function_cache import function_cache_manager
+from ..utils.path_utils import get_repo_root_and_relative_path
+from ..vectorizer.factory import get_vectorizer
+
+logger = logging.getLogger(__name__)
+
+# Passes that try to write a function before it is given up on.
+MAX_WRITE_ATTEMPTS = 3
+
+
+@dataclass
+class FunctionRegistration:
+    """What ``@vectorize`` knows about a function at import time."""
+    func: Callable
+    function_name: str
+    module_name: str
+    func_identifier: str
+    func_uuid: str
+    search_description: Optional[str] = None
+    sequence_narrative: Optional[str] = None
+    execution_tags: Dict[str, Any] = field(default_factory=dict)
+    pending: bool = True
+    write_attempts: int = 0
+
+    def static_properties(self) -> Dict[str, Any]:
+        """The ``COLLECTION_NAME`` row for this function. Reads its source, so
+        raises (OSError/TypeError) for functions without one."""
+        docstring = inspect.getdoc(self.func) or ""
+        source_code = inspect.getsource(self.func)
+
+        try:
+            abs_file_path = os.path.abspath(inspect.getsourcefile(self.func))
+            repo_root, relative_file_path = get_repo_root_and_relative_path(abs_file_path)
+            if relative_file_path:
+                file_path = relative_file_path
+            else:
+                file_path = abs_file_path
+                logger.warning(f"Function '{self.function_name}' is not in a Git repository. "
+                               f"PR creation might fail for absolute path: {file_path}")
+        except Exception as e:
+            file_path = ""
+            logger.error(f"Failed to determine file path for '{self.function_name}': {e}")
+
+        static_properties = {
+            "function_name": self.function_name,
+            "file_path": file_path,
+            "module_name": self.module_name,
+            "docstring": docstring,
+            "source_code": source_code,
+            "search_description": self.search_description,
+            "sequence_narrative": self.sequence_narrative
+        }
+        static_properties.update(self.execution_tags)
+        return static_properties
+
+
+@dataclass
+class RegistrySync:
+    """Outcome and timing of one registry sync pass."""
+    pending: int = 0
+    unchanged: int = 0
+    written: int = 0
+    failed: int = 0
+    requeued: int = 0
+    embedded: int = 0
+    collect_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    write_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.written} written, {self.unchanged} unchanged, {self.failed} failed "
+            f"({self.requeued} requeued) "
+            f"of {self.pending} in {self.total_seconds * 1000:.1f} ms "
+            f"(collect {self.collect_seconds * 1000:.1f} ms, "
+            f"embed {self.embedded} in {self.embed_seconds * 1000:.1f} ms, "
+            f"write {self.write_seconds * 1000:.1f} ms)"
+        )
+
+
+def embed_descriptions(vectorizer, texts: List[Optional[str]]) -> List[Optional[List[float]]]:
+    """One vector (or None) per text, from a single ``embed_batch`` over the
+    distinct non-empty texts; embeds one by one if the batch call fails."""
+    if vectorizer is None:
+        return [None] * len(texts)
+    unique_texts = list(dict.fromkeys(t for t in texts if t))
+    if not unique_texts:
+        return [None] * len(texts)
+
+    try:
+        vectors = vectorizer.embed_batch(unique_texts)
+        if len(vectors) != len(unique_texts):
+            raise ValueError(f"expected {len(unique_texts)} vectors, got {len(vectors)}")
+    except Exception as e:
+        logger.warning(f"Batch vectorization of {len(unique_texts)} descriptions failed, embedding one by one: {e}")
+        vectors = []
+        for text in unique_texts:
+            try:
+                vectors.append(vectorizer.embed(text))
+            except Exception as ve:
+                logger.warning(f"Failed to vectorize description '{text[:50]}': {ve}")
+                vectors.append(None)
+
+    # Empty vectors come back from OpenAIVectorizer for per-item failures.
+    by_text = {t: (list(v) if v is not None and len(v) else None) for t, v in zip(unique_texts, vectors)}
+    return [by_text[t] if t else None for t in texts]
+
+
+def write_function_rows(settings, batch, vectorizer, rows: List[tuple], sync: RegistrySync) -> bool:
+    """Embeds and writes ``(func_uuid, static_properties)`` rows into
+    ``COLLECTION_NAME`` with one bulk write, recording timing on ``sync``.
+    Returns False if any row wasn't written."""
+    started = time.perf_counter()
+    vectors = embed_descriptions(vectorizer, [props.get("search_description") for _, props in rows])
+    sync.embedded = sum(v is not None for v in vectors)
+    sync.embed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ok = batch.write_objects([
+        {
+            "collection": settings.COLLECTION_NAME,
+            "properties": props,
+            "uuid": func_uuid,
+            "vector": vector,
+        }
+        for (func_uuid, props), vector in zip(rows, vectors)
+    ]) is not False
+    sync.write_seconds = time.perf_counter() - started
+    return ok
+
+
+class FunctionRegistry:
+    """Pending registrations plus the pass that writes them. Passes are
+    serialized; each one drains everything pending when it starts and puts
+    back the functions whose write failed."""
+
+    def __init__(self):
+        self._pending: List[FunctionRegistration] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._deps: tuple = ()
+        self.last_sync: Optional[RegistrySync] = None
+
+    def add(self, registration: FunctionRegistration) -> None:
+        with self._lock:
+            self._pending.append(registration)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def schedule_flush(self) -> None:
+        """Starts a background pass unless one is running or nothing is pending."""
+        with self._lock:
+            if not self._pending or (self._worker is not None and self._worker.is_alive()):
+                return
+            # The lru_cache singletons are resolved here, on the caller's thread,
+            # so the pass can't build a second batch manager while the call's
+            # own span builds the first.
+            self._deps = (get_weaviate_settings(), get_batch_manager(), get_vectorizer())
+            # atexit runs hooks last-in first-out: (re-)registering after the
+            # batch manager (whose hook is its shutdown) makes the exit flush
+            # run while it can still write.
+            atexit.unregister(self._flush_at_exit)
+            atexit.register(self._flush_at_exit)
+            self._worker = threading.Thread(
+                target=self.flush, args=self._deps, name="VectorWaveRegistration", daemon=True
+            )
+            self._worker.start()
+
+    def _flush_at_exit(self) -> None:
+        """Waits for the background pass (the worker is a daemon thread and
+        would otherwise be killed mid-write) and registers what is left."""
+        try:
+            self.flush(*self._deps)
+        except Exception as e:
+            logger.error(f"Function registration at exit failed: {e}")
+
+    def flush(self, settings=None, batch=None, vectorizer=None) -> int:
+        """Registers everything pending now; returns how many functions were
+        written (unchanged ones are skipped)."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            retry: List[FunctionRegistration] = []
+            try:
+                return self._register(pending, settings, batch, vectorizer, retry)
+            finally:
+                for registration in pending:
+                    registration.pending = False
+                if retry:
+                    with self._lock:
+                        self._pending[:0] = retry
+                    for registration in retry:
+                        registration.pending = True
+
+    def _register(self, pending: List[FunctionRegistration], settings, batch, vectorizer,
+                  retry: List[FunctionRegistration]) -> int:
+        started = time.perf_counter()
+        sync = RegistrySync(pending=len(pending))
+        rows = []
+        hashes = {}
+        writing = []
+
+        for registration in pending:
+            try:
+                static_properties = registration.static_properties()
+            except Exception as e:
+                logger.error("Error registering @vectorize function '%s': %s", registration.function_name, e)
+                sync.failed += 1
+                continue
+            current_content_hash = function_cache_manager.calculate_content_hash(
+                registration.func_identifier, static_properties
+            )
+            if function_cache_manager.is_cached_and_unchanged(registration.func_uuid, current_content_hash):
+                logger.debug(f"Function '{registration.function_name}' is UNCHANGED. Skipping DB write.")
+                sync.unchanged += 1
+                continue
+            rows.append((registration.func_uuid, static_properties))
+            writing.append(registration)
+            hashes[registration.func_uuid] = current_content_hash
+        sync.collect_seconds = time.perf_counter() - started
+
+        if rows:
+            settings = settings or get_weaviate_settings()
+            if batch is None:
+                batch = get_batch_manager()
+                vectorizer = get_vectorizer()
+            try:
+                ok = write_function_rows(settings, batch, vectorizer, rows, sync)
+            except Exception as e:
+                logger.error(f"Writing {len(rows)} @vectorize functions failed: {e}")
+                ok = False
+            if ok:
+                sync.written = len(rows)
+                function_cache_manager.update_cache_many(hashes)
+            else:
+                # Left out of the cache and put back for the next pass.
+                sync.failed += len(rows)
+                for registration in writing:
+                    registration.write_attempts += 1
+                    if registration.write_attempts < MAX_WRITE_ATTEMPTS:
+                        retry.append(registration)
+                    else:
+                        logger.error(f"Giving up registering @vectorize function '{registration.function_name}' "
+                                     f"after {registration.write_attempts} failed writes.")
+                sync.requeued = len(retry)
+
+        sync.total_seconds = time.perf_counter() - started
+        self.last_sync = sync
+        logger.info(f"Function registry sync: {sync.summary()}")
+        return sync.written
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"pending": self.pending_count()}
+        if self.last_sync is not None:
+            stats["last_sync"] = asdict(self.last_sync)
+        return stats
+
+
+function_registry = FunctionRegistry()
+
+try:
+    from ..runtime import register_stats_provider
+    register_stats_provider("function_registry", function_registry.stats)
+except Exception:
+    pass
+
+
+def flush_registrations() -> int:
+    """
+    Registers every ``@vectorize`` function still pending, in the calling
+    thread, and returns how many were written to the store. Use it where
+    functions must be searchable before their first call (e.g. at startup
+    or in tests).
+    """
+    return function_registry.flush()
@@ -8,6 +8,8 @@ from weaviate.util import generate_uuid5
 
 from ..models.db_config import get_weaviate_settings
 from ..store import get_vector_store
+from ..utils.semantic_index import get_semantic_index
+from ..utils.exact_cache import get_exact_cache
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +63,20 @@ class VectorWaveDatasetManager:
                 "tags": tags if tags else [],
             }
 
-            self.store.insert(
+            golden_uuid = self.store.insert(
                 collection=self.settings.GOLDEN_COLLECTION_NAME,
                 properties=golden_props,
                 vector=vector,
                 uuid=generate_uuid5(log_uuid),
             )
+
+            local_index = get_semantic_index()
+            if local_index is not None and golden_props["function_name"]:
+                local_index.add_golden(golden_props["function_name"], golden_uuid, vector, golden_props)
+            # Golden data outranks earlier answers; drop them from the exact tier.
+            exact_cache = get_exact_cache()
+            if exact_cache is not None and golden_props["function_name"]:
+                exact_cache.invalidate(golden_props["function_name"])
             logger.info(f"✅ Registered log {log_uuid} as Golden Data.")
             return True
 
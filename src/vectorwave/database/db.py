@@ -42,8 +42,6 @@ def get_weaviate_client(
                 port=port or 8080,
                 grpc_port=grpc_port or 50051,
                 additional_config=AdditionalConfig(
-                    dynamic=True,
-                    batch_size=20,
                     timeout_retries=3
                 )
             )
@@ -68,8 +66,6 @@ def get_weaviate_client(
                     port=settings.WEAVIATE_PORT,
                     grpc_port=settings.WEAVIATE_GRPC_PORT,
                     additional_config=AdditionalConfig(
-                        dynamic=True,
-                        batch_size=20,
                         timeout_retries=3
                     )
                 )
@@ -1,7 +1,7 @@
 import logging
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
-from typing import Dict, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set
 import json
 import os
 
@@ -32,14 +32,50 @@ class WeaviateSettings(BaseSettings):
     # batch configs
     BATCH_THRESHOLD: int = 20
     FLUSH_INTERVAL_SECONDS: float = 2.0
+    BATCH_QUEUE_SIZE: int = 10000
+    # "drop", "block", "spill"
+    BATCH_QUEUE_OVERFLOW_POLICY: str = "drop"
+    BATCH_QUEUE_BLOCK_TIMEOUT_SECONDS: float = 0.05
+    # directory for the on-disk spill of unwritable batches; disabled when unset
+    BATCH_SPILL_PATH: Optional[str] = None
+    BATCH_SPILL_MAX_SEGMENT_BYTES: int = 16 * 1024 * 1024
+    BATCH_SPILL_MAX_BYTES: int = 256 * 1024 * 1024
+    BATCH_SPILL_REPLAY_INTERVAL_SECONDS: float = 5.0
+    # re-submission of failed writes, then a JSON Lines dead-letter file (log only when unset)
+    BATCH_RETRY_MAX_ATTEMPTS: int = 5
+    BATCH_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    BATCH_RETRY_MAX_DELAY_SECONDS: float = 30.0
+    BATCH_RETRY_MAX_PENDING: int = 10000
+    BATCH_DEAD_LETTER_PATH: Optional[str] = None
+    # parallel flush workers, each with its own queue of BATCH_QUEUE_SIZE; items are sharded by "collection" or "trace_id"
+    BATCH_FLUSH_WORKERS: int = 1
+    BATCH_SHARD_KEY: str = "collection"
+    # JSON map of collection -> {"batch_threshold", "flush_interval_seconds", "queue_size"}; each gets a dedicated worker
+    BATCH_COLLECTION_WORKERS: Optional[Dict[str, Dict[str, Any]]] = None
+    # retune each worker's batch threshold within these bounds from flush latency and errors
+    BATCH_ADAPTIVE: bool = False
+    BATCH_ADAPTIVE_MIN_SIZE: int = 10
+    BATCH_ADAPTIVE_MAX_SIZE: int = 1000
+    BATCH_ADAPTIVE_TARGET_P95_SECONDS: float = 1.0
+    BATCH_ADAPTIVE_MAX_ERROR_RATE: float = 0.05
 
     WEAVIATE_VECTORIZER_MODULE: str = "text2vec-openai"
 
     WEAVIATE_GENERATIVE_MODULE: str = "generative-openai"
 
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
+    # per-request input cap for batched embeddings (API limit is 2048)
+    OPENAI_EMBEDDING_MAX_INPUTS: int = 2048
+    OPENAI_EMBEDDING_MAX_CONCURRENCY: int = 4
     HF_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
 
+    # embedding memoization (wraps the Python vectorizer)
+    EMBEDDING_CACHE: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 4096
+    # SQLite file for a persistent tier; memory only when unset
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+
     CUSTOM_PROPERTIES_FILE_PATH: str = ".weaviate_properties"
     FAILURE_MAPPING_FILE_PATH: str = ".vectorwave_errors.json"
     IGNORE_ERROR_FILE_PATH: str = ".vtwignore"
@@ -67,9 +103,53 @@ class WeaviateSettings(BaseSettings):
 
     SENSITIVE_FIELD_NAMES: str = "password,api_key,token,secret,auth_token"
     sensitive_keys: Set[str] = set()
+    # JSON lists. Keys matching a glob ("*_token") or "re:<regex>" are masked;
+    # value patterns are regexes or presets ("email", "bearer_token", "jwt",
+    # "aws_access_key") replaced by [MASKED] inside string values.
+    SENSITIVE_KEY_PATTERNS: List[str] = []
+    SENSITIVE_VALUE_PATTERNS: List[str] = []
 
     ASYNC_LOGGING: bool = False
 
+    # limits on captured arguments and return values; unlimited when unset.
+    # @vectorize(capture_limits={...}) overrides them per function.
+    CAPTURE_MAX_DEPTH: Optional[int] = None
+    CAPTURE_MAX_BYTES: Optional[int] = None
+    CAPTURE_MAX_LIST_ITEMS: Optional[int] = None
+    CAPTURE_MAX_STRING_LENGTH: Optional[int] = None
+
+    # exact-match (hash) tier checked before embedding on semantic_cache lookups
+    SEMANTIC_CACHE_EXACT_MATCH: bool = True
+    SEMANTIC_CACHE_EXACT_MAX_ENTRIES: int = 1024
+    SEMANTIC_CACHE_EXACT_TTL_SECONDS: float = 60.0
+
+    # in-process vector index queried before the store on semantic_cache lookups
+    SEMANTIC_CACHE_LOCAL_INDEX: bool = False
+    SEMANTIC_CACHE_LOCAL_INDEX_MAX_ROWS: int = 10000
+    SEMANTIC_CACHE_LOCAL_INDEX_TTL_SECONDS: float = 300.0
+
+    # trace sampling, decided at trace_root for the whole trace. Head probability
+    # (SAMPLING_RATES: JSON map of function name or "module.qualname" -> rate) and
+    # a per-root-function rate limit; traces the head drops are still logged
+    # when a span fails or runs slower than SAMPLING_SLOW_PERCENTILE.
+    SAMPLING_RATE: float = 1.0
+    SAMPLING_RATES: Dict[str, float] = {}
+    SAMPLING_MAX_TRACES_PER_SECOND: Optional[float] = None
+    SAMPLING_KEEP_ERRORS: bool = True
+    SAMPLING_KEEP_SLOW: bool = True
+    SAMPLING_SLOW_PERCENTILE: float = 99.0
+    SAMPLING_SLOW_MIN_SAMPLES: int = 100
+
+    # span pipeline (used when ASYNC_LOGGING=True)
+    SPAN_QUEUE_SIZE: int = 10000
+    # "drop_oldest", "drop_newest", "block"
+    SPAN_QUEUE_OVERFLOW_POLICY: str = "drop_oldest"
+    SPAN_QUEUE_BLOCK_TIMEOUT_SECONDS: float = 0.05
+    SPAN_WORKERS: int = 4
+    SPAN_BATCH_SIZE: int = 64
+    # how long a worker waits for a partial batch to fill before embedding it
+    SPAN_BATCH_LINGER_MS: float = 10.0
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra='ignore')
 
 
@@ -0,0 +1,264 @@
+"""Bounded, batched hand-off from the traced call to the background logger.
+
+With ``ASYNC_LOGGING=true`` every finished span used to go through
+``ThreadPoolExecutor.submit``: one Future + lock round-trip per span and an
+unbounded work queue, so a burst of calls could grow process memory without
+limit. ``SpanPipeline`` replaces that with:
+
+- a fixed-capacity ring buffer (``SPAN_QUEUE_SIZE``),
+- an explicit overflow policy (``SPAN_QUEUE_OVERFLOW_POLICY``):
+  ``drop_oldest`` (default), ``drop_newest`` or ``block`` — the latter waits
+  up to ``SPAN_QUEUE_BLOCK_TIMEOUT_SECONDS`` and then drops the new span,
+- ``SPAN_WORKERS`` daemon threads that drain the buffer in micro-batches of
+  up to ``SPAN_BATCH_SIZE`` spans per handler call. A worker that finds a
+  partial batch waits up to ``SPAN_BATCH_LINGER_MS`` for it to fill, so the
+  handler can amortise per-call costs (e.g. one ``embed_batch`` per batch).
+
+Counters (enqueued / processed / dropped / depth) are exposed via
+``stats()`` and surfaced through ``vectorwave.runtime.get_info()``.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class SpanPipeline:
+    """Fixed-capacity span buffer drained by a pool of batch workers.
+
+    ``handler`` is called from a worker thread with a non-empty list of the
+    submitted items (in submission order per worker). Exceptions raised by
+    the handler are logged and swallowed so one bad batch can't kill a worker.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], None],
+        capacity: int = 10000,
+        overflow_policy: str = "drop_oldest",
+        block_timeout: float = 0.05,
+        workers: int = 4,
+        batch_size: int = 64,
+        linger: float = 0.0,
+        thread_name_prefix: str = "VectorWaveLogger",
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{overflow_policy}'. "
+                f"Expected one of: {', '.join(OVERFLOW_POLICIES)}."
+            )
+        if capacity < 1:
+            raise ValueError("SpanPipeline capacity must be >= 1.")
+
+        self._handler = handler
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.batch_size = max(1, batch_size)
+        self.linger = max(0.0, linger)
+
+        self._buffer: Deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        # Waited on only by the lingering worker, so the submit that fills
+        # its batch wakes it rather than a parked worker.
+        self._batch_full = threading.Condition(self._lock)
+        self._stopped = False
+        self._in_flight = 0
+        # True while one worker is waiting for a partial batch to fill; the
+        # other workers stay parked so the batch isn't split between them.
+        self._lingering = False
+
+        # Counters. Mutated under self._lock only.
+        self._enqueued = 0
+        self._processed = 0
+        self._batches = 0
+        self._handler_errors = 0
+        self._dropped_oldest = 0
+        self._dropped_newest = 0
+        self._dropped_timeout = 0
+        self._high_water = 0
+
+        self._workers: List[threading.Thread] = []
+        for i in range(max(1, workers)):
+            t = threading.Thread(
+                target=self._worker_loop, name=f"{thread_name_prefix}_{i}", daemon=True
+            )
+            t.start()
+            self._workers.append(t)
+
+        atexit.register(self.shutdown)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, item: Any) -> bool:
+        """Enqueue ``item``. Returns False if it was dropped instead.
+
+        Under ``drop_oldest`` the new item is always accepted (an older one is
+        evicted to make room), so the return value is True even when a drop
+        was recorded.
+        """
+        with self._lock:
+            if self._stopped:
+                self._record_drop_locked("newest")
+                return False
+
+            if len(self._buffer) >= self.capacity:
+                if self.overflow_policy == "drop_oldest":
+                    self._buffer.popleft()
+                    self._record_drop_locked("oldest")
+                elif self.overflow_policy == "drop_newest":
+                    self._record_drop_locked("newest")
+                    return False
+                else:  # block
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self._buffer) >= self.capacity and not self._stopped:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._not_full.wait(remaining)
+                    if len(self._buffer) >= self.capacity or self._stopped:
+                        self._record_drop_locked("timeout")
+                        return False
+
+            self._buffer.append(item)
+            self._enqueued += 1
+            depth = len(self._buffer)
+            if depth > self._high_water:
+                self._high_water = depth
+            if not self._lingering:
+                self._not_empty.notify()
+            elif depth >= self.batch_size:
+                self._batch_full.notify()
+            return True
+
+    def _record_drop_locked(self, reason: str) -> None:
+        if reason == "oldest":
+            self._dropped_oldest += 1
+        elif reason == "newest":
+            self._dropped_newest += 1
+        else:
+            self._dropped_timeout += 1
+        total = self._dropped_oldest + self._dropped_newest + self._dropped_timeout
+        # Warn on the 1st, 2nd, 4th, 8th, ... drop so a sustained overload is
+        # visible in the logs without emitting one line per lost span.
+        if total & (total - 1) == 0:
+            logger.warning(
+                "🚨 VectorWave span queue is FULL (capacity=%d, policy=%s). "
+                "%d spans dropped so far.",
+                self.capacity, self.overflow_policy, total,
+            )
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._lock:
+                while True:
+                    while not self._buffer and not self._stopped:
+                        self._not_empty.wait()
+                    if not self._buffer:
+                        # Stopped and fully drained.
+                        return
+                    if self.linger and len(self._buffer) < self.batch_size and not self._stopped:
+                        if self._lingering:
+                            self._not_empty.wait()
+                            continue
+                        self._lingering = True
+                        deadline = time.monotonic() + self.linger
+                        while len(self._buffer) < self.batch_size and not self._stopped:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._batch_full.wait(remaining)
+                        self._lingering = False
+                        if not self._buffer:
+                            continue
+                    break
+                n = min(self.batch_size, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(n)]
+                self._in_flight += n
+                if self._buffer:
+                    self._not_empty.notify()
+                self._not_full.notify_all()
+
+            try:
+                self._handler(batch)
+            except Exception as e:
+                logger.error("Span pipeline handler failed for %d spans: %s", len(batch), e)
+                with self._lock:
+                    self._handler_errors += 1
+            finally:
+                with self._lock:
+                    self._in_flight -= n
+                    self._processed += n
+                    self._batches += 1
+                    if not self._buffer and self._in_flight == 0:
+                        self._not_full.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every submitted span has been handled (or ``timeout``).
+
+        Returns True if the pipeline drained in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while self._buffer or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._not_full.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop accepting spans, drain what is buffered and join the workers.
+        Idempotent, so the atexit hook and an explicit call can both run."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._not_empty.notify_all()
+            self._batch_full.notify_all()
+            self._not_full.notify_all()
+        deadline = time.monotonic() + timeout
+        for t in self._workers:
+            t.join(max(0.0, deadline - time.monotonic()))
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            dropped = self._dropped_oldest + self._dropped_newest + self._dropped_timeout
+            return {
+                "policy": self.overflow_policy,
+                "capacity": self.capacity,
+                "workers": len(self._workers),
+                "batch_size": self.batch_size,
+                "linger_ms": self.linger * 1000.0,
+                "depth": len(self._buffer),
+                "in_flight": self._in_flight,
+                "high_water": self._high_water,
+                "enqueued": self._enqueued,
+                "processed": self._processed,
+                "batches": self._batches,
+                "handler_errors": self._handler_errors,
+                "dropped": dropped,
+                "dropped_oldest": self._dropped_oldest,
+                "dropped_newest": self._dropped_newest,
+                "dropped_timeout": self._dropped_timeout,
+            }
@@ -0,0 +1,205 @@
+"""Trace sampling decided at ``trace_root``.
+
+Every traced call used to become a full span: masking, embedding and a DB
+row. ``Sampler`` decides once per trace, when the root starts, and the
+decision rides on the ``TraceCollector`` in ``current_tracer_var`` so a
+whole trace is kept or dropped together:
+
+- head sampling: a trace is kept with probability ``SAMPLING_RATE``
+  (``SAMPLING_RATES`` per root function, ``trace_root(sample_rate=...)``),
+- rate limiting: at most ``SAMPLING_MAX_TRACES_PER_SECOND`` traces per root
+  function are kept (token bucket, bursts of up to one second's worth),
+- tail sampling: a trace the head dropped is *deferred* instead when
+  ``SAMPLING_KEEP_ERRORS`` / ``SAMPLING_KEEP_SLOW`` is on. Its spans are
+  buffered (unmasked, unembedded) until the root returns and are logged only
+  if one of them failed or ran slower than its function's
+  ``SAMPLING_SLOW_PERCENTILE`` latency over the recent deferred calls.
+
+With the defaults (rate 1.0, no limit) every trace is kept and the tracer
+takes its old path. Counters are exposed under
+``runtime.get_info().stats["sampling"]``.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from ..models.db_config import get_weaviate_settings
+
+# Decisions returned by Sampler.decide().
+KEEP = "keep"
+DROP = "drop"
+DEFER = "defer"
+
+
+class _LatencyWindow:
+    """The last ``size`` durations of one function and their percentile,
+    re-sorted every ``size // 16`` observations rather than on each one."""
+
+    __slots__ = ("samples", "threshold", "_pending", "_every")
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.threshold: Optional[float] = None
+        self._pending = 0
+        self._every = max(1, size // 16)
+
+    def add(self, duration: float, percentile: float, min_samples: int) -> None:
+        self.samples.append(duration)
+        self._pending += 1
+        if self._pending >= self._every and len(self.samples) >= min_samples:
+            self._pending = 0
+            ordered = sorted(self.samples)
+            index = min(len(ordered) - 1, int(len(ordered) * percentile / 100.0))
+            self.threshold = ordered[index]
+
+
+class Sampler:
+    """Per-trace keep/drop decisions plus the state behind them (token
+    buckets per root function, latency windows per traced function)."""
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        rates: Optional[Dict[str, float]] = None,
+        max_traces_per_second: Optional[float] = None,
+        keep_errors: bool = True,
+        keep_slow: bool = True,
+        slow_percentile: float = 99.0,
+        slow_min_samples: int = 100,
+        latency_window: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.rate = rate
+        self.rates = dict(rates or {})
+        self.max_traces_per_second = max_traces_per_second
+        self.keep_errors = keep_errors
+        self.keep_slow = keep_slow
+        self.slow_percentile = slow_percentile
+        self.slow_min_samples = max(1, slow_min_samples)
+        self.latency_window = max(1, latency_window)
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        # root name -> [tokens, last refill]
+        self._buckets: Dict[str, list] = {}
+        # traced function -> latency window
+        self._latencies: Dict[Any, _LatencyWindow] = {}
+        self._counts = {
+            "kept": 0, "dropped": 0, "rate_limited": 0,
+            "deferred": 0, "kept_by_tail": 0, "dropped_spans": 0,
+        }
+
+    @property
+    def tail(self) -> bool:
+        return self.keep_errors or self.keep_slow
+
+    def rate_for(self, names: Iterable[str]) -> float:
+        """The head probability for a root known by ``names`` (most
+        specific first, e.g. ``("pkg.mod.func", "func")``)."""
+        if self.rates:
+            for name in names:
+                if name in self.rates:
+                    return self.rates[name]
+        return self.rate
+
+    def decide(
+        self,
+        names: tuple,
+        rate: Optional[float] = None,
+        max_traces_per_second: Optional[float] = None,
+    ) -> str:
+        """KEEP, DROP or DEFER (tail sampling pending) for a new trace rooted
+        at the function known by ``names``; decorator arguments win over the
+        settings."""
+        if rate is None:
+            rate = self.rate_for(names)
+        limit = self.max_traces_per_second if max_traces_per_second is None else max_traces_per_second
+        if rate >= 1.0 and limit is None:
+            return KEEP
+
+        keep = rate >= 1.0 or (rate > 0.0 and self._rng() < rate)
+        with self._lock:
+            if keep and limit is not None and not self._take_token(names[0], limit):
+                keep = False
+                self._counts["rate_limited"] += 1
+            if keep:
+                self._counts["kept"] += 1
+                return KEEP
+            if self.tail:
+                self._counts["deferred"] += 1
+                return DEFER
+            self._counts["dropped"] += 1
+            return DROP
+
+    def _take_token(self, key: str, per_second: float) -> bool:
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        burst = max(1.0, per_second)
+        if bucket is None:
+            bucket = self._buckets[key] = [burst, now]
+        else:
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * per_second)
+            bucket[1] = now
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True
+        return False
+
+    def should_keep_span(self, func: Any, duration: float, failed: bool) -> bool:
+        """Records a deferred span's duration and says whether it alone is
+        reason to keep its trace (it failed, or it is slow for ``func``)."""
+        if failed and self.keep_errors:
+            return True
+        if not self.keep_slow:
+            return False
+        with self._lock:
+            window = self._latencies.get(func)
+            if window is None:
+                window = self._latencies[func] = _LatencyWindow(self.latency_window)
+            threshold = window.threshold
+            window.add(duration, self.slow_percentile, self.slow_min_samples)
+        return threshold is not None and duration > threshold
+
+    def record_deferred(self, kept: bool, spans: int) -> None:
+        with self._lock:
+            if kept:
+                self._counts["kept_by_tail"] += 1
+            else:
+                self._counts["dropped"] += 1
+                self._counts["dropped_spans"] += spans
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counts)
+        stats["rate"] = self.rate
+        stats["max_traces_per_second"] = self.max_traces_per_second
+        stats["keep_errors"] = self.keep_errors
+        stats["keep_slow"] = self.keep_slow
+        return stats
+
+
+@lru_cache()
+def get_sampler() -> Sampler:
+    """Returns the process-wide sampler built from the ``SAMPLING_*`` settings."""
+    settings = get_weaviate_settings()
+    sampler = Sampler(
+        rate=settings.SAMPLING_RATE,
+        rates=settings.SAMPLING_RATES,
+        max_traces_per_second=settings.SAMPLING_MAX_TRACES_PER_SECOND,
+        keep_errors=settings.SAMPLING_KEEP_ERRORS,
+        keep_slow=settings.SAMPLING_KEEP_SLOW,
+        slow_percentile=settings.SAMPLING_SLOW_PERCENTILE,
+        slow_min_samples=settings.SAMPLING_SLOW_MIN_SAMPLES,
+    )
+    try:
+        from ..runtime import register_stats_provider
+        register_stats_provider("sampling", sampler.stats)
+    except Exception:
+        pass
+    return sampler
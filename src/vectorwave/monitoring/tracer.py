@@ -1,34 +1,44 @@
 import logging
 import inspect
+import itertools
+import os
 import threading
 import time
 import traceback
-import json
-from dataclasses import dataclass
 from functools import wraps, lru_cache
 from contextvars import ContextVar
 from typing import Optional, List, Dict, Any, Callable
 from uuid import uuid4
 from datetime import datetime, timezone
-from concurrent.futures import ThreadPoolExecutor
 
-import vectorwave.vectorwave_core as vectorwave_core
 from .alert.base import BaseAlerter
+from .pipeline import SpanPipeline, OVERFLOW_POLICIES
+from .sampling import DEFER, DROP, get_sampler
 from ..batch.batch import get_batch_manager
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 from .alert.factory import get_alerter
 from ..vectorizer.factory import get_vectorizer
 from ..database.db_search import check_semantic_drift
 from ..utils.context import execution_source_context
-from ..utils.serialization import deserialize_return_value as _deserialize_return_value
+from ..utils.semantic_index import get_semantic_index
+from ..utils.serialization import deserialize_return_value as _deserialize_return_value, encode_return_value, \
+    mask_value, CaptureLimits
+from ..utils.masking import MASKED, as_masker, get_masker
+from ..utils.arg_binding import BindingPlan
 
 logger = logging.getLogger(__name__)
 
-# Global executor for background logging
-_background_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="VectorWaveLogger")
-
 
 class TraceCollector:
+    # Sampling decision made at trace_root: True logs spans, False skips
+    # them, None defers them into `deferred` until the root returns and the
+    # tail decides (see monitoring.sampling). Class-level defaults; only a
+    # dropped or deferred trace sets its own.
+    sampled: Optional[bool] = True
+    deferred: Optional[List[tuple]] = None
+    keep_deferred: bool = False
+    _defer_lock: Optional[threading.Lock] = None
+
     def __init__(self, trace_id: str):
         self.trace_id = trace_id
         self.settings: WeaviateSettings = get_weaviate_settings()
@@ -41,27 +51,111 @@ class TraceCollector:
 
 
 current_tracer_var: ContextVar[Optional[TraceCollector]] = ContextVar('current_tracer', default=None)
-current_span_id_var: ContextVar[Optional[str]] = ContextVar('current_span_id', default=None)
+# The active span's id as issued by _next_span_id (see format_span_id).
+current_span_id_var: ContextVar[Optional[int]] = ContextVar('current_span_id', default=None)
+# ``(exact_cache, key, function_name)`` set by the semantic cache on a miss and
+# taken by the next span, which stores its encoded return value under ``key``
+# when it is logged instead of the caller encoding the result a second time.
+pending_exact_store_var: ContextVar[Optional[tuple]] = ContextVar('pending_exact_store', default=None)
+
+
+def _reset_span_ids() -> None:
+    """Span ids are a random 64-bit per-process prefix followed by a 64-bit
+    counter, kept as one int until the span is logged (see format_span_id).
+    Re-seeded in forked children so they never reuse the parent's ids."""
+    global _next_span_id
+    _next_span_id = itertools.count((int.from_bytes(os.urandom(8), "big") << 64) + 1).__next__
+
+
+_next_span_id: Callable[[], int]
+_reset_span_ids()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_span_ids)
+
+
+def format_span_id(span_id: Any) -> Optional[str]:
+    """The stored form of a span id: 32 hex characters (like ``uuid4().hex``).
+    Ids that are already strings (e.g. set by callers) pass through."""
+    if isinstance(span_id, int):
+        return f"{span_id:032x}"
+    return span_id
+
+
+def new_span_id() -> str:
+    """A fresh id, in stored form, for spans logged outside ``trace_span``
+    (looked up at call time: forked children rebind ``_next_span_id``)."""
+    return format_span_id(_next_span_id())
 
 
-@dataclass
 class SpanContext:
-    """Bundles all per-span logging data to avoid long parameter lists."""
-    tracer: TraceCollector
-    func: Callable
-    start_time: float
-    status: str
-    error_msg: Optional[str]
-    error_code: Optional[str]
-    my_span_id: str
-    parent_span_id: Optional[str]
-    capture_return_value: bool
-    result: Any
-    attributes_to_capture: Optional[List[str]]
-    args: tuple
-    kwargs: Dict[str, Any]  # shallow-copied at creation to avoid race conditions
-    exec_source: Optional[str]
-    enable_alert: bool = True
+    """Bundles all per-span logging data to avoid long parameter lists.
+
+    Built on the caller's thread for every span, so it is a plain
+    ``__slots__`` record. A failed call keeps its ``exc_info``; the traceback
+    text (``error_msg``) is only formatted when the span is logged.
+    """
+    __slots__ = (
+        "tracer", "func", "start_time", "status", "_error_msg", "error_code",
+        "my_span_id", "parent_span_id", "capture_return_value", "result",
+        "attributes_to_capture", "args", "kwargs", "exec_source", "enable_alert",
+        "capture_limits", "end_time", "exc_info", "binding_plan", "exact_store",
+    )
+
+    def __init__(
+            self,
+            tracer: TraceCollector,
+            func: Callable,
+            start_time: float,
+            status: str,
+            error_msg: Optional[str],
+            error_code: Optional[str],
+            my_span_id: Any,
+            parent_span_id: Any,
+            capture_return_value: bool,
+            result: Any,
+            attributes_to_capture: Optional[List[str]],
+            args: tuple,
+            kwargs: Dict[str, Any],  # shallow-copied at creation to avoid race conditions
+            exec_source: Optional[str],
+            enable_alert: bool = True,
+            # Per-decorator overrides of the CAPTURE_MAX_* settings.
+            capture_limits: Optional[Dict[str, Optional[int]]] = None,
+            # Captured on the caller's thread so queueing delay in the span
+            # pipeline doesn't inflate duration_ms.
+            end_time: Optional[float] = None,
+            exc_info: Optional[tuple] = None,
+            # trace_span's precomputed plan for attributes_to_capture.
+            binding_plan: Optional[BindingPlan] = None,
+            # pending_exact_store_var taken by this span.
+            exact_store: Optional[tuple] = None,
+    ):
+        self.tracer = tracer
+        self.func = func
+        self.start_time = start_time
+        self.status = status
+        self._error_msg = error_msg
+        self.error_code = error_code
+        self.my_span_id = my_span_id
+        self.parent_span_id = parent_span_id
+        self.capture_return_value = capture_return_value
+        self.result = result
+        self.attributes_to_capture = attributes_to_capture
+        self.args = args
+        self.kwargs = kwargs
+        self.exec_source = exec_source
+        self.enable_alert = enable_alert
+        self.capture_limits = capture_limits
+        self.end_time = end_time
+        self.exc_info = exc_info
+        self.binding_plan = binding_plan
+        self.exact_store = exact_store
+
+    @property
+    def error_msg(self) -> Optional[str]:
+        if self._error_msg is None and self.exc_info is not None:
+            self._error_msg = "".join(traceback.format_exception(*self.exc_info))
+            self.exc_info = None  # release the frames once formatted
+        return self._error_msg
 
 
 @lru_cache(maxsize=2048)
@@ -69,50 +163,46 @@ def _get_cached_signature(func: Callable) -> inspect.Signature:
     return inspect.signature(func)
 
 
+@lru_cache(maxsize=2048)
+def _get_binding_plan(func: Callable, attributes_to_capture: tuple) -> Optional[BindingPlan]:
+    return BindingPlan.for_function(func, attributes_to_capture)
+
+
 def _capture_span_attributes(
         attributes_to_capture: Optional[List[str]],
         args: tuple,
         kwargs: Dict[str, Any],
         func: Callable,
-        sensitive_keys: set
+        sensitive_keys: Any,
+        limits: Optional[CaptureLimits] = None,
+        plan: Optional[BindingPlan] = None
 ) -> Dict[str, Any]:
     """
-    Captures attribute values using cached function signature for performance.
+    Captures attribute values through the function's precomputed binding
+    plan (built here and cached when `plan` isn't given).
+    `sensitive_keys` is a compiled masker (see utils.masking) or a set of key names.
     """
     captured_attributes = {}
     if not attributes_to_capture:
         return captured_attributes
 
     try:
-        # 1. Use Cached Signature (Fast)
-        sig = _get_cached_signature(func)
-        valid_param_names = set(sig.parameters.keys())
-
-        # Filter kwargs
-        sig_kwargs = {k: v for k, v in kwargs.items() if k in valid_param_names}
-
-        # Bind arguments
-        bound = sig.bind(*args, **sig_kwargs)
-        bound.apply_defaults()
-
-        all_values = bound.arguments.copy()
-
-        # 2. Merge extra tags (e.g., 'team', 'run_id')
-        for key, value in kwargs.items():
-            if key not in all_values and key in attributes_to_capture:
-                all_values[key] = value
-
-        # 3. Process & Mask
-        for attr_name in attributes_to_capture:
-            if attr_name in all_values:
-                raw_value = all_values[attr_name]
-
-                if attr_name.lower() in sensitive_keys:
-                    processed_value = "[MASKED]"
-                else:
-                    processed_value = vectorwave_core.mask_and_serialize(raw_value, list(sensitive_keys))
-
-                captured_attributes[attr_name] = processed_value
+        # 1. Look up the values (parameters, then extra tags like 'team', 'run_id')
+        if plan is None:
+            plan = _get_binding_plan(func, tuple(attributes_to_capture))
+        if plan is None:
+            raise TypeError("signature is not inspectable")
+        all_values = plan.bind(args, kwargs)
+
+        # 2. Process & Mask
+        masker = as_masker(sensitive_keys)
+        for attr_name, raw_value in all_values.items():
+            if masker.is_sensitive(attr_name):
+                processed_value = MASKED
+            else:
+                processed_value = mask_value(raw_value, masker, limits)
+
+            captured_attributes[attr_name] = processed_value
 
     except Exception as e:
         logger.warning("Failed to capture attributes for '%s': %s", func.__name__, e)
@@ -152,9 +242,10 @@ def _create_span_properties(
         parent_span_id: Optional[str],
         capture_return_value: bool,
         result: Optional[Any],
-        exec_source: Optional[str]
+        exec_source: Optional[str],
+        end_time: Optional[float] = None
 ) -> Dict[str, Any]:
-    duration_ms = (time.perf_counter() - start_time) * 1000
+    duration_ms = ((end_time if end_time is not None else time.perf_counter()) - start_time) * 1000
 
     return_value_to_log = None
     if capture_return_value and status == "SUCCESS" and result is not None:
@@ -165,8 +256,8 @@ def _create_span_properties(
 
     span_properties = {
         "trace_id": tracer.trace_id,
-        "span_id": my_span_id,
-        "parent_span_id": parent_span_id,
+        "span_id": format_span_id(my_span_id),
+        "parent_span_id": format_span_id(parent_span_id),
         "function_name": func.__name__,
         "timestamp_utc": datetime.now(timezone.utc).isoformat(),
         "duration_ms": duration_ms,
@@ -188,19 +279,22 @@ def _create_input_vector_data(
         func_name: str,
         args: tuple,
         kwargs: Dict[str, Any],
-        sensitive_keys: set
+        sensitive_keys: Any,
+        limits: Optional[CaptureLimits] = None
 ) -> Dict[str, Any]:
-    processed_args = vectorwave_core.mask_and_serialize(list(args), list(sensitive_keys))
-    processed_kwargs = vectorwave_core.mask_and_serialize(kwargs, list(sensitive_keys))
+    # Depth and item limits count from the args list / kwargs dict.
+    masker = as_masker(sensitive_keys)
+    processed_args = mask_value(list(args), masker, limits)
+    processed_kwargs = mask_value(kwargs, masker, limits)
 
     texts_for_vector = [f"Function Context: {func_name}"]
 
     for val in processed_args:
-        if val != "[MASKED]":
+        if val != MASKED:
             texts_for_vector.append(str(val))
 
     for key, val in processed_kwargs.items():
-        if val != "[MASKED]":
+        if val != MASKED:
             texts_for_vector.append(f"{key}: {val}")
 
     vector_text = " ".join(texts_for_vector)
@@ -217,50 +311,72 @@ def _create_input_vector_data(
     }
 
 
-def _perform_background_logging(ctx: SpanContext):
+def _capture_limits(ctx: SpanContext) -> CaptureLimits:
+    return CaptureLimits.from_settings(ctx.tracer.settings, ctx.capture_limits)
+
+
+# Default for `_perform_background_logging(vector=...)`: embed inline.
+_EMBED_INLINE = object()
+
+
+def _embedding_text_for_span(ctx: SpanContext) -> Optional[str]:
+    """Text stored as the span's vector. Successful calls embed the input
+    args (used by semantic cache + drift detection); failed calls embed the
+    error message (used by search_errors_by_message). Mutually exclusive."""
+    if ctx.status == "SUCCESS" and ctx.capture_return_value:
+        input_vector_data = _create_input_vector_data(
+            func_name=ctx.func.__name__,
+            args=ctx.args,
+            kwargs=ctx.kwargs,
+            sensitive_keys=get_masker(ctx.tracer.settings),
+            limits=_capture_limits(ctx)
+        )
+        return input_vector_data['text']
+    if ctx.status != "SUCCESS":
+        return str(ctx.error_msg)
+    return None
+
+
+def _perform_background_logging(ctx: SpanContext, vector: Any = _EMBED_INLINE):
     """
     Executes logging tasks (Vectorization, DB Insert, Drift Check) in the background.
     Receives a SpanContext whose kwargs is already shallow-copied (race-condition safe).
+
+    `vector` lets the batch path pass an embedding computed for many spans at
+    once (None means "no vector"); by default the span is embedded here.
     """
     try:
+        limits = _capture_limits(ctx)
+        masker = get_masker(ctx.tracer.settings)
+
         # 1. Capture Attributes (Parsing inputs)
         captured_attributes = _capture_span_attributes(
-            ctx.attributes_to_capture, ctx.args, ctx.kwargs, ctx.func,
-            ctx.tracer.settings.sensitive_keys
+            ctx.attributes_to_capture, ctx.args, ctx.kwargs, ctx.func, masker, limits,
+            ctx.binding_plan
         )
 
         vector_to_add: Optional[List[float]] = None
         return_value_log: Optional[str] = None
-        vectorizer = get_vectorizer()
 
-        # 2. Vectorize for storage. Successful calls embed the input args (used
-        # by semantic cache + drift detection); failed calls embed the error
-        # message (used by search_errors_by_message). Mutually exclusive — the
-        # earlier code computed both and silently overwrote the input vector.
-        if vectorizer is not None:
-            try:
-                if ctx.status == "SUCCESS" and ctx.capture_return_value:
-                    input_vector_data = _create_input_vector_data(
-                        func_name=ctx.func.__name__,
-                        args=ctx.args,
-                        kwargs=ctx.kwargs,
-                        sensitive_keys=ctx.tracer.settings.sensitive_keys
-                    )
-                    vector_to_add = vectorizer.embed(input_vector_data['text'])
-                elif ctx.status != "SUCCESS":
-                    vector_to_add = vectorizer.embed(str(ctx.error_msg))
-            except Exception as ve:
-                logger.warning(f"Failed to vectorize span for '{ctx.func.__name__}': {ve}")
+        # 2. Vectorize for storage
+        if vector is not _EMBED_INLINE:
+            vector_to_add = vector
+        else:
+            vectorizer = get_vectorizer()
+            if vectorizer is not None:
+                try:
+                    text = _embedding_text_for_span(ctx)
+                    if text is not None:
+                        vector_to_add = vectorizer.embed(text)
+                except Exception as ve:
+                    logger.warning(f"Failed to vectorize span for '{ctx.func.__name__}': {ve}")
 
         # 3. Process Result
         if ctx.status == "SUCCESS" and ctx.capture_return_value:
-            processed_result = vectorwave_core.mask_and_serialize(
-                ctx.result, list(ctx.tracer.settings.sensitive_keys)
-            )
-            try:
-                return_value_log = json.dumps(processed_result)
-            except TypeError:
-                return_value_log = str(processed_result)
+            return_value_log = encode_return_value(ctx.result, masker, limits)
+            if ctx.exact_store is not None:
+                exact_cache, key, function_name = ctx.exact_store
+                exact_cache.put(key, function_name, return_value_log)
 
         # 5. Create Span Properties
         span_properties = _create_span_properties(
@@ -275,7 +391,8 @@ def _perform_background_logging(ctx: SpanContext):
             parent_span_id=ctx.parent_span_id,
             capture_return_value=ctx.capture_return_value,
             result=return_value_log if ctx.status == "SUCCESS" else None,
-            exec_source=ctx.exec_source
+            exec_source=ctx.exec_source,
+            end_time=ctx.end_time
         )
 
         # 6. Alerting (If Failure). Lock the check-and-set so concurrent
@@ -327,6 +444,14 @@ def _perform_background_logging(ctx: SpanContext):
             except Exception as e:
                 logger.error("Failed to log span: %s", e)
 
+            # Keep the local semantic-cache index in step with what we log.
+            if vector_to_add and span_properties["status"] == "SUCCESS" and ctx.capture_return_value:
+                local_index = get_semantic_index()
+                if local_index is not None:
+                    local_index.add_execution(
+                        ctx.func.__name__, span_properties["span_id"], vector_to_add, span_properties
+                    )
+
         # 9. Optional OTel mirror (issue #29). Emits an equivalent span to
         # whatever OTel exporter is configured so traces show up in Jaeger /
         # Tempo / DataDog alongside the Weaviate row. No-op unless
@@ -352,9 +477,84 @@ def _perform_background_logging(ctx: SpanContext):
         logger.error(f"Background logging failed for '{ctx.func.__name__}': {e}")
 
 
-def _init_trace_root(kwargs: Dict[str, Any], func: Callable):
+def _embed_span_batch(batch: List[SpanContext]) -> List[Any]:
+    """Embeds every span in `batch` with a single `embed_batch` call.
+
+    Returns one entry per span: the vector, None (nothing to embed), or
+    `_EMBED_INLINE` when the batch call failed so the span falls back to
+    per-span embedding. Identical texts (e.g. repeated error messages) are
+    embedded once.
+    """
+    vectorizer = get_vectorizer()
+    if vectorizer is None:
+        return [None] * len(batch)
+
+    texts: List[Optional[str]] = []
+    for ctx in batch:
+        try:
+            texts.append(_embedding_text_for_span(ctx))
+        except Exception as ve:
+            logger.warning(f"Failed to vectorize span for '{ctx.func.__name__}': {ve}")
+            texts.append(None)
+
+    unique_texts = list(dict.fromkeys(t for t in texts if t is not None))
+    if not unique_texts:
+        return [None] * len(batch)
+
+    try:
+        vectors = vectorizer.embed_batch(unique_texts)
+        if len(vectors) != len(unique_texts):
+            raise ValueError(f"expected {len(unique_texts)} vectors, got {len(vectors)}")
+    except Exception as ve:
+        logger.warning(f"Batch vectorization of {len(unique_texts)} spans failed, embedding one by one: {ve}")
+        return [_EMBED_INLINE if t is not None else None for t in texts]
+
+    # Empty vectors come back from OpenAIVectorizer for per-item failures.
+    by_text = {t: (list(v) if v is not None and len(v) else None) for t, v in zip(unique_texts, vectors)}
+    return [by_text[t] if t is not None else None for t in texts]
+
+
+def _perform_background_logging_batch(batch: List[SpanContext]):
+    """SpanPipeline handler: embeds a micro-batch of spans in one vectorizer
+    call, then logs each span with its own vector."""
+    vectors = _embed_span_batch(batch)
+    for ctx, vector in zip(batch, vectors):
+        _perform_background_logging(ctx, vector=vector)
+
+
+@lru_cache(maxsize=1)
+def _get_span_pipeline() -> SpanPipeline:
+    """Lazily builds the process-wide span pipeline on the first async span."""
+    settings = get_weaviate_settings()
+    policy = settings.SPAN_QUEUE_OVERFLOW_POLICY.lower()
+    if policy not in OVERFLOW_POLICIES:
+        logger.warning(
+            "Unknown SPAN_QUEUE_OVERFLOW_POLICY '%s'. Falling back to 'drop_oldest'.", policy
+        )
+        policy = "drop_oldest"
+    pipeline = SpanPipeline(
+        handler=_perform_background_logging_batch,
+        capacity=settings.SPAN_QUEUE_SIZE,
+        overflow_policy=policy,
+        block_timeout=settings.SPAN_QUEUE_BLOCK_TIMEOUT_SECONDS,
+        workers=settings.SPAN_WORKERS,
+        batch_size=settings.SPAN_BATCH_SIZE,
+        linger=settings.SPAN_BATCH_LINGER_MS / 1000.0,
+    )
+    try:
+        from ..runtime import register_stats_provider
+        register_stats_provider("span_pipeline", pipeline.stats)
+    except Exception:
+        pass
+    return pipeline
+
+
+def _init_trace_root(kwargs: Dict[str, Any], func: Callable, sampling: Optional[tuple] = None):
     """Setup for trace_root. Returns token or None if already inside a trace.
 
+    `sampling` is `(names, sample_rate, max_traces_per_second)`; the sampler's
+    decision is stored on the new TraceCollector.
+
     `trace_id` is a reserved kwarg that the tracer consumes to set the trace
     id, but if the wrapped function declares its own `trace_id` parameter we
     leave it in kwargs and just read its value so the function still receives
@@ -374,60 +574,131 @@ def _init_trace_root(kwargs: Dict[str, Any], func: Callable):
         trace_id = kwargs.pop("trace_id", None) or str(uuid4())
 
     tracer = TraceCollector(trace_id=trace_id)
+    if sampling is None:
+        sampling = (_sampling_names(func), None, None)
+    decision = get_sampler().decide(*sampling)
+    if decision == DROP:
+        tracer.sampled = False
+    elif decision == DEFER:
+        tracer.sampled = None
+        tracer.deferred = []
+        tracer._defer_lock = threading.Lock()
     token = current_tracer_var.set(tracer)
     current_span_id_var.set(None)
     return token
 
 
-def trace_root() -> Callable:
+def _sampling_names(func: Callable) -> tuple:
+    name = getattr(func, "__name__", repr(func))
+    return f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', name)}", name
+
+
+def _end_trace_root(token) -> None:
+    tracer = current_tracer_var.get()
+    current_tracer_var.reset(token)
+    if tracer.sampled is None:
+        _finish_deferred_trace(tracer)
+
+
+def trace_root(
+        sample_rate: Optional[float] = None,
+        max_traces_per_second: Optional[float] = None
+) -> Callable:
+    """
+    Starts a trace for calls made outside one. `sample_rate` and
+    `max_traces_per_second` override the SAMPLING_RATE(S) /
+    SAMPLING_MAX_TRACES_PER_SECOND settings for traces rooted here.
+    """
     def decorator(func: Callable) -> Callable:
+        sampling = (_sampling_names(func), sample_rate, max_traces_per_second)
+
         if inspect.iscoroutinefunction(func):
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
-                token = _init_trace_root(kwargs, func)
+                token = _init_trace_root(kwargs, func, sampling)
                 if token is None:
                     return await func(*args, **kwargs)
                 try:
                     return await func(*args, **kwargs)
                 finally:
-                    current_tracer_var.reset(token)
+                    _end_trace_root(token)
             return async_wrapper
         else:
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
-                token = _init_trace_root(kwargs, func)
+                token = _init_trace_root(kwargs, func, sampling)
                 if token is None:
                     return func(*args, **kwargs)
                 try:
                     return func(*args, **kwargs)
                 finally:
-                    current_tracer_var.reset(token)
+                    _end_trace_root(token)
             return sync_wrapper
     return decorator
 
 
-def _dispatch_span_logging(ctx: SpanContext, use_async: bool, token):
-    """Dispatches logging (sync or async) and resets the span context."""
+def _log_span(ctx: SpanContext, use_async: bool) -> None:
     try:
         if use_async:
-            _background_executor.submit(_perform_background_logging, ctx)
+            _get_span_pipeline().submit(ctx)
         else:
             _perform_background_logging(ctx)
     except Exception as log_e:
         logger.error(f"Error dispatching log for {ctx.func.__name__}: {log_e}")
+
+
+def _dispatch_span_logging(ctx: SpanContext, use_async: bool, token):
+    """Dispatches logging (sync or async) and resets the span context."""
+    try:
+        if ctx.tracer.sampled:
+            _log_span(ctx, use_async)
+        else:
+            _defer_span(ctx, use_async)
     finally:
         current_span_id_var.reset(token)
 
 
+def _defer_span(ctx: SpanContext, use_async: bool) -> None:
+    """Holds a span of a trace awaiting its tail-sampling decision. Spans
+    finishing after the root (e.g. in tasks it spawned) follow the decision."""
+    tracer = ctx.tracer
+    keep = get_sampler().should_keep_span(ctx.func, ctx.end_time - ctx.start_time, ctx.status != "SUCCESS")
+    with tracer._defer_lock:
+        if tracer.deferred is not None:
+            tracer.deferred.append((ctx, use_async))
+            tracer.keep_deferred = tracer.keep_deferred or keep
+            return
+        late_keep = tracer.sampled
+    if late_keep:
+        _log_span(ctx, use_async)
+
+
+def _finish_deferred_trace(tracer: TraceCollector) -> None:
+    """Tail decision at the end of a deferred trace: log its buffered spans
+    if any of them failed or was slow, otherwise drop them."""
+    with tracer._defer_lock:
+        spans, tracer.deferred = tracer.deferred, None
+        keep = tracer.sampled = tracer.keep_deferred
+    get_sampler().record_deferred(keep, len(spans))
+    if keep:
+        for ctx, use_async in spans:
+            _log_span(ctx, use_async)
+
+
 def trace_span(
         _func: Optional[Callable] = None,
         *,
         attributes_to_capture: Optional[List[str]] = None,
         capture_return_value: bool = False,
         force_sync: bool = False,
-        enable_alert: bool = True
+        enable_alert: bool = True,
+        capture_limits: Optional[Dict[str, Optional[int]]] = None
 ) -> Callable:
+    if capture_limits:
+        CaptureLimits(**capture_limits)  # reject unknown limit names at decoration time
+
     def decorator(func: Callable) -> Callable:
+        binding_plan = BindingPlan.for_function(func, attributes_to_capture) if attributes_to_capture else None
 
         def should_use_async(tracer):
             return tracer.settings.ASYNC_LOGGING and not force_sync
@@ -436,17 +707,20 @@ def trace_span(
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
                 tracer = current_tracer_var.get()
-                if tracer is None:
+                if tracer is None or tracer.sampled is False:
                     return await func(*args, **kwargs)
 
                 parent_span_id = current_span_id_var.get()
-                my_span_id = str(uuid4())
+                my_span_id = _next_span_id()
                 token = current_span_id_var.set(my_span_id)
                 exec_source = execution_source_context.get()
+                exact_store = pending_exact_store_var.get()
+                if exact_store is not None:
+                    pending_exact_store_var.set(None)  # nested spans must not take it
 
                 start_time = time.perf_counter()
                 status = "SUCCESS"
-                error_msg = None
+                exc_info = None
                 error_code = None
                 result = None
 
@@ -454,22 +728,23 @@ def trace_span(
                     result = await func(*args, **kwargs)
                 except Exception as e:
                     status = "ERROR"
-                    error_msg = traceback.format_exc()
+                    # Formatted lazily by the logging side (SpanContext.error_msg).
+                    exc_info = (type(e), e, e.__traceback__)
                     error_code = _determine_error_code(tracer, e)
                     if error_code in tracer.settings.ignored_error_codes:
                         status = "FAILURE"
                         tracer.alert_sent = True
                     raise e
                 finally:
+                    # Positional: keyword binding of 20 arguments costs more
+                    # than the rest of the span on this path.
                     ctx = SpanContext(
-                        tracer=tracer, func=func, start_time=start_time,
-                        status=status, error_msg=error_msg, error_code=error_code,
-                        my_span_id=my_span_id, parent_span_id=parent_span_id,
-                        capture_return_value=capture_return_value, result=result,
-                        attributes_to_capture=attributes_to_capture,
-                        args=args, kwargs=kwargs.copy(),  # shallow copy guards against caller mutation
-                        exec_source=exec_source,
-                        enable_alert=enable_alert
+                        tracer, func, start_time, status, None, error_code,
+                        my_span_id, parent_span_id, capture_return_value, result,
+                        attributes_to_capture,
+                        args, kwargs.copy(),  # shallow copy guards against caller mutation
+                        exec_source, enable_alert, capture_limits,
+                        time.perf_counter(), exc_info, binding_plan, exact_store
                     )
                     _dispatch_span_logging(ctx, should_use_async(tracer), token)
                 return result
@@ -479,17 +754,20 @@ def trace_span(
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
                 tracer = current_tracer_var.get()
-                if tracer is None:
+                if tracer is None or tracer.sampled is False:
                     return func(*args, **kwargs)
 
                 parent_span_id = current_span_id_var.get()
-                my_span_id = str(uuid4())
+                my_span_id = _next_span_id()
                 token = current_span_id_var.set(my_span_id)
                 exec_source = execution_source_context.get()
+                exact_store = pending_exact_store_var.get()
+                if exact_store is not None:
+                    pending_exact_store_var.set(None)  # nested spans must not take it
 
                 start_time = time.perf_counter()
                 status = "SUCCESS"
-                error_msg = None
+                exc_info = None
                 error_code = None
                 result = None
 
@@ -497,22 +775,23 @@ def trace_span(
                     result = func(*args, **kwargs)
                 except Exception as e:
                     status = "ERROR"
-                    error_msg = traceback.format_exc()
+                    # Formatted lazily by the logging side (SpanContext.error_msg).
+                    exc_info = (type(e), e, e.__traceback__)
                     error_code = _determine_error_code(tracer, e)
                     if error_code in tracer.settings.ignored_error_codes:
                         status = "FAILURE"
                         tracer.alert_sent = True
                     raise e
                 finally:
+                    # Positional: keyword binding of 20 arguments costs more
+                    # than the rest of the span on this path.
                     ctx = SpanContext(
-                        tracer=tracer, func=func, start_time=start_time,
-                        status=status, error_msg=error_msg, error_code=error_code,
-                        my_span_id=my_span_id, parent_span_id=parent_span_id,
-                        capture_return_value=capture_return_value, result=result,
-                        attributes_to_capture=attributes_to_capture,
-                        args=args, kwargs=kwargs.copy(),  # shallow copy guards against caller mutation
-                        exec_source=exec_source,
-                        enable_alert=enable_alert
+                        tracer, func, start_time, status, None, error_code,
+                        my_span_id, parent_span_id, capture_return_value, result,
+                        attributes_to_capture,
+                        args, kwargs.copy(),  # shallow copy guards against caller mutation
+                        exec_source, enable_alert, capture_limits,
+                        time.perf_counter(), exc_info, binding_plan, exact_store
                     )
                     _dispatch_span_logging(ctx, should_use_async(tracer), token)
                 return result
@@ -24,10 +24,15 @@ import threading
 import time
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# API version of the compiled vectorwave_core this package expects (the
+# module's ``API_VERSION``; builds that predate it count as 1). An older
+# build still loads, with the Python fallbacks standing in for what it lacks.
+RUST_CORE_API_VERSION = 2
+
 
 def _run_dir() -> Path:
     return Path(os.environ.get("VECTORWAVE_RUN_DIR", Path.home() / ".vectorwave" / "run"))
@@ -45,12 +50,18 @@ class RuntimeInfo:
     otel_service_name: Optional[str] = None
     instrumented_modules: List[str] = field(default_factory=list)
     rust_core: bool = False
+    # The compiled core is older than this package; rebuild it.
+    rust_core_stale: bool = False
+    # Live counters from registered components (e.g. ``span_pipeline``),
+    # refreshed on every ``get_info()`` call.
+    stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 
 # Singleton — there's one runtime state per Python process.
 _info: Optional[RuntimeInfo] = None
 _pid_file: Optional[Path] = None
 _lock = threading.Lock()
+_stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
 
 
 def _detect_mode() -> str:
@@ -75,6 +86,21 @@ def _detect_rust_core() -> bool:
         return False
 
 
+def rust_core_api_version() -> Optional[int]:
+    """The compiled core's API version, or None when it isn't built."""
+    try:
+        import vectorwave.vectorwave_core as core
+    except ImportError:
+        return None
+    return getattr(core, "API_VERSION", 1)
+
+
+def rust_core_is_stale() -> bool:
+    """True when a compiled core is present but older than this package."""
+    version = rust_core_api_version()
+    return version is not None and version < RUST_CORE_API_VERSION
+
+
 def get_info() -> RuntimeInfo:
     """Return the current process's runtime info, initialising on first call."""
     global _info
@@ -87,10 +113,29 @@ def get_info() -> RuntimeInfo:
                     otel_enabled=_detect_otel(),
                     otel_service_name=os.environ.get("OTEL_SERVICE_NAME"),
                     rust_core=_detect_rust_core(),
+                    rust_core_stale=rust_core_is_stale(),
                 )
+    _refresh_stats(_info)
     return _info
 
 
+def register_stats_provider(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Expose a component's counters under ``get_info().stats[name]``.
+
+    ``provider`` is called on every ``get_info()``, so it must be cheap and
+    must not call back into ``get_info()``.
+    """
+    _stats_providers[name] = provider
+
+
+def _refresh_stats(info: RuntimeInfo) -> None:
+    for name, provider in list(_stats_providers.items()):
+        try:
+            info.stats[name] = provider()
+        except Exception as e:
+            logger.debug(f"vectorwave: stats provider '{name}' failed: {e}")
+
+
 def register_instrumented_module(module_name: str) -> None:
     """Called by VectorWaveAutoInjector each time a module is auto-wired so
     `vectorwave info` can list what's currently being observed."""
@@ -107,7 +152,7 @@ def _format_banner(info: RuntimeInfo) -> str:
     if info.otel_enabled:
         bits.append(f"otel={info.otel_service_name or 'on'}")
     if info.rust_core:
-        bits.append("rust-core")
+        bits.append("rust-core (stale, rebuild with 'maturin develop')" if info.rust_core_stale else "rust-core")
     return f"[vectorwave] active — {', '.join(bits)} (pid={info.pid})"
 
 
@@ -47,6 +47,9 @@ class VectorStore(ABC):
     # Schema
     # ------------------------------------------------------------------
 
+    @abstractmethod
+    def list_collections(self) -> List[str]: ...
+
     @abstractmethod
     def collection_exists(self, collection: str) -> bool: ...
 
@@ -113,8 +116,11 @@ class VectorStore(ABC):
         sort_ascending: bool = False,
         limit: int = 10,
         return_properties: Optional[List[str]] = None,
+        include_vector: bool = False,
     ) -> List[StoreRecord]:
-        """Filter + sort fetch. Used by archiver / replayer / search_executions."""
+        """Filter + sort fetch. Used by archiver / replayer / search_executions.
+        ``include_vector=True`` also returns stored embeddings (used to warm the
+        local semantic-cache index)."""
 
     @abstractmethod
     def near_vector(
@@ -127,9 +133,9 @@ class VectorStore(ABC):
         include_vector: bool = False,
         return_properties: Optional[List[str]] = None,
     ) -> List[StoreRecord]:
-        """Vector similarity search. ``certainty`` is interpreted as
-        ``(1 + cos_sim) / 2`` — backends that don't provide it natively
-        compute it from the distance."""
+        """Vector similarity search. ``certainty`` is the backend's own:
+        ``(1 + cos_sim) / 2`` for Weaviate, ``1 - distance / 2`` (plain
+        ``cos_sim`` for unit vectors) for Lance."""
 
     @abstractmethod
     def iterate(self, collection: str, batch_size: int = 100) -> Iterable[StoreRecord]:
@@ -0,0 +1,99 @@
+"""CLI surface for Lite-mode index management: `vectorwave index <subcommand>`."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+
+def _open_store(args: argparse.Namespace):
+    from .lance_store import LanceVectorStore
+
+    path = args.path or os.environ.get("VECTORWAVE_LITE_PATH", ".vectorwave/lance")
+    if not os.path.isdir(path):
+        raise RuntimeError(f"no Lite-mode database at '{path}'")
+    # Index work is explicit here; don't spawn the automatic checker.
+    return LanceVectorStore(db_path=path, scalar_index_min_rows=None, vector_index_min_rows=None)
+
+
+def _collections(store, requested):
+    names = store.list_collections()
+    if not requested:
+        return names
+    missing = [c for c in requested if c not in names]
+    if missing:
+        raise RuntimeError(f"unknown collection(s): {', '.join(missing)}")
+    return list(requested)
+
+
+def _cmd_build(args: argparse.Namespace, rebuild: bool = False) -> int:
+    try:
+        store = _open_store(args)
+        collections = _collections(store, args.collections)
+    except RuntimeError as e:
+        print(f"index: {e}", file=sys.stderr)
+        return 1
+
+    for name in collections:
+        built = store.build_indexes(name, force=True, rebuild=rebuild)
+        print(f"{name}: {', '.join(built) if built else 'up to date'}")
+    return 0
+
+
+def _cmd_rebuild(args: argparse.Namespace) -> int:
+    return _cmd_build(args, rebuild=True)
+
+
+def _cmd_inspect(args: argparse.Namespace) -> int:
+    try:
+        store = _open_store(args)
+        collections = _collections(store, args.collections)
+    except RuntimeError as e:
+        print(f"index: {e}", file=sys.stderr)
+        return 1
+
+    header = ("COLLECTION", "INDEX", "TYPE", "COLUMN", "INDEXED", "UNINDEXED")
+    rows = []
+    for name in collections:
+        indexes = store.inspect_indexes(name)
+        if not indexes:
+            rows.append((name, "-", "-", "-", "-", "-"))
+        for idx in indexes:
+            rows.append((
+                name, idx["name"], idx["type"], ",".join(idx["columns"]),
+                str(idx["indexed_rows"]), str(idx["unindexed_rows"]),
+            ))
+
+    widths = [max(len(r[i]) for r in (rows + [header])) for i in range(len(header))]
+    fmt = "  ".join(f"{{:<{w}}}" for w in widths)
+    print(fmt.format(*header))
+    print(fmt.format(*("-" * w for w in widths)))
+    for row in rows:
+        print(fmt.format(*row))
+    return 0
+
+
+def add_index_subparser(subparsers: "argparse._SubParsersAction") -> None:
+    index = subparsers.add_parser(
+        "index",
+        help="Build, rebuild or inspect Lite-mode (LanceDB) indexes",
+    )
+    index_sub = index.add_subparsers(dest="index_cmd", required=True)
+
+    for name, func, help_text in (
+        ("build", _cmd_build, "Create missing scalar + vector indexes and fold in new rows"),
+        ("rebuild", _cmd_rebuild, "Drop and recreate every index"),
+        ("inspect", _cmd_inspect, "Show indexes and their indexed / unindexed row counts"),
+    ):
+        p = index_sub.add_parser(name, help=help_text)
+        p.add_argument(
+            "collections",
+            nargs="*",
+            help="Collections to act on (default: all tables)",
+        )
+        p.add_argument(
+            "--path",
+            default=None,
+            help="LanceDB directory (default: $VECTORWAVE_LITE_PATH or .vectorwave/lance)",
+        )
+        p.set_defaults(func=func)
@@ -25,11 +25,23 @@ def get_vector_store() -> VectorStore:
     mode = os.environ.get("VECTORWAVE_MODE", "pro").lower()
 
     if mode == "lite":
-        from .lance_store import LanceVectorStore
+        from .lance_store import (
+            DEFAULT_SCALAR_INDEX_MIN_ROWS,
+            DEFAULT_VECTOR_INDEX_MIN_ROWS,
+            LanceVectorStore,
+        )
 
         db_path = os.environ.get("VECTORWAVE_LITE_PATH", ".vectorwave/lance")
+        # Legacy JSON-payload tables are rewritten to the columnar layout on
+        # first open unless this is turned off.
+        auto_migrate = os.environ.get("VECTORWAVE_LITE_AUTO_MIGRATE", "true").lower() not in ("0", "false", "no")
         logger.info("[VectorWave] Lite mode active — LanceDB at %s", db_path)
-        return LanceVectorStore(db_path=db_path)
+        return LanceVectorStore(
+            db_path=db_path,
+            auto_migrate=auto_migrate,
+            scalar_index_min_rows=_env_threshold("VECTORWAVE_LITE_SCALAR_INDEX_MIN_ROWS", DEFAULT_SCALAR_INDEX_MIN_ROWS),
+            vector_index_min_rows=_env_threshold("VECTORWAVE_LITE_VECTOR_INDEX_MIN_ROWS", DEFAULT_VECTOR_INDEX_MIN_ROWS),
+        )
 
     if mode in ("pro", "weaviate"):
         from ..database.db import get_cached_client
@@ -41,3 +53,18 @@ def get_vector_store() -> VectorStore:
     raise ValueError(
         f"Unknown VECTORWAVE_MODE='{mode}'. Expected 'pro' (default) or 'lite'."
     )
+
+
+def _env_threshold(name: str, default: int):
+    """Row threshold from the environment; ``0``/``off`` disables it."""
+    raw = os.environ.get(name)
+    if raw is None or raw.strip() == "":
+        return default
+    if raw.strip().lower() in ("off", "none", "false"):
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %d.", name, raw, default)
+        return default
+    return value if value > 0 else None
@@ -7,22 +7,38 @@ local-dev use. Tradeoffs vs the Weaviate backend:
 - ✅ Vector + filter + sort search are supported
 - ⚠️  Hybrid search (BM25 + vector) and Weaviate's modular vectorizers are
    not available; Lite mode requires a Python-side vectorizer (HF / OpenAI client)
-- ⚠️  Filtering happens in Python after fetch (good enough for ≲100k rows; if
-   you outgrow Lite, switch to Weaviate)
-
-Each VectorWave collection becomes a LanceDB table with a fixed schema
-``(uuid: string, vector: list<float32, dim>, payload: string)`` — every
-property is stuffed into the JSON ``payload`` so the same code can host
-arbitrary VectorWave property shapes without per-collection schemas. We
-trade a bit of query speed for schema simplicity. For Lite use this is the
-right call.
+- ⚠️  Filters on the typed columns below are pushed down to LanceDB as SQL
+   predicates; filters on custom properties (kept in JSON) still run in
+   Python on the pushed-down result
+
+Each VectorWave collection becomes a LanceDB table with a fixed schema:
+``uuid``, ``vector`` (``list<float32, dim>``), one typed column per
+well-known execution field (``TYPED_COLUMNS``: ``function_name``,
+``status``, ``timestamp_utc``, ``duration_ms``, ``trace_id``,
+``error_code``, ``exec_source``) and an overflow JSON ``payload`` holding
+every other property. Filters and sorts on the typed fields read those
+columns directly and only decode ``payload`` for the rows returned.
+
+Tables written by older versions keep everything in ``payload``; they are
+read transparently and rewritten into the columnar layout the first time
+they are opened (see ``migrate_collection``).
+
+Indexes are maintained automatically once a table is big enough to benefit:
+scalar indexes (``SCALAR_INDEXES``) past ``scalar_index_min_rows`` and an
+IVF-PQ index on ``vector`` past ``vector_index_min_rows``. Rows added after
+an index was built are folded in by ``optimize()`` once they pile up. The
+check runs on a background thread so the batch flush never waits on it;
+``vectorwave index build|rebuild|inspect`` does the same by hand.
 """
 from __future__ import annotations
 
 import json
 import logging
+import math
 import os
-from typing import Any, Dict, Iterable, List, Optional
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
 from .base import StoreRecord, VectorStore
@@ -34,6 +50,62 @@ logger = logging.getLogger(__name__)
 DEFAULT_VECTOR_DIM = 384
 
 
+# Scalar indexes built once a table passes `scalar_index_min_rows`.
+# BITMAP suits the low-cardinality columns, BTREE the near-unique ones.
+SCALAR_INDEXES: Dict[str, str] = {
+    "uuid": "BTREE",
+    "function_name": "BITMAP",
+    "status": "BITMAP",
+    "timestamp_utc": "BTREE",
+    "trace_id": "BTREE",
+}
+DEFAULT_SCALAR_INDEX_MIN_ROWS = 10_000
+DEFAULT_VECTOR_INDEX_MIN_ROWS = 50_000
+# Re-check thresholds / unindexed rows after this many writes per table.
+INDEX_CHECK_EVERY_ROWS = 1_000
+# Thresholded searches on an IVF-PQ index: partitions probed, and the factor
+# of extra candidates re-ranked by exact distance. PQ distances alone are too
+# coarse to compare against a semantic-cache certainty.
+VECTOR_SEARCH_NPROBES = 64
+VECTOR_SEARCH_REFINE_FACTOR = 10
+# How long "this table has no vector index" is trusted before asking again
+# (another process may have built one).
+VECTOR_INDEX_RECHECK_SECONDS = 60.0
+
+
+def _create_scalar_index(tbl, column: str, index_type: str) -> None:
+    try:
+        from lancedb.index import Bitmap, BTree
+    except ImportError:
+        # lancedb < 0.25 only has the dedicated scalar-index call.
+        tbl.create_scalar_index(column, index_type=index_type, replace=True)
+        return
+    config = Bitmap() if index_type == "BITMAP" else BTree()
+    tbl.create_index(column, config=config, replace=True)
+
+
+def _pq_sub_vectors(dim: int) -> int:
+    """Largest PQ split (≈16 dims per sub-vector) that divides ``dim``."""
+    for target in range(max(1, dim // 16), 0, -1):
+        if dim % target == 0:
+            return target
+    return 1
+
+
+# Well-known execution fields stored as typed columns instead of in `payload`.
+# Ints are stored in float64 columns as floats; values of any other Python
+# type stay in the overflow JSON so they round-trip unchanged.
+TYPED_COLUMNS: Dict[str, str] = {
+    "function_name": "string",
+    "status": "string",
+    "timestamp_utc": "string",
+    "duration_ms": "float64",
+    "trace_id": "string",
+    "error_code": "string",
+    "exec_source": "string",
+}
+
+
 def _serialize_properties(props: Dict[str, Any]) -> str:
     return json.dumps(props, default=str, ensure_ascii=False)
 
@@ -93,8 +165,121 @@ def _matches_filter(props: Dict[str, Any], filters: Optional[Dict[str, Any]]) ->
     return True
 
 
-def _row_to_record(row: Dict[str, Any], include_vector: bool = False, distance: Optional[float] = None) -> StoreRecord:
+_SQL_OPS = {"not_equal": "!=", "gte": ">=", "gt": ">", "lte": "<=", "lt": "<"}
+
+
+def _sql_literal(kind: str, value: Any) -> Optional[str]:
+    """Renders ``value`` as a SQL literal for a ``kind`` column, or None if
+    it can't be compared there (the predicate then stays in Python)."""
+    if kind == "string":
+        if not isinstance(value, str):
+            return None
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if value != value or value in (float("inf"), float("-inf")):
+        return None
+    return repr(float(value))
+
+
+def _compile_predicate(column: str, kind: str, op: str, value: Any) -> Optional[str]:
+    if op == "equal":
+        if value is None:
+            return f"{column} IS NULL"
+        if isinstance(value, list):
+            literals = [_sql_literal(kind, v) for v in value]
+            if any(lit is None for lit in literals):
+                return None
+            return f"{column} IN ({', '.join(literals)})" if literals else "FALSE"
+        lit = _sql_literal(kind, value)
+        return f"{column} = {lit}" if lit is not None else None
+    if op == "like":
+        if not isinstance(value, str) or kind != "string":
+            return None
+        # `_matches_filter` treats like as substring containment.
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("'", "''")
+        return f"{column} LIKE '%{escaped}%' ESCAPE '\\'"
+    sql_op = _SQL_OPS.get(op)
+    lit = _sql_literal(kind, value) if sql_op else None
+    if lit is None:
+        return None
+    if op == "not_equal":
+        # Python semantics: a missing value is "not equal".
+        return f"({column} IS NULL OR {column} != {lit})"
+    return f"{column} {sql_op} {lit}"
+
+
+def _compile_filters(
+    filters: Optional[Dict[str, Any]], columns: Dict[str, str]
+) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Translates the dict filter grammar into a LanceDB ``where`` clause.
+
+    Predicates on ``columns`` (name -> kind) become SQL; anything else (custom
+    properties in the overflow JSON, unsupported value types) is returned as
+    residual filters for ``_matches_filter``.
+    """
+    clauses: List[str] = []
+    residual: Dict[str, Any] = {}
+    for key, value in (filters or {}).items():
+        segments = key.split("__")
+        prop = segments[0]
+        op = segments[1] if len(segments) > 1 else "equal"
+        kind = columns.get(prop)
+        clause = _compile_predicate(prop, kind, op, value) if kind else None
+        if clause is None:
+            residual[key] = value
+        else:
+            clauses.append(clause)
+    return (" AND ".join(clauses) if clauses else None), residual
+
+
+def _column_accepts(kind: str, value: Any) -> bool:
+    if kind == "float64":
+        # bool is an int subclass but isn't a measurement.
+        return isinstance(value, (float, int)) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+def _split_properties(props: Dict[str, Any]) -> Dict[str, Any]:
+    """Splits ``props`` into typed column values plus the overflow ``payload``.
+
+    Explicit ``None`` values stay in the overflow JSON so that "present but
+    null" survives the round-trip (a null column reads back as absent).
+    """
+    row: Dict[str, Any] = {name: None for name in TYPED_COLUMNS}
+    overflow: Dict[str, Any] = {}
+    for key, value in props.items():
+        kind = TYPED_COLUMNS.get(key)
+        if kind is not None and _column_accepts(kind, value):
+            row[key] = float(value) if kind == "float64" else value
+        else:
+            overflow[key] = value
+    row["payload"] = _serialize_properties(overflow)
+    return row
+
+
+def _row_properties(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuilds the full property dict from a columnar or legacy row."""
     props = _deserialize_properties(row.get("payload"))
+    for name in TYPED_COLUMNS:
+        value = row.get(name)
+        if value is not None:
+            props[name] = value
+    return props
+
+
+def _columnar_schema(dim: int):
+    import pyarrow as pa
+    types = {"string": pa.string(), "float64": pa.float64()}
+    return pa.schema(
+        [pa.field("uuid", pa.string()), pa.field("vector", pa.list_(pa.float32(), dim))]
+        + [pa.field(name, types[kind]) for name, kind in TYPED_COLUMNS.items()]
+        + [pa.field("payload", pa.string())]
+    )
+
+
+def _row_to_record(row: Dict[str, Any], include_vector: bool = False, distance: Optional[float] = None) -> StoreRecord:
+    props = _row_properties(row)
     vector = None
     if include_vector and row.get("vector") is not None:
         vector = list(row["vector"])
@@ -111,7 +296,14 @@ def _row_to_record(row: Dict[str, Any], include_vector: bool = False, distance:
 class LanceVectorStore(VectorStore):
     backend_name = "lance"
 
-    def __init__(self, db_path: str = ".vectorwave/lance", vector_dim: int = DEFAULT_VECTOR_DIM):
+    def __init__(
+        self,
+        db_path: str = ".vectorwave/lance",
+        vector_dim: int = DEFAULT_VECTOR_DIM,
+        auto_migrate: bool = True,
+        scalar_index_min_rows: Optional[int] = DEFAULT_SCALAR_INDEX_MIN_ROWS,
+        vector_index_min_rows: Optional[int] = DEFAULT_VECTOR_INDEX_MIN_ROWS,
+    ):
         try:
             import lancedb
         except ImportError as e:
@@ -124,7 +316,18 @@ class LanceVectorStore(VectorStore):
         self._db = lancedb.connect(db_path)
         self._db_path = db_path
         self._vector_dim = vector_dim
+        self._auto_migrate = auto_migrate
         self._open_tables: Dict[str, Any] = {}
+        # collection -> True if the table has the typed-column layout
+        self._columnar: Dict[str, bool] = {}
+        # None disables automatic index maintenance for that kind.
+        self._scalar_index_min_rows = scalar_index_min_rows
+        self._vector_index_min_rows = vector_index_min_rows
+        self._writes_since_index_check: Dict[str, int] = {}
+        self._index_lock = threading.Lock()
+        self._indexing: set = set()
+        # collection -> (has a vector index, when that was checked)
+        self._vector_indexed: Dict[str, Tuple[bool, float]] = {}
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -135,13 +338,31 @@ class LanceVectorStore(VectorStore):
 
     def close(self) -> None:
         self._open_tables.clear()
+        self._columnar.clear()
+        self._vector_indexed.clear()
 
     # ------------------------------------------------------------------
     # Schema
     # ------------------------------------------------------------------
 
+    def _table_names(self) -> List[str]:
+        # Newer lancedb returns a paginated ListTablesResponse rather than a
+        # list of names; older versions return the list directly.
+        listed = self._db.list_tables()
+        tables = getattr(listed, "tables", listed)
+        names = list(tables)
+        page_token = getattr(listed, "page_token", None)
+        while page_token:
+            listed = self._db.list_tables(page_token=page_token)
+            names.extend(listed.tables)
+            page_token = listed.page_token
+        return names
+
+    def list_collections(self) -> List[str]:
+        return self._table_names()
+
     def collection_exists(self, collection: str) -> bool:
-        return collection in self._db.list_tables()
+        return collection in self._table_names()
 
     def ensure_collection(
         self,
@@ -149,17 +370,10 @@ class LanceVectorStore(VectorStore):
         properties: List[Dict[str, Any]],
         vector_dim: Optional[int] = None,
     ) -> None:
-        if collection in self._db.list_tables():
+        if collection in self._table_names():
             return
-        import pyarrow as pa
         dim = vector_dim or self._vector_dim
-        schema = pa.schema(
-            [
-                pa.field("uuid", pa.string()),
-                pa.field("vector", pa.list_(pa.float32(), dim)),
-                pa.field("payload", pa.string()),
-            ]
-        )
+        schema = _columnar_schema(dim)
         # `exist_ok=True` makes ensure_collection truly idempotent across the
         # in-memory list_tables cache and any concurrent worker — if the table
         # is already on disk we just no-op and move on.
@@ -175,22 +389,197 @@ class LanceVectorStore(VectorStore):
                     raise
 
     def delete_collection(self, collection: str) -> None:
-        if collection in self._db.list_tables():
+        if collection in self._table_names():
             self._db.drop_table(collection)
             self._open_tables.pop(collection, None)
+            self._columnar.pop(collection, None)
+            self._vector_indexed.pop(collection, None)
 
     def _open(self, collection: str):
         cached = self._open_tables.get(collection)
         if cached is not None:
             return cached
-        if collection not in self._db.list_tables():
+        if collection not in self._table_names():
             # Collections appear lazily — create with the default schema if a
             # caller writes before calling ensure_collection.
             self.ensure_collection(collection, properties=[])
         tbl = self._db.open_table(collection)
+        columnar = "function_name" in tbl.schema.names
+        if not columnar and self._auto_migrate:
+            try:
+                self.migrate_collection(collection)
+                tbl = self._db.open_table(collection)
+                columnar = True
+            except Exception as e:
+                logger.warning(
+                    "Could not migrate Lance table '%s' to the columnar layout; "
+                    "reading it as JSON payload rows: %s", collection, e,
+                )
         self._open_tables[collection] = tbl
+        self._columnar[collection] = columnar
         return tbl
 
+    def migrate_collection(self, collection: str) -> int:
+        """Rewrites a legacy ``(uuid, vector, payload)`` table into the typed
+        column layout. Returns the number of rows migrated (0 if the table is
+        already columnar). Runs automatically on first open unless the store
+        was created with ``auto_migrate=False``."""
+        tbl = self._db.open_table(collection)
+        if "function_name" in tbl.schema.names:
+            return 0
+        import pyarrow as pa
+        dim = tbl.schema.field("vector").type.list_size
+        rows = []
+        for r in tbl.to_arrow().to_pylist():
+            row = {"uuid": r["uuid"], "vector": r["vector"]}
+            row.update(_split_properties(_deserialize_properties(r.get("payload"))))
+            rows.append(row)
+        schema = _columnar_schema(dim)
+        # `overwrite` commits a new table version atomically; the legacy rows
+        # remain readable until it lands.
+        self._db.create_table(collection, data=pa.Table.from_pylist(rows, schema=schema), mode="overwrite")
+        self._open_tables.pop(collection, None)
+        self._vector_indexed.pop(collection, None)
+        logger.info("Migrated Lance table '%s' to columnar layout (%d rows).", collection, len(rows))
+        return len(rows)
+
+    def _make_row(self, collection: str, uuid: str, vector: List[float], properties: Dict[str, Any]) -> Dict[str, Any]:
+        if self._columnar.get(collection, True):
+            row = {"uuid": uuid, "vector": vector}
+            row.update(_split_properties(properties))
+            return row
+        return {"uuid": uuid, "vector": vector, "payload": _serialize_properties(properties)}
+
+    def _pushdown(self, collection: str, filters: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Dict[str, Any]]:
+        columns = dict(TYPED_COLUMNS) if self._columnar.get(collection) else {}
+        columns["uuid"] = "string"
+        return _compile_filters(filters, columns)
+
+    def _read_columns(self, collection: str, include_vector: bool) -> List[str]:
+        columns = ["uuid", "payload"]
+        if self._columnar.get(collection):
+            columns += list(TYPED_COLUMNS)
+        if include_vector:
+            columns.append("vector")
+        return columns
+
+    def _scan(self, tbl, collection: str, where: Optional[str], include_vector: bool = False,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows matching ``where`` without the vector column unless asked for."""
+        q = tbl.search()
+        if where:
+            q = q.where(where)
+        q = q.select(self._read_columns(collection, include_vector)).limit(limit)
+        return q.to_arrow().to_pylist()
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _note_writes(self, collection: str, n: int) -> None:
+        if self._scalar_index_min_rows is None and self._vector_index_min_rows is None:
+            return
+        with self._index_lock:
+            pending = self._writes_since_index_check.get(collection, 0) + n
+            if pending < INDEX_CHECK_EVERY_ROWS or collection in self._indexing:
+                self._writes_since_index_check[collection] = pending
+                return
+            self._writes_since_index_check[collection] = 0
+            self._indexing.add(collection)
+        threading.Thread(
+            target=self._background_index_check, args=(collection,),
+            name=f"VectorWaveLanceIndex_{collection}", daemon=True,
+        ).start()
+
+    def _background_index_check(self, collection: str) -> None:
+        try:
+            self.build_indexes(collection)
+        except Exception as e:
+            logger.warning("Automatic index maintenance failed for '%s': %s", collection, e)
+        finally:
+            with self._index_lock:
+                self._indexing.discard(collection)
+
+    def build_indexes(self, collection: str, force: bool = False, rebuild: bool = False) -> List[str]:
+        """Creates missing indexes on ``collection`` and folds unindexed rows
+        into existing ones. Returns the names of the indexes (re)built.
+
+        Without ``force`` only indexes whose row threshold has been reached
+        are created; ``rebuild`` recreates every index from scratch.
+        """
+        tbl = self._open(collection)
+        rows = tbl.count_rows()
+        existing = {cfg.columns[0]: cfg for cfg in tbl.list_indices()}
+        columns = set(tbl.schema.names)
+        built: List[str] = []
+
+        def _due(min_rows: Optional[int]) -> bool:
+            return force or rebuild or (min_rows is not None and rows >= min_rows)
+
+        if rows and _due(self._scalar_index_min_rows):
+            for column, index_type in SCALAR_INDEXES.items():
+                if column not in columns or (column in existing and not rebuild):
+                    continue
+                _create_scalar_index(tbl, column, index_type)
+                built.append(f"{column}_idx")
+
+        # IVF-PQ needs enough rows to train its partitions / codebooks.
+        if rows >= 256 and _due(self._vector_index_min_rows) and ("vector" not in existing or rebuild):
+            dim = tbl.schema.field("vector").type.list_size
+            ivf_pq = {
+                "num_partitions": max(1, min(int(math.sqrt(rows)), 1024)),
+                "num_sub_vectors": _pq_sub_vectors(dim),
+            }
+            # l2 matches the distance near_vector searches with.
+            try:
+                from lancedb.index import IvfPq
+            except ImportError:
+                tbl.create_index(metric="l2", vector_column_name="vector", index_type="IVF_PQ",
+                                 replace=True, **ivf_pq)
+            else:
+                tbl.create_index("vector", config=IvfPq(distance_type="l2", **ivf_pq), replace=True)
+            built.append("vector_idx")
+            self._vector_indexed[collection] = (True, time.monotonic())
+
+        if built:
+            logger.info("Built Lance indexes on '%s' (%d rows): %s", collection, rows, ", ".join(built))
+        elif existing and self._has_unindexed_backlog(tbl, existing):
+            # New rows are scanned brute-force until merged into the index.
+            tbl.optimize()
+            logger.info("Optimized Lance indexes on '%s' (%d rows).", collection, rows)
+        return built
+
+    def _has_vector_index(self, tbl, collection: str) -> bool:
+        known = self._vector_indexed.get(collection)
+        if known is not None and (known[0] or time.monotonic() - known[1] < VECTOR_INDEX_RECHECK_SECONDS):
+            return known[0]
+        indexed = any(cfg.columns[0] == "vector" for cfg in tbl.list_indices())
+        self._vector_indexed[collection] = (indexed, time.monotonic())
+        return indexed
+
+    @staticmethod
+    def _has_unindexed_backlog(tbl, existing: Dict[str, Any]) -> bool:
+        for cfg in existing.values():
+            stats = tbl.index_stats(cfg.name)
+            if stats and stats.num_unindexed_rows > max(INDEX_CHECK_EVERY_ROWS, stats.num_indexed_rows // 10):
+                return True
+        return False
+
+    def inspect_indexes(self, collection: str) -> List[Dict[str, Any]]:
+        """Index name, type, column and (un)indexed row counts for ``collection``."""
+        tbl = self._open(collection)
+        out = []
+        for cfg in tbl.list_indices():
+            stats = tbl.index_stats(cfg.name)
+            out.append({
+                "name": cfg.name,
+                "type": str(cfg.index_type),
+                "columns": list(cfg.columns),
+                "indexed_rows": stats.num_indexed_rows if stats else None,
+                "unindexed_rows": stats.num_unindexed_rows if stats else None,
+            })
+        return out
+
     # ------------------------------------------------------------------
     # Writes
     # ------------------------------------------------------------------
@@ -217,68 +606,132 @@ class LanceVectorStore(VectorStore):
             else:
                 vec = vec[: self._vector_dim]
         tbl = self._open(collection)
-        tbl.add([{"uuid": uuid, "vector": vec, "payload": _serialize_properties(properties)}])
+        tbl.add([self._make_row(collection, uuid, vec, properties)])
+        self._note_writes(collection, 1)
         return uuid
 
     def insert_many(self, collection: str, items: List[Dict[str, Any]]) -> int:
         if not items:
             return 0
-        tbl = self._open(collection)
-        rows = []
-        for it in items:
-            uuid = it.get("uuid") or str(uuid4())
+        import numpy as np
+        vectors = np.zeros((len(items), self._vector_dim), dtype=np.float32)
+        for i, it in enumerate(items):
             vec = it.get("vector")
-            vec = list(vec) if vec is not None else [0.0] * self._vector_dim
-            if len(vec) != self._vector_dim:
-                if len(vec) < self._vector_dim:
-                    vec = vec + [0.0] * (self._vector_dim - len(vec))
-                else:
-                    vec = vec[: self._vector_dim]
-            rows.append({
-                "uuid": uuid,
-                "vector": vec,
-                "payload": _serialize_properties(it["properties"]),
-            })
-        tbl.add(rows)
-        return len(rows)
+            if vec is not None:
+                vec = vec[: self._vector_dim]
+                vectors[i, : len(vec)] = vec
+        return self.insert_columns(
+            collection,
+            [it["properties"] for it in items],
+            vectors,
+            uuids=[it.get("uuid") for it in items],
+        )
+
+    def insert_columns(
+        self,
+        collection: str,
+        properties: List[Dict[str, Any]],
+        vectors: Any = None,
+        uuids: Optional[List[Optional[str]]] = None,
+    ) -> int:
+        """Columnar bulk insert used by the batch flush.
+
+        ``vectors`` is an ``(n, dim)`` float32 array (anything
+        ``numpy.asarray`` accepts; ``None`` writes zero vectors). A
+        C-contiguous float32 array of the table's dim is wrapped as the Arrow
+        ``vector`` column without copying; other dims are padded / truncated.
+        Missing UUIDs are generated. Returns the number of rows written.
+        """
+        n = len(properties)
+        if not n:
+            return 0
+        import numpy as np
+        import pyarrow as pa
+
+        tbl = self._open(collection)
+        schema = tbl.schema
+        dim = getattr(schema.field("vector").type, "list_size", -1)
+        if dim < 0:
+            dim = self._vector_dim
+        if vectors is None:
+            vectors = np.zeros((n, dim), dtype=np.float32)
+        else:
+            vectors = np.asarray(vectors, dtype=np.float32).reshape(n, -1)
+        if vectors.shape[1] != dim:
+            logger.warning(
+                "Vector dim %d != table dim %d for collection '%s'; padding/truncating.",
+                vectors.shape[1], dim, collection,
+            )
+            resized = np.zeros((n, dim), dtype=np.float32)
+            width = min(dim, vectors.shape[1])
+            resized[:, :width] = vectors[:, :width]
+            vectors = resized
+        flat = pa.array(np.ascontiguousarray(vectors).reshape(-1), type=pa.float32())
+
+        if uuids is None:
+            uuids = [None] * n
+        columns: Dict[str, Any] = {
+            "uuid": pa.array([u or str(uuid4()) for u in uuids], type=pa.string()),
+            "vector": pa.FixedSizeListArray.from_arrays(flat, dim),
+        }
+        if self._columnar.get(collection, True):
+            rows = [_split_properties(props) for props in properties]
+            for name in list(TYPED_COLUMNS) + ["payload"]:
+                columns[name] = [row[name] for row in rows]
+        else:
+            columns["payload"] = [_serialize_properties(props) for props in properties]
+
+        arrays = []
+        for field in schema:
+            value = columns.get(field.name)
+            if value is None:
+                arrays.append(pa.nulls(n, type=field.type))
+            elif isinstance(value, list):
+                arrays.append(pa.array(value, type=field.type))
+            else:
+                arrays.append(value.cast(field.type) if value.type != field.type else value)
+        tbl.add(pa.Table.from_arrays(arrays, schema=schema))
+        self._note_writes(collection, n)
+        return n
 
     def update(self, collection: str, uuid: str, properties: Dict[str, Any]) -> None:
         tbl = self._open(collection)
         # Read current row, merge properties, rewrite. LanceDB's `update` API
-        # works on column expressions; for our JSON-blob schema that's awkward,
+        # works on column expressions; for the overflow JSON that's awkward,
         # so we delete + re-insert with the same UUID. The vector is preserved.
-        rows = tbl.search().where(f"uuid = '{uuid}'").limit(1).to_list()
+        where = f"uuid = {_sql_literal('string', str(uuid))}"
+        rows = tbl.search().where(where).limit(1).to_list()
         if not rows:
             logger.warning("update: uuid '%s' not found in '%s'", uuid, collection)
             return
         existing = rows[0]
-        merged = _deserialize_properties(existing.get("payload"))
+        merged = _row_properties(existing)
         merged.update(properties)
-        tbl.delete(f"uuid = '{uuid}'")
-        tbl.add(
-            [{
-                "uuid": uuid,
-                "vector": list(existing.get("vector") or [0.0] * self._vector_dim),
-                "payload": _serialize_properties(merged),
-            }]
-        )
+        tbl.delete(where)
+        tbl.add([self._make_row(
+            collection, uuid, list(existing.get("vector") or [0.0] * self._vector_dim), merged
+        )])
 
     def delete_by_filter(self, collection: str, filters: Dict[str, Any]) -> int:
         if not filters:
             return 0
         tbl = self._open(collection)
-        # LanceDB's `delete` takes a SQL expression. We can't easily push our
-        # dict-style filters down without translating each operator, so do a
-        # Python-side fetch + bulk delete by uuid list.
-        # `to_arrow().to_pylist()` keeps us off the pandas dependency path.
-        all_rows = tbl.to_arrow().to_pylist()
-        targets = [r["uuid"] for r in all_rows
-                   if _matches_filter(_deserialize_properties(r.get("payload")), filters)]
+        where, residual = self._pushdown(collection, filters)
+        if not residual:
+            # Fully pushed down: count + delete without materialising rows.
+            count = tbl.count_rows(where)
+            if count:
+                tbl.delete(where)
+            return count
+        # Custom-property predicates: narrow with SQL, finish in Python, then
+        # delete the survivors by uuid.
+        targets = [r["uuid"] for r in self._scan(tbl, collection, where)
+                   if _matches_filter(_row_properties(r), residual)]
         if not targets:
             return 0
-        # SQL-escape uuids (they are generated UUIDs / safe strings) and delete.
-        uuid_list = ",".join(f"'{u}'" for u in targets)
-        tbl.delete(f"uuid IN ({uuid_list})")
+        for i in range(0, len(targets), 1000):
+            uuid_list = ",".join(_sql_literal("string", u) for u in targets[i:i + 1000])
+            tbl.delete(f"uuid IN ({uuid_list})")
         return len(targets)
 
     # ------------------------------------------------------------------
@@ -292,7 +745,7 @@ class LanceVectorStore(VectorStore):
         include_vector: bool = False,
     ) -> Optional[StoreRecord]:
         tbl = self._open(collection)
-        rows = tbl.search().where(f"uuid = '{uuid}'").limit(1).to_list()
+        rows = tbl.search().where(f"uuid = {_sql_literal('string', str(uuid))}").limit(1).to_list()
         if not rows:
             return None
         return _row_to_record(rows[0], include_vector=include_vector)
@@ -305,23 +758,24 @@ class LanceVectorStore(VectorStore):
         sort_ascending: bool = False,
         limit: int = 10,
         return_properties: Optional[List[str]] = None,
+        include_vector: bool = False,
     ) -> List[StoreRecord]:
         tbl = self._open(collection)
-        # Fetch-all-then-filter — fine for Lite mode dataset sizes. Using
-        # to_arrow keeps the runtime free of a pandas dependency.
-        rows = tbl.to_arrow().to_pylist()
-        records: List[StoreRecord] = []
-        filtered = [r for r in rows if _matches_filter(_deserialize_properties(r.get("payload")), filters)]
+        where, residual = self._pushdown(collection, filters)
+        # LanceDB can't ORDER BY, so sorted or residual-filtered queries read
+        # every row the pushed-down predicate matches; otherwise LIMIT goes down too.
+        pushed_limit = limit if not sort_by and not residual else None
+        rows = self._scan(tbl, collection, where, include_vector=include_vector, limit=pushed_limit)
+        records = [_row_to_record(r, include_vector=include_vector) for r in rows]
+        if residual:
+            records = [r for r in records if _matches_filter(r.properties, residual)]
         if sort_by:
-            def _sort_key(row):
-                key = _deserialize_properties(row.get("payload")).get(sort_by)
-                # None values sort last regardless of order
-                return (key is None, key)
-            filtered.sort(key=_sort_key, reverse=not sort_ascending)
-        filtered = filtered[: limit]
-        for r in filtered:
-            records.append(_row_to_record(r))
-        return records
+            # None values sort last regardless of order
+            present = [r for r in records if r.properties.get(sort_by) is not None]
+            missing = [r for r in records if r.properties.get(sort_by) is None]
+            present.sort(key=lambda rec: rec.properties[sort_by], reverse=not sort_ascending)
+            records = present + missing
+        return records[: limit]
 
     def near_vector(
         self,
@@ -340,25 +794,42 @@ class LanceVectorStore(VectorStore):
                 vec = vec + [0.0] * (self._vector_dim - len(vec))
             else:
                 vec = vec[: self._vector_dim]
-        # Fetch a generous superset; we filter + truncate in Python.
-        fetch_limit = max(limit * 5, 50)
-        rows = tbl.search(vec).limit(fetch_limit).to_list()
-        out: List[StoreRecord] = []
-        for r in rows:
-            props = _deserialize_properties(r.get("payload"))
-            if not _matches_filter(props, filters):
-                continue
-            distance = float(r.get("_distance", 0.0))
-            cert = max(0.0, 1.0 - distance / 2.0)
-            if certainty is not None and cert < certainty:
-                continue
-            rec = _row_to_record(r, include_vector=include_vector, distance=distance)
-            out.append(rec)
-            if len(out) >= limit:
-                break
-        return out
+        where, residual = self._pushdown(collection, filters)
+
+        # The pushed-down predicate is applied before the search (prefilter),
+        # so a selective filter can't starve the result. Only residual
+        # custom-property filters need a larger fetch, grown until satisfied.
+        fetch_limit = limit if not residual else max(limit * 5, 50)
+        # Certainty is compared against a threshold, so it must come from the
+        # exact distance, not the index's PQ approximation.
+        refine = certainty is not None and self._has_vector_index(tbl, collection)
+        while True:
+            q = tbl.search(vec)
+            if refine:
+                q = q.nprobes(VECTOR_SEARCH_NPROBES).refine_factor(VECTOR_SEARCH_REFINE_FACTOR)
+            if where:
+                q = q.where(where, prefilter=True)
+            rows = q.limit(fetch_limit).to_list()
+            out: List[StoreRecord] = []
+            below_threshold = False
+            for r in rows:
+                distance = float(r.get("_distance", 0.0))
+                cert = max(0.0, 1.0 - distance / 2.0)
+                if certainty is not None and cert < certainty:
+                    # Rows come back nearest first; nothing further qualifies.
+                    below_threshold = True
+                    break
+                rec = _row_to_record(r, include_vector=include_vector, distance=distance)
+                if residual and not _matches_filter(rec.properties, residual):
+                    continue
+                out.append(rec)
+                if len(out) >= limit:
+                    return out
+            if below_threshold or len(rows) < fetch_limit:
+                return out
+            fetch_limit *= 4
 
     def iterate(self, collection: str, batch_size: int = 100) -> Iterable[StoreRecord]:
         tbl = self._open(collection)
-        for r in tbl.to_arrow().to_pylist():
+        for r in self._scan(tbl, collection, None):
             yield _row_to_record(r)
@@ -139,6 +139,9 @@ class WeaviateVectorStore(VectorStore):
     # Schema
     # ------------------------------------------------------------------
 
+    def list_collections(self) -> List[str]:
+        return list(self._client.collections.list_all(simple=True))
+
     def collection_exists(self, collection: str) -> bool:
         return self._client.collections.exists(collection)
 
@@ -262,6 +265,7 @@ class WeaviateVectorStore(VectorStore):
         sort_ascending: bool = False,
         limit: int = 10,
         return_properties: Optional[List[str]] = None,
+        include_vector: bool = False,
     ) -> List[StoreRecord]:
         col = self._client.collections.get(collection)
         wf = _build_weaviate_filter(filters)
@@ -271,8 +275,10 @@ class WeaviateVectorStore(VectorStore):
         kwargs: Dict[str, Any] = {"limit": limit, "filters": wf, "sort": sort}
         if return_properties:
             kwargs["return_properties"] = return_properties
+        if include_vector:
+            kwargs["include_vector"] = True
         response = col.query.fetch_objects(**kwargs)
-        return [_to_record(o) for o in response.objects]
+        return [_to_record(o, include_vector=include_vector) for o in response.objects]
 
     def near_vector(
         self,
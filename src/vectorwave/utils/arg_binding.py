@@ -0,0 +1,114 @@
+"""Argument-binding plans for decorated functions.
+
+``inspect.Signature.bind`` + ``apply_defaults`` costs several microseconds
+per call. A ``BindingPlan`` works out once, from the signature, where each
+wanted argument lives in a call's ``(args, kwargs)`` (positional index,
+keyword name, default), so looking the values up per call is plain tuple
+indexing and dict access.
+"""
+import inspect
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+_MISSING = object()
+
+# How a wanted name is looked up.
+_POSITIONAL = 0       # args[index], else kwargs[name], else default
+_POSITIONAL_ONLY = 1  # args[index], else default
+_KEYWORD = 2          # kwargs[name], else default
+_VAR_POSITIONAL = 3   # args[index:]
+_VAR_KEYWORD = 4      # always {}: only declared names reach bind()
+_EXTRA = 5            # not a parameter: kwargs[name] if present
+
+
+class BindingPlan:
+    """
+    Looks up ``names`` in calls to one function, giving what
+    ``sig.bind(*args, **kwargs)`` + ``apply_defaults()`` would for them.
+    Keyword arguments that aren't parameters are ignored, except that names
+    which aren't parameters are taken from ``kwargs`` when
+    ``extras_from_kwargs`` (execution tags such as ``team`` or ``run_id``).
+    """
+    __slots__ = ("_slots", "_n_positional", "_var_positional", "_positional_names",
+                 "_required_positional", "_required_keyword")
+
+    def __init__(self, sig: inspect.Signature, names: Iterable[str], extras_from_kwargs: bool = True):
+        params = sig.parameters
+        positional = [p for p in params.values()
+                      if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        index_of = {p.name: i for i, p in enumerate(positional)}
+
+        self._n_positional = len(positional)
+        self._var_positional = any(p.kind == p.VAR_POSITIONAL for p in params.values())
+        self._positional_names: Tuple[str, ...] = tuple(p.name for p in positional)
+        self._required_positional: Tuple[Tuple[int, str], ...] = tuple(
+            (i, p.name) for i, p in enumerate(positional) if p.default is p.empty)
+        self._required_keyword: Tuple[str, ...] = tuple(
+            p.name for p in params.values() if p.kind == p.KEYWORD_ONLY and p.default is p.empty)
+
+        slots = []
+        for name in dict.fromkeys(names):
+            param = params.get(name)
+            if param is None:
+                if extras_from_kwargs:
+                    slots.append((name, _EXTRA, -1, _MISSING))
+                continue
+            default = _MISSING if param.default is param.empty else param.default
+            if param.kind == param.POSITIONAL_OR_KEYWORD:
+                slots.append((name, _POSITIONAL, index_of[name], default))
+            elif param.kind == param.POSITIONAL_ONLY:
+                slots.append((name, _POSITIONAL_ONLY, index_of[name], default))
+            elif param.kind == param.KEYWORD_ONLY:
+                slots.append((name, _KEYWORD, -1, default))
+            elif param.kind == param.VAR_POSITIONAL:
+                slots.append((name, _VAR_POSITIONAL, self._n_positional, _MISSING))
+            else:
+                slots.append((name, _VAR_KEYWORD, -1, _MISSING))
+        self._slots = tuple(slots)
+
+    @classmethod
+    def for_function(cls, func: Callable, names: Iterable[str],
+                     extras_from_kwargs: bool = True) -> Optional["BindingPlan"]:
+        """Plan for ``func``, or None when it has no inspectable signature."""
+        try:
+            sig = inspect.signature(func)
+        except (TypeError, ValueError):
+            return None
+        return cls(sig, names, extras_from_kwargs)
+
+    def bind(self, args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The wanted values for one call, in ``names`` order; names without a
+        value (and no default) are left out. Raises TypeError, like
+        ``sig.bind``, when the call doesn't fit the signature.
+        """
+        n = len(args)
+        if n > self._n_positional and not self._var_positional:
+            raise TypeError("too many positional arguments")
+        if kwargs:
+            for name in self._positional_names[:n]:
+                if name in kwargs:
+                    raise TypeError(f"multiple values for argument '{name}'")
+        for i, name in self._required_positional:
+            if i >= n and name not in kwargs:
+                raise TypeError(f"missing a required argument: '{name}'")
+        for name in self._required_keyword:
+            if name not in kwargs:
+                raise TypeError(f"missing a required argument: '{name}'")
+
+        values = {}
+        for name, how, index, default in self._slots:
+            if how == _POSITIONAL:
+                value = args[index] if index < n else kwargs.get(name, default)
+            elif how == _POSITIONAL_ONLY:
+                value = args[index] if index < n else default
+            elif how == _KEYWORD:
+                value = kwargs.get(name, default)
+            elif how == _VAR_POSITIONAL:
+                value = args[index:]
+            elif how == _VAR_KEYWORD:
+                value = {}
+            else:
+                value = kwargs.get(name, _MISSING)
+            if value is not _MISSING:
+                values[name] = value
+        return values
@@ -0,0 +1,120 @@
+"""Exact-match tier in front of the semantic cache.
+
+A semantic-cache lookup embeds the call's arguments and runs a vector search
+even when the very same arguments were seen a moment ago. This tier keys the
+masked canonical ``{function, args, kwargs}`` (the same structure
+``_create_input_vector_data`` builds from ``mask_and_serialize``) plus the
+resolved ``semantic_cache_scope`` / ``semantic_cache_filters`` by SHA-256 and
+keeps the serialized return value in a bounded LRU map with a TTL. A hit
+skips the vectorizer and the store entirely.
+
+Per-tier hit/miss counters are kept here too and exposed under
+``runtime.get_info().stats["semantic_cache"]``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from ..models.db_config import get_weaviate_settings
+
+logger = logging.getLogger(__name__)
+
+# Lookup tiers, in the order a call walks through them.
+TIERS = ("exact", "local_index", "store")
+
+
+def exact_cache_key(canonical: Dict[str, Any], filters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """SHA-256 over the masked canonical call plus its cache filters.
+
+    Returns None if the payload can't be encoded deterministically, in which
+    case the call simply skips this tier.
+    """
+    try:
+        payload = json.dumps(
+            {"call": canonical, "filters": filters or {}},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExactMatchCache:
+    """Thread-safe LRU map of ``key -> serialized return value`` with a TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        # key -> (function_name, return_value, stored_at)
+        self._entries: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tier_counts: Dict[str, Dict[str, int]] = {
+            tier: {"hits": 0, "misses": 0} for tier in TIERS
+        }
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns ``(found, return_value)``; expired entries count as absent."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if time.monotonic() - entry[2] >= self.ttl_seconds:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def put(self, key: str, function_name: str, return_value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (function_name, return_value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, function_name: Optional[str] = None) -> None:
+        """Drops every entry (or only ``function_name``'s)."""
+        with self._lock:
+            if function_name is None:
+                self._entries.clear()
+                return
+            for key in [k for k, v in self._entries.items() if v[0] == function_name]:
+                del self._entries[key]
+
+    def record(self, tier: str, hit: bool) -> None:
+        with self._lock:
+            self._tier_counts[tier]["hits" if hit else "misses"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = {t: dict(c) for t, c in self._tier_counts.items()}
+            stats["exact"]["size"] = len(self._entries)
+            stats["exact"]["capacity"] = self.max_entries
+            return stats
+
+
+@lru_cache()
+def get_exact_cache() -> Optional[ExactMatchCache]:
+    """Returns the process-wide exact-match tier, or None when
+    ``SEMANTIC_CACHE_EXACT_MATCH`` is off."""
+    settings = get_weaviate_settings()
+    if not settings.SEMANTIC_CACHE_EXACT_MATCH:
+        return None
+    cache = ExactMatchCache(
+        max_entries=settings.SEMANTIC_CACHE_EXACT_MAX_ENTRIES,
+        ttl_seconds=settings.SEMANTIC_CACHE_EXACT_TTL_SECONDS,
+    )
+    try:
+        from ..runtime import register_stats_provider
+        register_stats_provider("semantic_cache", cache.stats)
+    except Exception:
+        pass
+    return cache
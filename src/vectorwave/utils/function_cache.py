@@ -2,44 +2,202 @@ import hashlib
 import json
 import logging
 import os
+import sqlite3
 import threading
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, Tuple
 from ..models.db_config import get_weaviate_settings
 
 logger = logging.getLogger(__name__)
 
+CACHE_DB_FILE_NAME = ".vectorwave_functions_cache.db"
+# Pre-SQLite cache file; imported into the database on first load.
 CACHE_FILE_NAME = ".vectorwave_functions_cache.json"
 
+# Attempts at opening the database while another process holds its lock.
+OPEN_ATTEMPTS = 3
+OPEN_RETRY_DELAY_SECONDS = 0.1
+
+
+def _is_locked(error: sqlite3.Error) -> bool:
+    return isinstance(error, sqlite3.OperationalError) and (
+        "locked" in str(error) or "busy" in str(error)
+    )
+
 
 class FunctionCacheManager:
-    """Manages the local file cache for VectorWave function definitions."""
+    """
+    Manages the local cache of VectorWave function definitions: the content
+    hash (and generated metadata) last registered for each function uuid.
+
+    Entries live in a SQLite file in WAL mode, one row per function, so an
+    update is a single-row upsert instead of a rewrite of the whole cache,
+    and SQLite's file locking keeps several processes sharing the directory
+    consistent. The file is opened on first use, not at construction, so
+    importing VectorWave creates nothing on disk. A legacy JSON cache file is
+    imported on first open and left in place.
+
+    While another process holds the database locked, reads and writes go to
+    memory and the database is retried on the next call; buffered writes are
+    saved once it opens. If it can't be opened for any other reason, the
+    cache stays in memory.
+    """
 
     def __init__(self, cache_dir: str = "."):
-        self.cache_path = os.path.join(cache_dir, CACHE_FILE_NAME)
-        # Guards both the in-memory dict and the on-disk JSON. Concurrent
-        # @vectorize decorations from parallel imports would otherwise
-        # interleave json.dump calls and corrupt the file.
+        self.cache_path = os.path.join(cache_dir, CACHE_DB_FILE_NAME)
+        self.legacy_cache_path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        # One connection per process, shared by threads under this lock.
         self._lock = threading.Lock()
-        self.cache: Dict[str, Any] = self._load_cache()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+        self._memory_only = False
+        # Memory only: every entry. Otherwise: writes not yet in the database.
+        self._memory: Dict[str, Any] = {}
         logger.info(f"FunctionCacheManager initialized. Cache file: {self.cache_path}")
 
-    def _load_cache(self) -> Dict[str, Any]:
-        if not os.path.exists(self.cache_path):
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        # isolation_level=None: statements autocommit; imports use explicit BEGIN IMMEDIATE.
+        db = sqlite3.connect(path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS functions "
+            "(func_uuid TEXT PRIMARY KEY, hash TEXT NOT NULL, metadata TEXT)"
+        )
+        return db
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """The database connection, opened on first use and reopened in a
+        forked child (a SQLite connection must not be shared across fork).
+        None when the cache is in memory, for now or for good. Caller holds
+        self._lock."""
+        if self._memory_only:
+            return None
+        if self._db is not None and os.getpid() == self._pid:
+            return self._db
+
+        self._db, self._pid = None, os.getpid()
+        for attempt in range(OPEN_ATTEMPTS):
+            db = None
+            try:
+                db = self._open(self.cache_path)
+                self._import_legacy_json(db)
+                self._save_buffered(db)
+                self._db = db
+                return db
+            except (sqlite3.Error, OSError) as e:
+                if db is not None:
+                    db.close()
+                if isinstance(e, sqlite3.Error) and _is_locked(e):
+                    if attempt + 1 < OPEN_ATTEMPTS:
+                        time.sleep(OPEN_RETRY_DELAY_SECONDS * (attempt + 1))
+                        continue
+                    logger.warning(f"Function cache at '{self.cache_path}' is locked, retrying on next use: {e}")
+                    return None
+                logger.warning(f"Function cache at '{self.cache_path}' unavailable, memory only: {e}")
+                self._memory_only = True
+                self._memory = {**self._load_legacy_json(), **self._memory}
+                return None
+        return None
+
+    def _load_legacy_json(self) -> Dict[str, Any]:
+        if not os.path.exists(self.legacy_cache_path):
             return {}
         try:
-            with open(self.cache_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.legacy_cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
         except (IOError, json.JSONDecodeError) as e:
-            logger.warning(f"Failed to load cache. Starting clean. Error: {e}")
+            logger.warning(f"Failed to load legacy cache '{self.legacy_cache_path}'. Error: {e}")
             return {}
 
-    def _save_cache_locked(self):
-        """Caller must hold self._lock."""
+    def _import_legacy_json(self, db: sqlite3.Connection):
+        """Copies the JSON cache into an empty database. Runs in one write
+        transaction so concurrent first loads import it once."""
+        if not os.path.exists(self.legacy_cache_path):
+            return
+        db.execute("BEGIN IMMEDIATE")
         try:
-            with open(self.cache_path, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=4, sort_keys=True)
-        except IOError as e:
-            logger.error(f"Failed to save cache. Error: {e}")
+            if db.execute("SELECT 1 FROM functions LIMIT 1").fetchone() is None:
+                rows = [
+                    (func_uuid, *self._split_entry(entry))
+                    for func_uuid, entry in self._load_legacy_json().items()
+                ]
+                rows = [row for row in rows if row[1] is not None]
+                db.executemany("INSERT OR IGNORE INTO functions VALUES (?, ?, ?)", rows)
+                if rows:
+                    logger.info(f"Imported {len(rows)} entries from legacy cache '{self.legacy_cache_path}'.")
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def _save_buffered(self, db: sqlite3.Connection):
+        """Writes entries buffered in memory while the database was locked."""
+        if self._memory:
+            self._write(db, {
+                func_uuid: self._split_entry(entry) for func_uuid, entry in self._memory.items()
+            }, encoded=True)
+            self._memory.clear()
+
+    @staticmethod
+    def _write(db: sqlite3.Connection, entries: Dict[str, tuple], encoded: bool = False):
+        db.executemany(
+            "INSERT OR REPLACE INTO functions (func_uuid, hash, metadata) VALUES (?, ?, ?)",
+            [
+                (func_uuid, current_hash,
+                 metadata if encoded or metadata is None else json.dumps(metadata))
+                for func_uuid, (current_hash, metadata) in entries.items()
+            ],
+        )
+
+    @staticmethod
+    def _split_entry(entry: Any) -> Tuple[Optional[str], Optional[str]]:
+        """``(hash, metadata JSON)`` of a legacy entry: a hash string (old
+        format) or ``{"hash", "metadata"}``."""
+        if isinstance(entry, str):
+            return entry, None
+        if isinstance(entry, dict) and isinstance(entry.get("hash"), str):
+            metadata = entry.get("metadata")
+            return entry["hash"], json.dumps(metadata) if metadata is not None else None
+        return None, None
+
+    def _get(self, func_uuid: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        with self._lock:
+            db = self._connection()
+            if db is None or func_uuid in self._memory:
+                stored_hash, metadata = self._split_entry(self._memory.get(func_uuid))
+            else:
+                try:
+                    row = db.execute(
+                        "SELECT hash, metadata FROM functions WHERE func_uuid = ?", (func_uuid,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Function cache read failed: {e}")
+                    row = None
+                stored_hash, metadata = row if row is not None else (None, None)
+        return stored_hash, json.loads(metadata) if metadata else None
+
+    def _put(self, entries: Dict[str, Tuple[str, Optional[Dict[str, Any]]]]):
+        with self._lock:
+            db = self._connection()
+            if db is not None:
+                try:
+                    self._write(db, entries)
+                    return
+                except sqlite3.Error as e:
+                    if not _is_locked(e):
+                        logger.error(f"Failed to save cache. Error: {e}")
+                        return
+                    logger.warning(f"Function cache is locked, keeping the update for the next write: {e}")
+                    # Reopening saves the buffered entries.
+                    db.close()
+                    self._db = None
+            for func_uuid, (current_hash, metadata) in entries.items():
+                self._memory[func_uuid] = {"hash": current_hash, "metadata": metadata}
 
     @staticmethod
     def calculate_content_hash(func_identifier: str, static_properties: Dict[str, Any]) -> str:
@@ -55,41 +213,38 @@ class FunctionCacheManager:
         """
         Returns cached metadata (description/narrative) if hash matches.
         """
-        entry = self.cache.get(func_uuid)
-        if isinstance(entry, dict) and entry.get("hash") == current_hash:
-            return entry.get("metadata")
+        stored_hash, metadata = self._get(func_uuid)
+        if stored_hash == current_hash:
+            return metadata
         return None
 
     def is_cached_and_unchanged(self, func_uuid: str, current_hash: str) -> bool:
-        """Checks if function is cached and unchanged (supports both old string format and new dict format)."""
-        entry = self.cache.get(func_uuid)
-        if entry is None:
-            return False
-
-        # Support old format (string hash)
-        if isinstance(entry, str):
-            return entry == current_hash
-
-        # Support new format (dict with hash)
-        if isinstance(entry, dict):
-            return entry.get("hash") == current_hash
-
-        return False
+        """Checks if function is cached with this hash."""
+        stored_hash, _ = self._get(func_uuid)
+        return stored_hash is not None and stored_hash == current_hash
 
     def update_cache(self, func_uuid: str, current_hash: str):
         """Legacy update: saves only hash."""
-        with self._lock:
-            self.cache[func_uuid] = {"hash": current_hash, "metadata": None}
-            self._save_cache_locked()
+        self._put({func_uuid: (current_hash, None)})
+
+    def update_cache_many(self, hashes: Dict[str, str]):
+        """Saves the hashes of several functions in one statement."""
+        if hashes:
+            self._put({func_uuid: (current_hash, None) for func_uuid, current_hash in hashes.items()})
 
     def update_cache_with_metadata(self, func_uuid: str, current_hash: str, metadata: Dict[str, Any]):
         """[NEW] Updates cache with hash and generated metadata."""
+        self._put({func_uuid: (current_hash, metadata)})
+
+    def clear(self):
+        """Removes every entry (the legacy JSON file is not touched)."""
         with self._lock:
-            self.cache[func_uuid] = {
-                "hash": current_hash,
-                "metadata": metadata
-            }
-            self._save_cache_locked()
+            self._memory.clear()
+            if self._db is None and not os.path.exists(self.cache_path):
+                return
+            db = self._connection()
+            if db is not None:
+                db.execute("DELETE FROM functions")
 
 
 def initialize_cache_manager() -> FunctionCacheManager:
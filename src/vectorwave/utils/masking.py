@@ -0,0 +1,236 @@
+"""Compiled masking rules for captured values.
+
+A ``Masker`` is built once from the sensitive-key settings and reused for
+every span, instead of rebuilding the key set on every
+``mask_and_serialize`` call. Besides exact key names
+(``SENSITIVE_FIELD_NAMES``) it masks keys matching a glob (``"*_token"``)
+or a ``re:``-prefixed regex from ``SENSITIVE_KEY_PATTERNS``, and replaces
+substrings of string values matching ``SENSITIVE_VALUE_PATTERNS`` (regexes
+or preset names from ``VALUE_PATTERN_PRESETS``) with ``[MASKED]``.
+
+Regexes are compiled by the Rust ``regex`` crate when the core provides
+``Masker`` and by ``re`` otherwise, so stick to their common syntax.
+"""
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import Any, FrozenSet, Iterable, Optional, Tuple
+
+import vectorwave.vectorwave_core as vectorwave_core
+
+try:
+    from vectorwave.vectorwave_core import Masker as _RustMasker
+except ImportError:  # older vectorwave_core builds
+    _RustMasker = None
+
+try:
+    from vectorwave.vectorwave_core import mask_and_encode as _rust_mask_and_encode
+except ImportError:  # older vectorwave_core builds
+    _rust_mask_and_encode = None
+
+logger = logging.getLogger(__name__)
+
+# Placeholders written in place of masked or cut data.
+MASKED = "[MASKED]"
+MAX_DEPTH_MARKER = "[MAX_DEPTH]"
+TRUNCATED_SUFFIX = "...[TRUNCATED]"
+MORE_ITEMS = "...[{} more items]"
+
+VALUE_PATTERN_PRESETS = {
+    "email": r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}",
+    "bearer_token": r"(?i:bearer)\s+[A-Za-z0-9._~+/-]+=*",
+    "jwt": r"eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]*",
+    "aws_access_key": r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b",
+}
+
+_GLOB_META = set("\\.+()|[]{}^$#&-~")
+
+
+def _rust_supports_limits() -> bool:
+    try:
+        vectorwave_core.mask_and_serialize(None, [], max_depth=None)
+        return True
+    except TypeError:  # built before the capture limits
+        return False
+
+
+_RUST_LIMITS = _rust_mask_and_encode is not None and _rust_supports_limits()
+
+
+def key_pattern_regex(pattern: str) -> str:
+    """Regex for one ``SENSITIVE_KEY_PATTERNS`` entry: ``re:`` entries are
+    used as-is (searched), anything else is a glob matched against the
+    whole key (``*`` any run, ``?`` one character)."""
+    if pattern.startswith("re:"):
+        return pattern[3:]
+    body = "".join(
+        ".*" if c == "*" else "." if c == "?" else "\\" + c if c in _GLOB_META else c
+        for c in pattern
+    )
+    return f"^{body}$"
+
+
+def value_pattern_regex(pattern: str) -> str:
+    return VALUE_PATTERN_PRESETS.get(pattern, pattern)
+
+
+def _union(patterns: Iterable[str], flags: int) -> Optional["re.Pattern"]:
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+    except re.error as e:
+        raise ValueError(f"Invalid mask pattern: {e}") from e
+
+
+class _PyMasker:
+    """Pure-Python ``vectorwave_core.Masker`` for core builds that predate it.
+    Plain key-name rules still run through the Rust module functions."""
+
+    def __init__(self, sensitive_keys: Iterable[str], key_patterns: Iterable[str] = (),
+                 value_patterns: Iterable[str] = ()):
+        self._keys = [k.lower() for k in sensitive_keys]
+        self._key_set = set(self._keys)
+        self._key_re = _union(key_patterns, re.IGNORECASE)
+        self._value_re = _union(value_patterns, 0)
+        self._plain = self._key_re is None and self._value_re is None
+
+    def is_sensitive(self, key: str) -> bool:
+        key = str(key).lower()
+        return key in self._key_set or (self._key_re is not None and self._key_re.search(key) is not None)
+
+    def redact(self, text: str) -> str:
+        return self._value_re.sub(MASKED, text) if self._value_re is not None else text
+
+    def mask(self, data: Any, max_depth: Optional[int] = None, max_list_items: Optional[int] = None,
+             max_string_length: Optional[int] = None) -> Any:
+        if self._plain:
+            if max_depth is None and max_list_items is None and max_string_length is None:
+                return vectorwave_core.mask_and_serialize(data, self._keys)
+            if _RUST_LIMITS:
+                return vectorwave_core.mask_and_serialize(
+                    data, self._keys, max_depth=max_depth,
+                    max_list_items=max_list_items, max_string_length=max_string_length,
+                )
+        return self._walk(data, max_depth, max_list_items, max_string_length, 0)
+
+    def encode(self, data: Any, max_depth: Optional[int] = None, max_bytes: Optional[int] = None,
+               max_list_items: Optional[int] = None, max_string_length: Optional[int] = None) -> bytes:
+        if self._plain and _RUST_LIMITS:
+            return _rust_mask_and_encode(
+                data, self._keys, max_depth=max_depth, max_bytes=max_bytes,
+                max_list_items=max_list_items, max_string_length=max_string_length,
+            )
+        processed = self.mask(data, max_depth, max_list_items, max_string_length)
+        try:
+            text = json.dumps(processed, separators=(",", ":"), ensure_ascii=False)
+        except (TypeError, ValueError):
+            text = str(processed)
+        encoded = text.encode("utf-8")
+        if max_bytes is not None and len(encoded) > max_bytes:
+            head = encoded[:max_bytes].decode("utf-8", "ignore")
+            return json.dumps(head + TRUNCATED_SUFFIX, ensure_ascii=False).encode("utf-8")
+        return encoded
+
+    def _cut(self, text: str, max_string_length: Optional[int]) -> str:
+        text = self.redact(text)
+        if max_string_length is not None and len(text) > max_string_length:
+            return text[:max_string_length] + TRUNCATED_SUFFIX
+        return text
+
+    def _walk(self, value: Any, max_depth: Optional[int], max_items: Optional[int],
+              max_len: Optional[int], depth: int) -> Any:
+        if isinstance(value, (dict, list)):
+            if max_depth is not None and depth >= max_depth:
+                return MAX_DEPTH_MARKER
+            keep = len(value) if max_items is None else max_items
+            if isinstance(value, list):
+                out = [self._walk(v, max_depth, max_items, max_len, depth + 1) for v in value[:keep]]
+                if len(value) > keep:
+                    out.append(MORE_ITEMS.format(len(value) - keep))
+                return out
+            out = {}
+            for i, (k, v) in enumerate(value.items()):
+                if i >= keep:
+                    out["..."] = MORE_ITEMS.format(len(value) - keep)
+                    break
+                out[k] = MASKED if self.is_sensitive(k) else self._walk(v, max_depth, max_items, max_len, depth + 1)
+            return out
+        if isinstance(value, str):
+            return self._cut(value, max_len)
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        summary = _summarize(value, max_items, max_len)
+        if summary is not None:
+            return summary
+        try:
+            return self._cut(str(value), max_len)
+        except Exception:
+            return "[SERIALIZATION_ERROR]"
+
+
+def _summarize(value: Any, max_items: Optional[int], max_len: Optional[int]) -> Optional[str]:
+    type_name = type(value).__name__
+    if isinstance(value, (bytes, bytearray)):
+        if max_len is not None and len(value) > max_len:
+            return f"<{type_name} len={len(value)}>"
+        return None
+    if max_items is None or not hasattr(value, "shape"):
+        return None
+    size = getattr(value, "size", None)
+    if not isinstance(size, int) or isinstance(size, bool) or size <= max_items:
+        return None
+    dtype = getattr(value, "dtype", None)
+    if dtype is None:
+        return f"<{type_name} shape={value.shape}>"
+    return f"<{type_name} shape={value.shape} dtype={dtype}>"
+
+
+MASKER_TYPES: Tuple[type, ...] = (_PyMasker,) if _RustMasker is None else (_PyMasker, _RustMasker)
+
+
+@lru_cache(maxsize=32)
+def compile_masker(
+        sensitive_keys: FrozenSet[str] = frozenset(),
+        key_patterns: Tuple[str, ...] = (),
+        value_patterns: Tuple[str, ...] = (),
+):
+    """
+    Builds (once per distinct rule set) a masker with ``is_sensitive``,
+    ``redact``, ``mask`` and ``encode``. Raises ValueError on an invalid
+    pattern.
+    """
+    keys = sorted(k.lower() for k in sensitive_keys)
+    key_res = [key_pattern_regex(p) for p in key_patterns]
+    value_res = [value_pattern_regex(p) for p in value_patterns]
+    if _RustMasker is not None:
+        return _RustMasker(keys, key_res, value_res)
+    return _PyMasker(keys, key_res, value_res)
+
+
+@lru_cache(maxsize=32)
+def _settings_masker(keys: FrozenSet[str], key_patterns: Tuple[str, ...], value_patterns: Tuple[str, ...]):
+    try:
+        return compile_masker(keys, key_patterns, value_patterns)
+    except ValueError as e:
+        logger.warning(f"Ignoring SENSITIVE_KEY_PATTERNS / SENSITIVE_VALUE_PATTERNS: {e}")
+        return compile_masker(keys)
+
+
+def get_masker(settings):
+    """The masker for ``settings``' sensitive keys and patterns. An invalid
+    pattern is logged once and masking falls back to the key names."""
+    return _settings_masker(
+        frozenset(settings.sensitive_keys),
+        tuple(settings.SENSITIVE_KEY_PATTERNS or ()),
+        tuple(settings.SENSITIVE_VALUE_PATTERNS or ()),
+    )
+
+
+def as_masker(sensitive):
+    """Accepts a masker or a plain collection of sensitive key names."""
+    if isinstance(sensitive, MASKER_TYPES):
+        return sensitive
+    return compile_masker(frozenset(sensitive))
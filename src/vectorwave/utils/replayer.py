@@ -12,9 +12,8 @@ from unittest.mock import patch
 
 from ..models.db_config import get_weaviate_settings
 from ..store import get_vector_store
-import vectorwave.vectorwave_core as vectorwave_core
 from .context import execution_source_context
-from .serialization import deserialize_return_value
+from .serialization import deserialize_return_value, encode_return_value
 
 logger = logging.getLogger(__name__)
 
@@ -275,11 +274,7 @@ class VectorWaveReplayer:
     def _update_baseline_value(self, uuid_str: str, new_value: Any, is_golden: bool):
         collection_name = self.golden_collection_name if is_golden else self.collection_name
 
-        processed_val = vectorwave_core.mask_and_serialize(new_value, [])
-        try:
-            val_str = json.dumps(processed_val)
-        except (TypeError, ValueError):
-            val_str = str(processed_val)
+        val_str = encode_return_value(new_value, [])
 
         try:
             self.store.update(
@@ -1,6 +1,5 @@
 import logging
 from typing import Optional, Tuple, Any, Dict, Callable
-import json
 from datetime import datetime, timezone
 from uuid import uuid4
 
@@ -8,12 +7,15 @@ from weaviate.util import generate_uuid5
 
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 from ..monitoring.tracer import _create_input_vector_data, current_tracer_var, \
-    current_span_id_var
-from .serialization import deserialize_return_value as _deserialize_return_value
+    current_span_id_var, format_span_id, pending_exact_store_var, new_span_id
+from .serialization import deserialize_return_value as _deserialize_return_value, CaptureLimits
+from .masking import get_masker
 from ..database.db_search import search_similar_execution
 from ..vectorizer.factory import get_vectorizer
 from ..batch.batch import get_batch_manager
 from ..store import get_vector_store
+from .semantic_index import get_semantic_index
+from .exact_cache import exact_cache_key, get_exact_cache
 
 logger = logging.getLogger(__name__)
 
@@ -31,13 +33,21 @@ def _check_and_return_cached_result(
         function_name: str,
         cache_threshold: float,
         is_async: bool,
-        filters: Optional[Dict[str, Any]] = None  # [NEW] 인자 추가
+        filters: Optional[Dict[str, Any]] = None,  # [NEW] 인자 추가
+        capture_limits: Optional[Dict[str, Optional[int]]] = None,
+        remember_exact: bool = False
 ) -> Any:
     """
     Checks for a cached result. Returns the cached return value (which may be
     None) on hit, or the `CACHE_MISS` sentinel on miss/error.
     Priority 1: VectorWaveGoldenDataset (Golden Data)
     Priority 2: VectorWaveExecutions (Standard Logs)
+    With SEMANTIC_CACHE_LOCAL_INDEX enabled, both are answered from the
+    in-process index first and the store is only queried when it can't.
+    Before any of that, the exact-match tier (SEMANTIC_CACHE_EXACT_MATCH)
+    answers repeated calls with identical masked arguments without embedding.
+    With `remember_exact`, a miss leaves its exact-match key in
+    `pending_exact_store_var` for the span that computes the result.
     """
     if not cache_threshold:
         return CACHE_MISS
@@ -50,18 +60,64 @@ def _check_and_return_cached_result(
         return CACHE_MISS
 
     try:
-        # (A) Create vectorization data
+        # (A) Create vectorization data, capped like the logged spans it is compared against
+        limits = CaptureLimits.from_settings(settings, capture_limits)
+        masker = get_masker(settings)
         input_vector_data = _create_input_vector_data(
             func_name=function_name,
             args=args,
             kwargs=kwargs,
-            sensitive_keys=settings.sensitive_keys
+            sensitive_keys=masker,
+            limits=limits
         )
 
+        # (A-1) Exact-match tier: identical masked call seen recently
+        exact_cache = get_exact_cache()
+        exact_key = None
+        if exact_cache is not None:
+            canonical = input_vector_data['properties'] if not limits.active else \
+                _exact_canonical(function_name, args, kwargs, masker)
+            exact_key = exact_cache_key(canonical, filters)
+            if exact_key is not None:
+                found, return_value = exact_cache.get(exact_key)
+                exact_cache.record("exact", found)
+                if found:
+                    return _log_cache_hit_and_return(
+                        func, function_name, settings, None,
+                        {"return_value": return_value, "metadata": {"distance": 0.0}},
+                        is_golden_hit=False, label="Exact Match"
+                    )
+
         # (B) Vectorize
         input_vector = vectorizer.embed(input_vector_data['text'])
 
-        # (C) Priority 1: Search Golden Dataset
+        # (C) Local index first: answers hits and authoritative misses in-process
+        local_index = get_semantic_index()
+        if local_index is not None:
+            local = local_index.search(function_name, input_vector, cache_threshold, filters)
+            if exact_cache is not None:
+                exact_cache.record("local_index", local is not None and local is not NotImplemented)
+            if local is None:
+                return _exact_miss(exact_cache, exact_key, function_name, remember_exact)
+            if local is not NotImplemented:
+                if exact_key is not None:
+                    exact_cache.put(exact_key, function_name, local.return_value)
+                if local.is_golden:
+                    logger.info(
+                        f"🌟 [Golden Cache Hit] '{function_name}' found in local index. "
+                        f"(Distance: {local.distance:.4f})"
+                    )
+                return _log_cache_hit_and_return(
+                    func, function_name, settings, input_vector,
+                    {
+                        "return_value": local.return_value,
+                        "metadata": {"distance": local.distance, "certainty": local.certainty},
+                        "uuid": local.uuid,
+                    },
+                    is_golden_hit=local.is_golden,
+                )
+
+        # (D) Priority 1: Search Golden Dataset
         store = get_vector_store()
         golden_match = None
 
@@ -88,7 +144,7 @@ def _check_and_return_cached_result(
         except Exception as e:
             logger.warning(f"Golden cache search failed: {e}")
 
-        # (D) Decide Source (Golden vs Standard)
+        # (E) Decide Source (Golden vs Standard)
         cached_log = None
         is_golden_hit = False
 
@@ -111,56 +167,91 @@ def _check_and_return_cached_result(
                 filters=filters
             )
 
-        # (E) Process Cache Hit
+        if exact_cache is not None:
+            exact_cache.record("store", bool(cached_log))
+
+        # (F) Process Cache Hit
         if cached_log:
-            if not is_golden_hit:
-                distance = cached_log['metadata'].get('distance')
-                logger.info(
-                    f"[Cache Hit] '{function_name}' skipped (Standard Log). "
-                    f"Distance: {distance:.4f}"
-                )
+            if exact_key is not None:
+                exact_cache.put(exact_key, function_name, cached_log.get('return_value'))
+            return _log_cache_hit_and_return(
+                func, function_name, settings, input_vector, cached_log, is_golden_hit=is_golden_hit
+            )
 
-            # (F) Log CACHE_HIT event
-            try:
-                batch_manager = get_batch_manager()
-
-                tracer = current_tracer_var.get()
-                parent_span_id = current_span_id_var.get()
-                trace_id = tracer.trace_id if tracer else str(uuid4())
-
-                module_name = getattr(func, "__module__", "__main__")
-                func_uuid = generate_uuid5(f"{module_name}.{function_name}")
-
-                hit_properties = {
-                    "trace_id": trace_id,
-                    "span_id": str(uuid4()),
-                    "parent_span_id": parent_span_id,
-                    "function_name": function_name,
-                    "function_uuid": func_uuid,
-                    "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-                    "duration_ms": 0.0,
-                    "status": "CACHE_HIT",
-                    "return_value": cached_log.get('return_value'),
-                    "is_golden_source": is_golden_hit
-                }
-
-                if settings.global_custom_values:
-                    hit_properties.update(settings.global_custom_values)
-
-                # Add to batch
-                batch_manager.add_object(
-                    collection=settings.EXECUTION_COLLECTION_NAME,
-                    properties=hit_properties,
-                    vector=input_vector
-                )
+        return _exact_miss(exact_cache, exact_key, function_name, remember_exact)
 
-            except Exception as log_e:
-                logger.error(f"Failed to log CACHE_HIT: {log_e}")
+    except Exception as e:
+        logger.error(f"Failed to check semantic cache for '{function_name}': {e}", exc_info=True)
+        return CACHE_MISS
 
-            return _deserialize_return_value(cached_log.get('return_value'))
 
-        return CACHE_MISS
+def _log_cache_hit_and_return(
+        func: Callable,
+        function_name: str,
+        settings: WeaviateSettings,
+        input_vector: Any,
+        cached_log: Dict[str, Any],
+        is_golden_hit: bool,
+        label: str = "Standard Log"
+) -> Any:
+    """Logs a CACHE_HIT event for `cached_log` and returns its deserialized value."""
+    if not is_golden_hit:
+        distance = cached_log['metadata'].get('distance')
+        logger.info(
+            f"[Cache Hit] '{function_name}' skipped ({label}). "
+            f"Distance: {distance:.4f}"
+        )
 
-    except Exception as e:
-        logger.error(f"Failed to check semantic cache for '{function_name}': {e}", exc_info=True)
-        return CACHE_MISS
\ No newline at end of file
+    try:
+        batch_manager = get_batch_manager()
+
+        tracer = current_tracer_var.get()
+        parent_span_id = format_span_id(current_span_id_var.get())
+        trace_id = tracer.trace_id if tracer else str(uuid4())
+
+        module_name = getattr(func, "__module__", "__main__")
+        func_uuid = generate_uuid5(f"{module_name}.{function_name}")
+
+        hit_properties = {
+            "trace_id": trace_id,
+            "span_id": new_span_id(),
+            "parent_span_id": parent_span_id,
+            "function_name": function_name,
+            "function_uuid": func_uuid,
+            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": 0.0,
+            "status": "CACHE_HIT",
+            "return_value": cached_log.get('return_value'),
+            "is_golden_source": is_golden_hit
+        }
+
+        if settings.global_custom_values:
+            hit_properties.update(settings.global_custom_values)
+
+        # Add to batch
+        batch_manager.add_object(
+            collection=settings.EXECUTION_COLLECTION_NAME,
+            properties=hit_properties,
+            vector=input_vector
+        )
+
+    except Exception as log_e:
+        logger.error(f"Failed to log CACHE_HIT: {log_e}")
+
+    return _deserialize_return_value(cached_log.get('return_value'))
+
+
+def _exact_canonical(function_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], sensitive_keys) -> Dict[str, Any]:
+    """Canonical call data for exact-match keys. Never capped: calls whose
+    arguments only differ past a capture limit must not share a key."""
+    return _create_input_vector_data(function_name, args, kwargs, sensitive_keys)['properties']
+
+
+def _exact_miss(exact_cache, exact_key: Optional[str], function_name: str, remember_exact: bool) -> Any:
+    """Returns CACHE_MISS, handing the exact-match key to the span about to
+    compute the result: the tracer stores the return value it encodes for the
+    span log, so the result is serialized once and off the hot path when
+    logging is async."""
+    if remember_exact and exact_key is not None:
+        pending_exact_store_var.set((exact_cache, exact_key, function_name))
+    return CACHE_MISS
@@ -0,0 +1,350 @@
+"""In-process vector index for the semantic cache hot path.
+
+Without it, every call of a ``semantic_cache=True`` function does up to two
+remote ``near_vector`` round-trips (golden dataset, then executions). With
+``SEMANTIC_CACHE_LOCAL_INDEX=true`` each cached function gets a flat NumPy
+matrix of its SUCCESS vectors (plus its golden entries):
+
+- warmed from the store on the function's first lookup, and rebuilt from the
+  store every ``SEMANTIC_CACHE_LOCAL_INDEX_TTL_SECONDS`` so archiver deletes
+  and out-of-process writes are picked up,
+- appended to by the tracer as new SUCCESS spans are logged (so it is never
+  behind the batch manager's flush),
+- searched by exact cosine similarity, with certainties (and distances) on
+  the scale of the backend the index was warmed from, so a threshold means
+  the same locally as in the store: ``(1 + cos) / 2`` for Weaviate, plain
+  ``cos`` for Lance (``1 - l2² / 2`` over unit vectors), and the same dict
+  filter grammar.
+
+At most ``SEMANTIC_CACHE_LOCAL_INDEX_MAX_ROWS`` execution rows are kept per
+function (oldest evicted first). Once a function has more rows than that, a
+local miss is no longer authoritative and the caller falls back to the store.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from ..models.db_config import get_weaviate_settings, WeaviateSettings
+from ..store.lance_store import _matches_filter
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Golden entries are curated and few; this bounds the warm-up query only.
+GOLDEN_WARM_LIMIT = 1000
+
+
+class _CertaintyScale(NamedTuple):
+    """How a backend's ``near_vector`` reports a match at cosine ``cos``."""
+    certainty: Callable[[float], float]
+    min_cos: Callable[[float], float]  # certainty threshold -> cosine bound
+    distance: Callable[[float], float]
+
+
+# Keyed by VectorStore.backend_name; unknown backends use Weaviate's scale.
+CERTAINTY_SCALES: Dict[str, _CertaintyScale] = {
+    "weaviate": _CertaintyScale(
+        certainty=lambda cos: (1.0 + cos) / 2.0,
+        min_cos=lambda threshold: 2.0 * threshold - 1.0,
+        distance=lambda cos: 1.0 - cos,
+    ),
+    # Squared L2 over unit vectors: d = 2 - 2cos, certainty = 1 - d / 2.
+    "lance": _CertaintyScale(
+        certainty=lambda cos: cos,
+        min_cos=lambda threshold: threshold,
+        distance=lambda cos: 2.0 - 2.0 * cos,
+    ),
+}
+
+
+class LocalCacheHit(NamedTuple):
+    uuid: str
+    return_value: Any
+    is_golden: bool
+    distance: float
+    certainty: float
+
+
+class _Entries:
+    """Fixed-capacity ring of unit vectors plus their properties."""
+
+    def __init__(self, dim: int, capacity: int):
+        self.capacity = max(1, capacity)
+        self.vectors = np.zeros((min(self.capacity, 64), dim), dtype=np.float32)
+        self.meta: List[Optional[tuple]] = []
+        self.head = 0  # next slot to overwrite once full
+        self.evicted = False
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def add(self, vector, uuid: str, properties: Dict[str, Any]) -> None:
+        n = len(self.meta)
+        if n < self.capacity:
+            if n == self.vectors.shape[0]:
+                grown = np.zeros((min(self.capacity, n * 2), self.vectors.shape[1]), dtype=np.float32)
+                grown[:n] = self.vectors
+                self.vectors = grown
+            self.vectors[n] = vector
+            self.meta.append((uuid, properties))
+            return
+        self.vectors[self.head] = vector
+        self.meta[self.head] = (uuid, properties)
+        self.head = (self.head + 1) % self.capacity
+        self.evicted = True
+
+    def candidates(self, query, min_cos: float):
+        """Yields (index, cos) above ``min_cos``, best first."""
+        n = len(self.meta)
+        if n == 0:
+            return
+        sims = self.vectors[:n] @ query
+        idx = np.nonzero(sims >= min_cos)[0]
+        for i in idx[np.argsort(-sims[idx], kind="stable")]:
+            yield int(i), float(sims[i])
+
+
+class _FunctionIndex:
+    def __init__(self, dim: int, max_rows: int):
+        self.dim = dim
+        self.golden = _Entries(dim, GOLDEN_WARM_LIMIT)
+        self.executions = _Entries(dim, max_rows)
+        self.complete = True
+        self.built_at = time.monotonic()
+
+
+def _unit(vector) -> Optional["np.ndarray"]:
+    arr = np.asarray(vector, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(arr))
+    if not arr.size or norm == 0.0:
+        return None
+    return arr / norm
+
+
+class LocalSemanticIndex:
+    """Per-function local vector indexes for semantic-cache lookups."""
+
+    def __init__(self, max_rows: int = 10000, ttl_seconds: float = 300.0, backend: Optional[str] = None):
+        """``backend`` pins the certainty scale (a ``CERTAINTY_SCALES`` key);
+        by default it follows the store the index is warmed from."""
+        if np is None:
+            raise ImportError("The local semantic index requires numpy (`pip install numpy`).")
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self._pinned_backend = backend is not None
+        self.backend = backend or "weaviate"
+        self._indexes: Dict[str, _FunctionIndex] = {}
+        self._lock = threading.Lock()
+        self._warm_locks: Dict[str, threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._store_fallbacks = 0
+        self._rebuilds = 0
+
+    # ------------------------------------------------------------------
+    # Build / maintenance
+    # ------------------------------------------------------------------
+
+    def _is_fresh(self, function_name: str) -> bool:
+        idx = self._indexes.get(function_name)
+        return idx is not None and (time.monotonic() - idx.built_at) < self.ttl_seconds
+
+    def warm(self, function_name: str, settings: Optional[WeaviateSettings] = None) -> bool:
+        """(Re)builds ``function_name``'s index from the store. Returns False if
+        the store could not be read, in which case lookups keep going to it."""
+        settings = settings or get_weaviate_settings()
+        from ..store import get_vector_store
+        try:
+            store = get_vector_store()
+            if not self._pinned_backend:
+                backend = getattr(store, "backend_name", None)
+                self.backend = backend if backend in CERTAINTY_SCALES else "weaviate"
+            executions = store.query(
+                collection=settings.EXECUTION_COLLECTION_NAME,
+                filters={"function_name": function_name, "status": "SUCCESS"},
+                sort_by="timestamp_utc",
+                sort_ascending=False,
+                limit=self.max_rows,
+                include_vector=True,
+            )
+        except Exception as e:
+            logger.warning(f"Local semantic index warm-up failed for '{function_name}': {e}")
+            return False
+
+        golden = []
+        try:
+            if store.collection_exists(settings.GOLDEN_COLLECTION_NAME):
+                golden = store.query(
+                    collection=settings.GOLDEN_COLLECTION_NAME,
+                    filters={"function_name": function_name},
+                    limit=GOLDEN_WARM_LIMIT,
+                    include_vector=True,
+                )
+        except Exception as e:
+            logger.debug(f"Golden warm-up skipped for '{function_name}': {e}")
+
+        dim = next((len(r.vector) for r in list(golden) + list(executions) if r.vector), None)
+        rebuilt = _FunctionIndex(dim or 0, self.max_rows)
+        # A full page means older rows may exist beyond what was loaded.
+        rebuilt.complete = len(executions) < self.max_rows
+        if dim:
+            for rec in golden:
+                self._add_to(rebuilt.golden, rebuilt.dim, rec.uuid, rec.vector, rec.properties)
+            # Oldest first so ring eviction drops the oldest rows.
+            for rec in reversed(executions):
+                self._add_to(rebuilt.executions, rebuilt.dim, rec.uuid, rec.vector, rec.properties)
+
+        with self._lock:
+            if function_name in self._indexes:
+                self._rebuilds += 1
+            self._indexes[function_name] = rebuilt
+        logger.debug(
+            f"Local semantic index for '{function_name}': "
+            f"{len(rebuilt.executions)} executions, {len(rebuilt.golden)} golden."
+        )
+        return True
+
+    def _ensure_fresh(self, function_name: str) -> bool:
+        if self._is_fresh(function_name):
+            return True
+        with self._lock:
+            warm_lock = self._warm_locks.setdefault(function_name, threading.Lock())
+        with warm_lock:
+            if self._is_fresh(function_name):
+                return True
+            return self.warm(function_name)
+
+    @staticmethod
+    def _add_to(entries: _Entries, dim: int, uuid: str, vector, properties: Dict[str, Any]) -> None:
+        if vector is None or len(vector) != dim:
+            return
+        unit = _unit(vector)
+        if unit is not None:
+            entries.add(unit, str(uuid), dict(properties or {}))
+
+    def add_execution(self, function_name: str, uuid: str, vector, properties: Dict[str, Any]) -> None:
+        """Records a freshly logged SUCCESS span. No-op for functions that have
+        no index yet — they are warmed from the store on first lookup."""
+        with self._lock:
+            idx = self._indexes.get(function_name)
+            if idx is None:
+                return
+            if not idx.dim and vector:
+                idx.dim = len(vector)
+                idx.golden = _Entries(idx.dim, GOLDEN_WARM_LIMIT)
+                idx.executions = _Entries(idx.dim, self.max_rows)
+            self._add_to(idx.executions, idx.dim, uuid, vector, properties)
+            if idx.executions.evicted:
+                idx.complete = False
+
+    def add_golden(self, function_name: str, uuid: str, vector, properties: Dict[str, Any]) -> None:
+        with self._lock:
+            idx = self._indexes.get(function_name)
+            if idx is None:
+                return
+            if not idx.dim and vector:
+                idx.dim = len(vector)
+                idx.golden = _Entries(idx.dim, GOLDEN_WARM_LIMIT)
+                idx.executions = _Entries(idx.dim, self.max_rows)
+            self._add_to(idx.golden, idx.dim, uuid, vector, properties)
+
+    def invalidate(self, function_name: Optional[str] = None) -> None:
+        """Drops one function's index (or all of them); the next lookup rebuilds."""
+        with self._lock:
+            if function_name is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(function_name, None)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        function_name: str,
+        vector: List[float],
+        threshold: float,
+        filters: Optional[Dict[str, Any]] = None,
+    ):
+        """Looks ``vector`` up locally with golden entries taking priority.
+
+        Returns a ``LocalCacheHit``, None for an authoritative miss, or
+        ``NotImplemented`` when the caller must ask the store instead (index
+        unavailable or truncated by ``max_rows``).
+        """
+        if not self._ensure_fresh(function_name):
+            with self._lock:
+                self._store_fallbacks += 1
+            return NotImplemented
+
+        query = _unit(vector)
+        with self._lock:
+            idx = self._indexes.get(function_name)
+            if idx is None or query is None or (idx.dim and len(query) != idx.dim):
+                self._store_fallbacks += 1
+                return NotImplemented
+
+            scale = CERTAINTY_SCALES.get(self.backend, CERTAINTY_SCALES["weaviate"])
+            min_cos = scale.min_cos(threshold)
+            for entries, is_golden in ((idx.golden, True), (idx.executions, False)):
+                for i, cos in entries.candidates(query, min_cos):
+                    uuid, props = entries.meta[i]
+                    if filters and not _matches_filter(props, filters):
+                        continue
+                    self._hits += 1
+                    return LocalCacheHit(
+                        uuid=uuid,
+                        return_value=props.get("return_value"),
+                        is_golden=is_golden,
+                        distance=scale.distance(cos),
+                        certainty=scale.certainty(cos),
+                    )
+
+            if not idx.complete:
+                self._store_fallbacks += 1
+                return NotImplemented
+            self._misses += 1
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "functions": len(self._indexes),
+                "rows": sum(len(i.executions) + len(i.golden) for i in self._indexes.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "store_fallbacks": self._store_fallbacks,
+                "rebuilds": self._rebuilds,
+            }
+
+
+@lru_cache()
+def get_semantic_index() -> Optional[LocalSemanticIndex]:
+    """Returns the process-wide local index, or None when
+    ``SEMANTIC_CACHE_LOCAL_INDEX`` is off (or numpy is missing)."""
+    settings = get_weaviate_settings()
+    if not settings.SEMANTIC_CACHE_LOCAL_INDEX:
+        return None
+    try:
+        index = LocalSemanticIndex(
+            max_rows=settings.SEMANTIC_CACHE_LOCAL_INDEX_MAX_ROWS,
+            ttl_seconds=settings.SEMANTIC_CACHE_LOCAL_INDEX_TTL_SECONDS,
+        )
+    except ImportError as e:
+        logger.warning(f"SEMANTIC_CACHE_LOCAL_INDEX is enabled but unavailable: {e}")
+        return None
+    try:
+        from ..runtime import register_stats_provider
+        register_stats_provider("semantic_index", index.stats)
+    except Exception:
+        pass
+    return index
@@ -1,5 +1,48 @@
 import json
-from typing import Any, Optional
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .masking import MAX_DEPTH_MARKER, TRUNCATED_SUFFIX, as_masker  # noqa: F401
+
+
+@dataclass(frozen=True)
+class CaptureLimits:
+    """
+    Bounds on the captured arguments and return values of a traced call;
+    ``None`` means unlimited.
+
+    - ``max_depth``: dicts/lists nested deeper become ``MAX_DEPTH_MARKER``.
+    - ``max_list_items``: dicts/lists keep their first N items plus a
+      ``"...[K more items]"`` marker; ndarray/DataFrame-like values with more
+      elements are stored as a ``<type shape=... dtype=...>`` summary.
+    - ``max_string_length``: longer strings (and ``str()`` of unknown
+      objects) are cut and end in ``TRUNCATED_SUFFIX``; longer bytes are
+      stored as ``<bytes len=N>``.
+    - ``max_bytes``: an encoded return value longer than this is stored as a
+      JSON string of its prefix ending in ``TRUNCATED_SUFFIX``.
+    """
+    max_depth: Optional[int] = None
+    max_bytes: Optional[int] = None
+    max_list_items: Optional[int] = None
+    max_string_length: Optional[int] = None
+
+    @classmethod
+    def from_settings(cls, settings, overrides: Optional[Dict[str, Optional[int]]] = None) -> "CaptureLimits":
+        """Global ``CAPTURE_MAX_*`` settings, with per-decorator ``overrides``
+        (e.g. ``{"max_list_items": 100}``) taking precedence."""
+        limits = cls(
+            max_depth=settings.CAPTURE_MAX_DEPTH,
+            max_bytes=settings.CAPTURE_MAX_BYTES,
+            max_list_items=settings.CAPTURE_MAX_LIST_ITEMS,
+            max_string_length=settings.CAPTURE_MAX_STRING_LENGTH,
+        )
+        return replace(limits, **overrides) if overrides else limits
+
+    @property
+    def active(self) -> bool:
+        return any(v is not None for v in (
+            self.max_depth, self.max_bytes, self.max_list_items, self.max_string_length))
+
 
 
 def deserialize_return_value(value: Optional[Any]) -> Any:
@@ -15,3 +58,47 @@ def deserialize_return_value(value: Optional[Any]) -> Any:
         except (json.JSONDecodeError, TypeError):
             return value
     return value
+
+
+def mask_value(
+        value: Any,
+        sensitive: Union[Iterable[str], Any],
+        limits: Optional[CaptureLimits] = None,
+) -> Any:
+    """
+    Masks ``value`` like ``vectorwave_core.mask_and_serialize`` with the
+    structural ``limits`` applied (``max_bytes`` only concerns encoded
+    return values). ``sensitive`` is a masker from ``utils.masking`` or a
+    collection of sensitive key names.
+    """
+    masker = as_masker(sensitive)
+    if limits is None or not limits.active:
+        return masker.mask(value)
+    return masker.mask(
+        value,
+        max_depth=limits.max_depth,
+        max_list_items=limits.max_list_items,
+        max_string_length=limits.max_string_length,
+    )
+
+
+def encode_return_value(
+        value: Any,
+        sensitive: Union[Iterable[str], Any],
+        limits: Optional[CaptureLimits] = None,
+) -> str:
+    """
+    Masks ``value`` and encodes it as the compact JSON stored in
+    ``return_value``, applying ``limits`` (see ``CaptureLimits``). The Rust
+    core does both in a single walk.
+    """
+    masker = as_masker(sensitive)
+    if limits is None or not limits.active:
+        return masker.encode(value).decode("utf-8")
+    return masker.encode(
+        value,
+        max_depth=limits.max_depth,
+        max_bytes=limits.max_bytes,
+        max_list_items=limits.max_list_items,
+        max_string_length=limits.max_string_length,
+    ).decode("utf-8")
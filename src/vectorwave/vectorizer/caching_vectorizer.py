@@ -0,0 +1,165 @@
+from .base import BaseVectorizer
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class CachingVectorizer(BaseVectorizer):
+    """Memoizes another vectorizer's embeddings.
+
+    The same strings are embedded over and over (``search_description`` on
+    every process start, identical error messages, repeated replay outputs).
+    Vectors are keyed by ``sha256(model_name + text)`` and kept in an
+    in-memory LRU; with ``disk_path`` set they are also persisted to a
+    SQLite file so a restarted process doesn't pay for them again.
+    Empty vectors (a failed embedding) are never cached.
+    """
+
+    def __init__(
+        self,
+        inner: BaseVectorizer,
+        model_name: str,
+        max_entries: int = 4096,
+        disk_path: Optional[str] = None,
+    ):
+        self.inner = inner
+        self.model_name = model_name
+        self.max_entries = max(1, max_entries)
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self.disk_path = disk_path
+        if disk_path:
+            try:
+                self._db = self._open_disk_tier(disk_path)
+            except Exception as e:
+                logger.warning("Embedding disk cache at '%s' unavailable, memory only: %s", disk_path, e)
+
+    @staticmethod
+    def _open_disk_tier(path: str) -> sqlite3.Connection:
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        db.commit()
+        return db
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def _remember_locked(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self._memory_hits += 1
+
+            missing = [k for k in keys if k not in found]
+            if missing and self._db is not None:
+                rows = []
+                try:
+                    # Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds.
+                    for i in range(0, len(missing), 500):
+                        chunk = missing[i:i + 500]
+                        placeholders = ",".join("?" * len(chunk))
+                        rows.extend(self._db.execute(
+                            f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                        ).fetchall())
+                except sqlite3.Error as e:
+                    logger.warning("Embedding disk cache read failed: %s", e)
+                    rows = []
+                for key, blob in rows:
+                    vector = array("d", blob).tolist()
+                    found[key] = vector
+                    self._remember_locked(key, vector)
+                    self._disk_hits += 1
+
+            self._misses += sum(1 for k in keys if k not in found)
+        return found
+
+    def _store(self, entries: Dict[str, List[float]]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            for key, vector in entries.items():
+                self._remember_locked(key, vector)
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(k, array("d", v).tobytes()) for k, v in entries.items()],
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Embedding disk cache write failed: %s", e)
+
+    # ------------------------------------------------------------------
+    # BaseVectorizer
+    # ------------------------------------------------------------------
+
+    def embed(self, text: str) -> List[float]:
+        key = self._key(text)
+        found = self._lookup([key])
+        if key in found:
+            return list(found[key])
+        vector = self.inner.embed(text)
+        if vector:
+            self._store({key: list(vector)})
+        return vector
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(t) for t in texts]
+        # Duplicate texts in one batch are looked up and embedded once.
+        unique_keys = list(dict.fromkeys(keys))
+        found = self._lookup(unique_keys)
+
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+
+        if pending:
+            vectors = self.inner.embed_batch(list(pending.values()))
+            fresh = {k: list(v) for k, v in zip(pending.keys(), vectors) if v}
+            self._store(fresh)
+            found.update(fresh)
+
+        return [list(found[k]) if k in found else [] for k in keys]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "model": self.model_name,
+                "entries": len(self._memory),
+                "capacity": self.max_entries,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "disk_path": self.disk_path if self._db is not None else None,
+            }
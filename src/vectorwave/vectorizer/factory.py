@@ -3,6 +3,7 @@ from typing import Optional
 import logging
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 from .base import BaseVectorizer
+from .caching_vectorizer import CachingVectorizer
 from .huggingface_vectorizer import HuggingFaceVectorizer
 from .openai_vectorizer import OpenAIVectorizer
 
@@ -15,8 +16,29 @@ def get_vectorizer() -> Optional[BaseVectorizer]:
     Reads the configuration file (.env) and returns an appropriate Python Vectorizer instance.
     - "weaviate_module" or "none": Returns None as Weaviate handles processing.
     - "huggingface", "openai_client": Returns the actual instance as Python handles processing.
+    With EMBEDDING_CACHE enabled (default) the instance is wrapped in a CachingVectorizer.
     """
     settings: WeaviateSettings = get_weaviate_settings()
+    vectorizer = _create_vectorizer(settings)
+    if vectorizer is None or not settings.EMBEDDING_CACHE:
+        return vectorizer
+
+    model_name = getattr(vectorizer, "model_name", None) or getattr(vectorizer, "model", None)
+    cached = CachingVectorizer(
+        vectorizer,
+        model_name=f"{type(vectorizer).__name__}:{model_name}",
+        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        disk_path=settings.EMBEDDING_CACHE_PATH,
+    )
+    try:
+        from ..runtime import register_stats_provider
+        register_stats_provider("embedding_cache", cached.stats)
+    except Exception:
+        pass
+    return cached
+
+
+def _create_vectorizer(settings: WeaviateSettings) -> Optional[BaseVectorizer]:
     vectorizer_name = settings.VECTORIZER.lower()
 
     logger.info("Initializing vectorizer based on setting: '%s'", vectorizer_name)
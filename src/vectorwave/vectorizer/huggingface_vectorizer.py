@@ -21,6 +21,7 @@ class HuggingFaceVectorizer(BaseVectorizer):
             raise ImportError("Could not find the 'sentence-transformers' library.")
 
         # Force use of CPU (can be changed to 'cuda', etc., if needed)
+        self.model_name = model_name
         self.model = SentenceTransformer(model_name, device='cpu')
         logger.info("HuggingFaceVectorizer loaded model '%s' on CPU.", model_name)
 
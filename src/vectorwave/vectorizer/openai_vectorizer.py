@@ -36,11 +36,12 @@ class OpenAIVectorizer(BaseVectorizer):
         return vector if vector else []
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        embeddings = []
-        for text in texts:
-            emb = self.embed(text)
-            if emb:
-                embeddings.append(emb)
-            else:
-                embeddings.append([])
-        return embeddings
+        # One request per OPENAI_EMBEDDING_MAX_INPUTS texts instead of one per text.
+        if not texts:
+            return []
+        vectors = self.client.create_embedding(
+            text=[t.replace("\n", " ") for t in texts],
+            model=self.model,
+            category="embedding"
+        )
+        return [v if v else [] for v in vectors]